@@ -0,0 +1,191 @@
+"""
+Deterministic stand-ins for the LLM, embedding model and tokenizer.
+
+They let the benchmark suite drive the real LightRAG pipeline offline: every
+call sleeps for a fixed latency and returns output derived only from the
+prompt, so two runs over the same documents do exactly the same work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import re
+from typing import Any
+
+import numpy as np
+
+from lightrag.prompt import PROMPTS
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+_TUPLE = PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+_COMPLETE = PROMPTS["DEFAULT_COMPLETION_DELIMITER"]
+
+# Capitalized words and phrases are used as synthetic entity names
+_ENTITY_PATTERN = re.compile(r"\b[A-Z][A-Za-z0-9\-]+(?:\s+[A-Z][A-Za-z0-9\-]+)*")
+_SENTENCE_PATTERN = re.compile(r"[^.!?\n]+[.!?]?")
+_WORD_PATTERN = re.compile(r"\w+")
+_TOKEN_PATTERN = re.compile(r"\s+|\w+|[^\w\s]")
+_INPUT_TEXT_PATTERN = re.compile(
+    r"---Real Data to be Processed---.*?Text:\n```\n(.*)\n```", re.DOTALL
+)
+_QUERY_PATTERN = re.compile(r"User Query:\s*(.*?)\n\n---Output---", re.DOTALL)
+
+
+class WordTokenizer:
+    """Reversible word-level tokenizer that needs no downloaded vocabulary"""
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._pieces: list[str] = []
+
+    def encode(self, content: str) -> list[int]:
+        tokens = []
+        for piece in _TOKEN_PATTERN.findall(content):
+            token = self._ids.get(piece)
+            if token is None:
+                token = len(self._pieces)
+                self._ids[piece] = token
+                self._pieces.append(piece)
+            tokens.append(token)
+        return tokens
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(self._pieces[token] for token in tokens)
+
+    def token_offsets(self, content: str, tokens: list[int]) -> list[int]:
+        return [0, *itertools.accumulate(len(self._pieces[token]) for token in tokens)]
+
+
+def make_tokenizer(name: str) -> Tokenizer | None:
+    """Return the tokenizer for a --tokenizer choice, None means LightRAG's default"""
+    if name == "word":
+        return Tokenizer(model_name="word", tokenizer=WordTokenizer())
+    return None
+
+
+def _extraction_output(text: str, max_entities: int) -> str:
+    """Build an extraction answer in the record format parsed by operate.py"""
+    entities: dict[str, str] = {}
+    relations: dict[tuple[str, str], str] = {}
+
+    for sentence in _SENTENCE_PATTERN.findall(text):
+        sentence = sentence.strip()
+        names = []
+        for match in _ENTITY_PATTERN.findall(sentence):
+            name = match.strip()
+            if len(name) < 3:
+                continue
+            if name not in entities:
+                if len(entities) >= max_entities:
+                    continue
+                entities[name] = sentence
+            names.append(name)
+        for src, tgt in zip(names, names[1:]):
+            if src != tgt and (src, tgt) not in relations:
+                relations[(src, tgt)] = sentence
+
+    lines = [
+        f"entity{_TUPLE}{name}{_TUPLE}concept{_TUPLE}{name} is mentioned in: {sentence}"
+        for name, sentence in entities.items()
+    ]
+    lines.extend(
+        f"relation{_TUPLE}{src}{_TUPLE}{tgt}{_TUPLE}co-occurrence{_TUPLE}{sentence}"
+        for (src, tgt), sentence in relations.items()
+    )
+    lines.append(_COMPLETE)
+    return "\n".join(lines)
+
+
+def _keywords_output(query: str) -> str:
+    low_level = sorted({m.strip() for m in _ENTITY_PATTERN.findall(query)})
+    high_level = sorted({w.lower() for w in _WORD_PATTERN.findall(query) if len(w) > 6})
+    return json.dumps(
+        {"high_level_keywords": high_level, "low_level_keywords": low_level}
+    )
+
+
+class FakeLLM:
+    """Prompt-driven fake completion function with a fixed per-call latency
+
+    Calls are counted per kind (extract, glean, summary, keywords, answer) so
+    the benchmark can report how much work each stage asked for.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, max_entities: int = 20):
+        self.latency = latency_ms / 1000.0
+        self.max_entities = max_entities
+        self.calls: dict[str, int] = {}
+
+    def _count(self, kind: str) -> None:
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+
+    async def __call__(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        history_messages: list[dict[str, Any]] | None = None,
+        keyword_extraction: bool = False,
+        **kwargs: Any,
+    ) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if keyword_extraction or "high_level_keywords" in prompt:
+            self._count("keywords")
+            match = _QUERY_PATTERN.search(prompt)
+            return _keywords_output(match.group(1) if match else prompt)
+
+        if system_prompt and _INPUT_TEXT_PATTERN.search(system_prompt):
+            if history_messages:
+                # Gleaning pass: nothing was missed the first time
+                self._count("glean")
+                return _COMPLETE
+            self._count("extract")
+            text = _INPUT_TEXT_PATTERN.search(system_prompt).group(1)
+            return _extraction_output(text, self.max_entities)
+
+        if "Description List:" in prompt:
+            self._count("summary")
+            descriptions = prompt.split("Description List:", 1)[1]
+            return " ".join(descriptions.split())[:400]
+
+        self._count("answer")
+        digest = hashlib.md5(prompt.encode("utf-8")).hexdigest()
+        return f"Synthetic answer {digest} over {len(prompt)} prompt characters."
+
+
+class FakeEmbedding:
+    """Hashed bag-of-words embedding, so similar texts get similar vectors"""
+
+    def __init__(self, dim: int = 256, latency_ms: float = 0.0):
+        self.dim = dim
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+        self.texts = 0
+
+    async def __call__(self, texts: list[str], **kwargs: Any) -> np.ndarray:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.calls += 1
+        self.texts += len(texts)
+
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in _WORD_PATTERN.findall(text.lower()):
+                bucket = int.from_bytes(
+                    hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest(),
+                    "little",
+                )
+                vectors[row, bucket % self.dim] += 1.0
+            norm = np.linalg.norm(vectors[row])
+            if norm:
+                vectors[row] /= norm
+            else:
+                vectors[row, 0] = 1.0
+        return vectors
+
+    def as_embedding_func(self) -> EmbeddingFunc:
+        return EmbeddingFunc(embedding_dim=self.dim, max_token_size=8192, func=self)
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Load Generator and Latency SLO Check for the LightRAG API Server
+
+Replays a query corpus against a running lightrag-server (uvicorn or gunicorn)
+at a target request rate, spread over /query, /query/stream, /query/data and
+the Ollama-compatible /api/chat according to a weighted mix. Reports per
+endpoint:
+- Latency percentiles (p50/p90/p95/p99) from request sent to response complete
+- Time to first token for the streaming endpoints
+- Queue wait: delay between the scheduled and actual send time, which grows
+  once the --concurrency cap is the bottleneck
+- Error rate by kind and throughput of successful requests
+
+Point the server at benchmarks/stub_backend.py so the numbers reflect the
+server and its storages only, not an LLM provider.
+
+Usage:
+    # 20 req/s for 60 s with the default endpoint mix, against localhost:9621
+    python benchmarks/load_test.py --rps 20 --duration 60
+
+    # Ingest the sample documents first, only stream endpoints, fail on SLO miss
+    python benchmarks/load_test.py --ingest --mix query_stream=1,api_chat=1 \\
+        --rps 10 --duration 30 --slo-p95-ms 2000 --slo-ttft-p95-ms 800
+
+    # Closed loop: 32 clients sending back to back for 500 requests
+    python benchmarks/load_test.py --rps 0 --concurrency 32 --requests 500
+
+Results are saved to: benchmarks/results/load_YYYYMMDD_HHMMSS.json
+
+Technical Notes:
+    - The load is open loop by default: requests are scheduled at --rps
+      (constant or Poisson arrivals) whatever the server latency, so a slow
+      server shows up as queue wait and errors instead of a lower offered rate
+    - Run the load generator on a different host than the server when
+      measuring more than a few hundred requests per second
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run_benchmarks import (  # noqa: E402
+    DEFAULT_RESULTS_DIR,
+    QUERY_MODES,
+    SAMPLE_DATASET,
+    latency_summary,
+    load_documents,
+)
+
+ENDPOINTS = {
+    "query": "/query",
+    "query_stream": "/query/stream",
+    "query_data": "/query/data",
+    "api_chat": "/api/chat",
+}
+STREAMING_ENDPOINTS = {"query_stream", "api_chat"}
+DEFAULT_MIX = "query=4,query_stream=3,query_data=2,api_chat=1"
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    ok: bool
+    latency: float
+    queue_wait: float
+    ttft: float | None = None
+    error: str | None = None
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Return the queries of a corpus file
+
+    Accepts the evaluation dataset format ({"test_cases": [{"question": ...}]}),
+    a JSON list of strings or objects, or JSON Lines. Objects contribute their
+    "query", "question" or "title" field, in that order of preference.
+    """
+    text = path.read_text(encoding="utf-8-sig")
+    if path.suffix == ".jsonl":
+        items: list[Any] = [
+            json.loads(line) for line in text.splitlines() if line.strip()
+        ]
+    else:
+        data = json.loads(text)
+        items = data.get("test_cases", []) if isinstance(data, dict) else data
+
+    queries = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("query") or item.get("question") or item.get("title")
+        if isinstance(item, str) and item.strip():
+            queries.append(item.strip())
+    if not queries:
+        raise ValueError(f"No queries found in {path}")
+    return queries
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown endpoint '{name}', choose from {', '.join(ENDPOINTS)}"
+            )
+        mix[name] = float(weight) if weight else 1.0
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("Endpoint mix needs a positive weight")
+    return mix
+
+
+def build_request(
+    endpoint: str, query: str, mode: str, args: argparse.Namespace
+) -> dict[str, Any]:
+    if endpoint == "api_chat":
+        return {
+            "model": args.ollama_model,
+            "messages": [{"role": "user", "content": f"/{mode} {query}"}],
+            "stream": True,
+        }
+    payload = {"query": query, "mode": mode, "top_k": args.top_k}
+    if endpoint == "query":
+        payload.update(stream=False, include_references=False)
+    elif endpoint == "query_stream":
+        payload["stream"] = True
+    return payload
+
+
+def _first_token(endpoint: str, line: str) -> bool:
+    """Whether a streamed NDJSON line carries answer text"""
+    try:
+        message = json.loads(line)
+    except json.JSONDecodeError:
+        return False
+    if "error" in message:
+        raise RuntimeError(f"stream error: {str(message['error'])[:200]}")
+    if endpoint == "api_chat":
+        return bool((message.get("message") or {}).get("content"))
+    return bool(message.get("response"))
+
+
+async def send(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    payload: dict[str, Any],
+    scheduled: float,
+) -> Sample:
+    started = time.perf_counter()
+    queue_wait = max(0.0, started - scheduled)
+    ttft = None
+    try:
+        if endpoint in STREAMING_ENDPOINTS:
+            async with client.stream("POST", ENDPOINTS[endpoint], json=payload) as resp:
+                if resp.status_code >= 400:
+                    await resp.aread()
+                    return Sample(
+                        endpoint,
+                        False,
+                        time.perf_counter() - started,
+                        queue_wait,
+                        error=f"http_{resp.status_code}",
+                    )
+                async for line in resp.aiter_lines():
+                    if ttft is None and line and _first_token(endpoint, line):
+                        ttft = time.perf_counter() - started
+        else:
+            resp = await client.post(ENDPOINTS[endpoint], json=payload)
+            if resp.status_code >= 400:
+                return Sample(
+                    endpoint,
+                    False,
+                    time.perf_counter() - started,
+                    queue_wait,
+                    error=f"http_{resp.status_code}",
+                )
+            resp.json()
+    except Exception as e:
+        kind = "stream_error" if isinstance(e, RuntimeError) else type(e).__name__
+        return Sample(
+            endpoint, False, time.perf_counter() - started, queue_wait, error=kind
+        )
+    return Sample(endpoint, True, time.perf_counter() - started, queue_wait, ttft)
+
+
+def _arrival_gaps(args: argparse.Namespace, rng: random.Random):
+    if args.arrival == "poisson":
+        while True:
+            yield rng.expovariate(args.rps)
+    while True:
+        yield 1.0 / args.rps
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    queries: list[str],
+    mix: dict[str, float],
+    args: argparse.Namespace,
+) -> tuple[list[Sample], float]:
+    """Drive the server until --duration or --requests is reached
+
+    Returns the samples and the wall-clock seconds the run took.
+    """
+    rng = random.Random(args.seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    query_cycle = itertools.cycle(
+        (query, mode) for query in queries for mode in args.modes
+    )
+    limit = args.requests or float("inf")
+    deadline = time.perf_counter() + args.duration if args.duration else float("inf")
+    slots = asyncio.Semaphore(args.concurrency)
+    samples: list[Sample] = []
+
+    def next_request() -> tuple[str, dict[str, Any]]:
+        endpoint = rng.choices(names, weights)[0]
+        query, mode = next(query_cycle)
+        return endpoint, build_request(endpoint, query, mode, args)
+
+    async def one(endpoint: str, payload: dict[str, Any], scheduled: float):
+        async with slots:
+            samples.append(await send(client, endpoint, payload, scheduled))
+
+    start = time.perf_counter()
+    tasks: list[asyncio.Task] = []
+
+    if args.rps > 0:
+        scheduled = start
+        gaps = _arrival_gaps(args, rng)
+        while len(tasks) < limit and scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint, payload = next_request()
+            tasks.append(asyncio.create_task(one(endpoint, payload, scheduled)))
+            scheduled += next(gaps)
+        await asyncio.gather(*tasks)
+    else:
+        issued = 0
+
+        async def worker():
+            nonlocal issued
+            while issued < limit and time.perf_counter() < deadline:
+                issued += 1
+                endpoint, payload = next_request()
+                samples.append(
+                    await send(client, endpoint, payload, time.perf_counter())
+                )
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict[str, Any]:
+    def block(group: list[Sample]) -> dict[str, Any]:
+        ok = [s for s in group if s.ok]
+        errors: dict[str, int] = {}
+        for s in group:
+            if not s.ok:
+                errors[s.error] = errors.get(s.error, 0) + 1
+        ttfts = [s.ttft for s in ok if s.ttft is not None]
+        return {
+            "requests": len(group),
+            "succeeded": len(ok),
+            "error_rate": round(1 - len(ok) / len(group), 4) if group else 0.0,
+            "errors": errors,
+            "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+            "latency": latency_summary([s.latency for s in ok]),
+            "ttft": latency_summary(ttfts) if ttfts else None,
+            "queue_wait": latency_summary([s.queue_wait for s in group]),
+        }
+
+    by_endpoint: dict[str, list[Sample]] = {}
+    for s in samples:
+        by_endpoint.setdefault(s.endpoint, []).append(s)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": block(samples),
+        "endpoints": {
+            name: block(group) for name, group in sorted(by_endpoint.items())
+        },
+    }
+
+
+def check_slo(summary: dict[str, Any], args: argparse.Namespace) -> list[str]:
+    """Return one line per endpoint metric violating the requested SLOs"""
+    violations = []
+    for name, stats in summary["endpoints"].items():
+        checks = [
+            ("error_rate", stats["error_rate"], args.max_error_rate),
+            ("p95_ms", stats["latency"]["p95_ms"], args.slo_p95_ms),
+            ("p99_ms", stats["latency"]["p99_ms"], args.slo_p99_ms),
+        ]
+        if stats["ttft"] is not None:
+            checks.append(
+                ("ttft_p95_ms", stats["ttft"]["p95_ms"], args.slo_ttft_p95_ms)
+            )
+        for metric, value, limit in checks:
+            if limit is not None and value > limit:
+                violations.append(f"{name}.{metric}: {value} > {limit}")
+    return violations
+
+
+def print_report(summary: dict[str, Any]) -> None:
+    header = (
+        f"{'endpoint':<14}{'req':>7}{'err%':>7}{'ok/s':>8}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'ttft50':>9}{'ttft95':>9}{'queue95':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["endpoints"].items()) + [("overall", summary["overall"])]
+    for name, stats in rows:
+        ttft = stats["ttft"] or {}
+        print(
+            f"{name:<14}{stats['requests']:>7}{stats['error_rate'] * 100:>7.1f}"
+            f"{stats['throughput_rps']:>8.2f}"
+            f"{stats['latency']['p50_ms']:>9.0f}{stats['latency']['p95_ms']:>9.0f}"
+            f"{stats['latency']['p99_ms']:>9.0f}"
+            f"{ttft.get('p50_ms', 0):>9.0f}{ttft.get('p95_ms', 0):>9.0f}"
+            f"{stats['queue_wait']['p95_ms']:>9.0f}"
+        )
+    print("Latencies in ms, ok/s is the throughput of successful requests")
+
+
+async def authenticate(client: httpx.AsyncClient, args: argparse.Namespace) -> None:
+    if args.api_key:
+        client.headers["X-API-Key"] = args.api_key
+    token = args.token
+    if not token and args.username:
+        resp = await client.post(
+            "/login", data={"username": args.username, "password": args.password}
+        )
+        resp.raise_for_status()
+        token = resp.json()["access_token"]
+    if token:
+        client.headers["Authorization"] = f"Bearer {token}"
+
+
+async def ingest_samples(client: httpx.AsyncClient, poll_seconds: float = 1.0) -> None:
+    """Insert the benchmark sample documents and wait for the pipeline to go idle"""
+    documents = load_documents(1)
+    resp = await client.post(
+        "/documents/texts",
+        json={
+            "texts": [content for _, content in documents],
+            "file_sources": [name for name, _ in documents],
+        },
+    )
+    resp.raise_for_status()
+    print(f"Ingesting {len(documents)} sample documents ...")
+    while True:
+        await asyncio.sleep(poll_seconds)
+        status = (await client.get("/documents/pipeline_status")).json()
+        if not status.get("busy"):
+            break
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load generator and latency SLO check for lightrag-server"
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:9621")
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=SAMPLE_DATASET,
+        help="Queries to replay: evaluation dataset JSON, JSON list or JSON Lines",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"Endpoint weights (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["mix"],
+        choices=QUERY_MODES,
+        help="Query modes to cycle through",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=10.0,
+        help="Target arrival rate, 0 runs closed loop with --concurrency clients",
+    )
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="poisson")
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="Maximum requests in flight"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Seconds to run, 0 for no limit"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=0, help="Stop after N requests, 0 for no limit"
+    )
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--ollama-model", default="lightrag:latest")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--api-key", help="Sent as X-API-Key")
+    parser.add_argument("--token", help="Bearer token")
+    parser.add_argument("--username", help="Log in through /login")
+    parser.add_argument("--password", default="")
+    parser.add_argument(
+        "--ingest",
+        action="store_true",
+        help="Insert the benchmark sample documents before the run",
+    )
+    parser.add_argument("--slo-p95-ms", type=float)
+    parser.add_argument("--slo-p99-ms", type=float)
+    parser.add_argument("--slo-ttft-p95-ms", type=float)
+    parser.add_argument(
+        "--max-error-rate", type=float, help="Allowed failed fraction, e.g. 0.01"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Result JSON file path")
+    args = parser.parse_args(argv)
+    if not args.duration and not args.requests:
+        parser.error("set --duration or --requests")
+    return args
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    queries = load_corpus(args.corpus)
+
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=args.timeout, limits=limits
+    ) as client:
+        await authenticate(client, args)
+        if args.ingest:
+            await ingest_samples(client)
+        samples, elapsed = await run_load(client, queries, args.mix, args)
+
+    summary = summarize(samples, elapsed)
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "config": {
+                k: str(v) if isinstance(v, Path) else v
+                for k, v in vars(args).items()
+                if k not in ("api_key", "token", "password")
+            },
+            "corpus_queries": len(queries),
+        },
+        **summary,
+    }
+
+    print_report(summary)
+    output = args.output or DEFAULT_RESULTS_DIR / (
+        f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    violations = check_slo(summary, args)
+    if violations:
+        print(f"{len(violations)} SLO violation(s):")
+        for line in violations:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
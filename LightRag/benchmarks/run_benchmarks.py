@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite for LightRAG Ingestion and Query Hot Paths
+
+Drives the real LightRAG pipeline with deterministic fake LLM and embedding
+functions (see fake_models.py) over the sample documents in
+lightrag/evaluation/sample_documents, using JSON KV / NetworkX graph storage
+and each selected vector storage. Measures:
+- Chunking throughput of the configured chunking function
+- Extraction and merge throughput of the ingestion pipeline
+- Per-mode query latency percentiles
+- Memory high-water marks per phase
+
+Usage:
+    # Defaults: NanoVectorDB + Faiss, all query modes, 5 ms fake LLM latency
+    python benchmarks/run_benchmarks.py
+
+    # Bigger corpus, more query rounds, one vector storage
+    python benchmarks/run_benchmarks.py --scale 10 --query-rounds 5 --vector-storage NanoVectorDBStorage
+
+    # Fail (exit code 1) if ingestion or query p95 regressed more than 20%
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/benchmark_20250101_120000.json
+
+Results are saved to: benchmarks/results/benchmark_YYYYMMDD_HHMMSS.json
+
+Technical Notes:
+    - No network access is needed with the default "word" tokenizer
+    - LLM caching is disabled so every round runs the full code path
+    - Stage timings are wall-clock busy time: overlapping calls from
+      concurrently processed documents are counted once
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+import json
+import logging
+import math
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_models import FakeEmbedding, FakeLLM, make_tokenizer  # noqa: E402
+
+import lightrag.lightrag as lightrag_module  # noqa: E402
+from lightrag import LightRAG, QueryParam, __version__  # noqa: E402
+from lightrag.base import DocStatus  # noqa: E402
+from lightrag.kg.shared_storage import initialize_pipeline_status  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+SAMPLE_DOCUMENTS_DIR = (
+    BENCHMARK_DIR.parent / "lightrag" / "evaluation" / "sample_documents"
+)
+SAMPLE_DATASET = (
+    BENCHMARK_DIR.parent / "lightrag" / "evaluation" / "sample_dataset.json"
+)
+DEFAULT_RESULTS_DIR = BENCHMARK_DIR / "results"
+
+QUERY_MODES = ["local", "global", "hybrid", "mix", "naive"]
+VECTOR_STORAGES = ["NanoVectorDBStorage", "FaissVectorDBStorage"]
+_VECTOR_STORAGE_MODULES = {"FaissVectorDBStorage": "faiss"}
+
+# Metrics compared against --baseline; all are "lower is better"
+_REGRESSION_METRICS = [
+    ("chunking", "seconds_per_round"),
+    ("ingestion", "seconds"),
+    ("ingestion", "extract_busy_seconds"),
+    ("ingestion", "merge_busy_seconds"),
+]
+
+
+def load_documents(scale: int) -> list[tuple[str, str]]:
+    """Return (file_name, content) pairs, the sample set repeated scale times
+
+    Copies get a distinct heading so they are stored as separate documents
+    while still producing the same entities, which exercises merging.
+    """
+    sources = sorted(SAMPLE_DOCUMENTS_DIR.glob("*.md"))
+    sources = [p for p in sources if p.name.lower() != "readme.md"]
+    if not sources:
+        raise FileNotFoundError(f"No sample documents found in {SAMPLE_DOCUMENTS_DIR}")
+
+    documents = []
+    for copy in range(scale):
+        for path in sources:
+            content = path.read_text(encoding="utf-8")
+            if copy:
+                content = f"# Copy {copy}\n\n{content}"
+            documents.append((f"{path.stem}_{copy}{path.suffix}", content))
+    return documents
+
+
+def load_questions() -> list[str]:
+    with open(SAMPLE_DATASET, encoding="utf-8") as f:
+        return [case["question"] for case in json.load(f)["test_cases"]]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile, stable for the small sample sizes used here"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    ms = [v * 1000 for v in latencies]
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p90_ms": round(percentile(ms, 90), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+    }
+
+
+def _max_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(rss / divisor, 2)
+
+
+@contextmanager
+def memory_phase(memory: dict[str, Any], phase: str, trace: bool):
+    """Record the process RSS high-water mark (and traced Python peak) of a phase"""
+    if trace:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        entry: dict[str, Any] = {"max_rss_mb": _max_rss_mb()}
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            entry["traced_peak_mb"] = round(peak / (1024 * 1024), 2)
+        memory[phase] = entry
+
+
+@dataclass
+class StageTimer:
+    """Collects call intervals of a pipeline stage and reports busy wall time"""
+
+    intervals: list[tuple[float, float]] = field(default_factory=list)
+
+    def wrap(self, func):
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.intervals.append((start, time.perf_counter()))
+
+        return timed
+
+    @property
+    def calls(self) -> int:
+        return len(self.intervals)
+
+    @property
+    def busy_seconds(self) -> float:
+        busy = 0.0
+        current_start, current_end = None, None
+        for start, end in sorted(self.intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    busy += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            busy += current_end - current_start
+        return busy
+
+
+@contextmanager
+def instrument_pipeline(extract_timer: StageTimer, merge_timer: StageTimer):
+    """Time extract_entities and merge_nodes_and_edges as called by LightRAG"""
+    original_extract = lightrag_module.extract_entities
+    original_merge = lightrag_module.merge_nodes_and_edges
+    lightrag_module.extract_entities = extract_timer.wrap(original_extract)
+    lightrag_module.merge_nodes_and_edges = merge_timer.wrap(original_merge)
+    try:
+        yield
+    finally:
+        lightrag_module.extract_entities = original_extract
+        lightrag_module.merge_nodes_and_edges = original_merge
+
+
+def bench_chunking(rag: LightRAG, documents: list[tuple[str, str]], rounds: int):
+    total_chars = sum(len(content) for _, content in documents)
+    chunks = tokens = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        chunks = tokens = 0
+        for _, content in documents:
+            for chunk in rag.chunking_func(
+                rag.tokenizer,
+                content,
+                None,
+                False,
+                rag.chunk_overlap_token_size,
+                rag.chunk_token_size,
+            ):
+                chunks += 1
+                tokens += chunk["tokens"]
+    elapsed = time.perf_counter() - start
+    return {
+        "rounds": rounds,
+        "documents": len(documents),
+        "chunks_per_round": chunks,
+        "seconds_per_round": round(elapsed / rounds, 6),
+        "chunks_per_second": round(chunks * rounds / elapsed, 2),
+        "tokens_per_second": round(tokens * rounds / elapsed, 2),
+        "mb_per_second": round(total_chars * rounds / elapsed / 1_000_000, 4),
+    }
+
+
+async def bench_ingestion(rag: LightRAG, documents: list[tuple[str, str]]):
+    extract_timer, merge_timer = StageTimer(), StageTimer()
+    with instrument_pipeline(extract_timer, merge_timer):
+        start = time.perf_counter()
+        await rag.ainsert(
+            [content for _, content in documents],
+            file_paths=[name for name, _ in documents],
+        )
+        elapsed = time.perf_counter() - start
+
+    graph = rag.chunk_entity_relation_graph
+    entities = len(await graph.get_all_labels())
+    relations = len(await graph.get_all_edges())
+    processed = await rag.doc_status.get_docs_by_status(DocStatus.PROCESSED)
+    chunks = sum(doc.chunks_count or 0 for doc in processed.values())
+
+    extract_busy = extract_timer.busy_seconds
+    merge_busy = merge_timer.busy_seconds
+    return {
+        "documents": len(documents),
+        "failed_documents": len(documents) - len(processed),
+        "chunks": chunks,
+        "entities": entities,
+        "relations": relations,
+        "seconds": round(elapsed, 4),
+        "documents_per_second": round(len(documents) / elapsed, 3),
+        "extract_busy_seconds": round(extract_busy, 4),
+        "extract_chunks_per_second": round(chunks / extract_busy, 2)
+        if extract_busy
+        else None,
+        "merge_calls": merge_timer.calls,
+        "merge_busy_seconds": round(merge_busy, 4),
+        "merge_items_per_second": round((entities + relations) / merge_busy, 2)
+        if merge_busy
+        else None,
+    }
+
+
+async def bench_queries(
+    rag: LightRAG, questions: list[str], modes: list[str], rounds: int
+):
+    results = {}
+    for mode in modes:
+        param = QueryParam(mode=mode, enable_rerank=False)
+        # Warm-up so lazy initialization does not land in the percentiles
+        await rag.aquery(questions[0], param=param)
+        latencies = []
+        for _ in range(rounds):
+            for question in questions:
+                start = time.perf_counter()
+                await rag.aquery(question, param=param)
+                latencies.append(time.perf_counter() - start)
+        results[mode] = latency_summary(latencies)
+    return results
+
+
+async def run_for_vector_storage(
+    vector_storage: str, args: argparse.Namespace, documents, questions
+) -> dict[str, Any]:
+    run: dict[str, Any] = {"vector_storage": vector_storage}
+    module = _VECTOR_STORAGE_MODULES.get(vector_storage)
+    if module and importlib.util.find_spec(module) is None:
+        run["skipped"] = f"{module} is not installed"
+        print(f"Skipping {vector_storage}: {run['skipped']}")
+        return run
+
+    llm = FakeLLM(latency_ms=args.llm_latency_ms, max_entities=args.max_entities)
+    embedding = FakeEmbedding(dim=args.embedding_dim, latency_ms=args.embed_latency_ms)
+    working_dir = tempfile.mkdtemp(prefix="lightrag_bench_")
+    memory: dict[str, Any] = {}
+    run["memory"] = memory
+
+    rag_kwargs: dict[str, Any] = {}
+    tokenizer = make_tokenizer(args.tokenizer)
+    if tokenizer is not None:
+        rag_kwargs["tokenizer"] = tokenizer
+
+    rag = LightRAG(
+        working_dir=working_dir,
+        workspace=f"bench_{vector_storage.lower()}",
+        kv_storage="JsonKVStorage",
+        graph_storage="NetworkXStorage",
+        vector_storage=vector_storage,
+        doc_status_storage="JsonDocStatusStorage",
+        llm_model_func=llm,
+        embedding_func=embedding.as_embedding_func(),
+        vector_db_storage_cls_kwargs={
+            "cosine_better_than_threshold": args.cosine_threshold
+        },
+        enable_llm_cache=False,
+        llm_model_max_async=args.llm_max_async,
+        max_parallel_insert=args.max_parallel_insert,
+        **rag_kwargs,
+    )
+    try:
+        await rag.initialize_storages()
+        await initialize_pipeline_status()
+
+        print(f"[{vector_storage}] chunking x{args.chunking_rounds}")
+        with memory_phase(memory, "chunking", args.trace_memory):
+            run["chunking"] = bench_chunking(rag, documents, args.chunking_rounds)
+
+        print(f"[{vector_storage}] ingesting {len(documents)} documents")
+        gc.collect()
+        with memory_phase(memory, "ingestion", args.trace_memory):
+            run["ingestion"] = await bench_ingestion(rag, documents)
+        run["ingestion"]["llm_calls"] = dict(llm.calls)
+        run["ingestion"]["embedding_calls"] = embedding.calls
+        run["ingestion"]["embedded_texts"] = embedding.texts
+
+        print(f"[{vector_storage}] querying modes {', '.join(args.modes)}")
+        gc.collect()
+        with memory_phase(memory, "query", args.trace_memory):
+            run["queries"] = await bench_queries(
+                rag, questions, args.modes, args.query_rounds
+            )
+    finally:
+        await rag.finalize_storages()
+        shutil.rmtree(working_dir, ignore_errors=True)
+    return run
+
+
+def compare_with_baseline(
+    results: dict[str, Any], baseline_path: Path, max_regression: float
+) -> list[str]:
+    """Return a message per metric that got slower than the allowed ratio"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    baseline_runs = {run["vector_storage"]: run for run in baseline.get("runs", [])}
+
+    regressions = []
+    for run in results["runs"]:
+        base = baseline_runs.get(run["vector_storage"])
+        if not base or "skipped" in run or "skipped" in base:
+            continue
+        metrics = list(_REGRESSION_METRICS)
+        metrics.extend(("queries", mode) for mode in run.get("queries", {}))
+        for section, name in metrics:
+            current = run.get(section, {}).get(name)
+            previous = base.get(section, {}).get(name)
+            if section == "queries":
+                current = (current or {}).get("p95_ms")
+                previous = (previous or {}).get("p95_ms")
+                name = f"{name}.p95_ms"
+            if not current or not previous:
+                continue
+            ratio = current / previous
+            line = f"{run['vector_storage']} {section}.{name}: {previous} -> {current} ({ratio:.2f}x)"
+            print(line)
+            if ratio > 1 + max_regression:
+                regressions.append(line)
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Offline benchmark for LightRAG ingestion and query hot paths"
+    )
+    parser.add_argument(
+        "--vector-storage",
+        action="append",
+        choices=VECTOR_STORAGES,
+        help="Vector storage to benchmark, repeatable (default: all)",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=QUERY_MODES,
+        choices=QUERY_MODES,
+        help="Query modes to measure",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Copies of the sample documents"
+    )
+    parser.add_argument("--chunking-rounds", type=int, default=20)
+    parser.add_argument("--query-rounds", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=5.0)
+    parser.add_argument("--embed-latency-ms", type=float, default=1.0)
+    parser.add_argument("--llm-max-async", type=int, default=4)
+    parser.add_argument("--max-parallel-insert", type=int, default=2)
+    parser.add_argument(
+        "--max-entities", type=int, default=20, help="Entities per fake extraction"
+    )
+    parser.add_argument("--embedding-dim", type=int, default=256)
+    parser.add_argument("--cosine-threshold", type=float, default=0.0)
+    parser.add_argument(
+        "--tokenizer",
+        choices=["word", "tiktoken"],
+        default="word",
+        help="tiktoken downloads its encoding on first use",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also record tracemalloc peaks (slows every phase down)",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Result JSON file path")
+    parser.add_argument("--baseline", type=Path, help="Previous result to compare")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown versus --baseline before failing (0.2 = 20%%)",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.getLogger("lightrag").setLevel(logging.WARNING)
+
+    documents = load_documents(max(1, args.scale))
+    questions = load_questions()
+    results: dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "lightrag_version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()
+            },
+        },
+        "runs": [],
+    }
+
+    for vector_storage in args.vector_storage or VECTOR_STORAGES:
+        results["runs"].append(
+            await run_for_vector_storage(vector_storage, args, documents, questions)
+        )
+
+    output = args.output or DEFAULT_RESULTS_DIR / (
+        f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print(
+                f"{len(regressions)} metric(s) regressed beyond {args.max_regression:.0%}:"
+            )
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
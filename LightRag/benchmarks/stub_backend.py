@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+OpenAI-compatible stub LLM and embedding backend for load tests
+
+Serves /v1/chat/completions (plain and streamed) and /v1/embeddings with the
+deterministic fake models of fake_models.py, so lightrag-server can run with
+its regular "openai" bindings while every model call costs a fixed, known
+latency instead of a real provider round trip.
+
+Usage:
+    python benchmarks/stub_backend.py --port 9700 --llm-latency-ms 300 --token-latency-ms 5
+
+    LLM_BINDING=openai LLM_BINDING_HOST=http://127.0.0.1:9700/v1 LLM_MODEL=stub \\
+    LLM_BINDING_API_KEY=stub EMBEDDING_BINDING=openai \\
+    EMBEDDING_BINDING_HOST=http://127.0.0.1:9700/v1 EMBEDDING_MODEL=stub \\
+    EMBEDDING_BINDING_API_KEY=stub EMBEDDING_DIM=1024 lightrag-server
+
+Technical Notes:
+    - --llm-latency-ms is paid before the first token, --token-latency-ms
+      between streamed tokens, so TTFT and total latency can be tuned apart
+    - Embeddings are returned in the encoding requested by the client
+      (float list or base64 float32, the latter is what LightRAG asks for)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_models import FakeEmbedding, FakeLLM  # noqa: E402
+
+_STREAM_PIECE = re.compile(r"\s*\S+")
+
+
+def _split_messages(
+    messages: list[dict[str, Any]],
+) -> tuple[str, str | None, list[dict[str, Any]]]:
+    """Return (prompt, system_prompt, history) the way LightRAG built the messages"""
+    system_prompt = None
+    if messages and messages[0].get("role") == "system":
+        system_prompt = messages[0].get("content")
+        messages = messages[1:]
+    if not messages:
+        return "", system_prompt, []
+    return messages[-1].get("content") or "", system_prompt, messages[:-1]
+
+
+def _usage(prompt: str, completion: str) -> dict[str, int]:
+    prompt_tokens = len(prompt.split())
+    completion_tokens = len(completion.split())
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(
+    llm: FakeLLM, embedding: FakeEmbedding, token_latency_ms: float = 0.0
+) -> FastAPI:
+    app = FastAPI(title="LightRAG stub model backend")
+    token_latency = token_latency_ms / 1000.0
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "stub", "object": "model"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt, system_prompt, history = _split_messages(body.get("messages") or [])
+        # LightRAG only asks for a response_format on keyword extraction
+        answer = await llm(
+            prompt,
+            system_prompt=system_prompt,
+            history_messages=history,
+            keyword_extraction="response_format" in body,
+        )
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = body.get("model", "stub")
+
+        if not body.get("stream"):
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": answer},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": _usage(prompt, answer),
+                }
+            )
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream():
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in _STREAM_PIECE.findall(answer):
+                yield chunk({"content": piece})
+                if token_latency:
+                    await asyncio.sleep(token_latency)
+            yield chunk({}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        texts = body.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        vectors = await embedding(texts)
+        as_base64 = body.get("encoding_format") == "base64"
+        data = [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": base64.b64encode(vector.tobytes()).decode("ascii")
+                if as_base64
+                else vector.tolist(),
+            }
+            for i, vector in enumerate(vectors)
+        ]
+        tokens = sum(len(text.split()) for text in texts)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "stub"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {
+            "llm_calls": llm.calls,
+            "embedding_calls": embedding.calls,
+            "embedded_texts": embedding.texts,
+        }
+
+    return app
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="OpenAI-compatible stub LLM/embedding backend for load tests"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9700)
+    parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=200.0,
+        help="Delay before the first token of every completion",
+    )
+    parser.add_argument(
+        "--token-latency-ms",
+        type=float,
+        default=5.0,
+        help="Delay between streamed tokens",
+    )
+    parser.add_argument("--embed-latency-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--embedding-dim",
+        type=int,
+        default=1024,
+        help="Must match EMBEDDING_DIM of the server under test",
+    )
+    parser.add_argument(
+        "--max-entities", type=int, default=20, help="Entities per fake extraction"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    app = create_app(
+        FakeLLM(latency_ms=args.llm_latency_ms, max_entities=args.max_entities),
+        FakeEmbedding(dim=args.embedding_dim, latency_ms=args.embed_latency_ms),
+        token_latency_ms=args.token_latency_ms,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
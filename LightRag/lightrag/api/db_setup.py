@@ -11,11 +11,18 @@ This module provides MongoDB collection management for:
 import os
 import hashlib
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import ASCENDING, DESCENDING
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from dotenv import load_dotenv
 
+# motor/pymongo are imported on first connect: importing them pulls in the whole
+# driver (~100ms) which every API worker would otherwise pay at startup
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+# Same values as pymongo.ASCENDING / pymongo.DESCENDING
+ASCENDING = 1
+DESCENDING = -1
+
 try:
     import bcrypt
     _HAS_BCRYPT = True
@@ -29,8 +36,8 @@ class DatabaseManager:
     """Singleton manager for MongoDB connections and collections."""
     
     _instance: Optional['DatabaseManager'] = None
-    _client: Optional[AsyncIOMotorClient] = None
-    _db: Optional[AsyncIOMotorDatabase] = None
+    _client: Optional["AsyncIOMotorClient"] = None
+    _db: Optional["AsyncIOMotorDatabase"] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -45,6 +52,8 @@ class DatabaseManager:
         mongo_uri = uri or os.getenv("MONGO_URI", "mongodb://localhost:27017")
         db_name = database or os.getenv("MONGO_DATABASE", "LightRag")
         
+        from motor.motor_asyncio import AsyncIOMotorClient
+
         self._client = AsyncIOMotorClient(mongo_uri)
         self._db = self._client[db_name]
         
@@ -74,7 +83,7 @@ class DatabaseManager:
         await self._db.audit_logs.create_index([("user_email", ASCENDING), ("timestamp", DESCENDING)])
     
     @property
-    def db(self) -> AsyncIOMotorDatabase:
+    def db(self) -> "AsyncIOMotorDatabase":
         """Get the database instance."""
         if self._db is None:
             raise RuntimeError("Database not initialized. Call initialize() first.")
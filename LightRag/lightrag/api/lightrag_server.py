@@ -1286,9 +1286,9 @@ import logging
 import logging.config
 import sys
 import uvicorn
-import pipmaster as pm
+import importlib.util
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from pathlib import Path
 import configparser
 from ascii_colors import ASCIIColors
@@ -1309,6 +1309,8 @@ from lightrag.utils import get_env_value
 from lightrag import LightRAG, __version__ as core_version
 from lightrag.api import __api_version__
 from lightrag.types import GPTKeywordExtractionFormat
+from lightrag.tracing import get_stage_histograms, render_prometheus
+from lightrag.kg.read_cache import ReadThroughKVCache
 from lightrag.utils import EmbeddingFunc
 from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
@@ -2379,6 +2381,34 @@ def create_app(args):
             logger.error(f"Error getting health status: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.get("/metrics", dependencies=[Depends(combined_auth)])
+    async def get_metrics(format: str = "prometheus"):
+        """Per-stage query latency histograms and text chunk cache counters
+
+        Returns the Prometheus text exposition format by default, or a JSON
+        summary with estimated percentiles when format=json.
+        """
+        chunk_cache = (
+            rag.text_chunks.cache_stats()
+            if isinstance(rag.text_chunks, ReadThroughKVCache)
+            else None
+        )
+        if format == "json":
+            return {"query_stages": get_stage_histograms(), "chunk_cache": chunk_cache}
+
+        text = render_prometheus()
+        if chunk_cache is not None:
+            text += (
+                "# HELP lightrag_chunk_cache_requests_total Text chunk read cache lookups.\n"
+                "# TYPE lightrag_chunk_cache_requests_total counter\n"
+                f'lightrag_chunk_cache_requests_total{{result="hit"}} {chunk_cache["hits"]}\n'
+                f'lightrag_chunk_cache_requests_total{{result="miss"}} {chunk_cache["misses"]}\n'
+                "# HELP lightrag_chunk_cache_bytes Approximate size of the text chunk read cache.\n"
+                "# TYPE lightrag_chunk_cache_bytes gauge\n"
+                f"lightrag_chunk_cache_bytes {chunk_cache['bytes']}\n"
+            )
+        return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
     # Custom StaticFiles class for smart caching
     class SmartStaticFiles(StaticFiles):  # Renamed from NoCacheStaticFiles
         async def get_response(self, path: str, scope):
@@ -2528,7 +2558,19 @@ def check_and_install_dependencies():
         # Add other required packages here
     ]
 
-    for package in required_packages:
+    # find_spec does not import the package, and pipmaster (slow to import) is
+    # only loaded when something actually has to be installed
+    missing = [
+        package
+        for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
+    if not missing:
+        return
+
+    import pipmaster as pm
+
+    for package in missing:
         if not pm.is_installed(package):
             print(f"Installing {package}...")
             pm.install(package)
@@ -33,6 +33,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set, Union
 
+from lightrag.utils import split_graph_field
+
 from .db_setup import UserRole
 
 
@@ -539,7 +541,4 @@ def filter_graph_by_chunks(
 
 def _is_source_allowed(source_id_str: str, accessible_chunks: Set[str]) -> bool:
     """Check if a source_id references any accessible chunk."""
-    if not source_id_str:
-        return False
-    parts = str(source_id_str).split("<SEP>")
-    return any(p.strip() in accessible_chunks for p in parts if p.strip())
+    return any(p in accessible_chunks for p in split_graph_field(source_id_str))
@@ -3,11 +3,11 @@ This module contains all document-related routes for the LightRAG API.
 """
 
 import asyncio
+import json
 from lightrag.utils import logger, get_pinyin_sort_key
 import aiofiles
 import shutil
 import traceback
-import pipmaster as pm
 import io
 from datetime import datetime, timezone, timedelta
 
@@ -36,6 +36,8 @@ from lightrag.api.utils_api import get_combined_auth_dependency
 from lightrag.api.tenant_context import get_optional_tenant_context, TenantContext, DEFAULT_TENANT_ID
 from lightrag.api.db_setup import get_user_by_email
 from lightrag.api.rls import build_document_metadata, build_read_filter
+from lightrag.api.routers.user_routes import require_admin
+from lightrag.kg.read_cache import unwrap_storage
 from ..config import global_args
 
 
@@ -353,6 +355,61 @@ class ClearCacheResponse(BaseModel):
         }
 
 
+class ExtractionCacheReportResponse(BaseModel):
+    """Response model for the shared extraction cache report
+
+    Attributes:
+        enabled: Whether the shared extraction cache is enabled
+        shared_workspace: Workspace holding the shared cache entries
+        workspaces: Reuse counters per workspace that used the shared cache
+        totals: Counters summed over all reported workspaces, plus hit_rate
+    """
+
+    enabled: bool = Field(description="Whether the shared extraction cache is enabled")
+    shared_workspace: Optional[str] = Field(
+        default=None, description="Workspace holding the shared cache entries"
+    )
+    workspaces: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="hits, cross_workspace_hits, saved_tokens, stored and stored_tokens per workspace",
+    )
+    totals: Dict[str, Any] = Field(
+        default_factory=dict, description="Counters summed over all workspaces"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "enabled": True,
+                "shared_workspace": "shared_extraction",
+                "workspaces": {
+                    "tenant_a": {
+                        "hits": 2,
+                        "cross_workspace_hits": 0,
+                        "saved_tokens": 5200,
+                        "stored": 120,
+                        "stored_tokens": 310000,
+                    },
+                    "tenant_b": {
+                        "hits": 98,
+                        "cross_workspace_hits": 95,
+                        "saved_tokens": 254000,
+                        "stored": 4,
+                        "stored_tokens": 10400,
+                    },
+                },
+                "totals": {
+                    "hits": 100,
+                    "cross_workspace_hits": 95,
+                    "saved_tokens": 259200,
+                    "stored": 124,
+                    "stored_tokens": 320400,
+                    "hit_rate": 0.4464,
+                },
+            }
+        }
+
+
 """Response model for document status
 
 Attributes:
@@ -786,6 +843,8 @@ class PipelineStatusResponse(BaseModel):
         request_pending: Flag for pending request for processing
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
+        history_seq: Sequence number of the newest history message, usable as
+            the cursor of /documents/pipeline_events
         update_status: Status of update flags for all namespaces
     """
 
@@ -799,6 +858,7 @@ class PipelineStatusResponse(BaseModel):
     request_pending: bool = False
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
+    history_seq: Optional[int] = None
     update_status: Optional[dict] = None
 
     @field_validator("job_start", mode="before")
@@ -811,6 +871,34 @@ class PipelineStatusResponse(BaseModel):
         extra = "allow"  # Allow additional fields from the pipeline status
 
 
+# Pipeline fields sent as a "status" event by /documents/pipeline_events
+PIPELINE_STATUS_EVENT_FIELDS = (
+    "busy",
+    "job_name",
+    "job_start",
+    "docs",
+    "batchs",
+    "cur_batch",
+    "request_pending",
+)
+# How often the event stream checks for new pipeline messages, in seconds
+PIPELINE_EVENTS_POLL_INTERVAL = 0.5
+# Maximum number of messages read from the history per check
+PIPELINE_EVENTS_BATCH_SIZE = 500
+# Idle time after which a keep-alive comment is sent, in seconds
+PIPELINE_EVENTS_KEEPALIVE = 15
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Events message with a JSON payload"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
 class DocumentManager:
     def __init__(
         self,
@@ -989,6 +1077,10 @@ async def pipeline_enqueue_file(
         tuple: (success: bool, track_id: str)
     """
 
+    # Imported here rather than at module level: pipmaster is only needed to
+    # install the optional document parsers and would slow down server startup
+    import pipmaster as pm
+
     # Generate track_id if not provided
     if track_id is None:
         track_id = generate_track_id("unknown")
@@ -2327,6 +2419,7 @@ def create_document_routes(
                 rag.full_relations,
                 rag.entity_chunks,
                 rag.relation_chunks,
+                rag.chunk_extractions,
                 rag.entities_vdb,
                 rag.relationships_vdb,
                 rag.chunks_vdb,
@@ -2340,9 +2433,9 @@ def create_document_routes(
                     "Starting to drop storage components"
                 )
 
+            storages = [storage for storage in storages if storage is not None]
             for storage in storages:
-                if storage is not None:
-                    drop_tasks.append(storage.drop())
+                drop_tasks.append(storage.drop())
 
             # Wait for all drop tasks to complete
             drop_results = await asyncio.gather(*drop_tasks, return_exceptions=True)
@@ -2353,7 +2446,8 @@ def create_document_routes(
             storage_error_count = 0
 
             for i, result in enumerate(drop_results):
-                storage_name = storages[i].__class__.__name__
+                # Report the configured backend, not the read cache around it
+                storage_name = type(unwrap_storage(storages[i])).__name__
                 if isinstance(result, Exception):
                     error_msg = f"Error dropping {storage_name}: {str(result)}"
                     errors.append(error_msg)
@@ -2604,19 +2698,18 @@ def create_document_routes(
             # Add processed update_status to the status dictionary
             status_dict["update_status"] = processed_update_status
 
-            # Convert history_messages to a regular list if it's a Manager.list
-            # and limit to latest 1000 entries with truncation message if needed
+            # Read only the latest 1000 history messages, in one call to the
+            # shared PipelineHistory, and add a truncation message if needed
             if "history_messages" in status_dict:
-                history_list = list(status_dict["history_messages"])
-                total_count = len(history_list)
+                history_tail = status_dict["history_messages"].tail(1000)
+                latest_messages = history_tail["messages"]
+                total_count = history_tail["count"]
+                status_dict["history_seq"] = history_tail["last_seq"]
 
                 if total_count > 1000:
                     # Calculate truncated message count
                     truncated_count = total_count - 1000
 
-                    # Take only the latest 1000 messages
-                    latest_messages = history_list[-1000:]
-
                     # Add truncation message at the beginning
                     truncation_message = (
                         f"[Truncated history messages: {truncated_count}/{total_count}]"
@@ -2626,7 +2719,7 @@ def create_document_routes(
                     ] + latest_messages
                 else:
                     # No truncation needed, return all messages
-                    status_dict["history_messages"] = history_list
+                    status_dict["history_messages"] = latest_messages
 
             # Ensure job_start is properly formatted as a string with timezone information
             if "job_start" in status_dict and status_dict["job_start"]:
@@ -2639,6 +2732,75 @@ def create_document_routes(
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/pipeline_events", dependencies=[Depends(combined_auth)])
+    async def stream_pipeline_events(
+        request: Request,
+        after: int = Query(
+            0,
+            ge=0,
+            description="Sequence number of the last message already received",
+        ),
+    ) -> StreamingResponse:
+        """
+        Stream pipeline progress as Server-Sent Events.
+
+        Unlike polling /documents/pipeline_status, each client only receives
+        the history messages recorded after its cursor. The cursor is the
+        `after` query parameter, or the Last-Event-ID header sent by browsers
+        when an EventSource reconnects.
+
+        Events:
+            - message: {"seq": int, "message": str}, with the sequence number as id
+            - status: the pipeline fields (busy, job_name, docs, cur_batch, ...),
+              sent on connect and whenever one of them changes
+            - dropped: {"count": int}, messages after the cursor that already
+              left the history buffer
+        """
+        from lightrag.kg.shared_storage import get_namespace_data
+
+        pipeline_status = await get_namespace_data("pipeline_status")
+        history = pipeline_status["history_messages"]
+        last_event_id = request.headers.get("last-event-id", "")
+        cursor = int(last_event_id) if last_event_id.isdigit() else after
+
+        async def event_stream():
+            nonlocal cursor
+            last_status = None
+            idle_since = asyncio.get_running_loop().time()
+            while not await request.is_disconnected():
+                sent = False
+                snapshot = pipeline_status.copy()
+                status = {k: snapshot.get(k) for k in PIPELINE_STATUS_EVENT_FIELDS}
+                status["job_start"] = format_datetime(status["job_start"])
+                if status != last_status:
+                    last_status = status
+                    sent = True
+                    yield format_sse("status", status)
+
+                batch = history.events_since(cursor, PIPELINE_EVENTS_BATCH_SIZE)
+                if batch["dropped"]:
+                    sent = True
+                    yield format_sse("dropped", {"count": batch["dropped"]})
+                for event in batch["events"]:
+                    sent = True
+                    yield format_sse("message", event, event_id=event["seq"])
+                cursor = batch["last_seq"]
+
+                now = asyncio.get_running_loop().time()
+                if sent:
+                    idle_since = now
+                elif now - idle_since >= PIPELINE_EVENTS_KEEPALIVE:
+                    idle_since = now
+                    yield ": keep-alive\n\n"
+                if len(batch["events"]) < PIPELINE_EVENTS_BATCH_SIZE:
+                    await asyncio.sleep(PIPELINE_EVENTS_POLL_INTERVAL)
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     # TODO: Deprecated, use /documents/paginated instead
     @router.get(
         "", response_model=DocsStatusesResponse, dependencies=[Depends(combined_auth)]
@@ -2892,6 +3054,35 @@ def create_document_routes(
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get(
+        "/extraction_cache_report",
+        response_model=ExtractionCacheReportResponse,
+        dependencies=[Depends(combined_auth), Depends(require_admin)],
+    )
+    async def get_extraction_cache_report() -> ExtractionCacheReportResponse:
+        """
+        Report reuse and savings of the extraction cache shared by all workspaces.
+
+        Admin only, since the report names every workspace using the shared
+        cache. Enabled with ENABLE_SHARED_EXTRACTION_CACHE. Hits are chunks whose
+        extraction was served from the shared cache instead of the LLM,
+        saved_tokens estimates the prompt and completion tokens not spent.
+
+        Returns:
+            ExtractionCacheReportResponse: Per-workspace and total reuse counters
+
+        Raises:
+            HTTPException: If the caller is not an admin (403) or the report
+                cannot be read (500).
+        """
+        try:
+            report = await rag.aget_shared_extraction_cache_report()
+            return ExtractionCacheReportResponse(**report)
+        except Exception as e:
+            logger.error(f"Error reading extraction cache report: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
     @router.delete(
         "/delete_entity",
         response_model=DeletionResult,
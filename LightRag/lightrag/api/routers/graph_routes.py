@@ -64,6 +64,14 @@ class EntityMergeRequest(BaseModel):
     )
 
 
+class EntityMergeBatchRequest(BaseModel):
+    merges: list[EntityMergeRequest] = Field(
+        ...,
+        description="Merges to apply together. An entity may only appear in one merge.",
+        min_length=1,
+    )
+
+
 class EntityCreateRequest(BaseModel):
     entity_name: str = Field(
         ...,
@@ -809,4 +817,55 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 status_code=500, detail=f"Error merging entities: {str(e)}"
             )
 
+    @router.post("/graph/entities/merge_batch", dependencies=[Depends(combined_auth)])
+    async def merge_entities_batch(request: EntityMergeBatchRequest):
+        """
+        Apply several entity merges in one request
+
+        Each merge behaves like POST /graph/entities/merge, but all of them are
+        applied under a single lock acquisition with batched graph reads, one
+        bulk write-back and one re-embedding pass, which is much faster than
+        sending the merges one by one when cleaning up many duplicates.
+
+        Request Body:
+            merges (list): Items with entities_to_change and entity_to_change_into
+
+        Example Request:
+            POST /graph/entities/merge_batch
+            {
+                "merges": [
+                    {"entities_to_change": ["Elon Msk"], "entity_to_change_into": "Elon Musk"},
+                    {"entities_to_change": ["NY", "NYC"], "entity_to_change_into": "New York"}
+                ]
+            }
+
+        Note:
+            - An entity may only appear in one merge of the batch
+            - The batch is validated up front; if it is rejected nothing is merged
+        """
+        try:
+            result = await rag.amerge_entities_batch(
+                [
+                    {
+                        "source_entities": merge.entities_to_change,
+                        "target_entity": merge.entity_to_change_into,
+                    }
+                    for merge in request.merges
+                ]
+            )
+            return {
+                "status": "success",
+                "message": f"Successfully applied {len(request.merges)} entity merges",
+                "data": result,
+            }
+        except ValueError as ve:
+            logger.error(f"Validation error merging entities in batch: {str(ve)}")
+            raise HTTPException(status_code=400, detail=str(ve))
+        except Exception as e:
+            logger.error(f"Error merging entities in batch: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"Error merging entities: {str(e)}"
+            )
+
     return router
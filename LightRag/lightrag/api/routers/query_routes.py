@@ -173,6 +173,10 @@ class QueryResponse(BaseModel):
         default=None,
         description="Raw context data including entities and relations for graph visualization",
     )
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Query metadata including keywords, processing information and per-stage timings",
+    )
 
 
 class QueryDataResponse(BaseModel):
@@ -347,6 +351,7 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
             response_obj = {
                 "response": response_content,
                 "context_data": data,  # Gửi toàn bộ data (chứa entities) về Frontend
+                "metadata": result.get("metadata"),
             }
 
             if request.include_references:
@@ -432,6 +437,7 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
 
                     # Gửi luôn context_data (chứa entities) về Frontend
                     first_packet["context_data"] = data
+                    first_packet["metadata"] = result.get("metadata")
 
                     yield f"{json.dumps(first_packet)}\n"
 
@@ -449,7 +455,7 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
                 else:
                     response_content = llm_response.get("content", "")
                     stream_state["collected_response"].append(response_content)
-                    yield f"{json.dumps({'response': response_content, 'references': references if request.include_references else None, 'context_data': data})}\n"
+                    yield f"{json.dumps({'response': response_content, 'references': references if request.include_references else None, 'context_data': data, 'metadata': result.get('metadata')})}\n"
 
             async def log_stream_query():
                 """Background task to log the streaming query after response completes."""
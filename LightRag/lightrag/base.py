@@ -15,8 +15,10 @@ from typing import (
     Dict,
     List,
     AsyncIterator,
+    Awaitable,
 )
-from .utils import EmbeddingFunc
+import numpy as np
+from .utils import EmbeddingFunc, split_graph_field
 from .types import KnowledgeGraph
 from .constants import (
     DEFAULT_TOP_K,
@@ -114,6 +116,17 @@ class QueryParam:
     If None, defaults to top_k value.
     """
 
+    hnsw_ef_search: int | None = None
+    """HNSW search width (hnsw.ef_search) for the vector searches of this query.
+    Larger values trade latency for recall. If None, the vector storage configuration applies.
+    Only honored by vector storages with HNSW indexes, currently PGVectorStorage.
+    """
+
+    ivfflat_probes: int | None = None
+    """Number of IVFFlat lists probed (ivfflat.probes) for the vector searches of this query.
+    If None, the vector storage configuration applies. Only honored by PGVectorStorage.
+    """
+
     max_entity_tokens: int = int(
         os.getenv("MAX_ENTITY_TOKENS", str(DEFAULT_MAX_ENTITY_TOKENS))
     )
@@ -175,6 +188,14 @@ class QueryParam:
     None means no restriction (admin/teacher can access everything).
     """
 
+    accessible_chunk_ids: set | None = None
+    """Chunk IDs of the documents in accessible_doc_ids.
+    Filled in by LightRAG from the document status storage when accessible_doc_ids
+    is set, so that entity and relation vector searches can be restricted to
+    accessible sources. None means unknown: those searches are then filtered
+    only after retrieval.
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -221,6 +242,31 @@ class StorageNameSpace(ABC):
         """
 
 
+@dataclass(frozen=True)
+class VectorScopeFilter:
+    """Restricts a vector search to records of accessible documents.
+
+    Chunk records carry a full_doc_id and match when it is in doc_ids. Entity
+    and relation records match when their source_id references one of
+    chunk_ids; if chunk_ids is None they are not restricted here and are left
+    to the post-retrieval scope filter.
+    """
+
+    doc_ids: frozenset[str]
+    chunk_ids: frozenset[str] | None = None
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        full_doc_id = record.get("full_doc_id")
+        if full_doc_id is not None:
+            return full_doc_id in self.doc_ids
+        if self.chunk_ids is None:
+            return True
+        return any(
+            chunk_id in self.chunk_ids
+            for chunk_id in split_graph_field(record.get("source_id"))
+        )
+
+
 @dataclass
 class BaseVectorStorage(StorageNameSpace, ABC):
     embedding_func: EmbeddingFunc
@@ -229,7 +275,13 @@ class BaseVectorStorage(StorageNameSpace, ABC):
 
     @abstractmethod
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
         """Query the vector storage and retrieve top_k results.
 
@@ -238,18 +290,64 @@ class BaseVectorStorage(StorageNameSpace, ABC):
             top_k: Number of top results to return
             query_embedding: Optional pre-computed embedding for the query.
                            If provided, skips embedding computation for better performance.
+            scope: Optional filter applied during the search, so that up to top_k
+                   results are returned from the records it matches.
+            ef_search: Optional HNSW search width for this query only. Ignored by
+                   storages without such an index setting.
+            probes: Optional number of IVFFlat lists probed for this query only.
+                   Ignored by storages without such an index setting.
         """
 
     @abstractmethod
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         """Insert or update vectors in the storage.
 
         Importance notes for in-memory storage:
         1. Changes will be persisted to disk during the next index_done_callback
         2. Only one process should updating the storage at a time before index_done_callback,
            KG-storage-log should be used to avoid data corruption
+
+        Args:
+            data: Records keyed by id, embedded from their "content"
+            vectors: Optional precomputed embeddings keyed by record id, e.g.
+                from a workspace export. Records without one are embedded.
         """
 
+    def _upsert_embedder(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None,
+    ) -> Callable[..., Awaitable[np.ndarray]]:
+        """Embedding call for one upsert, answering from precomputed vectors
+
+        Only contents without a vector in vectors reach embedding_func, which
+        is left untouched for concurrent callers of the storage.
+        """
+        if not vectors:
+            return self.embedding_func
+        known = {
+            data[key]["content"]: vector
+            for key, vector in vectors.items()
+            if key in data and vector is not None
+        }
+
+        async def _embed(texts: list[str], **kwargs) -> np.ndarray:
+            missing = [text for text in texts if text not in known]
+            computed = {}
+            if missing:
+                embeddings = await self.embedding_func(missing, **kwargs)
+                computed = dict(zip(missing, embeddings))
+            return np.array(
+                [known[text] if text in known else computed[text] for text in texts],
+                dtype=np.float32,
+            )
+
+        return _embed
+
     @abstractmethod
     async def delete_entity(self, entity_name: str) -> None:
         """Delete a single entity by its name.
@@ -565,6 +663,35 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Insert or update multiple nodes
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        for node_id, node_data in nodes.items():
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations. Both end nodes of every edge must
+        already exist, as for upsert_edge.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
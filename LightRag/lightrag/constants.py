@@ -9,10 +9,22 @@ consistency and makes maintenance easier.
 # Default values for server settings
 DEFAULT_WOKERS = 2
 DEFAULT_MAX_GRAPH_NODES = 1000
+# Number of recent (label, depth, max_nodes) subgraph results kept by in-memory graph storages
+DEFAULT_GRAPH_QUERY_CACHE_SIZE = 32
+# Maximum rows sent in one statement by batched graph writes
+DEFAULT_GRAPH_WRITE_BATCH_SIZE = 1000
 
 # Default values for extraction settings
 DEFAULT_SUMMARY_LANGUAGE = "English"  # Default language for document processing
 DEFAULT_MAX_GLEANING = 1
+# Chunks shorter than this many tokens are not gleaned
+DEFAULT_GLEANING_MIN_CHUNK_TOKENS = 100
+# Skip gleaning when the first pass found this many entities per 100 tokens (0 disables)
+DEFAULT_GLEANING_MAX_ENTITY_DENSITY = 5.0
+# Token budget of chunk text packed into one extraction request (0 disables packing)
+DEFAULT_EXTRACTION_PACK_MAX_TOKENS = 0
+# Only chunks up to this many tokens are packed together
+DEFAULT_EXTRACTION_PACK_CHUNK_MAX_TOKENS = 300
 DEFAULT_ENTITY_NAME_MAX_LENGTH = 256
 
 # Number of description fragments to trigger LLM summary
@@ -50,6 +62,10 @@ DEFAULT_MAX_TOTAL_TOKENS = 30000
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
+# Factor by which vector storages that cannot filter a scope inside the index
+# search widen it, per round, until top_k in-scope results are found (see
+# BaseVectorStorage.query)
+DEFAULT_VECTOR_SCOPE_OVERSAMPLE = 4
 
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
@@ -98,6 +114,19 @@ DEFAULT_TIMEOUT = 300
 DEFAULT_LLM_TIMEOUT = 180
 DEFAULT_EMBEDDING_TIMEOUT = 30
 
+# In-process read cache for text chunks (0 disables the cache)
+DEFAULT_CHUNK_CACHE_MAX_ENTRIES = 20000
+DEFAULT_CHUNK_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+
+# Workspace holding the extraction cache shared by all workspaces
+DEFAULT_SHARED_EXTRACTION_CACHE_WORKSPACE = "shared_extraction"
+
+# Number of entities read and written per page by the streaming export
+DEFAULT_EXPORT_BATCH_SIZE = 500
+
+# Pipeline history ring buffer: oldest messages are dropped beyond this size
+DEFAULT_PIPELINE_HISTORY_SIZE = 10000
+
 # Logging configuration defaults
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
 DEFAULT_LOG_BACKUP_COUNT = 5  # Default 5 backups
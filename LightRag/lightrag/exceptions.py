@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-import httpx
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    # Only used in annotations; importing httpx eagerly costs every import of
+    # lightrag (and every API worker start) tens of milliseconds
+    import httpx
 
 
 class APIStatusError(Exception):
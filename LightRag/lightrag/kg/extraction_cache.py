@@ -0,0 +1,181 @@
+"""
+Content-addressed entity extraction cache shared by all workspaces.
+
+The per-workspace llm_response_cache is keyed on the exact prompt hash and
+lives in the workspace of the LightRAG instance, so the same chunk uploaded to
+another tenant workspace, or uploaded again under a new file name, is sent to
+the LLM a second time. SharedExtractionCache keys extraction answers on what
+actually determines them: the chunk content, the prompt template version, the
+model, the language and the entity types. Entries live in one KV namespace
+under a fixed workspace that every LightRAG instance points to.
+
+Reuse is tracked per consuming workspace in ``stats:<workspace>`` records next
+to the entries. Counters are accumulated in memory and folded into the stored
+records by flush(), which LightRAG calls right before it persists the shared
+storage at the end of a batch. Concurrent flushes from several processes into
+the same workspace record may lose a few increments, so the report is an
+estimate rather than an audit trail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+from lightrag.base import BaseKVStorage
+from lightrag.utils import compute_args_hash, compute_mdhash_id, logger
+
+_STATS_PREFIX = "stats:"
+_STATS_INDEX_KEY = "stats:index"
+_STAT_FIELDS = (
+    "hits",
+    "cross_workspace_hits",
+    "saved_tokens",
+    "stored",
+    "stored_tokens",
+)
+
+
+def extraction_prompt_version(*templates: str) -> str:
+    """Short fingerprint of the prompt templates used for extraction
+
+    Editing a template or the examples changes the version, so answers
+    produced by an older prompt are never served for a newer one.
+    """
+    return compute_args_hash(*templates)[:16]
+
+
+class SharedExtractionCache:
+    """Extraction answers keyed by chunk content instead of by workspace"""
+
+    def __init__(self, storage: BaseKVStorage, workspace: str, tokenizer=None):
+        self.storage = storage
+        # The default workspace is the empty string, give it a readable name
+        self.workspace = workspace or "_"
+        self.tokenizer = tokenizer
+        self._pending = dict.fromkeys(_STAT_FIELDS, 0)
+        self._registered = False
+        self._stats_lock = asyncio.Lock()
+
+    @staticmethod
+    def make_key(
+        content: str,
+        *,
+        prompt_version: str,
+        model: str,
+        language: str,
+        entity_types: list[str],
+        stage: str = "extract",
+    ) -> str:
+        """Build the content address of one extraction call
+
+        ``stage`` separates the initial extraction from gleaning rounds; a
+        gleaning stage should include a hash of the answer it continues from.
+        """
+        parts = [
+            compute_args_hash(content),
+            prompt_version,
+            model,
+            language,
+            list(entity_types),
+            stage,
+        ]
+        return compute_mdhash_id(
+            json.dumps(parts, ensure_ascii=False), prefix="extract-"
+        )
+
+    def count_tokens(self, *texts: str) -> int:
+        if self.tokenizer is None:
+            return 0
+        return sum(len(self.tokenizer.encode(text)) for text in texts if text)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached entry for key and record the reuse, or None"""
+        entry = await self.storage.get_by_id(key)
+        if not entry or "return" not in entry:
+            return None
+        self._pending["hits"] += 1
+        self._pending["saved_tokens"] += entry.get("tokens", 0)
+        if entry.get("created_by") != self.workspace:
+            self._pending["cross_workspace_hits"] += 1
+        logger.debug(f"Shared extraction cache hit({key})")
+        return entry
+
+    async def put(self, key: str, content: str, tokens: int = 0, **metadata) -> None:
+        """Store an extraction answer produced by this workspace"""
+        await self.storage.upsert(
+            {
+                key: {
+                    "return": content,
+                    "tokens": tokens,
+                    "created_by": self.workspace,
+                    "create_time": int(time.time()),
+                    **metadata,
+                }
+            }
+        )
+        self._pending["stored"] += 1
+        self._pending["stored_tokens"] += tokens
+
+    async def flush(self) -> None:
+        """Fold the in-memory counters into this workspace's stats record"""
+        async with self._stats_lock:
+            if not any(self._pending.values()):
+                return
+            pending, self._pending = self._pending, dict.fromkeys(_STAT_FIELDS, 0)
+
+            stats_key = _STATS_PREFIX + self.workspace
+            stats = await self.storage.get_by_id(stats_key) or {}
+            updated = {
+                field: stats.get(field, 0) + pending[field] for field in _STAT_FIELDS
+            }
+            updated["updated_at"] = int(time.time())
+            records = {stats_key: updated}
+
+            if not self._registered:
+                index = await self.storage.get_by_id(_STATS_INDEX_KEY) or {}
+                workspaces = list(index.get("workspaces", []))
+                if self.workspace not in workspaces:
+                    records[_STATS_INDEX_KEY] = {
+                        "workspaces": workspaces + [self.workspace]
+                    }
+                self._registered = True
+
+            await self.storage.upsert(records)
+
+    async def report(self, workspaces: list[str] | None = None) -> dict[str, Any]:
+        """Summarise reuse and savings of the shared cache
+
+        Args:
+            workspaces: Restrict the report to these workspaces, defaults to
+                every workspace that has used the shared cache.
+
+        Returns:
+            dict with per-workspace counters and totals. ``saved_tokens`` is
+            the estimated prompt and completion tokens not sent to the LLM.
+        """
+        await self.flush()
+        if workspaces is None:
+            index = await self.storage.get_by_id(_STATS_INDEX_KEY) or {}
+            workspaces = index.get("workspaces", [])
+        records = await self.storage.get_by_ids(
+            [_STATS_PREFIX + (ws or "_") for ws in workspaces]
+        )
+
+        per_workspace = {}
+        totals = dict.fromkeys(_STAT_FIELDS, 0)
+        for ws, record in zip(workspaces, records):
+            counters = {field: (record or {}).get(field, 0) for field in _STAT_FIELDS}
+            per_workspace[ws] = counters
+            for field in _STAT_FIELDS:
+                totals[field] += counters[field]
+
+        lookups = totals["hits"] + totals["stored"]
+        totals["hit_rate"] = round(totals["hits"] / lookups, 4) if lookups else 0.0
+        return {
+            "shared_workspace": self.storage.workspace,
+            "workspaces": per_workspace,
+            "totals": totals,
+        }
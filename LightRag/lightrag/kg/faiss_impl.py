@@ -6,8 +6,8 @@ import json
 import numpy as np
 from dataclasses import dataclass
 
-from lightrag.utils import logger, compute_mdhash_id
-from lightrag.base import BaseVectorStorage
+from lightrag.utils import logger, compute_mdhash_id, split_graph_field
+from lightrag.base import BaseVectorStorage, VectorScopeFilter
 
 from .shared_storage import (
     get_storage_lock,
@@ -67,6 +67,12 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Keep a local store for metadata, IDs, etc.
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
+        # Faiss ids by the keys a VectorScopeFilter matches on, so scoped
+        # queries do not scan _id_to_meta. Chunk records are keyed by
+        # full_doc_id, entities and relations by their source chunk ids.
+        self._fids_by_doc_id: dict[str, set[int]] = {}
+        self._fids_by_chunk_id: dict[str, set[int]] = {}
+        self._fids_without_doc_id: set[int] = set()
 
         self._load_faiss_index()
 
@@ -93,7 +99,11 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 self.storage_updated.value = False
             return self._index
 
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         """
         Insert or update vectors in the Faiss index.
 
@@ -134,7 +144,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
             for i in range(0, len(contents), self._max_batch_size)
         ]
 
-        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embed = self._upsert_embedder(data, vectors)
+        embedding_tasks = [embed(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
 
         # Flatten the list of arrays
@@ -173,6 +184,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             # Store the raw vector so we can rebuild if something is removed
             meta["__vector__"] = embeddings[i].tolist()
             self._id_to_meta.update({fid: meta})
+            self._add_scope_keys(fid, meta)
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -180,10 +192,17 @@ class FaissVectorDBStorage(BaseVectorStorage):
         return [m["__id__"] for m in list_data]
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search by a textual query; returns top_k results with their metadata + similarity distance.
+        With a scope, only the Faiss ids of matching records are searched.
         """
         if query_embedding is not None:
             embedding = np.array([query_embedding], dtype=np.float32)
@@ -198,7 +217,17 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        if scope is None:
+            distances, indices = index.search(embedding, top_k)
+        else:
+            allowed = self._scoped_fids(scope)
+            if not allowed:
+                return []
+            selector = faiss.IDSelectorBatch(
+                np.fromiter(allowed, dtype=np.int64, count=len(allowed))
+            )
+            params = faiss.SearchParameters(sel=selector)
+            distances, indices = index.search(embedding, top_k, params=params)
 
         distances = distances[0]
         indices = indices[0]
@@ -295,6 +324,36 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
+    def _add_scope_keys(self, fid: int, meta: dict[str, Any]) -> None:
+        """Register a Faiss id under the keys VectorScopeFilter.matches uses"""
+        full_doc_id = meta.get("full_doc_id")
+        if full_doc_id is not None:
+            self._fids_by_doc_id.setdefault(full_doc_id, set()).add(fid)
+            return
+        self._fids_without_doc_id.add(fid)
+        for chunk_id in split_graph_field(meta.get("source_id")):
+            self._fids_by_chunk_id.setdefault(chunk_id, set()).add(fid)
+
+    def _rebuild_scope_keys(self) -> None:
+        """Recompute the scope maps after _id_to_meta was replaced"""
+        self._fids_by_doc_id = {}
+        self._fids_by_chunk_id = {}
+        self._fids_without_doc_id = set()
+        for fid, meta in self._id_to_meta.items():
+            self._add_scope_keys(fid, meta)
+
+    def _scoped_fids(self, scope: VectorScopeFilter) -> set[int]:
+        """Faiss ids of the records scope matches, without scanning all records"""
+        allowed = set()
+        for doc_id in scope.doc_ids:
+            allowed.update(self._fids_by_doc_id.get(doc_id, ()))
+        if scope.chunk_ids is None:
+            allowed.update(self._fids_without_doc_id)
+        else:
+            for chunk_id in scope.chunk_ids:
+                allowed.update(self._fids_by_chunk_id.get(chunk_id, ()))
+        return allowed
+
     def _find_faiss_id_by_custom_id(self, custom_id: str):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
@@ -328,6 +387,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 self._index.add(arr)
 
             self._id_to_meta = new_id_to_meta
+            # Faiss ids were renumbered by the rebuild
+            self._rebuild_scope_keys()
 
     def _save_faiss_index(self):
         """
@@ -354,6 +415,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             logger.warning(
                 f"[{self.workspace}] No existing Faiss index file found for {self.namespace}"
             )
+            self._rebuild_scope_keys()
             return
 
         try:
@@ -379,6 +441,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
             self._index = faiss.IndexFlatIP(self._dim)
             self._id_to_meta = {}
+        self._rebuild_scope_keys()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
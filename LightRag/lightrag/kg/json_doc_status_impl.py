@@ -1,6 +1,7 @@
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 import os
-from typing import Any, Union, final
+from typing import Any, Iterable, Iterator, Union, final
 
 from lightrag.base import (
     DocProcessingStatus,
@@ -24,6 +25,126 @@ from .shared_storage import (
     try_initialize_namespace,
 )
 
+_SORTED_INDEX_FIELDS = ("created_at", "updated_at")
+
+# Number of writes other processes can replay key by key before they have to
+# rebuild their indexes from scratch
+_INDEX_CHANGE_LOG_SIZE = 64
+
+
+def _to_doc_status(data: dict[str, Any]) -> DocProcessingStatus:
+    # Make a copy of the data to avoid modifying the original
+    data = data.copy()
+    # Remove deprecated content field if it exists
+    data.pop("content", None)
+    # If file_path is not in data, use document id as file path
+    if "file_path" not in data:
+        data["file_path"] = "no-file-path"
+    # Ensure new fields exist with default values
+    if "metadata" not in data:
+        data["metadata"] = {}
+    if "error_msg" not in data:
+        data["error_msg"] = None
+    return DocProcessingStatus(**data)
+
+
+class _DocStatusIndex:
+    """Per-process secondary indexes over the shared doc status dict
+
+    Ordered dicts with None values are used as insertion ordered sets, so
+    lookups keep returning documents in the order the old linear scans did.
+    The indexed keys of every document are remembered, because records
+    handed out by get_by_id may be modified in place before being upserted.
+    """
+
+    def __init__(self):
+        self.by_file_path: dict[str, dict[str, None]] = {}
+        self.by_status: dict[str, dict[str, None]] = {}
+        self.by_track_id: dict[str, dict[str, None]] = {}
+        self.sorted: dict[str, list[tuple[str, str]]] = {
+            field: [] for field in _SORTED_INDEX_FIELDS
+        }
+        self._keys: dict[str, tuple] = {}
+
+    @staticmethod
+    def _index_keys(doc: dict[str, Any]) -> tuple:
+        return (
+            doc.get("file_path"),
+            doc.get("status"),
+            doc.get("track_id"),
+        ) + tuple(doc.get(field) or "" for field in _SORTED_INDEX_FIELDS)
+
+    def _lookups(self) -> tuple[dict[str, dict[str, None]], ...]:
+        return (self.by_file_path, self.by_status, self.by_track_id)
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[str, dict[str, Any]]]) -> "_DocStatusIndex":
+        index = cls()
+        lookups = index._lookups()
+        for doc_id, doc in items:
+            keys = index._keys[doc_id] = cls._index_keys(doc)
+            for lookup, key in zip(lookups, keys):
+                if key is not None:
+                    lookup.setdefault(key, {})[doc_id] = None
+            for field, value in zip(_SORTED_INDEX_FIELDS, keys[len(lookups) :]):
+                index.sorted[field].append((value, doc_id))
+        for entries in index.sorted.values():
+            entries.sort()
+        return index
+
+    def add(self, doc_id: str, doc: dict[str, Any]) -> None:
+        """Index a new or changed document"""
+        old_keys = self._keys.get(doc_id)
+        new_keys = self._index_keys(doc)
+        if old_keys == new_keys:
+            return
+        self._keys[doc_id] = new_keys
+        lookups = self._lookups()
+        for i, lookup in enumerate(lookups):
+            old_key = old_keys[i] if old_keys else None
+            if old_keys and old_key == new_keys[i]:
+                continue
+            if old_key is not None:
+                self._discard(lookup, old_key, doc_id)
+            if new_keys[i] is not None:
+                lookup.setdefault(new_keys[i], {})[doc_id] = None
+        for i, field in enumerate(_SORTED_INDEX_FIELDS, start=len(lookups)):
+            if old_keys and old_keys[i] == new_keys[i]:
+                continue
+            if old_keys:
+                self._discard_sorted(field, (old_keys[i], doc_id))
+            insort(self.sorted[field], (new_keys[i], doc_id))
+
+    def remove(self, doc_id: str) -> None:
+        keys = self._keys.pop(doc_id, None)
+        if keys is None:
+            return
+        lookups = self._lookups()
+        for lookup, key in zip(lookups, keys):
+            if key is not None:
+                self._discard(lookup, key, doc_id)
+        for field, value in zip(_SORTED_INDEX_FIELDS, keys[len(lookups) :]):
+            self._discard_sorted(field, (value, doc_id))
+
+    @staticmethod
+    def _discard(lookup: dict[str, dict[str, None]], key: Any, doc_id: str) -> None:
+        ids = lookup.get(key)
+        if ids is not None:
+            ids.pop(doc_id, None)
+            if not ids:
+                del lookup[key]
+
+    def _discard_sorted(self, field: str, entry: tuple[str, str]) -> None:
+        entries = self.sorted[field]
+        pos = bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
+
+    def iter_sorted(self, field: str, descending: bool) -> Iterator[str]:
+        entries = self.sorted[field]
+        ordered = reversed(entries) if descending else iter(entries)
+        return (doc_id for _, doc_id in ordered)
+
 
 @final
 @dataclass
@@ -47,11 +168,17 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Secondary indexes are private to each process. The shared version
+        # counter tells a process when another one has changed the data.
+        self._index: _DocStatusIndex | None = None
+        self._index_version = -1
+        self._index_meta = None
 
     async def initialize(self):
         """Initialize storage data"""
         self._storage_lock = get_storage_lock()
         self.storage_updated = await get_update_flag(self.final_namespace)
+        self._index_meta = await get_namespace_data(f"{self.final_namespace}_index")
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
@@ -64,6 +191,69 @@ class JsonDocStatusStorage(DocStatusStorage):
                         f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
                     )
 
+    def _ensure_index(self) -> _DocStatusIndex:
+        """Return up-to-date secondary indexes, must be called with the storage lock held
+
+        Writes made by other processes are replayed from the shared change
+        log, so only the documents they touched are re-indexed. The indexes
+        are rebuilt from scratch when the log no longer reaches back to the
+        version this process has seen, or after a drop.
+        """
+        version = self._index_meta.get("version", 0)
+        if self._index is not None and self._index_version == version:
+            return self._index
+
+        changed: dict[str, None] | None = None
+        if self._index is not None:
+            changed = {}
+            replayed = self._index_version
+            for entry_version, doc_ids in self._index_meta.get("changes", []):
+                if entry_version <= self._index_version:
+                    continue
+                if entry_version != replayed + 1 or doc_ids is None:
+                    changed = None
+                    break
+                changed.update(dict.fromkeys(doc_ids))
+                replayed = entry_version
+            if replayed != version:
+                changed = None
+
+        if changed is None:
+            self._index = _DocStatusIndex.build(self._data.items())
+        else:
+            for doc_id in changed:
+                doc = self._data.get(doc_id)
+                if doc is None:
+                    self._index.remove(doc_id)
+                else:
+                    self._index.add(doc_id, doc)
+        self._index_version = version
+        return self._index
+
+    def _bump_index_version(self, doc_ids: Iterable[str] | None) -> None:
+        """Record a write in the shared change log, None means every document changed"""
+        version = self._index_meta.get("version", 0) + 1
+        changes = list(self._index_meta.get("changes", []))
+        changes.append((version, None if doc_ids is None else list(doc_ids)))
+        # Reassign instead of mutating, the log may live in a manager dict
+        self._index_meta["changes"] = changes[-_INDEX_CHANGE_LOG_SIZE:]
+        self._index_meta["version"] = version
+        self._index_version = version
+
+    def _docs_for_ids(self, ids: Iterable[str]) -> dict[str, DocProcessingStatus]:
+        result = {}
+        for doc_id in ids:
+            doc = self._data.get(doc_id)
+            if doc is None:
+                continue
+            try:
+                result[doc_id] = _to_doc_status(doc)
+            except KeyError as e:
+                logger.error(
+                    f"[{self.workspace}] Missing required field for document {doc_id}: {e}"
+                )
+        return result
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         if self._storage_lock is None:
@@ -90,67 +280,25 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            for status, ids in self._ensure_index().by_status.items():
+                counts[status] = len(ids)
         return counts
 
     async def get_docs_by_status(
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
-        result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
-        return result
+            ids = self._ensure_index().by_status.get(status.value, {})
+            return self._docs_for_ids(ids)
 
     async def get_docs_by_track_id(
         self, track_id: str
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific track_id"""
-        result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v.get("track_id") == track_id:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
-        return result
+            ids = self._ensure_index().by_track_id.get(track_id, {})
+            return self._docs_for_ids(ids)
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -178,11 +326,15 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
+            index = self._ensure_index()
             # Ensure chunks_list field exists for new documents
             for doc_id, doc_data in data.items():
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
             self._data.update(data)
+            for doc_id, doc_data in data.items():
+                index.add(doc_id, doc_data)
+            self._bump_index_version(data.keys())
             await set_all_update_flags(self.final_namespace)
 
         await self.index_done_callback()
@@ -240,67 +392,51 @@ class JsonDocStatusStorage(DocStatusStorage):
         if sort_direction.lower() not in ["asc", "desc"]:
             sort_direction = "desc"
 
-        # For JSON storage, we load all data and sort/filter in memory
-        all_docs = []
-
-        async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                # Apply status filter
-                if (
-                    status_filter is not None
-                    and doc_data.get("status") != status_filter.value
-                ):
-                    continue
-
-                try:
-                    # Prepare document data
-                    data = doc_data.copy()
-                    data.pop("content", None)
-                    if "file_path" not in data:
-                        data["file_path"] = "no-file-path"
-                    if "metadata" not in data:
-                        data["metadata"] = {}
-                    if "error_msg" not in data:
-                        data["error_msg"] = None
-
-                    doc_status = DocProcessingStatus(**data)
-
-                    # Add sort key for sorting
-                    if sort_field == "id":
-                        doc_status._sort_key = doc_id
-                    elif sort_field == "file_path":
-                        # Use pinyin sorting for file_path field to support Chinese characters
-                        file_path_value = getattr(doc_status, sort_field, "")
-                        doc_status._sort_key = get_pinyin_sort_key(file_path_value)
-                    else:
-                        doc_status._sort_key = getattr(doc_status, sort_field, "")
-
-                    all_docs.append((doc_id, doc_status))
-
-                except KeyError as e:
-                    logger.error(
-                        f"[{self.workspace}] Error processing document {doc_id}: {e}"
-                    )
-                    continue
-
-        # Sort documents
         reverse_sort = sort_direction.lower() == "desc"
-        all_docs.sort(
-            key=lambda x: getattr(x[1], "_sort_key", ""), reverse=reverse_sort
-        )
-
-        # Remove sort key from documents
-        for doc_id, doc in all_docs:
-            if hasattr(doc, "_sort_key"):
-                delattr(doc, "_sort_key")
+        start_idx = (page - 1) * page_size
 
-        total_count = len(all_docs)
+        async with self._storage_lock:
+            index = self._ensure_index()
+            ids = None
+            if status_filter is not None:
+                ids = index.by_status.get(status_filter.value, {})
+            total_count = len(ids) if ids is not None else len(self._data)
+
+            if sort_field in _SORTED_INDEX_FIELDS:
+                # Walk the sorted index and stop as soon as the page is full
+                page_ids = []
+                skipped = 0
+                for doc_id in index.iter_sorted(sort_field, reverse_sort):
+                    if ids is not None and doc_id not in ids:
+                        continue
+                    if skipped < start_idx:
+                        skipped += 1
+                        continue
+                    page_ids.append(doc_id)
+                    if len(page_ids) >= page_size:
+                        break
+            else:
+                candidates = ids if ids is not None else self._data.keys()
+                if sort_field == "id":
+                    sort_keys = {doc_id: doc_id for doc_id in candidates}
+                else:
+                    # Use pinyin sorting for file_path field to support Chinese characters
+                    sort_keys = {
+                        doc_id: get_pinyin_sort_key(
+                            (self._data.get(doc_id) or {}).get(
+                                "file_path", "no-file-path"
+                            )
+                        )
+                        for doc_id in candidates
+                    }
+                ordered = sorted(sort_keys, key=sort_keys.get, reverse=reverse_sort)
+                page_ids = ordered[start_idx : start_idx + page_size]
 
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_docs = all_docs[start_idx:end_idx]
+            docs = self._docs_for_ids(page_ids)
 
+        paginated_docs = [
+            (doc_id, docs[doc_id]) for doc_id in page_ids if doc_id in docs
+        ]
         return paginated_docs, total_count
 
     async def get_all_status_counts(self, tenant_filter: dict | None = None) -> dict[str, int]:
@@ -331,13 +467,16 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
+            index = self._ensure_index()
+            deleted_ids = []
             for doc_id in doc_ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
-                    any_deleted = True
+                    index.remove(doc_id)
+                    deleted_ids.append(doc_id)
 
-            if any_deleted:
+            if deleted_ids:
+                self._bump_index_version(deleted_ids)
                 await set_all_update_flags(self.final_namespace)
 
     async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
@@ -354,10 +493,9 @@ class JsonDocStatusStorage(DocStatusStorage):
             raise StorageNotInitializedError("JsonDocStatusStorage")
 
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                if doc_data.get("file_path") == file_path:
-                    # Return complete document data, consistent with get_by_ids method
-                    return doc_data
+            for doc_id in self._ensure_index().by_file_path.get(file_path, {}):
+                # Return complete document data, consistent with get_by_ids method
+                return self._data.get(doc_id)
 
         return None
 
@@ -377,6 +515,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._index = _DocStatusIndex()
+                self._bump_index_version(None)
                 await set_all_update_flags(self.final_namespace)
 
             await self.index_done_callback()
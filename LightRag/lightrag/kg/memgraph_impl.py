@@ -1,11 +1,13 @@
 import os
 import asyncio
 import random
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import final
 import configparser
 
 from ..utils import logger
+from ..constants import DEFAULT_GRAPH_WRITE_BATCH_SIZE
 from ..base import BaseGraphStorage
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from ..kg.shared_storage import get_data_init_lock, get_graph_db_lock
@@ -645,6 +647,130 @@ class MemgraphStorage(BaseGraphStorage):
                 )
                 raise
 
+    async def _execute_write_with_retry(self, work, action: str) -> None:
+        """Run a write transaction, retrying transient conflicts like upsert_node does"""
+        max_retries = 100
+        initial_wait_time = 0.2
+        backoff_factor = 1.1
+        jitter_factor = 0.1
+
+        for attempt in range(max_retries):
+            try:
+                async with self._driver.session(database=self._DATABASE) as session:
+                    await session.execute_write(work)
+                return
+            except (TransientError, ResultFailedError) as e:
+                root_cause = e
+                while hasattr(root_cause, "__cause__") and root_cause.__cause__:
+                    root_cause = root_cause.__cause__
+
+                is_transient = (
+                    isinstance(root_cause, TransientError)
+                    or isinstance(e, TransientError)
+                    or "TransientError" in str(e)
+                    or "Cannot resolve conflicting transactions" in str(e)
+                )
+                if not is_transient:
+                    logger.error(
+                        f"[{self.workspace}] Non-transient error during {action}: {str(e)}"
+                    )
+                    raise
+                if attempt == max_retries - 1:
+                    logger.error(
+                        f"[{self.workspace}] Memgraph transient error during {action} after {max_retries} retries: {str(e)}"
+                    )
+                    raise
+                jitter = random.uniform(0, jitter_factor) * initial_wait_time
+                wait_time = initial_wait_time * (backoff_factor**attempt) + jitter
+                logger.warning(
+                    f"[{self.workspace}] {action.capitalize()} failed. Attempt #{attempt + 1} retrying in {wait_time:.3f} seconds... Error: {str(e)}"
+                )
+                await asyncio.sleep(wait_time)
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Unexpected error during {action}: {str(e)}"
+                )
+                raise
+
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes in a single write transaction using UNWIND.
+
+        Labels cannot be parameterized, so one statement is issued per entity type.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not nodes:
+            return
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = defaultdict(list)
+        for node_id, properties in nodes.items():
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Memgraph: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type[properties["entity_type"]].append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        async def execute_upsert(tx: AsyncManagedTransaction):
+            for entity_type, rows in rows_by_type.items():
+                query = f"""
+                UNWIND $rows AS row
+                MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                SET n += row.properties
+                SET n:`{entity_type}`
+                """
+                for start in range(0, len(rows), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
+                    result = await tx.run(
+                        query, rows=rows[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE]
+                    )
+                    await result.consume()  # Ensure result is fully consumed
+
+        await self._execute_write_with_retry(execute_upsert, "batch node upsert")
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges in a single write transaction using UNWIND.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not edges:
+            return
+        workspace_label = self._get_workspace_label()
+        rows = [
+            {"source": source, "target": target, "properties": properties}
+            for source, target, properties in edges
+        ]
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+        MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+        MERGE (source)-[r:DIRECTED]-(target)
+        SET r += row.properties
+        """
+
+        async def execute_upsert(tx: AsyncManagedTransaction):
+            for start in range(0, len(rows), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
+                result = await tx.run(
+                    query, rows=rows[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE]
+                )
+                await result.consume()  # Ensure result is fully consumed
+
+        await self._execute_write_with_retry(execute_upsert, "batch edge upsert")
+
     async def delete_node(self, node_id: str) -> None:
         """Delete a node with the specified label
 
@@ -686,8 +812,30 @@ class MemgraphStorage(BaseGraphStorage):
             raise RuntimeError(
                 "Memgraph driver is not initialized. Call 'await initialize()' first."
             )
-        for node in nodes:
-            await self.delete_node(node)
+        if not nodes:
+            return
+
+        async def _do_delete(tx: AsyncManagedTransaction):
+            workspace_label = self._get_workspace_label()
+            query = f"""
+            UNWIND $entity_ids AS entity_id
+            MATCH (n:`{workspace_label}` {{entity_id: entity_id}})
+            DETACH DELETE n
+            """
+            for start in range(0, len(nodes), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
+                result = await tx.run(
+                    query,
+                    entity_ids=nodes[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE],
+                )
+                await result.consume()
+            logger.debug(f"[{self.workspace}] Deleted {len(nodes)} nodes")
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                await session.execute_write(_do_delete)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during node deletion: {str(e)}")
+            raise
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -702,28 +850,30 @@ class MemgraphStorage(BaseGraphStorage):
             raise RuntimeError(
                 "Memgraph driver is not initialized. Call 'await initialize()' first."
             )
-        for source, target in edges:
+        if not edges:
+            return
+        rows = [{"source": source, "target": target} for source, target in edges]
 
-            async def _do_delete_edge(tx: AsyncManagedTransaction):
-                workspace_label = self._get_workspace_label()
-                query = f"""
-                MATCH (source:`{workspace_label}` {{entity_id: $source_entity_id}})-[r]-(target:`{workspace_label}` {{entity_id: $target_entity_id}})
-                DELETE r
-                """
+        async def _do_delete_edges(tx: AsyncManagedTransaction):
+            workspace_label = self._get_workspace_label()
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (source:`{workspace_label}` {{entity_id: row.source}})-[r]-(target:`{workspace_label}` {{entity_id: row.target}})
+            DELETE r
+            """
+            for start in range(0, len(rows), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
                 result = await tx.run(
-                    query, source_entity_id=source, target_entity_id=target
-                )
-                logger.debug(
-                    f"[{self.workspace}] Deleted edge from '{source}' to '{target}'"
+                    query, rows=rows[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE]
                 )
                 await result.consume()  # Ensure result is fully consumed
+            logger.debug(f"[{self.workspace}] Deleted {len(rows)} edges")
 
-            try:
-                async with self._driver.session(database=self._DATABASE) as session:
-                    await session.execute_write(_do_delete_edge)
-            except Exception as e:
-                logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
-                raise
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                await session.execute_write(_do_delete_edges)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
+            raise
 
     async def drop(self) -> dict[str, str]:
         """Drop all data from the current workspace and clean up resources
@@ -1,11 +1,12 @@
 import asyncio
+import json
 import os
 from typing import Any, final
 from dataclasses import dataclass
 import numpy as np
 from lightrag.utils import logger, compute_mdhash_id
-from ..base import BaseVectorStorage
-from ..constants import DEFAULT_MAX_FILE_PATH_LENGTH
+from ..base import BaseVectorStorage, VectorScopeFilter
+from ..constants import DEFAULT_MAX_FILE_PATH_LENGTH, DEFAULT_VECTOR_SCOPE_OVERSAMPLE
 from ..kg.shared_storage import get_data_init_lock, get_storage_lock
 import pipmaster as pm
 
@@ -18,6 +19,9 @@ from pymilvus import MilvusClient, DataType, CollectionSchema, FieldSchema  # ty
 config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
 
+# Largest limit (topk) a Milvus search accepts
+_MAX_SEARCH_LIMIT = 16384
+
 
 @final
 @dataclass
@@ -988,9 +992,12 @@ class MilvusVectorDBStorage(BaseVectorStorage):
                 return
 
             try:
-                # Create MilvusClient if not already created
+                # Create MilvusClient if not already created. The client is
+                # synchronous, so its calls are run in worker threads to keep
+                # the event loop free for concurrent queries.
                 if self._client is None:
-                    self._client = MilvusClient(
+                    self._client = await asyncio.to_thread(
+                        MilvusClient,
                         uri=os.environ.get(
                             "MILVUS_URI",
                             config.get(
@@ -1021,7 +1028,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
                     )
 
                 # Create collection and check compatibility
-                self._create_collection_if_not_exist()
+                await asyncio.to_thread(self._create_collection_if_not_exist)
                 self._initialized = True
                 logger.info(
                     f"[{self.workspace}] Milvus collection '{self.namespace}' initialized successfully"
@@ -1032,13 +1039,17 @@ class MilvusVectorDBStorage(BaseVectorStorage):
                 )
                 raise
 
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         # logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
             return
 
         # Ensure collection is loaded before upserting
-        self._ensure_collection_loaded()
+        await asyncio.to_thread(self._ensure_collection_loaded)
 
         import time
 
@@ -1058,22 +1069,29 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             for i in range(0, len(contents), self._max_batch_size)
         ]
 
-        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embed = self._upsert_embedder(data, vectors)
+        embedding_tasks = [embed(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
 
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["vector"] = embeddings[i]
-        results = self._client.upsert(
-            collection_name=self.final_namespace, data=list_data
+        results = await asyncio.to_thread(
+            self._client.upsert, collection_name=self.final_namespace, data=list_data
         )
         return results
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
         # Ensure collection is loaded before querying
-        self._ensure_collection_loaded()
+        await asyncio.to_thread(self._ensure_collection_loaded)
 
         # Use provided embedding or compute it
         if query_embedding is not None:
@@ -1086,25 +1104,55 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         # Include all meta_fields (created_at is now always included)
         output_fields = list(self.meta_fields)
 
-        results = self._client.search(
-            collection_name=self.final_namespace,
-            data=embedding,
-            limit=top_k,
-            output_fields=output_fields,
-            search_params={
-                "metric_type": "COSINE",
-                "params": {"radius": self.cosine_better_than_threshold},
-            },
-        )
-        return [
+        search_kwargs = {}
+        post_filter = None
+        limit = top_k
+        if scope is not None:
+            if "full_doc_id" in self.meta_fields:
+                # Chunks carry an indexed full_doc_id: filter inside the search
+                search_kwargs["filter"] = (
+                    f"full_doc_id in {json.dumps(sorted(scope.doc_ids))}"
+                )
+            else:
+                # source_id is a <SEP>-joined string, so entities and relations
+                # are filtered after the search, which is widened until top_k
+                # of them match or the candidates within the radius run out
+                post_filter = scope
+                limit = min(top_k * DEFAULT_VECTOR_SCOPE_OVERSAMPLE, _MAX_SEARCH_LIMIT)
+
+        while True:
+            results = await asyncio.to_thread(
+                self._client.search,
+                collection_name=self.final_namespace,
+                data=embedding,
+                limit=limit,
+                output_fields=output_fields,
+                search_params={
+                    "metric_type": "COSINE",
+                    "params": {"radius": self.cosine_better_than_threshold},
+                },
+                **search_kwargs,
+            )
+            candidates = results[0]
+            if post_filter is None:
+                break
+            exhausted = len(candidates) < limit or limit >= _MAX_SEARCH_LIMIT
+            candidates = [dp for dp in candidates if post_filter.matches(dp["entity"])]
+            if len(candidates) >= top_k or exhausted:
+                candidates = candidates[:top_k]
+                break
+            limit = min(limit * DEFAULT_VECTOR_SCOPE_OVERSAMPLE, _MAX_SEARCH_LIMIT)
+
+        hits = [
             {
                 **dp["entity"],
                 "id": dp["id"],
                 "distance": dp["distance"],
                 "created_at": dp.get("created_at"),
             }
-            for dp in results[0]
+            for dp in candidates
         ]
+        return hits
 
     async def index_done_callback(self) -> None:
         # Milvus handles persistence automatically
@@ -1124,8 +1172,10 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             )
 
             # Delete the entity from Milvus collection
-            result = self._client.delete(
-                collection_name=self.final_namespace, pks=[entity_id]
+            result = await asyncio.to_thread(
+                self._client.delete,
+                collection_name=self.final_namespace,
+                pks=[entity_id],
             )
 
             if result and result.get("delete_count", 0) > 0:
@@ -1148,14 +1198,17 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Ensure collection is loaded before querying
-            self._ensure_collection_loaded()
+            await asyncio.to_thread(self._ensure_collection_loaded)
 
             # Search for relations where entity is either source or target
             expr = f'src_id == "{entity_name}" or tgt_id == "{entity_name}"'
 
             # Find all relations involving this entity
-            results = self._client.query(
-                collection_name=self.final_namespace, filter=expr, output_fields=["id"]
+            results = await asyncio.to_thread(
+                self._client.query,
+                collection_name=self.final_namespace,
+                filter=expr,
+                output_fields=["id"],
             )
 
             if not results or len(results) == 0:
@@ -1172,8 +1225,10 @@ class MilvusVectorDBStorage(BaseVectorStorage):
 
             # Delete the relations
             if relation_ids:
-                delete_result = self._client.delete(
-                    collection_name=self.final_namespace, pks=relation_ids
+                delete_result = await asyncio.to_thread(
+                    self._client.delete,
+                    collection_name=self.final_namespace,
+                    pks=relation_ids,
                 )
 
                 logger.debug(
@@ -1193,10 +1248,12 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Ensure collection is loaded before deleting
-            self._ensure_collection_loaded()
+            await asyncio.to_thread(self._ensure_collection_loaded)
 
             # Delete vectors by IDs
-            result = self._client.delete(collection_name=self.final_namespace, pks=ids)
+            result = await asyncio.to_thread(
+                self._client.delete, collection_name=self.final_namespace, pks=ids
+            )
 
             if result and result.get("delete_count", 0) > 0:
                 logger.debug(
@@ -1223,13 +1280,14 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Ensure collection is loaded before querying
-            self._ensure_collection_loaded()
+            await asyncio.to_thread(self._ensure_collection_loaded)
 
             # Include all meta_fields (created_at is now always included) plus id
             output_fields = list(self.meta_fields) + ["id"]
 
             # Query Milvus for a specific ID
-            result = self._client.query(
+            result = await asyncio.to_thread(
+                self._client.query,
                 collection_name=self.final_namespace,
                 filter=f'id == "{id}"',
                 output_fields=output_fields,
@@ -1259,7 +1317,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
 
         try:
             # Ensure collection is loaded before querying
-            self._ensure_collection_loaded()
+            await asyncio.to_thread(self._ensure_collection_loaded)
 
             # Include all meta_fields (created_at is now always included) plus id
             output_fields = list(self.meta_fields) + ["id"]
@@ -1269,7 +1327,8 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             filter_expr = f'id in ["{id_list}"]'
 
             # Query Milvus with the filter
-            result = self._client.query(
+            result = await asyncio.to_thread(
+                self._client.query,
                 collection_name=self.final_namespace,
                 filter=filter_expr,
                 output_fields=output_fields,
@@ -1312,14 +1371,15 @@ class MilvusVectorDBStorage(BaseVectorStorage):
 
         try:
             # Ensure collection is loaded before querying
-            self._ensure_collection_loaded()
+            await asyncio.to_thread(self._ensure_collection_loaded)
 
             # Prepare the ID filter expression
             id_list = '", "'.join(ids)
             filter_expr = f'id in ["{id_list}"]'
 
             # Query Milvus with the filter, requesting only vector field
-            result = self._client.query(
+            result = await asyncio.to_thread(
+                self._client.query,
                 collection_name=self.final_namespace,
                 filter=filter_expr,
                 output_fields=["vector"],
@@ -1354,11 +1414,15 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         async with get_storage_lock():
             try:
                 # Drop the collection and recreate it
-                if self._client.has_collection(self.final_namespace):
-                    self._client.drop_collection(self.final_namespace)
+                if await asyncio.to_thread(
+                    self._client.has_collection, self.final_namespace
+                ):
+                    await asyncio.to_thread(
+                        self._client.drop_collection, self.final_namespace
+                    )
 
                 # Recreate the collection
-                self._create_collection_if_not_exist()
+                await asyncio.to_thread(self._create_collection_if_not_exist)
 
                 logger.info(
                     f"[{self.workspace}] Process {os.getpid()} drop Milvus collection {self.namespace}"
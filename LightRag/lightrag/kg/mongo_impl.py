@@ -15,10 +15,11 @@ from ..base import (
     DocProcessingStatus,
     DocStatus,
     DocStatusStorage,
+    VectorScopeFilter,
 )
 from ..utils import logger, compute_mdhash_id
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from ..constants import GRAPH_FIELD_SEP
+from ..constants import DEFAULT_VECTOR_SCOPE_OVERSAMPLE, GRAPH_FIELD_SEP
 from ..kg.shared_storage import get_data_init_lock, get_storage_lock, get_graph_db_lock
 
 import pipmaster as pm
@@ -38,6 +39,9 @@ config.read("config.ini", "utf-8")
 
 GRAPH_BFS_MODE = os.getenv("MONGO_GRAPH_BFS_MODE", "bidirectional")
 
+# Upper bound of numCandidates (and so of limit) accepted by $vectorSearch
+_VECTOR_SEARCH_MAX_CANDIDATES = 10000
+
 
 class ClientManager:
     _instances = {"db": None, "ref_count": 0}
@@ -1114,6 +1118,73 @@ class MongoGraphStorage(BaseGraphStorage):
             upsert=True,
         )
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Insert or update multiple node documents with a single bulk_write.
+        """
+        if not nodes:
+            return
+        operations = []
+        for node_id, node_data in nodes.items():
+            update_doc = {"$set": {**node_data}}
+            if node_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = node_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(UpdateOne({"_id": node_id}, update_doc, upsert=True))
+
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges with one bulk_write for the source nodes and one for the edges.
+        """
+        if not edges:
+            return
+
+        # Ensure source nodes exist, as upsert_edge does
+        source_ids = {source_node_id for source_node_id, _, _ in edges}
+        await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": node_id}, {"$set": {}}, upsert=True)
+                for node_id in source_ids
+            ],
+            ordered=False,
+        )
+
+        operations = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_doc = {
+                **edge_data,
+                "source_node_id": source_node_id,
+                "target_node_id": target_node_id,
+            }
+            if edge_data.get("source_id", ""):
+                edge_doc["source_ids"] = edge_data["source_id"].split(GRAPH_FIELD_SEP)
+            operations.append(
+                UpdateOne(
+                    {
+                        "$or": [
+                            {
+                                "source_node_id": source_node_id,
+                                "target_node_id": target_node_id,
+                            },
+                            {
+                                "source_node_id": target_node_id,
+                                "target_node_id": source_node_id,
+                            },
+                        ]
+                    },
+                    {"$set": edge_doc},
+                    upsert=True,
+                )
+            )
+
+        # Ordered, so the same undirected edge listed twice cannot be inserted twice
+        await self.edge_collection.bulk_write(operations, ordered=True)
+
     #
     # -------------------------------------------------------------------------
     # DELETION
@@ -2194,7 +2265,11 @@ class MongoVectorDBStorage(BaseVectorStorage):
                 f"Failed to create MongoDB vector index. Program cannot continue. {error_msg}"
             )
 
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
             return
@@ -2216,7 +2291,8 @@ class MongoVectorDBStorage(BaseVectorStorage):
             for i in range(0, len(contents), self._max_batch_size)
         ]
 
-        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embed = self._upsert_embedder(data, vectors)
+        embedding_tasks = [embed(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
@@ -2232,7 +2308,13 @@ class MongoVectorDBStorage(BaseVectorStorage):
         return list_data
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
         """Queries the vector database using Atlas Vector Search."""
         if query_embedding is not None:
@@ -2249,28 +2331,49 @@ class MongoVectorDBStorage(BaseVectorStorage):
             # Convert numpy array to a list to ensure compatibility with MongoDB
             query_vector = embedding[0].tolist()
 
-        # Define the aggregation pipeline with the converted query vector
-        pipeline = [
-            {
-                "$vectorSearch": {
-                    "index": self._index_name,  # Use stored index name for consistency
-                    "path": "vector",
-                    "queryVector": query_vector,
-                    "numCandidates": 100,  # Adjust for performance
-                    "limit": top_k,
-                }
-            },
-            {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
-            {"$match": {"score": {"$gte": self.cosine_better_than_threshold}}},
-            {"$project": {"vector": 0}},
-        ]
+        # The search index only covers the vector, so scoped queries drop
+        # out-of-scope documents after the search and widen it until top_k of
+        # them match or the candidates above the threshold run out
+        limit = top_k
+        if scope is not None:
+            limit = min(
+                top_k * DEFAULT_VECTOR_SCOPE_OVERSAMPLE, _VECTOR_SEARCH_MAX_CANDIDATES
+            )
 
-        # Execute the aggregation pipeline
-        cursor = await self._data.aggregate(pipeline, allowDiskUse=True)
-        results = await cursor.to_list(length=None)
+        while True:
+            # Define the aggregation pipeline with the converted query vector
+            pipeline = [
+                {
+                    "$vectorSearch": {
+                        "index": self._index_name,  # Use stored index name for consistency
+                        "path": "vector",
+                        "queryVector": query_vector,
+                        "numCandidates": max(100, limit),  # Adjust for performance
+                        "limit": limit,
+                    }
+                },
+                {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
+                {"$match": {"score": {"$gte": self.cosine_better_than_threshold}}},
+                {"$project": {"vector": 0}},
+            ]
+
+            # Execute the aggregation pipeline
+            cursor = await self._data.aggregate(pipeline, allowDiskUse=True)
+            results = await cursor.to_list(length=None)
+            if scope is None:
+                break
+
+            exhausted = len(results) < limit or limit >= _VECTOR_SEARCH_MAX_CANDIDATES
+            results = [doc for doc in results if scope.matches(doc)]
+            if len(results) >= top_k or exhausted:
+                results = results[:top_k]
+                break
+            limit = min(
+                limit * DEFAULT_VECTOR_SCOPE_OVERSAMPLE, _VECTOR_SEARCH_MAX_CANDIDATES
+            )
 
         # Format and return the results with created_at field
-        return [
+        hits = [
             {
                 **doc,
                 "id": doc["_id"],
@@ -2279,6 +2382,7 @@ class MongoVectorDBStorage(BaseVectorStorage):
             }
             for doc in results
         ]
+        return hits
 
     async def index_done_callback(self) -> None:
         # Mongo handles persistence automatically
@@ -12,7 +12,7 @@ from lightrag.utils import (
     compute_mdhash_id,
 )
 
-from lightrag.base import BaseVectorStorage
+from lightrag.base import BaseVectorStorage, VectorScopeFilter
 from nano_vectordb import NanoVectorDB
 from .shared_storage import (
     get_storage_lock,
@@ -88,7 +88,11 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
             return self._client
 
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         """
         Importance notes:
         1. Changes will be persisted to disk during the next index_done_callback
@@ -115,7 +119,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
         ]
 
         # Execute embedding outside of lock to avoid long lock times
-        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embed = self._upsert_embedder(data, vectors)
+        embedding_tasks = [embed(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
 
         embeddings = np.concatenate(embeddings_list)
@@ -137,7 +142,13 @@ class NanoVectorDBStorage(BaseVectorStorage):
             )
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
         # Use provided embedding or compute it
         if query_embedding is not None:
@@ -150,11 +161,21 @@ class NanoVectorDBStorage(BaseVectorStorage):
             embedding = embedding[0]
 
         client = await self._get_client()
-        results = client.query(
-            query=embedding,
-            top_k=top_k,
-            better_than_threshold=self.cosine_better_than_threshold,
-        )
+        try:
+            # With a scope, only the records it matches are ranked, so a
+            # narrow scope still fills top_k
+            results = client.query(
+                query=embedding,
+                top_k=top_k,
+                better_than_threshold=self.cosine_better_than_threshold,
+                filter_lambda=scope.matches if scope is not None else None,
+            )
+        except IndexError:
+            # NanoVectorDB cannot index its matrix when no record passes
+            # filter_lambda
+            if scope is None:
+                raise
+            results = []
         results = [
             {
                 **{k: v for k, v in dp.items() if k != "vector"},
@@ -1,5 +1,6 @@
 import os
 import re
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import final
 import configparser
@@ -14,6 +15,7 @@ from tenacity import (
 
 import logging
 from ..utils import logger
+from ..constants import DEFAULT_GRAPH_WRITE_BATCH_SIZE
 from ..base import BaseGraphStorage
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from ..kg.shared_storage import get_data_init_lock, get_graph_db_lock
@@ -951,6 +953,127 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"[{self.workspace}] Error during upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes in a single write transaction using UNWIND.
+
+        Labels cannot be parameterized, so one statement is issued per entity type.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        if not nodes:
+            return
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = defaultdict(list)
+        for node_id, properties in nodes.items():
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type[properties["entity_type"]].append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for entity_type, rows in rows_by_type.items():
+                        query = f"""
+                        UNWIND $rows AS row
+                        MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                        SET n += row.properties
+                        SET n:`{entity_type}`
+                        """
+                        for start in range(
+                            0, len(rows), DEFAULT_GRAPH_WRITE_BATCH_SIZE
+                        ):
+                            result = await tx.run(
+                                query,
+                                rows=rows[
+                                    start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE
+                                ],
+                            )
+                            await result.consume()  # Ensure result is fully consumed
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges in a single write transaction using UNWIND.
+
+        Edges whose end nodes do not exist are skipped, as with upsert_edge.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        if not edges:
+            return
+        workspace_label = self._get_workspace_label()
+        rows = [
+            {"source": source, "target": target, "properties": properties}
+            for source, target, properties in edges
+        ]
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+        MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+        MERGE (source)-[r:DIRECTED]-(target)
+        SET r += row.properties
+        """
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for start in range(0, len(rows), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
+                        result = await tx.run(
+                            query,
+                            rows=rows[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE],
+                        )
+                        await result.consume()  # Ensure result is fully consumed
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch edge upsert: {str(e)}")
+            raise
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -1483,8 +1606,30 @@ class Neo4JStorage(BaseGraphStorage):
         Args:
             nodes: List of node labels to be deleted
         """
-        for node in nodes:
-            await self.delete_node(node)
+        if not nodes:
+            return
+
+        async def _do_delete(tx: AsyncManagedTransaction):
+            workspace_label = self._get_workspace_label()
+            query = f"""
+            UNWIND $entity_ids AS entity_id
+            MATCH (n:`{workspace_label}` {{entity_id: entity_id}})
+            DETACH DELETE n
+            """
+            for start in range(0, len(nodes), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
+                result = await tx.run(
+                    query,
+                    entity_ids=nodes[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE],
+                )
+                await result.consume()  # Ensure result is fully consumed
+            logger.debug(f"[{self.workspace}] Deleted {len(nodes)} nodes")
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                await session.execute_write(_do_delete)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during node deletion: {str(e)}")
+            raise
 
     @retry(
         stop=stop_after_attempt(3),
@@ -1507,28 +1652,30 @@ class Neo4JStorage(BaseGraphStorage):
         Args:
             edges: List of edges to be deleted, each edge is a (source, target) tuple
         """
-        for source, target in edges:
+        if not edges:
+            return
+        rows = [{"source": source, "target": target} for source, target in edges]
 
-            async def _do_delete_edge(tx: AsyncManagedTransaction):
-                workspace_label = self._get_workspace_label()
-                query = f"""
-                MATCH (source:`{workspace_label}` {{entity_id: $source_entity_id}})-[r]-(target:`{workspace_label}` {{entity_id: $target_entity_id}})
-                DELETE r
-                """
+        async def _do_delete_edges(tx: AsyncManagedTransaction):
+            workspace_label = self._get_workspace_label()
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (source:`{workspace_label}` {{entity_id: row.source}})-[r]-(target:`{workspace_label}` {{entity_id: row.target}})
+            DELETE r
+            """
+            for start in range(0, len(rows), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
                 result = await tx.run(
-                    query, source_entity_id=source, target_entity_id=target
-                )
-                logger.debug(
-                    f"[{self.workspace}] Deleted edge from '{source}' to '{target}'"
+                    query, rows=rows[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE]
                 )
                 await result.consume()  # Ensure result is fully consumed
+            logger.debug(f"[{self.workspace}] Deleted {len(rows)} edges")
 
-            try:
-                async with self._driver.session(database=self._DATABASE) as session:
-                    await session.execute_write(_do_delete_edge)
-            except Exception as e:
-                logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
-                raise
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                await session.execute_write(_do_delete_edges)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
+            raise
 
     async def get_all_nodes(self) -> list[dict]:
         """Get all nodes in the graph.
@@ -1,11 +1,14 @@
 import os
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from typing import final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from lightrag.utils import logger
 from lightrag.base import BaseGraphStorage
+from lightrag.constants import DEFAULT_GRAPH_QUERY_CACHE_SIZE
 import networkx as nx
+import numpy as np
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
@@ -20,6 +23,53 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+@dataclass(frozen=True)
+class _GraphSnapshot:
+    """Immutable CSR adjacency view of the graph used by read-heavy traversals.
+
+    Nodes are mapped to integer ids in graph iteration order. The neighbors of
+    node ``i`` are ``indices[indptr[i]:indptr[i + 1]]``. Degrees follow NetworkX
+    semantics (self-loops count twice) and ``degree_order`` lists node ids by
+    degree, highest first, keeping graph order for ties.
+    """
+
+    node_ids: list[str]
+    node_index: dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    degrees: np.ndarray
+    degree_order: np.ndarray
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph) -> "_GraphSnapshot":
+        node_ids = list(graph.nodes())
+        node_index = {node: i for i, node in enumerate(node_ids)}
+        adjacency = graph.adj
+
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        neighbor_ids: list[int] = []
+        for i, node in enumerate(node_ids):
+            neighbor_ids.extend(node_index[neighbor] for neighbor in adjacency[node])
+            indptr[i + 1] = len(neighbor_ids)
+
+        degrees = np.fromiter(
+            (degree for _, degree in graph.degree(node_ids)),
+            dtype=np.int64,
+            count=len(node_ids),
+        )
+        return cls(
+            node_ids=node_ids,
+            node_index=node_index,
+            indptr=indptr,
+            indices=np.asarray(neighbor_ids, dtype=np.int64),
+            degrees=degrees,
+            degree_order=np.argsort(-degrees, kind="stable"),
+        )
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+
 @final
 @dataclass
 class NetworkXStorage(BaseGraphStorage):
@@ -55,6 +105,9 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Read-side acceleration structures, discarded on every write
+        self._snapshot: _GraphSnapshot | None = None
+        self._subgraph_cache: OrderedDict[tuple, KnowledgeGraph] = OrderedDict()
 
         # Load initial graph
         preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
@@ -88,11 +141,24 @@ class NetworkXStorage(BaseGraphStorage):
                 self._graph = (
                     NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
                 )
+                self._invalidate_snapshot()
                 # Reset update flag
                 self.storage_updated.value = False
 
             return self._graph
 
+    def _invalidate_snapshot(self) -> None:
+        """Drop the CSR snapshot and cached subgraphs after the graph changed"""
+        self._snapshot = None
+        self._subgraph_cache.clear()
+
+    async def _get_snapshot(self) -> tuple[nx.Graph, _GraphSnapshot]:
+        """Return the current graph together with its CSR snapshot, rebuilding it if stale"""
+        graph = await self._get_graph()
+        if self._snapshot is None:
+            self._snapshot = _GraphSnapshot.from_graph(graph)
+        return graph, self._snapshot
+
     async def has_node(self, node_id: str) -> bool:
         graph = await self._get_graph()
         return graph.has_node(node_id)
@@ -136,6 +202,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._invalidate_snapshot()
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -148,6 +215,37 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._invalidate_snapshot()
+
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Upsert multiple nodes in one pass over the graph
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        if not nodes:
+            return
+        graph = await self._get_graph()
+        graph.add_nodes_from(nodes.items())
+        self._invalidate_snapshot()
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Upsert multiple edges in one pass over the graph
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        if not edges:
+            return
+        graph = await self._get_graph()
+        graph.add_edges_from(edges)
+        self._invalidate_snapshot()
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -159,6 +257,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         if graph.has_node(node_id):
             graph.remove_node(node_id)
+            self._invalidate_snapshot()
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -180,6 +279,7 @@ class NetworkXStorage(BaseGraphStorage):
         for node in nodes:
             if graph.has_node(node):
                 graph.remove_node(node)
+        self._invalidate_snapshot()
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -196,6 +296,7 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+        self._invalidate_snapshot()
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -221,14 +322,12 @@ class NetworkXStorage(BaseGraphStorage):
         Returns:
             List of labels sorted by degree (highest first)
         """
-        graph = await self._get_graph()
-
-        # Get degrees of all nodes and sort by degree descending
-        degrees = dict(graph.degree())
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
+        _, snapshot = await self._get_snapshot()
 
-        # Return top labels limited by the specified limit
-        popular_labels = [str(node) for node, _ in sorted_nodes[:limit]]
+        # Nodes are pre-sorted by degree descending in the snapshot
+        popular_labels = [
+            str(snapshot.node_ids[i]) for i in snapshot.degree_order[:limit]
+        ]
 
         logger.debug(
             f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
@@ -317,157 +416,146 @@ class NetworkXStorage(BaseGraphStorage):
             # Limit max_nodes to not exceed global_config max_graph_nodes
             max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
 
-        graph = await self._get_graph()
+        cache_key = (node_label, max_depth, max_nodes)
+        graph, snapshot = await self._get_snapshot()
+
+        cached = self._subgraph_cache.get(cache_key)
+        if cached is not None:
+            self._subgraph_cache.move_to_end(cache_key)
+            logger.debug(
+                f"[{self.workspace}] Subgraph cache hit for {cache_key} | Node count: {len(cached.nodes)} | Edge count: {len(cached.edges)}"
+            )
+            # Shallow copy so callers can rebind nodes/edges without touching the cache
+            return cached.model_copy(
+                update={"nodes": list(cached.nodes), "edges": list(cached.edges)}
+            )
 
         result = KnowledgeGraph()
 
         # Handle special case for "*" label
         if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
+            node_count = len(snapshot.node_ids)
             # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
+            if node_count > max_nodes:
                 result.is_truncated = True
                 logger.info(
-                    f"[{self.workspace}] Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
+                    f"[{self.workspace}] Graph truncated: {node_count} nodes found, limited to {max_nodes}"
                 )
 
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
-            # Create subgraph with the highest degree nodes
-            subgraph = graph.subgraph(limited_nodes)
+            # Take the highest degree nodes from the pre-sorted snapshot
+            selected_nodes = snapshot.degree_order[:max_nodes].tolist()
         else:
             # Check if node exists
-            if node_label not in graph:
+            start_node = snapshot.node_index.get(node_label)
+            if start_node is None:
                 logger.warning(
                     f"[{self.workspace}] Node {node_label} not found in the graph"
                 )
                 return KnowledgeGraph()  # Return empty graph
 
+            degrees = snapshot.degrees
             # Use modified BFS to get nodes, prioritizing high-degree nodes at the same depth
-            bfs_nodes = []
-            visited = set()
-            # Store (node, depth, degree) in the queue
-            queue = [(node_label, 0, graph.degree(node_label))]
+            selected_nodes = []
+            visited = np.zeros(len(snapshot.node_ids), dtype=bool)
+            # Store (node, depth) in the queue, degrees come from the snapshot
+            queue = deque([(start_node, 0)])
 
             # Flag to track if there are unexplored neighbors due to depth limit
             has_unexplored_neighbors = False
 
             # Modified breadth-first search with degree-based prioritization
-            while queue and len(bfs_nodes) < max_nodes:
+            while queue and len(selected_nodes) < max_nodes:
                 # Get the current depth from the first node in queue
                 current_depth = queue[0][1]
 
                 # Collect all nodes at the current depth
                 current_level_nodes = []
                 while queue and queue[0][1] == current_depth:
-                    current_level_nodes.append(queue.pop(0))
+                    current_level_nodes.append(queue.popleft()[0])
 
-                # Sort nodes at current depth by degree (highest first)
-                current_level_nodes.sort(key=lambda x: x[2], reverse=True)
+                # Sort nodes at current depth by degree (highest first, stable for ties)
+                level = np.asarray(current_level_nodes, dtype=np.int64)
+                level = level[np.argsort(-degrees[level], kind="stable")]
 
                 # Process all nodes at current depth in order of degree
-                for current_node, depth, degree in current_level_nodes:
-                    if current_node not in visited:
-                        visited.add(current_node)
-                        bfs_nodes.append(current_node)
+                for current_node in level.tolist():
+                    if not visited[current_node]:
+                        visited[current_node] = True
+                        selected_nodes.append(current_node)
 
+                        neighbors = snapshot.neighbors(current_node)
+                        unvisited_neighbors = neighbors[~visited[neighbors]]
                         # Only explore neighbors if we haven't reached max_depth
-                        if depth < max_depth:
-                            # Add neighbor nodes to queue with incremented depth
-                            neighbors = list(graph.neighbors(current_node))
-                            # Filter out already visited neighbors
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            # Add neighbors to the queue with their degrees
-                            for neighbor in unvisited_neighbors:
-                                neighbor_degree = graph.degree(neighbor)
-                                queue.append((neighbor, depth + 1, neighbor_degree))
-                        else:
-                            # Check if there are unexplored neighbors (skipped due to depth limit)
-                            neighbors = list(graph.neighbors(current_node))
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            if unvisited_neighbors:
-                                has_unexplored_neighbors = True
+                        if current_depth < max_depth:
+                            queue.extend(
+                                (neighbor, current_depth + 1)
+                                for neighbor in unvisited_neighbors.tolist()
+                            )
+                        elif unvisited_neighbors.size:
+                            # Unexplored neighbors skipped due to depth limit
+                            has_unexplored_neighbors = True
 
                     # Check if we've reached max_nodes
-                    if len(bfs_nodes) >= max_nodes:
+                    if len(selected_nodes) >= max_nodes:
                         break
 
             # Check if graph is truncated - either due to max_nodes limit or depth limit
-            if (queue and len(bfs_nodes) >= max_nodes) or has_unexplored_neighbors:
-                if len(bfs_nodes) >= max_nodes:
+            if (queue and len(selected_nodes) >= max_nodes) or has_unexplored_neighbors:
+                if len(selected_nodes) >= max_nodes:
                     result.is_truncated = True
                     logger.info(
                         f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
                     )
                 else:
                     logger.info(
-                        f"[{self.workspace}] Graph truncated: found {len(bfs_nodes)} nodes within max_depth {max_depth}"
+                        f"[{self.workspace}] Graph truncated: found {len(selected_nodes)} nodes within max_depth {max_depth}"
                     )
 
-            # Create subgraph with BFS discovered nodes
-            subgraph = graph.subgraph(bfs_nodes)
-
         # Add nodes to result
-        seen_nodes = set()
-        seen_edges = set()
-        for node in subgraph.nodes():
-            if str(node) in seen_nodes:
-                continue
-
-            node_data = dict(subgraph.nodes[node])
-            # Get entity_type as labels
-            labels = []
-            if "entity_type" in node_data:
-                if isinstance(node_data["entity_type"], list):
-                    labels.extend(node_data["entity_type"])
-                else:
-                    labels.append(node_data["entity_type"])
-
-            # Create node with properties
-            node_properties = {k: v for k, v in node_data.items()}
-
+        node_ids = snapshot.node_ids
+        for node in selected_nodes:
+            node_id = node_ids[node]
             result.nodes.append(
                 KnowledgeGraphNode(
-                    id=str(node), labels=[str(node)], properties=node_properties
+                    id=str(node_id),
+                    labels=[str(node_id)],
+                    properties=dict(graph.nodes[node_id]),
                 )
             )
-            seen_nodes.add(str(node))
-
-        # Add edges to result
-        for edge in subgraph.edges():
-            source, target = edge
-            # Esure unique edge_id for undirect graph
-            if str(source) > str(target):
-                source, target = target, source
-            edge_id = f"{source}-{target}"
-            if edge_id in seen_edges:
-                continue
 
-            edge_data = dict(subgraph.edges[edge])
-
-            # Create edge with complete information
-            result.edges.append(
-                KnowledgeGraphEdge(
-                    id=edge_id,
-                    type="DIRECTED",
-                    source=str(source),
-                    target=str(target),
-                    properties=edge_data,
+        # Add edges between selected nodes, each undirected edge exactly once
+        in_subgraph = np.zeros(len(node_ids), dtype=bool)
+        in_subgraph[selected_nodes] = True
+        for node in selected_nodes:
+            neighbors = snapshot.neighbors(node)
+            for neighbor in neighbors[in_subgraph[neighbors]].tolist():
+                if neighbor < node:
+                    continue
+                source, target = node_ids[node], node_ids[neighbor]
+                edge_data = dict(graph.adj[source][target])
+                # Esure unique edge_id for undirect graph
+                if str(source) > str(target):
+                    source, target = target, source
+                result.edges.append(
+                    KnowledgeGraphEdge(
+                        id=f"{source}-{target}",
+                        type="DIRECTED",
+                        source=str(source),
+                        target=str(target),
+                        properties=edge_data,
+                    )
                 )
-            )
-            seen_edges.add(edge_id)
+
+        self._subgraph_cache[cache_key] = result
+        while len(self._subgraph_cache) > DEFAULT_GRAPH_QUERY_CACHE_SIZE:
+            self._subgraph_cache.popitem(last=False)
 
         logger.info(
             f"[{self.workspace}] Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
         )
-        return result
+        return result.model_copy(
+            update={"nodes": list(result.nodes), "edges": list(result.edges)}
+        )
 
     async def get_all_nodes(self) -> list[dict]:
         """Get all nodes in the graph.
@@ -510,6 +598,7 @@ class NetworkXStorage(BaseGraphStorage):
                 self._graph = (
                     NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
                 )
+                self._invalidate_snapshot()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -552,6 +641,7 @@ class NetworkXStorage(BaseGraphStorage):
                 if os.path.exists(self._graphml_xml_file):
                     os.remove(self._graphml_xml_file)
                 self._graph = nx.Graph()
+                self._invalidate_snapshot()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -30,9 +30,11 @@ from ..base import (
     DocProcessingStatus,
     DocStatus,
     DocStatusStorage,
+    VectorScopeFilter,
 )
 from ..namespace import NameSpace, is_namespace
 from ..utils import logger
+from ..constants import DEFAULT_GRAPH_WRITE_BATCH_SIZE, DEFAULT_VECTOR_SCOPE_OVERSAMPLE
 from ..kg.shared_storage import get_data_init_lock, get_graph_db_lock, get_storage_lock
 
 import pipmaster as pm
@@ -52,6 +54,11 @@ load_dotenv(dotenv_path=".env", override=False)
 
 T = TypeVar("T")
 
+# pgvector defaults and upper bound of the per-query index search settings
+_PGVECTOR_DEFAULT_EF_SEARCH = 40
+_PGVECTOR_MAX_EF_SEARCH = 1000
+_PGVECTOR_DEFAULT_PROBES = 1
+
 
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
@@ -77,6 +84,9 @@ class PostgreSQLDB:
         self.hnsw_m = config.get("hnsw_m")
         self.hnsw_ef = config.get("hnsw_ef")
         self.ivfflat_lists = config.get("ivfflat_lists")
+        # Default per-query search settings, None keeps the server default
+        self.hnsw_ef_search = config.get("hnsw_ef_search")
+        self.ivfflat_probes = config.get("ivfflat_probes")
 
         # Server settings
         self.server_settings = config.get("server_settings")
@@ -1449,13 +1459,31 @@ class PostgreSQLDB:
         multirows: bool = False,
         with_age: bool = False,
         graph_name: str | None = None,
+        settings: dict[str, Any] | None = None,
     ) -> dict[str, Any] | None | list[dict[str, Any]]:
-        async def _operation(connection: asyncpg.Connection) -> Any:
+        """Fetch rows for sql.
+
+        settings are applied with SET LOCAL semantics in a transaction around
+        the query, e.g. {"hnsw.ef_search": 100}, and do not leak to the pooled
+        connection.
+        """
+
+        async def _fetch(connection: asyncpg.Connection) -> list[asyncpg.Record]:
             prepared_params = tuple(params) if params else ()
             if prepared_params:
-                rows = await connection.fetch(sql, *prepared_params)
+                return await connection.fetch(sql, *prepared_params)
+            return await connection.fetch(sql)
+
+        async def _operation(connection: asyncpg.Connection) -> Any:
+            if settings:
+                async with connection.transaction():
+                    for name, value in settings.items():
+                        await connection.execute(
+                            "SELECT set_config($1, $2, true)", name, str(value)
+                        )
+                    rows = await _fetch(connection)
             else:
-                rows = await connection.fetch(sql)
+                rows = await _fetch(connection)
 
             if multirows:
                 if rows:
@@ -1516,6 +1544,76 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(self, sql: str, rows: list[dict[str, Any]]) -> None:
+        """Run sql once per row in a single transaction.
+
+        asyncpg pipelines the rows over one prepared statement, so a batch costs
+        a few round trips instead of one per row. Row values are passed in dict
+        order, like execute().
+        """
+        if not rows:
+            return
+
+        async def _operation(connection: asyncpg.Connection) -> None:
+            async with connection.transaction():
+                await connection.executemany(sql, [tuple(row.values()) for row in rows])
+
+        try:
+            await self._run_with_retry(_operation)
+        except Exception as e:
+            logger.error(
+                f"PostgreSQL database,\nsql:{sql},\nrows:{len(rows)},\nerror:{e}"
+            )
+            raise
+
+    async def copy_upsert(
+        self,
+        table_name: str,
+        rows: list[dict[str, Any]],
+        merge_sql: str,
+        column_types: dict[str, str] | None = None,
+    ) -> None:
+        """Bulk upsert rows through a temporary staging table.
+
+        The rows are streamed into a copy of table_name with COPY (binary
+        protocol), then merged by merge_sql, which selects from {stage_table}
+        and handles conflicts. column_types overrides staging column types,
+        e.g. to stage vectors as float4[] and cast them to vector in the merge.
+        All rows must have the same keys, which must be columns of table_name.
+        """
+        if not rows:
+            return
+        columns = list(rows[0].keys())
+        records = [tuple(row[column] for column in columns) for row in rows]
+        stage_table = f"{table_name.lower()}_stage"
+
+        async def _operation(connection: asyncpg.Connection) -> None:
+            async with connection.transaction():
+                await connection.execute(
+                    f"CREATE TEMP TABLE {stage_table} (LIKE {table_name}) ON COMMIT DROP"
+                )
+                for column, column_type in (column_types or {}).items():
+                    await connection.execute(
+                        f"ALTER TABLE {stage_table} ALTER COLUMN {column} "
+                        f"TYPE {column_type} USING NULL"
+                    )
+                await connection.copy_records_to_table(
+                    stage_table, records=records, columns=columns
+                )
+                await connection.execute(merge_sql.format(stage_table=stage_table))
+
+        try:
+            await self._run_with_retry(_operation)
+        except Exception as e:
+            logger.error(
+                f"PostgreSQL database,\ntable:{table_name},\nrows:{len(rows)},\nerror:{e}"
+            )
+            raise
+
+
+def _optional_int(value: Any) -> int | None:
+    return int(value) if value not in (None, "") else None
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1596,6 +1694,18 @@ class ClientManager:
                     config.get("postgres", "ivfflat_lists", fallback="100"),
                 )
             ),
+            "hnsw_ef_search": _optional_int(
+                os.environ.get(
+                    "POSTGRES_HNSW_EF_SEARCH",
+                    config.get("postgres", "hnsw_ef_search", fallback=None),
+                )
+            ),
+            "ivfflat_probes": _optional_int(
+                os.environ.get(
+                    "POSTGRES_IVFFLAT_PROBES",
+                    config.get("postgres", "ivfflat_probes", fallback=None),
+                )
+            ),
             # Server settings for Supabase
             "server_settings": os.environ.get(
                 "POSTGRES_SERVER_SETTINGS",
@@ -1798,6 +1908,18 @@ class PGKVStorage(BaseKVStorage):
             response["create_time"] = create_time
             response["update_time"] = create_time if update_time == 0 else update_time
 
+        # Special handling for CHUNK_EXTRACTIONS namespace
+        if response and is_namespace(
+            self.namespace, NameSpace.KV_STORE_CHUNK_EXTRACTIONS
+        ):
+            response = self._parse_chunk_extraction_row(response)
+
+        # Special handling for SHARED_EXTRACTION_CACHE namespace
+        if response and is_namespace(
+            self.namespace, NameSpace.KV_STORE_SHARED_EXTRACTION_CACHE
+        ):
+            response = self._parse_chunk_extraction_row(response, column="entry")
+
         # Special handling for RELATION_CHUNKS namespace
         if response and is_namespace(
             self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS
@@ -1817,6 +1939,26 @@ class PGKVStorage(BaseKVStorage):
 
         return response if response else None
 
+    @staticmethod
+    def _parse_chunk_extraction_row(
+        row: dict[str, Any], column: str = "extraction"
+    ) -> dict[str, Any]:
+        """Flatten a JSONB record column back into the stored record"""
+        extraction = row.get(column) or {}
+        if isinstance(extraction, str):
+            try:
+                extraction = json.loads(extraction)
+            except json.JSONDecodeError:
+                extraction = {}
+        create_time = row.get("create_time", 0)
+        update_time = row.get("update_time", 0)
+        return {
+            **extraction,
+            "id": row["id"],
+            "create_time": create_time,
+            "update_time": create_time if update_time == 0 else update_time,
+        }
+
     # Query by id
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         """Get data by ids"""
@@ -1939,6 +2081,21 @@ class PGKVStorage(BaseKVStorage):
                 result["create_time"] = create_time
                 result["update_time"] = create_time if update_time == 0 else update_time
 
+        # Special handling for CHUNK_EXTRACTIONS namespace
+        if results and is_namespace(
+            self.namespace, NameSpace.KV_STORE_CHUNK_EXTRACTIONS
+        ):
+            results = [self._parse_chunk_extraction_row(result) for result in results]
+
+        # Special handling for SHARED_EXTRACTION_CACHE namespace
+        if results and is_namespace(
+            self.namespace, NameSpace.KV_STORE_SHARED_EXTRACTION_CACHE
+        ):
+            results = [
+                self._parse_chunk_extraction_row(result, column="entry")
+                for result in results
+            ]
+
         # Special handling for RELATION_CHUNKS namespace
         if results and is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS):
             for result in results:
@@ -1985,11 +2142,13 @@ class PGKVStorage(BaseKVStorage):
         if not data:
             return
 
+        # Rows are written in one pipelined batch instead of a statement each
+        rows: list[dict[str, Any]] = []
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2002,20 +2161,20 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
+            upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
                 _data = {
                     "id": k,
                     "content": v["content"],
                     "doc_name": v.get("file_path", ""),  # Map file_path to doc_name
                     "workspace": self.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,  # Use flattened key as id
@@ -2029,13 +2188,12 @@ class PGKVStorage(BaseKVStorage):
                     if v.get("queryparam")
                     else None,
                 }
-
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_ENTITIES):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2044,12 +2202,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_RELATIONS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2058,12 +2216,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_entity_chunks"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_entity_chunks"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2072,12 +2230,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_relation_chunks"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_relation_chunks"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2086,7 +2244,36 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
+        elif is_namespace(self.namespace, NameSpace.KV_STORE_CHUNK_EXTRACTIONS):
+            # Get current UTC time and convert to naive datetime for database storage
+            current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_chunk_extractions"]
+            for k, v in data.items():
+                _data = {
+                    "workspace": self.workspace,
+                    "id": k,
+                    "extraction": json.dumps(v, ensure_ascii=False),
+                    "create_time": current_time,
+                    "update_time": current_time,
+                }
+                rows.append(_data)
+        elif is_namespace(self.namespace, NameSpace.KV_STORE_SHARED_EXTRACTION_CACHE):
+            # Get current UTC time and convert to naive datetime for database storage
+            current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_shared_extraction_cache"]
+            for k, v in data.items():
+                _data = {
+                    "workspace": self.workspace,
+                    "id": k,
+                    "entry": json.dumps(v, ensure_ascii=False),
+                    "create_time": current_time,
+                    "update_time": current_time,
+                }
+                rows.append(_data)
+
+        if rows:
+            await self.db.executemany(upsert_sql, rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -2214,7 +2401,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": item["__vector__"].tolist(),
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -2242,7 +2429,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"].tolist(),
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2266,7 +2453,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"].tolist(),
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2274,7 +2461,11 @@ class PGVectorStorage(BaseVectorStorage):
         }
         return upsert_sql, data
 
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
             return
@@ -2294,12 +2485,14 @@ class PGVectorStorage(BaseVectorStorage):
             for i in range(0, len(contents), self._max_batch_size)
         ]
 
-        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embed = self._upsert_embedder(data, vectors)
+        embedding_tasks = [embed(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
 
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
+        rows = []
         for item in list_data:
             if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
                 upsert_sql, data = self._upsert_chunks(item, current_time)
@@ -2309,13 +2502,40 @@ class PGVectorStorage(BaseVectorStorage):
                 upsert_sql, data = self._upsert_relationships(item, current_time)
             else:
                 raise ValueError(f"{self.namespace} is not supported")
-
-            await self.db.execute(upsert_sql, data)
+            rows.append(data)
+
+        # Vectors are copied in binary as float4[] and cast to vector on merge,
+        # instead of one INSERT per record with the vector as text
+        await self.db.copy_upsert(
+            namespace_to_table_name(self.namespace),
+            rows,
+            upsert_sql,
+            column_types={"content_vector": "float4[]"},
+        )
 
     #################### query method ###############
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
+        """Vector search; see BaseVectorStorage.query.
+
+        The embedding is bound as a binary float4[] parameter, so the statement
+        text only depends on the namespace and on whether a scope is given, and
+        asyncpg reuses its prepared statement across queries. ef_search (HNSW)
+        and probes (IVFFlat) override the configured search settings for this
+        query only.
+
+        The vector index applies the scope condition only to the candidates it
+        visits, so a scoped query that returns fewer than top_k rows is run
+        again with a wider ef_search or more probes until it fills top_k or
+        reaches the index limits.
+        """
         if query_embedding is not None:
             embedding = query_embedding
         else:
@@ -2324,16 +2544,79 @@ class PGVectorStorage(BaseVectorStorage):
             )  # higher priority for query
             embedding = embeddings[0]
 
-        embedding_string = ",".join(map(str, embedding))
-
-        sql = SQL_TEMPLATES[self.namespace].format(embedding_string=embedding_string)
         params = {
             "workspace": self.workspace,
             "closer_than_threshold": 1 - self.cosine_better_than_threshold,
             "top_k": top_k,
+            "embedding": np.asarray(embedding, dtype=np.float32).tolist(),
         }
-        results = await self.db.query(sql, params=list(params.values()), multirows=True)
-        return results
+        scope_condition = ""
+        if scope is not None:
+            if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
+                scope_condition = "AND full_doc_id = ANY($5::varchar[])"
+                params["doc_ids"] = list(scope.doc_ids)
+            elif scope.chunk_ids is not None:
+                # Rows written before chunk_ids existed are left to the
+                # post-retrieval scope filter
+                scope_condition = (
+                    "AND (chunk_ids && $5::varchar[] OR chunk_ids IS NULL)"
+                )
+                params["chunk_ids"] = list(scope.chunk_ids)
+
+        sql = SQL_TEMPLATES[self.namespace].format(scope_condition=scope_condition)
+        settings = self._search_settings(ef_search, probes)
+        while True:
+            results = await self.db.query(
+                sql,
+                params=list(params.values()),
+                multirows=True,
+                settings=settings,
+            )
+            if scope is None or len(results) >= top_k:
+                return results
+            settings = self._widened_search_settings(settings, top_k)
+            if settings is None:
+                return results
+
+    def _search_settings(
+        self, ef_search: int | None, probes: int | None
+    ) -> dict[str, int] | None:
+        """Index search settings for one query, falling back to the DB config"""
+        settings = {}
+        ef_search = ef_search if ef_search is not None else self.db.hnsw_ef_search
+        probes = probes if probes is not None else self.db.ivfflat_probes
+        if ef_search is not None:
+            settings["hnsw.ef_search"] = ef_search
+        if probes is not None:
+            settings["ivfflat.probes"] = probes
+        return settings or None
+
+    def _widened_search_settings(
+        self, settings: dict[str, int] | None, top_k: int
+    ) -> dict[str, int] | None:
+        """Search settings visiting more index candidates, None at the limit"""
+        settings = dict(settings or {})
+        index_type = (self.db.vector_index_type or "").upper()
+        if index_type == "HNSW":
+            current = settings.get("hnsw.ef_search", _PGVECTOR_DEFAULT_EF_SEARCH)
+            if current >= _PGVECTOR_MAX_EF_SEARCH:
+                return None
+            settings["hnsw.ef_search"] = min(
+                max(current, top_k) * DEFAULT_VECTOR_SCOPE_OVERSAMPLE,
+                _PGVECTOR_MAX_EF_SEARCH,
+            )
+        elif index_type == "IVFFLAT":
+            current = settings.get("ivfflat.probes", _PGVECTOR_DEFAULT_PROBES)
+            lists = self.db.ivfflat_lists or current
+            if current >= lists:
+                return None
+            settings["ivfflat.probes"] = min(
+                current * DEFAULT_VECTOR_SCOPE_OVERSAMPLE, lists
+            )
+        else:
+            # Without a vector index the scan is exact
+            return None
+        return settings
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -3707,6 +3990,100 @@ class PGGraphStorage(BaseGraphStorage):
             )
             raise
 
+    async def _execute_cypher_statements(self, statements: list[str]) -> None:
+        """Execute cypher() statements in one round trip per batch
+
+        Statements sent together run in a single implicit transaction. Unlike
+        upsert_node, a duplicate key error is raised rather than ignored, so a
+        failed batch is retried as a whole instead of being silently dropped.
+        """
+        for start in range(0, len(statements), DEFAULT_GRAPH_WRITE_BATCH_SIZE):
+            batch = statements[start : start + DEFAULT_GRAPH_WRITE_BATCH_SIZE]
+            await self._query("\n".join(batch), readonly=False)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes with multi-statement round trips.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        statements = []
+        for node_id, node_data in nodes.items():
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "PostgreSQL: node properties must contain an 'entity_id' field"
+                )
+            statements.append(
+                """SELECT * FROM cypher('%s', $$
+                     MERGE (n:base {entity_id: "%s"})
+                     SET n += %s
+                     RETURN n
+                   $$) AS (n agtype);"""
+                % (
+                    self.graph_name,
+                    self._normalize_node_id(node_id),
+                    self._format_properties(node_data),
+                )
+            )
+
+        try:
+            await self._execute_cypher_statements(statements)
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_nodes_batch error on {len(nodes)} nodes"
+            )
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges with multi-statement round trips.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        statements = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_properties = self._format_properties(edge_data)
+            statements.append(
+                """SELECT * FROM cypher('%s', $$
+                     MATCH (source:base {entity_id: "%s"})
+                     WITH source
+                     MATCH (target:base {entity_id: "%s"})
+                     MERGE (source)-[r:DIRECTED]-(target)
+                     SET r += %s
+                     SET r += %s
+                     RETURN r
+                   $$) AS (r agtype);"""
+                % (
+                    self.graph_name,
+                    self._normalize_node_id(source_node_id),
+                    self._normalize_node_id(target_node_id),
+                    edge_properties,
+                    edge_properties,  # same double SET as upsert_edge
+                )
+            )
+
+        try:
+            await self._execute_cypher_statements(statements)
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_edges_batch error on {len(edges)} edges"
+            )
+            raise
+
     async def delete_node(self, node_id: str) -> None:
         """
         Delete a node from the graph.
@@ -3756,23 +4133,25 @@ class PGGraphStorage(BaseGraphStorage):
         Args:
             edges (list[tuple[str, str]]): A list of edges to remove, where each edge is a tuple of (source_node_id, target_node_id).
         """
-        for source, target in edges:
-            src_label = self._normalize_node_id(source)
-            tgt_label = self._normalize_node_id(target)
-
-            query = """SELECT * FROM cypher('%s', $$
-                         MATCH (a:base {entity_id: "%s"})-[r]-(b:base {entity_id: "%s"})
-                         DELETE r
-                       $$) AS (r agtype)""" % (self.graph_name, src_label, tgt_label)
+        statements = [
+            """SELECT * FROM cypher('%s', $$
+                 MATCH (a:base {entity_id: "%s"})-[r]-(b:base {entity_id: "%s"})
+                 DELETE r
+               $$) AS (r agtype);"""
+            % (
+                self.graph_name,
+                self._normalize_node_id(source),
+                self._normalize_node_id(target),
+            )
+            for source, target in edges
+        ]
 
-            try:
-                await self._query(query, readonly=False)
-                logger.debug(
-                    f"[{self.workspace}] Deleted edge from '{source}' to '{target}'"
-                )
-            except Exception as e:
-                logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
-                raise
+        try:
+            await self._execute_cypher_statements(statements)
+            logger.debug(f"[{self.workspace}] Deleted {len(edges)} edges")
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
+            raise
 
     async def get_nodes_batch(
         self, node_ids: list[str], batch_size: int = 1000
@@ -4741,6 +5120,8 @@ NAMESPACE_TABLE_MAP = {
     NameSpace.KV_STORE_FULL_RELATIONS: "LIGHTRAG_FULL_RELATIONS",
     NameSpace.KV_STORE_ENTITY_CHUNKS: "LIGHTRAG_ENTITY_CHUNKS",
     NameSpace.KV_STORE_RELATION_CHUNKS: "LIGHTRAG_RELATION_CHUNKS",
+    NameSpace.KV_STORE_CHUNK_EXTRACTIONS: "LIGHTRAG_CHUNK_EXTRACTIONS",
+    NameSpace.KV_STORE_SHARED_EXTRACTION_CACHE: "LIGHTRAG_SHARED_EXTRACTION_CACHE",
     NameSpace.KV_STORE_LLM_RESPONSE_CACHE: "LIGHTRAG_LLM_CACHE",
     NameSpace.VECTOR_STORE_CHUNKS: "LIGHTRAG_VDB_CHUNKS",
     NameSpace.VECTOR_STORE_ENTITIES: "LIGHTRAG_VDB_ENTITY",
@@ -4903,6 +5284,26 @@ TABLES = {
                     CONSTRAINT LIGHTRAG_RELATION_CHUNKS_PK PRIMARY KEY (workspace, id)
                     )"""
     },
+    "LIGHTRAG_CHUNK_EXTRACTIONS": {
+        "ddl": """CREATE TABLE LIGHTRAG_CHUNK_EXTRACTIONS (
+                    id VARCHAR(255),
+                    workspace VARCHAR(255),
+                    extraction JSONB,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_CHUNK_EXTRACTIONS_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
+    "LIGHTRAG_SHARED_EXTRACTION_CACHE": {
+        "ddl": """CREATE TABLE LIGHTRAG_SHARED_EXTRACTION_CACHE (
+                    id VARCHAR(255),
+                    workspace VARCHAR(255),
+                    entry JSONB,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_SHARED_EXTRACTION_CACHE_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
 }
 
 
@@ -4980,6 +5381,26 @@ SQL_TEMPLATES = {
                                  EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
                                  FROM LIGHTRAG_RELATION_CHUNKS WHERE workspace=$1 AND id = ANY($2)
                                 """,
+    "get_by_id_chunk_extractions": """SELECT id, extraction,
+                                EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                FROM LIGHTRAG_CHUNK_EXTRACTIONS WHERE workspace=$1 AND id=$2
+                               """,
+    "get_by_ids_chunk_extractions": """SELECT id, extraction,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_CHUNK_EXTRACTIONS WHERE workspace=$1 AND id = ANY($2)
+                                """,
+    "get_by_id_shared_extraction_cache": """SELECT id, entry,
+                                EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                FROM LIGHTRAG_SHARED_EXTRACTION_CACHE WHERE workspace=$1 AND id=$2
+                               """,
+    "get_by_ids_shared_extraction_cache": """SELECT id, entry,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_SHARED_EXTRACTION_CACHE WHERE workspace=$1 AND id = ANY($2)
+                                """,
     "filter_keys": "SELECT id FROM {table_name} WHERE workspace=$1 AND id IN ({ids})",
     "upsert_doc_full": """INSERT INTO LIGHTRAG_DOC_FULL (id, content, doc_name, workspace)
                         VALUES ($1, $2, $3, $4)
@@ -5043,11 +5464,28 @@ SQL_TEMPLATES = {
                       count=EXCLUDED.count,
                       update_time = EXCLUDED.update_time
                      """,
+    "upsert_chunk_extractions": """INSERT INTO LIGHTRAG_CHUNK_EXTRACTIONS (workspace, id, extraction,
+                      create_time, update_time)
+                      VALUES ($1, $2, $3, $4, $5)
+                      ON CONFLICT (workspace,id) DO UPDATE
+                      SET extraction=EXCLUDED.extraction,
+                      update_time = EXCLUDED.update_time
+                     """,
+    "upsert_shared_extraction_cache": """INSERT INTO LIGHTRAG_SHARED_EXTRACTION_CACHE (workspace, id, entry,
+                      create_time, update_time)
+                      VALUES ($1, $2, $3, $4, $5)
+                      ON CONFLICT (workspace,id) DO UPDATE
+                      SET entry=EXCLUDED.entry,
+                      update_time = EXCLUDED.update_time
+                     """,
     # SQL for VectorStorage
+    # Upserts merge a staging table filled by PostgreSQLDB.copy_upsert
     "upsert_chunk": """INSERT INTO LIGHTRAG_VDB_CHUNKS (workspace, id, tokens,
                       chunk_order_index, full_doc_id, content, content_vector, file_path,
                       create_time, update_time)
-                      VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                      SELECT workspace, id, tokens, chunk_order_index, full_doc_id,
+                      content, content_vector::vector, file_path, create_time, update_time
+                      FROM {stage_table}
                       ON CONFLICT (workspace,id) DO UPDATE
                       SET tokens=EXCLUDED.tokens,
                       chunk_order_index=EXCLUDED.chunk_order_index,
@@ -5059,7 +5497,9 @@ SQL_TEMPLATES = {
                      """,
     "upsert_entity": """INSERT INTO LIGHTRAG_VDB_ENTITY (workspace, id, entity_name, content,
                       content_vector, chunk_ids, file_path, create_time, update_time)
-                      VALUES ($1, $2, $3, $4, $5, $6::varchar[], $7, $8, $9)
+                      SELECT workspace, id, entity_name, content, content_vector::vector,
+                      chunk_ids, file_path, create_time, update_time
+                      FROM {stage_table}
                       ON CONFLICT (workspace,id) DO UPDATE
                       SET entity_name=EXCLUDED.entity_name,
                       content=EXCLUDED.content,
@@ -5070,7 +5510,9 @@ SQL_TEMPLATES = {
                      """,
     "upsert_relationship": """INSERT INTO LIGHTRAG_VDB_RELATION (workspace, id, source_id,
                       target_id, content, content_vector, chunk_ids, file_path, create_time, update_time)
-                      VALUES ($1, $2, $3, $4, $5, $6, $7::varchar[], $8, $9, $10)
+                      SELECT workspace, id, source_id, target_id, content,
+                      content_vector::vector, chunk_ids, file_path, create_time, update_time
+                      FROM {stage_table}
                       ON CONFLICT (workspace,id) DO UPDATE
                       SET source_id=EXCLUDED.source_id,
                       target_id=EXCLUDED.target_id,
@@ -5086,8 +5528,9 @@ SQL_TEMPLATES = {
                             EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at
                      FROM LIGHTRAG_VDB_RELATION r
                      WHERE r.workspace = $1
-                       AND r.content_vector <=> '[{embedding_string}]'::vector < $2
-                     ORDER BY r.content_vector <=> '[{embedding_string}]'::vector
+                       AND r.content_vector <=> $4::float4[]::vector < $2
+                       {scope_condition}
+                     ORDER BY r.content_vector <=> $4::float4[]::vector
                      LIMIT $3;
                      """,
     "entities": """
@@ -5095,19 +5538,22 @@ SQL_TEMPLATES = {
                        EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at
                 FROM LIGHTRAG_VDB_ENTITY e
                 WHERE e.workspace = $1
-                  AND e.content_vector <=> '[{embedding_string}]'::vector < $2
-                ORDER BY e.content_vector <=> '[{embedding_string}]'::vector
+                  AND e.content_vector <=> $4::float4[]::vector < $2
+                  {scope_condition}
+                ORDER BY e.content_vector <=> $4::float4[]::vector
                 LIMIT $3;
                 """,
     "chunks": """
               SELECT c.id,
                      c.content,
                      c.file_path,
+                     c.full_doc_id,
                      EXTRACT(EPOCH FROM c.create_time)::BIGINT AS created_at
               FROM LIGHTRAG_VDB_CHUNKS c
               WHERE c.workspace = $1
-                AND c.content_vector <=> '[{embedding_string}]'::vector < $2
-              ORDER BY c.content_vector <=> '[{embedding_string}]'::vector
+                AND c.content_vector <=> $4::float4[]::vector < $2
+                {scope_condition}
+              ORDER BY c.content_vector <=> $4::float4[]::vector
               LIMIT $3;
               """,
     # DROP tables
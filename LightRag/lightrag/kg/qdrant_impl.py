@@ -9,21 +9,24 @@ from typing import Any, List, final
 import numpy as np
 import pipmaster as pm
 
-from ..base import BaseVectorStorage
+from ..base import BaseVectorStorage, VectorScopeFilter
 from ..exceptions import QdrantMigrationError
 from ..kg.shared_storage import get_data_init_lock, get_storage_lock
-from ..utils import compute_mdhash_id, logger
+from ..utils import compute_mdhash_id, logger, split_graph_field
 
 if not pm.is_installed("qdrant-client"):
     pm.install("qdrant-client")
 
-from qdrant_client import QdrantClient, models  # type: ignore
+from qdrant_client import AsyncQdrantClient, models  # type: ignore
 
 DEFAULT_WORKSPACE = "_"
 WORKSPACE_ID_FIELD = "workspace_id"
 ENTITY_PREFIX = "ent-"
 CREATED_AT_FIELD = "created_at"
 ID_FIELD = "id"
+# Parsed source_id of entity/relation points, used for scope filtering
+CHUNK_IDS_FIELD = "chunk_ids"
+FULL_DOC_ID_FIELD = "full_doc_id"
 
 config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
@@ -82,8 +85,8 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         self.__post_init__()
 
     @staticmethod
-    def setup_collection(
-        client: QdrantClient,
+    async def setup_collection(
+        client: AsyncQdrantClient,
         collection_name: str,
         legacy_namespace: str = None,
         workspace: str = None,
@@ -93,14 +96,16 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         Setup Qdrant collection with migration support from legacy collections.
 
         Args:
-            client: QdrantClient instance
+            client: AsyncQdrantClient instance
             collection_name: Name of the new collection
             legacy_namespace: Name of the legacy collection (if exists)
             workspace: Workspace identifier for data isolation
             **kwargs: Additional arguments for collection creation (vectors_config, hnsw_config, etc.)
         """
-        new_collection_exists = client.collection_exists(collection_name)
-        legacy_exists = legacy_namespace and client.collection_exists(legacy_namespace)
+        new_collection_exists = await client.collection_exists(collection_name)
+        legacy_exists = bool(legacy_namespace) and await client.collection_exists(
+            legacy_namespace
+        )
 
         # Case 1: Both new and legacy collections exist - Warning only (no migration)
         if new_collection_exists and legacy_exists:
@@ -113,12 +118,12 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         if new_collection_exists:
             # Check if workspace index exists, create if missing
             try:
-                collection_info = client.get_collection(collection_name)
+                collection_info = await client.get_collection(collection_name)
                 if WORKSPACE_ID_FIELD not in collection_info.payload_schema:
                     logger.info(
                         f"Qdrant: Creating missing workspace index for '{collection_name}'"
                     )
-                    client.create_payload_index(
+                    await client.create_payload_index(
                         collection_name=collection_name,
                         field_name=WORKSPACE_ID_FIELD,
                         field_schema=models.KeywordIndexParams(
@@ -135,8 +140,8 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         # Case 3: Neither exists - Create new collection
         if not legacy_exists:
             logger.info(f"Qdrant: Creating new collection '{collection_name}'")
-            client.create_collection(collection_name, **kwargs)
-            client.create_payload_index(
+            await client.create_collection(collection_name, **kwargs)
+            await client.create_payload_index(
                 collection_name=collection_name,
                 field_name=WORKSPACE_ID_FIELD,
                 field_schema=models.KeywordIndexParams(
@@ -154,16 +159,16 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
         try:
             # Get legacy collection count
-            legacy_count = client.count(
-                collection_name=legacy_namespace, exact=True
+            legacy_count = (
+                await client.count(collection_name=legacy_namespace, exact=True)
             ).count
             logger.info(f"Qdrant: Found {legacy_count} records in legacy collection")
 
             if legacy_count == 0:
                 logger.info("Qdrant: Legacy collection is empty, skipping migration")
                 # Create new empty collection
-                client.create_collection(collection_name, **kwargs)
-                client.create_payload_index(
+                await client.create_collection(collection_name, **kwargs)
+                await client.create_payload_index(
                     collection_name=collection_name,
                     field_name=WORKSPACE_ID_FIELD,
                     field_schema=models.KeywordIndexParams(
@@ -175,7 +180,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             # Create new collection first
             logger.info(f"Qdrant: Creating new collection '{collection_name}'")
-            client.create_collection(collection_name, **kwargs)
+            await client.create_collection(collection_name, **kwargs)
 
             # Batch migration (500 records per batch)
             migrated_count = 0
@@ -184,7 +189,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             while True:
                 # Scroll through legacy data
-                result = client.scroll(
+                result = await client.scroll(
                     collection_name=legacy_namespace,
                     limit=batch_size,
                     offset=offset,
@@ -222,7 +227,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                     )
 
                 # Upsert to new collection
-                client.upsert(
+                await client.upsert(
                     collection_name=collection_name, points=new_points, wait=True
                 )
 
@@ -236,7 +241,9 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             # Verify migration by comparing counts
             logger.info("Verifying migration...")
-            new_count = client.count(collection_name=collection_name, exact=True).count
+            new_count = (
+                await client.count(collection_name=collection_name, exact=True)
+            ).count
 
             if new_count != legacy_count:
                 error_msg = f"Qdrant: Migration verification failed, expected {legacy_count} records, got {new_count} in new collection"
@@ -249,7 +256,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             # Create payload index after successful migration
             logger.info("Qdrant: Creating workspace payload index...")
-            client.create_payload_index(
+            await client.create_payload_index(
                 collection_name=collection_name,
                 field_name=WORKSPACE_ID_FIELD,
                 field_schema=models.KeywordIndexParams(
@@ -322,24 +329,29 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                 return
 
             try:
-                # Create QdrantClient if not already created
+                # Create AsyncQdrantClient if not already created
                 if self._client is None:
-                    self._client = QdrantClient(
-                        url=os.environ.get(
-                            "QDRANT_URL", config.get("qdrant", "uri", fallback=None)
-                        ),
-                        api_key=os.environ.get(
-                            "QDRANT_API_KEY",
-                            config.get("qdrant", "apikey", fallback=None),
-                        ),
+                    url = os.environ.get(
+                        "QDRANT_URL", config.get("qdrant", "uri", fallback=None)
                     )
+                    if url == ":memory:":
+                        # Local in-memory mode, for tests and experiments
+                        self._client = AsyncQdrantClient(location=url)
+                    else:
+                        self._client = AsyncQdrantClient(
+                            url=url,
+                            api_key=os.environ.get(
+                                "QDRANT_API_KEY",
+                                config.get("qdrant", "apikey", fallback=None),
+                            ),
+                        )
                     logger.debug(
-                        f"[{self.workspace}] QdrantClient created successfully"
+                        f"[{self.workspace}] AsyncQdrantClient created successfully"
                     )
 
                 # Setup collection (create if not exists and configure indexes)
                 # Pass legacy_namespace and workspace for migration support
-                QdrantVectorDBStorage.setup_collection(
+                await QdrantVectorDBStorage.setup_collection(
                     self._client,
                     self.final_namespace,
                     legacy_namespace=self.legacy_namespace,
@@ -354,6 +366,8 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                     ),
                 )
 
+                await self._ensure_scope_index()
+
                 self._initialized = True
                 logger.info(
                     f"[{self.workspace}] Qdrant collection '{self.namespace}' initialized successfully"
@@ -364,7 +378,67 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                 )
                 raise
 
-    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+    async def finalize(self):
+        """Close the Qdrant client"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._initialized = False
+
+    def _scope_field(self) -> str | None:
+        """Payload field a VectorScopeFilter is matched against, if any"""
+        if FULL_DOC_ID_FIELD in self.meta_fields:
+            return FULL_DOC_ID_FIELD
+        if "source_id" in self.meta_fields:
+            return CHUNK_IDS_FIELD
+        return None
+
+    async def _ensure_scope_index(self) -> None:
+        """Create the keyword index used by scoped queries if it is missing"""
+        field_name = self._scope_field()
+        if field_name is None:
+            return
+        try:
+            collection_info = await self._client.get_collection(self.final_namespace)
+            if field_name not in collection_info.payload_schema:
+                await self._client.create_payload_index(
+                    collection_name=self.final_namespace,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+        except Exception as e:
+            logger.warning(
+                f"[{self.workspace}] Could not create '{field_name}' index for '{self.final_namespace}': {e}"
+            )
+
+    def _scope_condition(self, scope: VectorScopeFilter):
+        """Payload filter applying scope during the search, None if unrestricted"""
+        field_name = self._scope_field()
+        if field_name == FULL_DOC_ID_FIELD:
+            return models.FieldCondition(
+                key=FULL_DOC_ID_FIELD, match=models.MatchAny(any=list(scope.doc_ids))
+            )
+        if field_name == CHUNK_IDS_FIELD and scope.chunk_ids is not None:
+            # Points written before chunk_ids was stored are kept here and
+            # checked against their source_id after the search
+            return models.Filter(
+                should=[
+                    models.FieldCondition(
+                        key=CHUNK_IDS_FIELD,
+                        match=models.MatchAny(any=list(scope.chunk_ids)),
+                    ),
+                    models.IsEmptyCondition(
+                        is_empty=models.PayloadField(key=CHUNK_IDS_FIELD)
+                    ),
+                ]
+            )
+        return None
+
+    async def upsert(
+        self,
+        data: dict[str, dict[str, Any]],
+        vectors: dict[str, list[float]] | None = None,
+    ) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
             return
@@ -382,13 +456,17 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             }
             for k, v in data.items()
         ]
+        if self._scope_field() == CHUNK_IDS_FIELD:
+            for d in list_data:
+                d[CHUNK_IDS_FIELD] = list(split_graph_field(d.get("source_id")))
         contents = [v["content"] for v in data.values()]
         batches = [
             contents[i : i + self._max_batch_size]
             for i in range(0, len(contents), self._max_batch_size)
         ]
 
-        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embed = self._upsert_embedder(data, vectors)
+        embedding_tasks = [embed(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
 
         embeddings = np.concatenate(embeddings_list)
@@ -405,13 +483,19 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                 )
             )
 
-        results = self._client.upsert(
+        results = await self._client.upsert(
             collection_name=self.final_namespace, points=list_points, wait=True
         )
         return results
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        scope: VectorScopeFilter | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[dict[str, Any]]:
         if query_embedding is not None:
             embedding = query_embedding
@@ -421,16 +505,23 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )  # higher priority for query
             embedding = embedding_result[0]
 
-        results = self._client.query_points(
+        must = [workspace_filter_condition(self.effective_workspace)]
+        if scope is not None:
+            scope_condition = self._scope_condition(scope)
+            if scope_condition is not None:
+                must.append(scope_condition)
+
+        response = await self._client.query_points(
             collection_name=self.final_namespace,
             query=embedding,
             limit=top_k,
             with_payload=True,
             score_threshold=self.cosine_better_than_threshold,
-            query_filter=models.Filter(
-                must=[workspace_filter_condition(self.effective_workspace)]
-            ),
-        ).points
+            query_filter=models.Filter(must=must),
+        )
+        results = response.points
+        if scope is not None:
+            results = [dp for dp in results if scope.matches(dp.payload)]
 
         return [
             {
@@ -461,7 +552,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                 for id in ids
             ]
             # Delete points from the collection with workspace filtering
-            self._client.delete(
+            await self._client.delete(
                 collection_name=self.final_namespace,
                 points_selector=models.PointIdsList(points=qdrant_ids),
                 wait=True,
@@ -488,7 +579,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
 
             # Delete the entity point by its Qdrant ID directly
-            self._client.delete(
+            await self._client.delete(
                 collection_name=self.final_namespace,
                 points_selector=models.PointIdsList(points=[qdrant_entity_id]),
                 wait=True,
@@ -507,7 +598,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Find relations where the entity is either source or target, with workspace filtering
-            results = self._client.scroll(
+            results = await self._client.scroll(
                 collection_name=self.final_namespace,
                 scroll_filter=models.Filter(
                     must=[workspace_filter_condition(self.effective_workspace)],
@@ -530,8 +621,8 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             if ids_to_delete:
                 # Delete the relations with workspace filtering
-                assert isinstance(self._client, QdrantClient)
-                self._client.delete(
+                assert isinstance(self._client, AsyncQdrantClient)
+                await self._client.delete(
                     collection_name=self.final_namespace,
                     points_selector=models.PointIdsList(points=ids_to_delete),
                     wait=True,
@@ -564,7 +655,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
 
             # Retrieve the point by ID with workspace filtering
-            result = self._client.retrieve(
+            result = await self._client.retrieve(
                 collection_name=self.final_namespace,
                 ids=[qdrant_id],
                 with_payload=True,
@@ -604,7 +695,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             ]
 
             # Retrieve the points by IDs
-            results = self._client.retrieve(
+            results = await self._client.retrieve(
                 collection_name=self.final_namespace,
                 ids=qdrant_ids,
                 with_payload=True,
@@ -662,7 +753,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             ]
 
             # Retrieve the points by IDs with vectors
-            results = self._client.retrieve(
+            results = await self._client.retrieve(
                 collection_name=self.final_namespace,
                 ids=qdrant_ids,
                 with_vectors=True,  # Important: request vectors
@@ -701,7 +792,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         async with get_storage_lock():
             try:
                 # Delete all points for the current workspace
-                self._client.delete(
+                await self._client.delete(
                     collection_name=self.final_namespace,
                     points_selector=models.FilterSelector(
                         filter=models.Filter(
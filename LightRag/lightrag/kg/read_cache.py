@@ -0,0 +1,260 @@
+"""
+Read-through in-process cache in front of a KV storage.
+
+Chunk records are keyed by a hash of their content, so the content behind a
+chunk id never changes once it exists. Queries fetch the same popular chunks
+over and over, and on Mongo/PG/Redis every fetch is a network round trip.
+ReadThroughKVCache wraps the configured KV storage and keeps recently read
+records in a bounded LRU, limited both by entry count and approximate size.
+
+Writes (upsert/delete) evict the affected keys locally and append them to a
+bounded change log in a dedicated namespace of shared_storage. Before the next
+read every other worker evicts just those keys. Only drop(), or a worker that
+fell further behind than the log reaches, clears a whole cache. The namespace
+is separate from the one used by JsonKVStorage, so cache invalidation never
+triggers a file reload.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from lightrag.base import BaseKVStorage
+from lightrag.kg.shared_storage import get_namespace_data, get_storage_lock
+from lightrag.utils import logger
+
+# Rough per-record overhead of the dict and its keys, in bytes
+_RECORD_OVERHEAD = 256
+
+# Number of writes other workers can replay key by key before they have to
+# drop their whole cache
+_CHANGE_LOG_SIZE = 256
+
+
+def _approx_size(record: dict[str, Any]) -> int:
+    size = _RECORD_OVERHEAD
+    for value in record.values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, (list, tuple)):
+            size += sum(len(v) if isinstance(v, str) else 8 for v in value)
+        else:
+            size += 8
+    return size
+
+
+def unwrap_storage(storage: Any) -> Any:
+    """The storage behind a ReadThroughKVCache, or storage itself"""
+    if isinstance(storage, ReadThroughKVCache):
+        return storage.storage
+    return storage
+
+
+class ReadThroughKVCache(BaseKVStorage):
+    """LRU read cache wrapping another BaseKVStorage instance
+
+    All methods not defined here are forwarded to the wrapped storage, so
+    backend specific attributes (db clients, final_namespace, ...) stay
+    reachable through the wrapper.
+    """
+
+    def __init__(
+        self,
+        storage: BaseKVStorage,
+        max_entries: int,
+        max_bytes: int,
+    ):
+        # BaseKVStorage is a dataclass, mirror its fields from the wrapped storage
+        self.storage = storage
+        self.namespace = storage.namespace
+        self.workspace = storage.workspace
+        self.global_config = storage.global_config
+        self.embedding_func = storage.embedding_func
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._cache: OrderedDict[str, tuple[dict[str, Any], int]] = OrderedDict()
+        self._bytes = 0
+        # Bumped on every invalidation, so reads that raced a write do not
+        # put stale records back into the cache
+        self._generation = 0
+        # Shared change log and the last entry this worker has applied
+        self._changes = None
+        self._seen_version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        if name == "storage":
+            raise AttributeError(name)
+        return getattr(self.storage, name)
+
+    @property
+    def _changes_namespace(self) -> str:
+        if self.workspace:
+            return f"{self.workspace}_{self.namespace}_read_cache"
+        return f"{self.namespace}_read_cache"
+
+    async def initialize(self):
+        await self.storage.initialize()
+        if self._changes is None:
+            self._changes = await get_namespace_data(self._changes_namespace)
+            self._seen_version = self._changes.get("version", 0)
+
+    async def finalize(self):
+        self.clear()
+        await self.storage.finalize()
+
+    async def index_done_callback(self) -> None:
+        await self.storage.index_done_callback()
+
+    def clear(self) -> None:
+        """Drop every cached record of this worker"""
+        self._cache.clear()
+        self._bytes = 0
+        self._generation += 1
+
+    def _evict(self, ids) -> None:
+        self._generation += 1
+        for id in ids:
+            entry = self._cache.pop(id, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def _put(self, id: str, record: dict[str, Any]) -> None:
+        size = _approx_size(record)
+        if size > self.max_bytes:
+            return
+        previous = self._cache.pop(id, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        self._cache[id] = (record, size)
+        self._bytes += size
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, evicted_size) = self._cache.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _check_invalidated(self) -> None:
+        """Evict the keys other workers have written since the last read"""
+        if self._changes is None:
+            return
+        version = self._changes.get("version", 0)
+        if version == self._seen_version:
+            return
+
+        changed: dict[str, None] | None = {}
+        replayed = self._seen_version
+        for entry_version, ids in self._changes.get("entries", []):
+            if entry_version <= self._seen_version:
+                continue
+            if entry_version != replayed + 1 or ids is None:
+                changed = None
+                break
+            changed.update(dict.fromkeys(ids))
+            replayed = entry_version
+        if replayed != version:
+            changed = None
+        self._seen_version = version
+
+        if changed is None:
+            self.clear()
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} dropped {self.namespace} read cache"
+            )
+        else:
+            self._evict(changed)
+
+    async def _notify_workers(self, ids: Iterable[str] | None) -> None:
+        """Append a write to the change log, None makes every worker clear its cache"""
+        if self._changes is None:
+            return
+        async with get_storage_lock():
+            # Catch up first, the entries before ours belong to other workers
+            self._check_invalidated()
+            version = self._changes.get("version", 0) + 1
+            entries = list(self._changes.get("entries", []))
+            entries.append((version, None if ids is None else list(ids)))
+            # Reassign instead of mutating, the log may live in a manager dict
+            self._changes["entries"] = entries[-_CHANGE_LOG_SIZE:]
+            self._changes["version"] = version
+            self._seen_version = version
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        return (await self.get_by_ids([id]))[0]
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        self._check_invalidated()
+
+        results: list[dict[str, Any] | None] = [None] * len(ids)
+        missing: dict[str, list[int]] = {}
+        for i, id in enumerate(ids):
+            entry = self._cache.get(id)
+            if entry is None:
+                missing.setdefault(id, []).append(i)
+            else:
+                self._cache.move_to_end(id)
+                # Callers may annotate the returned dicts, never hand out the cached one
+                results[i] = dict(entry[0])
+                self.hits += 1
+
+        if missing:
+            self.misses += len(missing)
+            generation = self._generation
+            missing_ids = list(missing)
+            fetched = await self.storage.get_by_ids(missing_ids)
+            cacheable = generation == self._generation
+            for id, record in zip(missing_ids, fetched):
+                if record is None:
+                    continue
+                if cacheable:
+                    self._put(id, record)
+                for i in missing[id]:
+                    results[i] = dict(record)
+
+        return results
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        return await self.storage.filter_keys(keys)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        # Chunk content is immutable, but bookkeeping fields such as
+        # llm_cache_list are rewritten in place, so upserts invalidate too
+        self._evict(data.keys())
+        await self.storage.upsert(data)
+        await self._notify_workers(data.keys())
+
+    async def delete(self, ids: list[str]) -> None:
+        self._evict(ids)
+        await self.storage.delete(ids)
+        await self._notify_workers(ids)
+
+    async def is_empty(self) -> bool:
+        return await self.storage.is_empty()
+
+    async def drop(self) -> dict[str, str]:
+        self.clear()
+        result = await self.storage.drop()
+        await self._notify_workers(None)
+        return result
+
+    def cache_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
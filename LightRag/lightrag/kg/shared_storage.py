@@ -3,11 +3,12 @@ import sys
 import asyncio
 import multiprocessing as mp
 from multiprocessing.synchronize import Lock as ProcessLock
-from multiprocessing import Manager
+from multiprocessing.managers import ListProxy, SyncManager
 import time
 import logging
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
+from lightrag.constants import DEFAULT_PIPELINE_HISTORY_SIZE
 from lightrag.exceptions import PipelineNotInitializedError
 
 DEBUG_LOCKS = False
@@ -53,6 +54,123 @@ def direct_log(message, enable_output: bool = True, level: str = "DEBUG"):
 T = TypeVar("T")
 LockType = Union[ProcessLock, asyncio.Lock]
 
+
+class PipelineHistory(list):
+    """The history_messages list of pipeline_status, kept as a ring buffer of events.
+
+    Every appended message gets a sequence number (1, 2, ...) that keeps
+    increasing when old messages are dropped or the history is cleared, so a
+    client can poll or stream with a cursor and only receive new messages:
+    events_since(cursor) returns the messages after it. Writers keep using it
+    as a plain list (append, del history[:], history[:] = [...]).
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_PIPELINE_HISTORY_SIZE):
+        super().__init__()
+        self.maxlen = maxlen
+        # Sequence number of self[0]
+        self.first_seq = 1
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest message, 0 before the first one"""
+        return self.first_seq + len(self) - 1
+
+    def _drop_oldest(self) -> None:
+        overflow = len(self) - self.maxlen
+        if overflow > 0:
+            super().__delitem__(slice(0, overflow))
+            self.first_seq += overflow
+
+    def append(self, message: str) -> None:
+        super().append(message)
+        self._drop_oldest()
+
+    def extend(self, messages) -> None:
+        super().extend(messages)
+        self._drop_oldest()
+
+    def __iadd__(self, messages):
+        self.extend(messages)
+        return self
+
+    def __delitem__(self, index) -> None:
+        # Remaining messages keep their place at the end of the sequence
+        next_seq = self.last_seq + 1
+        super().__delitem__(index)
+        self.first_seq = next_seq - len(self)
+
+    def pop(self, index: int = -1) -> str:
+        message = self[index]
+        del self[index]
+        return message
+
+    def clear(self) -> None:
+        del self[:]
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            # A rewritten history is sent to clients as new messages
+            next_seq = self.last_seq + 1
+            super().__setitem__(index, value)
+            self.first_seq = next_seq
+            self._drop_oldest()
+        else:
+            super().__setitem__(index, value)
+
+    def events_since(self, seq: int = 0, limit: int | None = None) -> dict[str, Any]:
+        """Messages with a sequence number above seq, oldest first.
+
+        Returns a dict with "events" ([{"seq": ..., "message": ...}]),
+        "last_seq" (the cursor to pass next time) and "dropped" (messages after
+        seq that had already left the buffer).
+        """
+        if seq > self.last_seq:
+            # Cursor from before a restart: resend the whole buffer
+            seq = self.first_seq - 1
+        start = max(seq + 1, self.first_seq)
+        dropped = start - (seq + 1)
+        offset = start - self.first_seq
+        end = len(self) if limit is None else min(len(self), offset + limit)
+        events = [
+            {"seq": self.first_seq + i, "message": self[i]} for i in range(offset, end)
+        ]
+        return {
+            "events": events,
+            "last_seq": events[-1]["seq"] if events else max(seq, start - 1),
+            "dropped": dropped,
+        }
+
+    def tail(self, count: int) -> dict[str, Any]:
+        """The newest count messages, the buffered count and the last sequence"""
+        return {
+            "messages": list(self[-count:]) if count > 0 else [],
+            "count": len(self),
+            "last_seq": self.last_seq,
+        }
+
+
+class PipelineHistoryProxy(ListProxy):
+    """Manager proxy for PipelineHistory, reading events in one round trip"""
+
+    _exposed_ = ListProxy._exposed_ + ("clear", "events_since", "tail")
+
+    def clear(self) -> None:
+        return self._callmethod("clear")
+
+    def events_since(self, seq: int = 0, limit: int | None = None) -> dict[str, Any]:
+        return self._callmethod("events_since", (seq, limit))
+
+    def tail(self, count: int) -> dict[str, Any]:
+        return self._callmethod("tail", (count,))
+
+
+class SharedDataManager(SyncManager):
+    """SyncManager that can also host PipelineHistory objects"""
+
+
+SharedDataManager.register("PipelineHistory", PipelineHistory, PipelineHistoryProxy)
+
 _is_multiprocess = None
 _workers = None
 _manager = None
@@ -1219,7 +1337,8 @@ def initialize_share_data(workers: int = 1):
 
     if workers > 1:
         _is_multiprocess = True
-        _manager = Manager()
+        _manager = SharedDataManager()
+        _manager.start()
         _lock_registry = _manager.dict()
         _lock_registry_count = _manager.dict()
         _lock_cleanup_data = _manager.dict()
@@ -1282,8 +1401,10 @@ async def initialize_pipeline_status():
         if "busy" in pipeline_namespace:
             return
 
-        # Create a shared list object for history_messages
-        history_messages = _manager.list() if _is_multiprocess else []
+        # Create a shared ring buffer for history_messages
+        history_messages = (
+            _manager.PipelineHistory() if _is_multiprocess else PipelineHistory()
+        )
         pipeline_namespace.update(
             {
                 "autoscanned": False,  # Auto-scan started
@@ -1295,7 +1416,9 @@ async def initialize_pipeline_status():
                 "cur_batch": 0,  # Current processing batch
                 "request_pending": False,  # Flag for pending request for processing
                 "latest_message": "",  # Latest message from pipeline processing
-                "history_messages": history_messages,  # 使用共享列表对象
+                "history_messages": history_messages,  # Shared PipelineHistory
+                "extraction_progress": {},  # {doc_id: {"done", "total"}} per chunk
+                "gleaning_stats": {},  # GleaningPolicy.snapshot() of the instance
             }
         )
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
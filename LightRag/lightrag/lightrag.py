@@ -6,7 +6,7 @@ import configparser
 import os
 import time
 import warnings
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
 from functools import partial
 from typing import (
@@ -25,6 +25,10 @@ from lightrag.prompt import PROMPTS
 from lightrag.exceptions import PipelineCancelledException
 from lightrag.constants import (
     DEFAULT_MAX_GLEANING,
+    DEFAULT_GLEANING_MIN_CHUNK_TOKENS,
+    DEFAULT_GLEANING_MAX_ENTITY_DENSITY,
+    DEFAULT_EXTRACTION_PACK_MAX_TOKENS,
+    DEFAULT_EXTRACTION_PACK_CHUNK_MAX_TOKENS,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
     DEFAULT_TOP_K,
     DEFAULT_CHUNK_TOP_K,
@@ -50,6 +54,10 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
+    DEFAULT_CHUNK_CACHE_MAX_ENTRIES,
+    DEFAULT_CHUNK_CACHE_MAX_BYTES,
+    DEFAULT_SHARED_EXTRACTION_CACHE_WORKSPACE,
+    DEFAULT_EXPORT_BATCH_SIZE,
 )
 from lightrag.utils import get_env_value
 
@@ -57,6 +65,8 @@ from lightrag.kg import (
     STORAGES,
     verify_storage_implementation,
 )
+from lightrag.kg.extraction_cache import SharedExtractionCache
+from lightrag.kg.read_cache import ReadThroughKVCache
 
 
 from lightrag.kg.shared_storage import (
@@ -84,6 +94,10 @@ from lightrag.namespace import NameSpace
 from lightrag.operate import (
     chunking_by_token_size,
     chunking_by_token_size_with_table_awareness,
+    ChunkExtractionScheduler,
+    ChunkResultStream,
+    GleaningPolicy,
+    VectorUpsertQueue,
     extract_entities,
     merge_nodes_and_edges,
     kg_query,
@@ -91,6 +105,7 @@ from lightrag.operate import (
     rebuild_knowledge_from_chunks,
 )
 from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.tracing import query_trace
 from lightrag.utils import (
     Tokenizer,
     TiktokenTokenizer,
@@ -148,6 +163,20 @@ class LightRAG:
     doc_status_storage: str = field(default="JsonDocStatusStorage")
     """Storage type for tracking document processing statuses."""
 
+    chunk_cache_max_entries: int = field(
+        default=get_env_value(
+            "CHUNK_CACHE_MAX_ENTRIES", DEFAULT_CHUNK_CACHE_MAX_ENTRIES, int
+        )
+    )
+    """Maximum number of text chunks kept in the in-process read cache. Set to 0 to disable the cache."""
+
+    chunk_cache_max_bytes: int = field(
+        default=get_env_value(
+            "CHUNK_CACHE_MAX_BYTES", DEFAULT_CHUNK_CACHE_MAX_BYTES, int
+        )
+    )
+    """Approximate memory budget in bytes of the text chunk read cache. Set to 0 to disable the cache."""
+
     # Workspace
     # ---
 
@@ -208,6 +237,36 @@ class LightRAG:
     )
     """Maximum number of entity extraction attempts for ambiguous content."""
 
+    gleaning_min_chunk_tokens: int = field(
+        default=get_env_value(
+            "GLEANING_MIN_CHUNK_TOKENS", DEFAULT_GLEANING_MIN_CHUNK_TOKENS, int
+        )
+    )
+    """Chunks with fewer tokens than this are never gleaned. Set to 0 to glean every chunk."""
+
+    gleaning_max_entity_density: float = field(
+        default=get_env_value(
+            "GLEANING_MAX_ENTITY_DENSITY", DEFAULT_GLEANING_MAX_ENTITY_DENSITY, float
+        )
+    )
+    """Skip gleaning a chunk whose first pass already found this many entities per 100 tokens. Set to 0 to disable the check."""
+
+    extraction_pack_max_tokens: int = field(
+        default=get_env_value(
+            "EXTRACTION_PACK_MAX_TOKENS", DEFAULT_EXTRACTION_PACK_MAX_TOKENS, int
+        )
+    )
+    """Token budget of small chunks of a document packed into one extraction request, sharing the system prompt and examples. Set to 0 (default) to extract every chunk on its own."""
+
+    extraction_pack_chunk_max_tokens: int = field(
+        default=get_env_value(
+            "EXTRACTION_PACK_CHUNK_MAX_TOKENS",
+            DEFAULT_EXTRACTION_PACK_CHUNK_MAX_TOKENS,
+            int,
+        )
+    )
+    """Only chunks with at most this many tokens are packed with others."""
+
     force_llm_summary_on_merge: int = field(
         default=get_env_value(
             "FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int
@@ -360,6 +419,20 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    enable_shared_extraction_cache: bool = field(
+        default=get_env_value("ENABLE_SHARED_EXTRACTION_CACHE", False, bool)
+    )
+    """If True, entity extraction answers are also cached by chunk content in a tier shared by all workspaces, consulted before the workspace cache."""
+
+    shared_extraction_cache_workspace: str = field(
+        default=get_env_value(
+            "SHARED_EXTRACTION_CACHE_WORKSPACE",
+            DEFAULT_SHARED_EXTRACTION_CACHE_WORKSPACE,
+            str,
+        )
+    )
+    """Workspace of the shared extraction cache. Instances that should reuse each other's extractions must use the same value and KV storage backend."""
+
     # Extensions
     # ---
 
@@ -558,6 +631,13 @@ class LightRAG:
             workspace=self.workspace,
             embedding_func=self.embedding_func,
         )
+        if self.chunk_cache_max_entries > 0 and self.chunk_cache_max_bytes > 0:
+            # Chunk contents never change for a given id, serve repeated reads from memory
+            self.text_chunks = ReadThroughKVCache(
+                self.text_chunks,
+                max_entries=self.chunk_cache_max_entries,
+                max_bytes=self.chunk_cache_max_bytes,
+            )
 
         self.full_docs: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
             namespace=NameSpace.KV_STORE_FULL_DOCS,
@@ -589,6 +669,31 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        self.chunk_extractions: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
+            namespace=NameSpace.KV_STORE_CHUNK_EXTRACTIONS,
+            workspace=self.workspace,
+            embedding_func=self.embedding_func,
+        )
+
+        # Gleaning decisions and their recorded yield, shared by all batches
+        self.gleaning_policy = GleaningPolicy(
+            self.entity_extract_max_gleaning,
+            min_chunk_tokens=self.gleaning_min_chunk_tokens,
+            max_entity_density=self.gleaning_max_entity_density,
+        )
+
+        self.shared_extraction_cache: SharedExtractionCache | None = None
+        if self.enable_shared_extraction_cache:
+            self.shared_extraction_cache = SharedExtractionCache(
+                self.key_string_value_json_storage_cls(  # type: ignore
+                    namespace=NameSpace.KV_STORE_SHARED_EXTRACTION_CACHE,
+                    workspace=self.shared_extraction_cache_workspace,
+                    embedding_func=self.embedding_func,
+                ),
+                workspace=self.workspace,
+                tokenizer=self.tokenizer,
+            )
+
         self.chunk_entity_relation_graph: BaseGraphStorage = self.graph_storage_cls(  # type: ignore
             namespace=NameSpace.GRAPH_STORE_CHUNK_ENTITY_RELATION,
             workspace=self.workspace,
@@ -650,12 +755,14 @@ class LightRAG:
                 self.full_relations,
                 self.entity_chunks,
                 self.relation_chunks,
+                self.chunk_extractions,
                 self.entities_vdb,
                 self.relationships_vdb,
                 self.chunks_vdb,
                 self.chunk_entity_relation_graph,
                 self.llm_response_cache,
                 self.doc_status,
+                self.shared_extraction_cache and self.shared_extraction_cache.storage,
             ):
                 if storage:
                     # logger.debug(f"Initializing storage: {storage}")
@@ -674,6 +781,7 @@ class LightRAG:
                 ("full_relations", self.full_relations),
                 ("entity_chunks", self.entity_chunks),
                 ("relation_chunks", self.relation_chunks),
+                ("chunk_extractions", self.chunk_extractions),
                 ("entities_vdb", self.entities_vdb),
                 ("relationships_vdb", self.relationships_vdb),
                 ("chunks_vdb", self.chunks_vdb),
@@ -681,6 +789,11 @@ class LightRAG:
                 ("llm_response_cache", self.llm_response_cache),
                 ("doc_status", self.doc_status),
             ]
+            if self.shared_extraction_cache is not None:
+                await self.shared_extraction_cache.flush()
+                storages.append(
+                    ("shared_extraction_cache", self.shared_extraction_cache.storage)
+                )
 
             # Finalize each storage individually to ensure one failure doesn't prevent others from closing
             successful_finalizations = []
@@ -1690,8 +1803,25 @@ class LightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
+                # Create a semaphore to limit the number of concurrent file processing.
+                # A document leaves it once extracted, so the next one can keep the
+                # LLM busy while the rest of its merge finishes.
                 semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # A merge holds its own slot from the start of extraction until it
+                # has finished, so merge tails left behind are bounded as well
+                merge_semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # Chunks of all documents in the batch share these LLM slots fairly
+                chunk_scheduler = ChunkExtractionScheduler(self.llm_model_max_async)
+                # Vector writes of all merges go through one ordered queue per storage
+                vector_max_pending = (
+                    self.embedding_batch_num * self.embedding_func_max_async
+                )
+                entity_upsert_queue = VectorUpsertQueue(
+                    self.entities_vdb, vector_max_pending
+                )
+                relation_upsert_queue = VectorUpsertQueue(
+                    self.relationships_vdb, vector_max_pending
+                )
 
                 async def process_document(
                     doc_id: str,
@@ -1710,6 +1840,9 @@ class LightRAG:
                     processing_start_time = int(time.time())
                     first_stage_tasks = []
                     entity_relation_task = None
+                    merge_task = None
+                    chunk_result_stream = None
+                    chunks = {}
 
                     async with semaphore:
                         nonlocal processed_count
@@ -1743,15 +1876,6 @@ class LightRAG:
                                 pipeline_status["latest_message"] = log_message
                                 pipeline_status["history_messages"].append(log_message)
 
-                                # Prevent memory growth: keep only latest 5000 messages when exceeding 10000
-                                if len(pipeline_status["history_messages"]) > 10000:
-                                    logger.info(
-                                        f"Trimming pipeline history from {len(pipeline_status['history_messages'])} to 5000 messages"
-                                    )
-                                    pipeline_status["history_messages"] = (
-                                        pipeline_status["history_messages"][-5000:]
-                                    )
-
                             # Get document content from full_docs
                             content_data = await self.full_docs.get_by_id(doc_id)
                             if not content_data:
@@ -1833,13 +1957,61 @@ class LightRAG:
                             # Execute first stage tasks
                             await asyncio.gather(*first_stage_tasks)
 
-                            # Stage 2: Process entity relation graph (after text_chunks are saved)
+                            # Stage 2: Process entity relation graph (after text_chunks are saved).
+                            # Extracted chunks are merged in rounds while extraction goes on;
+                            # the bounded stream holds extraction back if merging falls behind.
+                            chunk_result_stream = ChunkResultStream(
+                                self.llm_model_max_async
+                            )
+                            await merge_semaphore.acquire()
+                            merge_task = asyncio.create_task(
+                                merge_nodes_and_edges(
+                                    chunk_results=chunk_result_stream,
+                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
+                                    entity_vdb=self.entities_vdb,
+                                    relationships_vdb=self.relationships_vdb,
+                                    global_config=asdict(self),
+                                    full_entities_storage=self.full_entities,
+                                    full_relations_storage=self.full_relations,
+                                    doc_id=doc_id,
+                                    pipeline_status=pipeline_status,
+                                    pipeline_status_lock=pipeline_status_lock,
+                                    llm_response_cache=self.llm_response_cache,
+                                    entity_chunks_storage=self.entity_chunks,
+                                    relation_chunks_storage=self.relation_chunks,
+                                    current_file_number=current_file_number,
+                                    total_files=total_files,
+                                    file_path=file_path,
+                                    entity_upsert_queue=entity_upsert_queue,
+                                    relation_upsert_queue=relation_upsert_queue,
+                                )
+                            )
+                            merge_task.add_done_callback(
+                                lambda _: merge_semaphore.release()
+                            )
                             entity_relation_task = asyncio.create_task(
                                 self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
+                                    chunks,
+                                    pipeline_status,
+                                    pipeline_status_lock,
+                                    chunk_scheduler=chunk_scheduler,
+                                    result_stream=chunk_result_stream,
                                 )
                             )
-                            chunk_results = await entity_relation_task
+                            await asyncio.wait(
+                                [entity_relation_task, merge_task],
+                                return_when=asyncio.FIRST_COMPLETED,
+                            )
+                            if merge_task.done():
+                                # Merging failed before extraction finished: stop
+                                # extracting and let the merge stage report the error
+                                entity_relation_task.cancel()
+                                await asyncio.gather(
+                                    entity_relation_task, return_exceptions=True
+                                )
+                            else:
+                                await entity_relation_task
+                                await chunk_result_stream.close()
                             file_extraction_stage_ok = True
 
                         except Exception as e:
@@ -1868,13 +2040,19 @@ class LightRAG:
                                     )
 
                             # Cancel tasks that are not yet completed
-                            all_tasks = first_stage_tasks + (
-                                [entity_relation_task] if entity_relation_task else []
-                            )
+                            all_tasks = first_stage_tasks + [
+                                task for task in (entity_relation_task,) if task
+                            ]
                             for task in all_tasks:
                                 if task and not task.done():
                                     task.cancel()
 
+                            # Let the merge finish the rounds it has taken, so the
+                            # entities already in the graph are listed for deletion
+                            if merge_task is not None and not merge_task.done():
+                                await chunk_result_stream.close()
+                                await asyncio.gather(merge_task, return_exceptions=True)
+
                             # Persistent llm cache with error handling
                             if self.llm_response_cache:
                                 try:
@@ -1893,6 +2071,9 @@ class LightRAG:
                                     doc_id: {
                                         "status": DocStatus.FAILED,
                                         "error_msg": str(e),
+                                        # Keep the chunks so the document can be deleted
+                                        "chunks_count": len(chunks),
+                                        "chunks_list": list(chunks.keys()),
                                         "content_summary": status_doc.content_summary,
                                         "content_length": status_doc.content_length,
                                         "created_at": status_doc.created_at,
@@ -1909,130 +2090,114 @@ class LightRAG:
                                 }
                             )
 
-                        # Concurrency is controlled by keyed lock for individual entities and relationships
-                        if file_extraction_stage_ok:
-                            try:
-                                # Check for cancellation before merge
-                                async with pipeline_status_lock:
-                                    if pipeline_status.get(
-                                        "cancellation_requested", False
-                                    ):
-                                        raise PipelineCancelledException(
-                                            "User cancelled"
-                                        )
+                    # Concurrency is controlled by keyed lock for individual entities and relationships
+                    if file_extraction_stage_ok:
+                        try:
+                            # Check for cancellation before merge
+                            async with pipeline_status_lock:
+                                if pipeline_status.get("cancellation_requested", False):
+                                    raise PipelineCancelledException("User cancelled")
 
-                                # Use chunk_results from entity_relation_task
-                                await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
-                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                    entity_vdb=self.entities_vdb,
-                                    relationships_vdb=self.relationships_vdb,
-                                    global_config=asdict(self),
-                                    full_entities_storage=self.full_entities,
-                                    full_relations_storage=self.full_relations,
-                                    doc_id=doc_id,
-                                    pipeline_status=pipeline_status,
-                                    pipeline_status_lock=pipeline_status_lock,
-                                    llm_response_cache=self.llm_response_cache,
-                                    entity_chunks_storage=self.entity_chunks,
-                                    relation_chunks_storage=self.relation_chunks,
-                                    current_file_number=current_file_number,
-                                    total_files=total_files,
-                                    file_path=file_path,
-                                )
+                            # Wait for the rounds still in flight and the final phase
+                            await merge_task
 
-                                # Record processing end time
-                                processing_end_time = int(time.time())
+                            # Record processing end time
+                            processing_end_time = int(time.time())
 
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
+                            await self.doc_status.upsert(
+                                {
+                                    doc_id: {
+                                        "status": DocStatus.PROCESSED,
+                                        "chunks_count": len(chunks),
+                                        "chunks_list": list(chunks.keys()),
+                                        "content_summary": status_doc.content_summary,
+                                        "content_length": status_doc.content_length,
+                                        "created_at": status_doc.created_at,
+                                        "updated_at": datetime.now(
+                                            timezone.utc
+                                        ).isoformat(),
+                                        "file_path": file_path,
+                                        "track_id": status_doc.track_id,  # Preserve existing track_id
+                                        "metadata": {
+                                            "processing_start_time": processing_start_time,
+                                            "processing_end_time": processing_end_time,
+                                        },
                                     }
-                                )
+                                }
+                            )
 
-                                # Call _insert_done after processing each file
-                                await self._insert_done()
+                            # Call _insert_done after processing each file
+                            await self._insert_done()
 
+                            async with pipeline_status_lock:
+                                log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
+                                logger.info(log_message)
+                                pipeline_status["latest_message"] = log_message
+                                pipeline_status["history_messages"].append(log_message)
+
+                        except Exception as e:
+                            # A cancelled pipeline stops the merge at its next check,
+                            # after it has listed what it merged
+                            await asyncio.gather(merge_task, return_exceptions=True)
+
+                            # Check if this is a user cancellation
+                            if isinstance(e, PipelineCancelledException):
+                                # User cancellation - log brief message only, no traceback
+                                error_msg = f"User cancelled during merge {current_file_number}/{total_files}: {file_path}"
+                                logger.warning(error_msg)
                                 async with pipeline_status_lock:
-                                    log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
-                                    logger.info(log_message)
-                                    pipeline_status["latest_message"] = log_message
+                                    pipeline_status["latest_message"] = error_msg
                                     pipeline_status["history_messages"].append(
-                                        log_message
+                                        error_msg
+                                    )
+                            else:
+                                # Other exceptions - log with traceback
+                                logger.error(traceback.format_exc())
+                                error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
+                                logger.error(error_msg)
+                                async with pipeline_status_lock:
+                                    pipeline_status["latest_message"] = error_msg
+                                    pipeline_status["history_messages"].append(
+                                        traceback.format_exc()
+                                    )
+                                    pipeline_status["history_messages"].append(
+                                        error_msg
                                     )
 
-                            except Exception as e:
-                                # Check if this is a user cancellation
-                                if isinstance(e, PipelineCancelledException):
-                                    # User cancellation - log brief message only, no traceback
-                                    error_msg = f"User cancelled during merge {current_file_number}/{total_files}: {file_path}"
-                                    logger.warning(error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = error_msg
-                                        pipeline_status["history_messages"].append(
-                                            error_msg
-                                        )
-                                else:
-                                    # Other exceptions - log with traceback
-                                    logger.error(traceback.format_exc())
-                                    error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
-                                    logger.error(error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = error_msg
-                                        pipeline_status["history_messages"].append(
-                                            traceback.format_exc()
-                                        )
-                                        pipeline_status["history_messages"].append(
-                                            error_msg
-                                        )
-
-                                # Persistent llm cache with error handling
-                                if self.llm_response_cache:
-                                    try:
-                                        await self.llm_response_cache.index_done_callback()
-                                    except Exception as persist_error:
-                                        logger.error(
-                                            f"Failed to persist LLM cache: {persist_error}"
-                                        )
+                            # Persistent llm cache with error handling
+                            if self.llm_response_cache:
+                                try:
+                                    await self.llm_response_cache.index_done_callback()
+                                except Exception as persist_error:
+                                    logger.error(
+                                        f"Failed to persist LLM cache: {persist_error}"
+                                    )
 
-                                # Record processing end time for failed case
-                                processing_end_time = int(time.time())
+                            # Record processing end time for failed case
+                            processing_end_time = int(time.time())
 
-                                # Update document status to failed
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.FAILED,
-                                            "error_msg": str(e),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now().isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
+                            # Update document status to failed
+                            await self.doc_status.upsert(
+                                {
+                                    doc_id: {
+                                        "status": DocStatus.FAILED,
+                                        "error_msg": str(e),
+                                        # Keep the chunks so the document can be deleted
+                                        "chunks_count": len(chunks),
+                                        "chunks_list": list(chunks.keys()),
+                                        "content_summary": status_doc.content_summary,
+                                        "content_length": status_doc.content_length,
+                                        "created_at": status_doc.created_at,
+                                        "updated_at": datetime.now().isoformat(),
+                                        "file_path": file_path,
+                                        "track_id": status_doc.track_id,  # Preserve existing track_id
+                                        "metadata": {
+                                            "processing_start_time": processing_start_time,
+                                            "processing_end_time": processing_end_time,
+                                        },
                                     }
-                                )
+                                }
+                            )
 
                 # Create processing tasks for all documents
                 doc_tasks = []
@@ -2105,7 +2270,12 @@ class LightRAG:
                 pipeline_status["history_messages"].append(log_message)
 
     async def _process_extract_entities(
-        self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
+        self,
+        chunk: dict[str, Any],
+        pipeline_status=None,
+        pipeline_status_lock=None,
+        chunk_scheduler: ChunkExtractionScheduler | None = None,
+        result_stream: ChunkResultStream | None = None,
     ) -> list:
         try:
             chunk_results = await extract_entities(
@@ -2115,6 +2285,11 @@ class LightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                chunk_extractions_storage=self.chunk_extractions,
+                chunk_scheduler=chunk_scheduler,
+                result_stream=result_stream,
+                shared_extraction_cache=self.shared_extraction_cache,
+                gleaning_policy=self.gleaning_policy,
             )
             return chunk_results
         except Exception as e:
@@ -2138,6 +2313,7 @@ class LightRAG:
                 self.full_relations,
                 self.entity_chunks,
                 self.relation_chunks,
+                self.chunk_extractions,
                 self.llm_response_cache,
                 self.entities_vdb,
                 self.relationships_vdb,
@@ -2146,6 +2322,16 @@ class LightRAG:
             ]
             if storage_inst is not None
         ]
+        if self.shared_extraction_cache is not None:
+            # Entries and reuse counters live outside this workspace, fold the
+            # counters in before persisting so they are written in this pass
+            shared_cache = self.shared_extraction_cache
+
+            async def _persist_shared_cache():
+                await shared_cache.flush()
+                await shared_cache.storage.index_done_callback()
+
+            tasks.append(_persist_shared_cache())
         await asyncio.gather(*tasks)
 
         log_message = "In memory DB persist to disk"
@@ -2207,6 +2393,7 @@ class LightRAG:
 
             # Insert entities into knowledge graph
             all_entities_data: list[dict[str, str]] = []
+            graph_nodes: dict[str, dict[str, str]] = {}
             for entity_data in custom_kg.get("entities", []):
                 entity_name = entity_data["entity_name"]
                 entity_type = entity_data.get("entity_type", "UNKNOWN")
@@ -2230,16 +2417,31 @@ class LightRAG:
                     "file_path": file_path,
                     "created_at": int(time.time()),
                 }
-                # Insert node data into the knowledge graph
-                await self.chunk_entity_relation_graph.upsert_node(
-                    entity_name, node_data=node_data
-                )
+                # Collect node data, written to the knowledge graph in one batch
+                graph_nodes[entity_name] = dict(node_data)
                 node_data["entity_name"] = entity_name
                 all_entities_data.append(node_data)
                 update_storage = True
 
+            await self.chunk_entity_relation_graph.upsert_nodes_batch(graph_nodes)
+
             # Insert relationships into knowledge graph
             all_relationships_data: list[dict[str, str]] = []
+            graph_edges: list[tuple[str, str, dict[str, str]]] = []
+            missing_nodes: dict[str, dict[str, str]] = {}
+            relationship_endpoints = {
+                node_id
+                for relationship_data in custom_kg.get("relationships", [])
+                for node_id in (
+                    relationship_data["src_id"],
+                    relationship_data["tgt_id"],
+                )
+            }
+            existing_nodes = set(
+                await self.chunk_entity_relation_graph.get_nodes_batch(
+                    list(relationship_endpoints)
+                )
+            )
             for relationship_data in custom_kg.get("relationships", []):
                 src_id = relationship_data["src_id"]
                 tgt_id = relationship_data["tgt_id"]
@@ -2256,35 +2458,34 @@ class LightRAG:
                         f"Relationship from '{src_id}' to '{tgt_id}' has an UNKNOWN source_id. Please check the source mapping."
                     )
 
-                # Check if nodes exist in the knowledge graph
+                # Placeholder nodes for endpoints missing from the knowledge graph
                 for need_insert_id in [src_id, tgt_id]:
-                    if not (
-                        await self.chunk_entity_relation_graph.has_node(need_insert_id)
+                    if (
+                        need_insert_id not in existing_nodes
+                        and need_insert_id not in missing_nodes
                     ):
-                        await self.chunk_entity_relation_graph.upsert_node(
-                            need_insert_id,
-                            node_data={
-                                "entity_id": need_insert_id,
-                                "source_id": source_id,
-                                "description": "UNKNOWN",
-                                "entity_type": "UNKNOWN",
-                                "file_path": file_path,
-                                "created_at": int(time.time()),
-                            },
-                        )
+                        missing_nodes[need_insert_id] = {
+                            "entity_id": need_insert_id,
+                            "source_id": source_id,
+                            "description": "UNKNOWN",
+                            "entity_type": "UNKNOWN",
+                            "file_path": file_path,
+                            "created_at": int(time.time()),
+                        }
 
-                # Insert edge into the knowledge graph
-                await self.chunk_entity_relation_graph.upsert_edge(
-                    src_id,
-                    tgt_id,
-                    edge_data={
-                        "weight": weight,
-                        "description": description,
-                        "keywords": keywords,
-                        "source_id": source_id,
-                        "file_path": file_path,
-                        "created_at": int(time.time()),
-                    },
+                graph_edges.append(
+                    (
+                        src_id,
+                        tgt_id,
+                        {
+                            "weight": weight,
+                            "description": description,
+                            "keywords": keywords,
+                            "source_id": source_id,
+                            "file_path": file_path,
+                            "created_at": int(time.time()),
+                        },
+                    )
                 )
 
                 edge_data: dict[str, str] = {
@@ -2300,6 +2501,10 @@ class LightRAG:
                 all_relationships_data.append(edge_data)
                 update_storage = True
 
+            # Edges require both end nodes, so placeholders are written first
+            await self.chunk_entity_relation_graph.upsert_nodes_batch(missing_nodes)
+            await self.chunk_entity_relation_graph.upsert_edges_batch(graph_edges)
+
             # Insert entities into vector storage with consistent format
             data_for_vdb = {
                 compute_mdhash_id(dp["entity_name"], prefix="ent-"): {
@@ -2523,8 +2728,54 @@ class LightRAG:
             The function adapts to the new data format from convert_to_user_format where
             actual data is nested under the 'data' field, with 'status' and 'message'
             fields at the top level.
+
+            metadata["timings"] holds the per-stage durations of this query,
+            see lightrag.tracing.QueryTrace.to_dict.
         """
+        with query_trace() as trace:
+            final_data = await self._aquery_data(query, param)
+        final_data.setdefault("metadata", {})["timings"] = trace.to_dict()
+        return final_data
+
+    async def _resolve_accessible_chunk_ids(
+        self, accessible_doc_ids: set[str]
+    ) -> set[str] | None:
+        """Collect the chunk IDs of the accessible documents from doc status.
+
+        Returns None when any document has no recorded chunks_list, in which
+        case entity and relation searches fall back to post-retrieval filtering.
+        """
+        if not accessible_doc_ids:
+            return set()
+        statuses = await self.doc_status.get_by_ids(list(accessible_doc_ids))
+        chunk_ids: set[str] = set()
+        for status in statuses:
+            if status is None:
+                # Unknown documents contribute no chunks
+                continue
+            chunks_list = status.get("chunks_list")
+            if chunks_list is None:
+                return None
+            chunk_ids.update(chunks_list)
+        return chunk_ids
+
+    async def _scoped_param(self, param: QueryParam) -> QueryParam:
+        """Return param with accessible_chunk_ids resolved for scoped queries"""
+        if param.accessible_doc_ids is None or param.accessible_chunk_ids is not None:
+            return param
+        chunk_ids = await self._resolve_accessible_chunk_ids(param.accessible_doc_ids)
+        if chunk_ids is None:
+            return param
+        return replace(param, accessible_chunk_ids=chunk_ids)
+
+    async def _aquery_data(
+        self,
+        query: str,
+        param: QueryParam = QueryParam(),
+    ) -> dict[str, Any]:
+        """Retrieval part of aquery_data, run inside its query trace"""
         global_config = asdict(self)
+        param = await self._scoped_param(param)
 
         # Create a copy of param to avoid modifying the original
         data_param = QueryParam(
@@ -2546,6 +2797,7 @@ class LightRAG:
             user_prompt=param.user_prompt,
             enable_rerank=param.enable_rerank,
             accessible_doc_ids=param.accessible_doc_ids,
+            accessible_chunk_ids=param.accessible_chunk_ids,
         )
 
         query_result = None
@@ -2640,8 +2892,23 @@ class LightRAG:
 
         Returns:
             dict[str, Any]: Complete response with structured data and LLM response.
+                metadata["timings"] holds the per-stage durations of this query;
+                for streaming responses the llm stage ends when the stream starts.
         """
+        with query_trace() as trace:
+            result = await self._aquery_llm(query, param, system_prompt)
+        result.setdefault("metadata", {})["timings"] = trace.to_dict()
+        return result
+
+    async def _aquery_llm(
+        self,
+        query: str,
+        param: QueryParam = QueryParam(),
+        system_prompt: str | None = None,
+    ) -> dict[str, Any]:
+        """Query and generation part of aquery_llm, run inside its query trace"""
         logger.debug(f"[aquery_llm] Query param: {param}")
+        param = await self._scoped_param(param)
 
         global_config = asdict(self)
 
@@ -3305,6 +3572,7 @@ class LightRAG:
                     try:
                         await self.chunks_vdb.delete(chunk_ids)
                         await self.text_chunks.delete(chunk_ids)
+                        await self.chunk_extractions.delete(chunk_ids)
 
                         async with pipeline_status_lock:
                             log_message = f"Successfully deleted {len(chunk_ids)} chunks from storage"
@@ -3464,6 +3732,7 @@ class LightRAG:
                         pipeline_status_lock=pipeline_status_lock,
                         entity_chunks_storage=self.entity_chunks,
                         relation_chunks_storage=self.relation_chunks,
+                        chunk_extractions_storage=self.chunk_extractions,
                     )
 
                 except Exception as e:
@@ -3870,23 +4139,58 @@ class LightRAG:
             )
         )
 
+    async def amerge_entities_batch(
+        self, merges: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Asynchronously apply several entity merges in one bulk pass.
+
+        Args:
+            merges: List of merges, each a dict with "source_entities",
+                "target_entity" and optional "target_entity_data", as for
+                amerge_entities. An entity may only appear in one merge.
+
+        Returns:
+            List with the merged entity information of each target
+        """
+        from lightrag.utils_graph import amerge_entities_batch
+
+        return await amerge_entities_batch(
+            self.chunk_entity_relation_graph,
+            self.entities_vdb,
+            self.relationships_vdb,
+            merges,
+            self.entity_chunks,
+            self.relation_chunks,
+        )
+
+    def merge_entities_batch(
+        self, merges: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(self.amerge_entities_batch(merges))
+
     async def aexport_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "jsonl", "parquet", "excel", "md", "txt"] = "csv",
         include_vector_data: bool = False,
+        progress_callback: Callable[[str, int, int], None] | None = None,
     ) -> None:
         """
         Asynchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
-                - csv: Comma-separated values file
+            file_format: Output format - "csv", "jsonl", "parquet", "excel", "md", "txt".
+                - csv: Comma-separated values file (streamed)
+                - jsonl: JSON Lines file (streamed)
+                - parquet: One Parquet file per table (streamed)
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
                 - table: Print formatted tables to console
             include_vector_data: Whether to include data from the vector database.
+            progress_callback: Optional callable(stage, processed, total) reporting
+                progress of streamed formats.
         """
         from lightrag.utils import aexport_data as utils_aexport_data
 
@@ -3897,25 +4201,31 @@ class LightRAG:
             output_path,
             file_format,
             include_vector_data,
+            progress_callback=progress_callback,
         )
 
     def export_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "jsonl", "parquet", "excel", "md", "txt"] = "csv",
         include_vector_data: bool = False,
+        progress_callback: Callable[[str, int, int], None] | None = None,
     ) -> None:
         """
         Synchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
-                - csv: Comma-separated values file
+            file_format: Output format - "csv", "jsonl", "parquet", "excel", "md", "txt".
+                - csv: Comma-separated values file (streamed)
+                - jsonl: JSON Lines file (streamed)
+                - parquet: One Parquet file per table (streamed)
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
                 - table: Print formatted tables to console
             include_vector_data: Whether to include data from the vector database.
+            progress_callback: Optional callable(stage, processed, total) reporting
+                progress of streamed formats.
         """
         try:
             loop = asyncio.get_event_loop()
@@ -3924,5 +4234,146 @@ class LightRAG:
             asyncio.set_event_loop(loop)
 
         loop.run_until_complete(
-            self.aexport_data(output_path, file_format, include_vector_data)
+            self.aexport_data(
+                output_path,
+                file_format,
+                include_vector_data,
+                progress_callback=progress_callback,
+            )
+        )
+
+    def _workspace_storages(self) -> dict[str, Any]:
+        from lightrag.utils_export import WORKSPACE_SECTIONS
+
+        return {attr: getattr(self, attr, None) for _, attr, _, _ in WORKSPACE_SECTIONS}
+
+    async def aexport_workspace(
+        self,
+        output_dir: str,
+        batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Export every namespace of this workspace to Parquet files.
+
+        Documents, chunks, extraction records and cache, entity/relation chunk
+        lists, the graph, the three vector stores (with their embeddings) and
+        doc_status are each written to "<output_dir>/<namespace>.parquet" in
+        streamed batches, next to a manifest.json. The result can be loaded
+        into an instance with any storage backends by aimport_workspace.
+
+        Args:
+            output_dir: Directory to write the export into
+            batch_size: Number of records read and written per batch
+            progress_callback: Optional callable(namespace, processed, total)
+
+        Returns:
+            The export manifest with the number of records per namespace
+        """
+        from lightrag.utils_export import aexport_workspace
+
+        return await aexport_workspace(
+            self._workspace_storages(),
+            output_dir,
+            batch_size=batch_size,
+            progress_callback=progress_callback,
+            manifest_extra={
+                "workspace": self.workspace,
+                "embedding_dim": self.embedding_func.embedding_dim,
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+
+    def export_workspace(
+        self,
+        output_dir: str,
+        batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+    ) -> dict[str, Any]:
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(
+            self.aexport_workspace(
+                output_dir, batch_size, progress_callback=progress_callback
+            )
+        )
+
+    async def aimport_workspace(
+        self,
+        input_dir: str,
+        batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+        reuse_vectors: bool = True,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+    ) -> dict[str, int]:
+        """
+        Load a workspace exported by aexport_workspace into this instance.
+
+        Records are upserted through this instance's storages in batches, so
+        an export from JSON storages can be imported into PostgreSQL, MongoDB
+        or any other configured backend. Exported embeddings are stored as is
+        unless reuse_vectors is False or the embedding dimension differs.
+        The pipeline must not be processing documents during the import.
+
+        Args:
+            input_dir: Directory holding the export
+            batch_size: Number of records written per batch
+            reuse_vectors: Whether to reuse the exported embeddings
+            progress_callback: Optional callable(namespace, processed, total)
+
+        Returns:
+            Number of records imported per namespace
+        """
+        from lightrag.utils_export import aimport_workspace
+
+        return await aimport_workspace(
+            self._workspace_storages(),
+            input_dir,
+            batch_size=batch_size,
+            reuse_vectors=reuse_vectors,
+            progress_callback=progress_callback,
+        )
+
+    def import_workspace(
+        self,
+        input_dir: str,
+        batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+        reuse_vectors: bool = True,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+    ) -> dict[str, int]:
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(
+            self.aimport_workspace(
+                input_dir,
+                batch_size,
+                reuse_vectors,
+                progress_callback=progress_callback,
+            )
+        )
+
+    async def aget_shared_extraction_cache_report(
+        self, workspaces: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Report reuse and savings of the shared extraction cache.
+
+        Args:
+            workspaces: Restrict the report to these workspaces, defaults to
+                every workspace that has used the shared cache
+
+        Returns:
+            Per-workspace and total counts of cache hits (hits served to a
+            workspace other than the one that stored the entry are counted
+            again as cross_workspace_hits), stored entries and estimated LLM
+            tokens saved. {"enabled": False} when the shared cache is off.
+        """
+        if self.shared_extraction_cache is None:
+            return {"enabled": False}
+        report = await self.shared_extraction_cache.report(workspaces)
+        return {"enabled": True, **report}
+
+    def get_shared_extraction_cache_report(
+        self, workspaces: list[str] | None = None
+    ) -> dict[str, Any]:
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(
+            self.aget_shared_extraction_cache_report(workspaces)
         )
@@ -12,6 +12,8 @@ class NameSpace:
     KV_STORE_FULL_RELATIONS = "full_relations"
     KV_STORE_ENTITY_CHUNKS = "entity_chunks"
     KV_STORE_RELATION_CHUNKS = "relation_chunks"
+    KV_STORE_CHUNK_EXTRACTIONS = "chunk_extractions"
+    KV_STORE_SHARED_EXTRACTION_CACHE = "shared_extraction_cache"
 
     VECTOR_STORE_ENTITIES = "entities"
     VECTOR_STORE_RELATIONSHIPS = "relationships"
@@ -6,8 +6,9 @@ import asyncio
 import json
 import re
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
-from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, overload, Literal, Sequence
+from collections import Counter, defaultdict, deque
+from contextlib import asynccontextmanager
 
 from lightrag.exceptions import PipelineCancelledException
 from lightrag.utils import (
@@ -18,8 +19,10 @@ from lightrag.utils import (
     sanitize_and_normalize_extracted_text,
     pack_user_ass_to_openai_messages,
     split_string_by_multi_markers,
+    split_graph_field,
     truncate_list_by_token_size,
     compute_args_hash,
+    llm_cache_key,
     handle_cache,
     save_to_cache,
     CacheData,
@@ -46,6 +49,7 @@ from lightrag.base import (
     QueryParam,
     QueryResult,
     QueryContextResult,
+    VectorScopeFilter,
 )
 from lightrag.prompt import PROMPTS
 from lightrag.constants import (
@@ -63,7 +67,12 @@ from lightrag.constants import (
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
 )
+from lightrag.kg.extraction_cache import (
+    SharedExtractionCache,
+    extraction_prompt_version,
+)
 from lightrag.kg.shared_storage import get_storage_keyed_lock
+from lightrag.tracing import trace_span, traced
 import time
 from dotenv import load_dotenv
 
@@ -94,6 +103,42 @@ def _truncate_entity_identifier(
     return display_value
 
 
+def _token_offsets(
+    tokenizer: Tokenizer, content: str, tokens: list[int]
+) -> Sequence[int] | None:
+    """Character offsets of the token boundaries, None if the tokenizer has none."""
+    token_offsets = getattr(tokenizer, "token_offsets", None)
+    if token_offsets is None:
+        return None
+    return token_offsets(content, tokens)
+
+
+def _split_token_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    tokens: list[int],
+    overlap_token_size: int,
+    max_token_size: int,
+) -> list[tuple[int, str]]:
+    """Cut ``tokens`` into overlapping windows, returning (token count, text) pairs.
+
+    Window text is sliced out of ``content`` through the token offsets, so
+    overlapping tokens are never decoded twice. Windows whose boundaries are
+    unknown or fall inside a character are decoded, which keeps the text
+    identical to ``tokenizer.decode`` in every case.
+    """
+    offsets = _token_offsets(tokenizer, content, tokens)
+    windows: list[tuple[int, str]] = []
+    for start in range(0, len(tokens), max_token_size - overlap_token_size):
+        end = min(start + max_token_size, len(tokens))
+        if offsets is not None and offsets[start] >= 0 and offsets[end] >= 0:
+            text = content[offsets[start] : offsets[end]]
+        else:
+            text = tokenizer.decode(tokens[start:end])
+        windows.append((end - start, text))
+    return windows
+
+
 def chunking_by_token_size(
     tokenizer: Tokenizer,
     content: str,
@@ -102,51 +147,41 @@ def chunking_by_token_size(
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
 ) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
+        # Each piece is encoded on its own: BPE merges across the separator
+        # would otherwise change the token counts of neighbouring pieces
+        new_chunks: list[tuple[int, str]] = []
+        for chunk in content.split(split_by_character):
+            _tokens = tokenizer.encode(chunk)
+            if not split_by_character_only and len(_tokens) > max_token_size:
+                new_chunks.extend(
+                    _split_token_windows(
+                        tokenizer,
+                        chunk,
+                        _tokens,
+                        overlap_token_size,
+                        max_token_size,
+                    )
+                )
+            else:
                 new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+        new_chunks = _split_token_windows(
+            tokenizer,
+            content,
+            tokenizer.encode(content),
+            overlap_token_size,
+            max_token_size,
+        )
+
+    return [
+        {
+            "tokens": _len,
+            "content": chunk.strip(),
+            "chunk_order_index": index,
+        }
+        for index, (_len, chunk) in enumerate(new_chunks)
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -869,6 +904,272 @@ async def _handle_single_relationship_extraction(
         return None
 
 
+class _GraphWriteBatcher:
+    """Group concurrent graph upserts into batch writes
+
+    Merge tasks keep calling upsert_node/upsert_edge and awaiting them while
+    holding their keyed locks, so locking semantics are unchanged. Writes that
+    arrive while a batch is being written are collected and sent together
+    with upsert_nodes_batch/upsert_edges_batch once it completes (group
+    commit). Nodes are always written before edges, because edge upserts
+    require both end nodes to exist. Every other attribute is forwarded to
+    the wrapped storage.
+    """
+
+    def __init__(self, graph: BaseGraphStorage):
+        self._graph = graph
+        self._nodes: dict[str, tuple[dict, list[asyncio.Future]]] = {}
+        self._edges: dict[tuple[str, str], tuple[dict, list[asyncio.Future]]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._graph, name)
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        # A later write of the same node within a batch replaces the earlier one
+        previous = self._nodes.get(node_id)
+        waiters = previous[1] if previous else []
+        waiters.append(future)
+        self._nodes[node_id] = (node_data, waiters)
+        self._schedule_flush()
+        await future
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        future = asyncio.get_running_loop().create_future()
+        key = (source_node_id, target_node_id)
+        previous = self._edges.get(key)
+        waiters = previous[1] if previous else []
+        waiters.append(future)
+        self._edges[key] = (edge_data, waiters)
+        self._schedule_flush()
+        await future
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    @staticmethod
+    def _resolve(waiters: list[asyncio.Future], error: BaseException | None) -> None:
+        for future in waiters:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def _write_nodes(self, nodes: dict) -> None:
+        try:
+            await self._graph.upsert_nodes_batch(
+                {node_id: data for node_id, (data, _) in nodes.items()}
+            )
+        except Exception:
+            # Retry one by one so only the offending node fails its caller
+            for node_id, (data, waiters) in nodes.items():
+                try:
+                    await self._graph.upsert_node(node_id, data)
+                except Exception as e:
+                    self._resolve(waiters, e)
+                else:
+                    self._resolve(waiters, None)
+        else:
+            for _, waiters in nodes.values():
+                self._resolve(waiters, None)
+
+    async def _write_edges(self, edges: dict) -> None:
+        try:
+            await self._graph.upsert_edges_batch(
+                [(src, tgt, data) for (src, tgt), (data, _) in edges.items()]
+            )
+        except Exception:
+            # Retry one by one so only the offending edge fails its caller
+            for (src, tgt), (data, waiters) in edges.items():
+                try:
+                    await self._graph.upsert_edge(src, tgt, data)
+                except Exception as e:
+                    self._resolve(waiters, e)
+                else:
+                    self._resolve(waiters, None)
+        else:
+            for _, waiters in edges.values():
+                self._resolve(waiters, None)
+
+    async def _flush(self) -> None:
+        # Let every task that is ready to write enqueue before the first batch
+        await asyncio.sleep(0)
+        while self._nodes or self._edges:
+            if self._nodes:
+                nodes, self._nodes = self._nodes, {}
+                await self._write_nodes(nodes)
+            else:
+                edges, self._edges = self._edges, {}
+                await self._write_edges(edges)
+
+
+class VectorUpsertQueue:
+    """Ordered background writes to one vector storage
+
+    Merge tasks hand their vector upserts and deletes to the queue and move
+    on to the next entity instead of waiting for the embedding call, so LLM
+    summaries and embeddings run side by side. A single writer task applies
+    the operations in submission order and folds consecutive upserts into one
+    ``upsert`` call, so two documents writing the same record cannot be
+    reordered. Submitters block once ``max_pending`` operations are waiting.
+    """
+
+    def __init__(self, storage: BaseVectorStorage, max_pending: int):
+        self.storage = storage
+        self._slots = asyncio.Semaphore(max(1, max_pending))
+        self._ops: deque[tuple[str, Any, asyncio.Future]] = deque()
+        self._writer: asyncio.Task | None = None
+
+    async def submit(self, kind: str, payload: Any) -> asyncio.Future:
+        """Queue an ``"upsert"`` (dict) or ``"delete"`` (id list) operation
+
+        Returns a future that resolves once the operation has been written.
+        """
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().create_future()
+        self._ops.append((kind, payload, future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._drain())
+        return future
+
+    def writer(self) -> "_VectorWriteHandle":
+        return _VectorWriteHandle(self)
+
+    async def _upsert(self, data: dict[str, Any], max_retries: int) -> None:
+        await safe_vdb_operation_with_exception(
+            operation=lambda: self.storage.upsert(data),
+            operation_name="batch_upsert",
+            entity_name=f"{len(data)} records",
+            max_retries=max_retries,
+            retry_delay=0.2,
+        )
+
+    async def _drain(self) -> None:
+        while self._ops:
+            kind, payload, future = self._ops.popleft()
+            entries = [(payload, future)]
+            errors: dict[asyncio.Future, Exception] = {}
+            if kind == "upsert":
+                while self._ops and self._ops[0][0] == "upsert":
+                    _, more, next_future = self._ops.popleft()
+                    entries.append((more, next_future))
+                batch = {}
+                for data, _ in entries:
+                    batch.update(data)
+                try:
+                    await self._upsert(batch, max_retries=3)
+                except Exception as e:
+                    if len(entries) == 1:
+                        errors[future] = e
+                    else:
+                        # Write each submission on its own, in order, so a bad
+                        # record only fails the merge that wrote it
+                        logger.warning(
+                            f"Vector upsert of {len(batch)} records from {len(entries)} writes failed, retrying them one by one"
+                        )
+                        for data, entry_future in entries:
+                            try:
+                                await self._upsert(data, max_retries=1)
+                            except Exception as entry_error:
+                                errors[entry_future] = entry_error
+            else:
+                try:
+                    await self.storage.delete(payload)
+                except Exception as e:
+                    logger.warning(f"Could not delete vector records {payload}: {e}")
+
+            for _, entry_future in entries:
+                self._slots.release()
+                if entry_future.done():
+                    continue
+                if entry_future in errors:
+                    entry_future.set_exception(errors[entry_future])
+                else:
+                    entry_future.set_result(None)
+
+
+class _VectorWriteHandle:
+    """View of a VectorUpsertQueue used by one merge
+
+    upsert/delete return as soon as the write is queued; flush waits for
+    the writes made through this handle and raises the first failure. Every
+    other attribute is forwarded to the wrapped storage.
+    """
+
+    def __init__(self, queue: VectorUpsertQueue):
+        self._queue = queue
+        self._futures: list[asyncio.Future] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._queue.storage, name)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        self._futures.append(await self._queue.submit("upsert", data))
+
+    async def delete(self, ids: list[str]) -> None:
+        self._futures.append(await self._queue.submit("delete", ids))
+
+    async def flush(self) -> None:
+        futures, self._futures = self._futures, []
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+
+class ChunkResultStream:
+    """Bounded hand-off of chunk extraction results to an incremental merge
+
+    extract_entities puts each chunk's (nodes, edges) as soon as it is
+    extracted and merge_nodes_and_edges takes whatever has arrived as one
+    merge round. put blocks while ``maxsize`` results are waiting, and raises
+    once the merge side has failed so extraction stops early.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = max(1, maxsize)
+        self._items: deque[tuple[dict, dict]] = deque()
+        self._closed = False
+        self._error: BaseException | None = None
+        self._changed = asyncio.Condition()
+
+    async def put(self, item: tuple[dict, dict]) -> None:
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: len(self._items) < self._maxsize or self._error is not None
+            )
+            if self._error is not None:
+                raise RuntimeError("Merge stage stopped") from self._error
+            self._items.append(item)
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        """Signal that no more results will be put"""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    async def abort(self, error: BaseException) -> None:
+        async with self._changed:
+            self._error = error
+            self._changed.notify_all()
+
+    async def get_batch(self) -> list[tuple[dict, dict]]:
+        """Wait for results and take all of them; empty once closed and drained"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._items or self._closed)
+            batch = list(self._items)
+            self._items.clear()
+            self._changed.notify_all()
+            return batch
+
+
 async def rebuild_knowledge_from_chunks(
     entities_to_rebuild: dict[str, list[str]],
     relationships_to_rebuild: dict[tuple[str, str], list[str]],
@@ -882,12 +1183,15 @@ async def rebuild_knowledge_from_chunks(
     pipeline_status_lock=None,
     entity_chunks_storage: BaseKVStorage | None = None,
     relation_chunks_storage: BaseKVStorage | None = None,
+    chunk_extractions_storage: BaseKVStorage | None = None,
 ) -> None:
     """Rebuild entity and relationship descriptions from cached extraction results with parallel processing
 
     This method uses cached LLM extraction results instead of calling LLM again,
     following the same approach as the insert process. Now with parallel processing
     controlled by llm_model_max_async and using get_storage_keyed_lock for data consistency.
+    Chunks with a persisted extraction record are loaded directly from
+    chunk_extractions_storage; only the remaining chunks re-parse the raw LLM cache.
 
     Args:
         entities_to_rebuild: Dict mapping entity_name -> list of remaining chunk_ids
@@ -902,6 +1206,7 @@ async def rebuild_knowledge_from_chunks(
         pipeline_status_lock: Lock for pipeline status
         entity_chunks_storage: KV storage maintaining full chunk IDs per entity
         relation_chunks_storage: KV storage maintaining full chunk IDs per relation
+        chunk_extractions_storage: KV storage with parsed extraction results per chunk
     """
     if not entities_to_rebuild and not relationships_to_rebuild:
         return
@@ -920,15 +1225,31 @@ async def rebuild_knowledge_from_chunks(
             pipeline_status["latest_message"] = status_message
             pipeline_status["history_messages"].append(status_message)
 
-    # Get cached extraction results for these chunks using storage
+    # Process cached results to get entities and relationships for each chunk
+    chunk_entities = {}  # chunk_id -> {entity_name: [entity_data]}
+    chunk_relationships = {}  # chunk_id -> {(src, tgt): [relationship_data]}
+
+    # Use persisted extraction results first, they need no parsing
+    if chunk_extractions_storage is not None:
+        chunk_entities, chunk_relationships = await _get_stored_chunk_extractions(
+            chunk_extractions_storage, all_referenced_chunk_ids
+        )
+        logger.info(
+            f"Loaded {len(chunk_entities)} of {len(all_referenced_chunk_ids)} chunk extractions from storage"
+        )
+
+    # Get cached extraction results for the remaining chunks using storage
     # cached_results： chunk_id -> [list of (extraction_result, create_time) from LLM cache sorted by create_time of the first extraction_result]
-    cached_results = await _get_cached_extraction_results(
-        llm_response_cache,
-        all_referenced_chunk_ids,
-        text_chunks_storage=text_chunks_storage,
-    )
+    remaining_chunk_ids = all_referenced_chunk_ids - chunk_entities.keys()
+    cached_results = {}
+    if remaining_chunk_ids:
+        cached_results = await _get_cached_extraction_results(
+            llm_response_cache,
+            remaining_chunk_ids,
+            text_chunks_storage=text_chunks_storage,
+        )
 
-    if not cached_results:
+    if not cached_results and not chunk_entities:
         status_message = "No cached extraction results found, cannot rebuild"
         logger.warning(status_message)
         if pipeline_status is not None and pipeline_status_lock is not None:
@@ -937,10 +1258,6 @@ async def rebuild_knowledge_from_chunks(
                 pipeline_status["history_messages"].append(status_message)
         return
 
-    # Process cached results to get entities and relationships for each chunk
-    chunk_entities = {}  # chunk_id -> {entity_name: [entity_data]}
-    chunk_relationships = {}  # chunk_id -> {(src, tgt): [relationship_data]}
-
     for chunk_id, results in cached_results.items():
         try:
             # Handle multiple extraction results per chunk
@@ -1017,6 +1334,8 @@ async def rebuild_knowledge_from_chunks(
     # Get max async tasks limit from global_config for semaphore control
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
+    # Graph upserts of concurrent rebuild tasks are written in batches
+    graph_writer = _GraphWriteBatcher(knowledge_graph_inst)
 
     # Counters for tracking progress
     rebuilt_entities_count = 0
@@ -1034,7 +1353,7 @@ async def rebuild_knowledge_from_chunks(
             ):
                 try:
                     await _rebuild_single_entity(
-                        knowledge_graph_inst=knowledge_graph_inst,
+                        knowledge_graph_inst=graph_writer,
                         entities_vdb=entities_vdb,
                         entity_name=entity_name,
                         chunk_ids=chunk_ids,
@@ -1067,7 +1386,7 @@ async def rebuild_knowledge_from_chunks(
             ):
                 try:
                     await _rebuild_single_relationship(
-                        knowledge_graph_inst=knowledge_graph_inst,
+                        knowledge_graph_inst=graph_writer,
                         relationships_vdb=relationships_vdb,
                         entities_vdb=entities_vdb,
                         src=src,
@@ -1246,6 +1565,38 @@ async def _get_cached_extraction_results(
     return sorted_cached_results  # each item: list(extraction_result, create_time)
 
 
+def _split_packed_extraction(
+    result: str,
+    section_count: int,
+    section_delimiter: str,
+    completion_delimiter: str,
+) -> dict[int, str]:
+    """Split the answer to a packed extraction prompt into per-section answers
+
+    Args:
+        result: LLM answer with a ``{section_delimiter}<n>`` line before each section
+        section_count: Number of sections sent in the prompt
+        section_delimiter: Marker starting a section
+        completion_delimiter: Completion marker, re-added to every section
+    Returns:
+        dict: {section_number: answer} shaped like single-chunk answers. Sections
+            whose marker is missing or out of range are left out.
+    """
+    marker = re.compile(
+        rf"^[ \t]*{re.escape(section_delimiter)}[ \t]*(\d+)[ \t]*$", re.MULTILINE
+    )
+    matches = list(marker.finditer(result))
+    sections: dict[int, str] = {}
+    for i, match in enumerate(matches):
+        number = int(match.group(1))
+        if not 1 <= number <= section_count or number in sections:
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(result)
+        body = result[match.end() : end].replace(completion_delimiter, "").strip()
+        sections[number] = f"{body}\n{completion_delimiter}".lstrip()
+    return sections
+
+
 async def _process_extraction_result(
     result: str,
     chunk_key: str,
@@ -1371,6 +1722,127 @@ async def _process_extraction_result(
     return dict(maybe_nodes), dict(maybe_edges)
 
 
+# Bump when the layout of persisted chunk extraction records changes; records
+# with another version are ignored and rebuilt from the LLM cache instead.
+_CHUNK_EXTRACTION_FORMAT = 1
+
+
+def _pack_chunk_extraction(
+    maybe_nodes: dict[str, list[dict]],
+    maybe_edges: dict[tuple[str, str], list[dict]],
+    file_path: str,
+) -> dict[str, Any]:
+    """Encode the parsed extraction result of one chunk for the chunk_extractions storage
+
+    source_id is implied by the record key and file_path is shared by all rows,
+    so entities and relations are stored as positional rows:
+    entities: [entity_name, entity_type, description, timestamp]
+    relations: [src_id, tgt_id, weight, description, keywords, timestamp]
+    """
+    entities = [
+        [
+            entity["entity_name"],
+            entity["entity_type"],
+            entity["description"],
+            entity.get("timestamp", 0),
+        ]
+        for entity_list in maybe_nodes.values()
+        for entity in entity_list
+    ]
+    relations = [
+        [
+            edge["src_id"],
+            edge["tgt_id"],
+            edge["weight"],
+            edge["description"],
+            edge["keywords"],
+            edge.get("timestamp", 0),
+        ]
+        for edge_list in maybe_edges.values()
+        for edge in edge_list
+    ]
+    return {
+        "format": _CHUNK_EXTRACTION_FORMAT,
+        "file_path": file_path,
+        "entities": entities,
+        "relations": relations,
+    }
+
+
+def _unpack_chunk_extraction(
+    chunk_id: str, record: dict[str, Any]
+) -> tuple[dict, dict]:
+    """Decode a chunk_extractions record into the dicts produced by _process_extraction_result"""
+    file_path = record.get("file_path") or "unknown_source"
+    maybe_nodes = defaultdict(list)
+    maybe_edges = defaultdict(list)
+
+    for entity_name, entity_type, description, timestamp in record.get("entities", []):
+        maybe_nodes[entity_name].append(
+            dict(
+                entity_name=entity_name,
+                entity_type=entity_type,
+                description=description,
+                source_id=chunk_id,
+                file_path=file_path,
+                timestamp=timestamp,
+            )
+        )
+
+    for src_id, tgt_id, weight, description, keywords, timestamp in record.get(
+        "relations", []
+    ):
+        maybe_edges[(src_id, tgt_id)].append(
+            dict(
+                src_id=src_id,
+                tgt_id=tgt_id,
+                weight=weight,
+                description=description,
+                keywords=keywords,
+                source_id=chunk_id,
+                file_path=file_path,
+                timestamp=timestamp,
+            )
+        )
+
+    return maybe_nodes, maybe_edges
+
+
+async def _get_stored_chunk_extractions(
+    chunk_extractions_storage: BaseKVStorage,
+    chunk_ids: set[str],
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Load persisted extraction results for the given chunks
+
+    Chunks without a usable record (extracted before records were persisted,
+    or stored with another format version) are left out of the result and
+    must be rebuilt from the LLM cache.
+
+    Returns:
+        Tuple of (chunk_entities, chunk_relationships) keyed by chunk_id
+    """
+    chunk_entities = {}
+    chunk_relationships = {}
+
+    chunk_id_list = list(chunk_ids)
+    records = await chunk_extractions_storage.get_by_ids(chunk_id_list)
+    for chunk_id, record in zip(chunk_id_list, records):
+        if (
+            not isinstance(record, dict)
+            or record.get("format") != _CHUNK_EXTRACTION_FORMAT
+        ):
+            continue
+        try:
+            entities, relationships = _unpack_chunk_extraction(chunk_id, record)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed extraction record for {chunk_id}: {e}")
+            continue
+        chunk_entities[chunk_id] = entities
+        chunk_relationships[chunk_id] = relationships
+
+    return chunk_entities, chunk_relationships
+
+
 async def _rebuild_from_extraction_result(
     text_chunks_storage: BaseKVStorage,
     extraction_result: str,
@@ -2735,7 +3207,7 @@ async def _merge_edges_then_upsert(
 
 
 async def merge_nodes_and_edges(
-    chunk_results: list,
+    chunk_results: list | ChunkResultStream,
     knowledge_graph_inst: BaseGraphStorage,
     entity_vdb: BaseVectorStorage,
     relationships_vdb: BaseVectorStorage,
@@ -2751,6 +3223,8 @@ async def merge_nodes_and_edges(
     current_file_number: int = 0,
     total_files: int = 0,
     file_path: str = "unknown_source",
+    entity_upsert_queue: VectorUpsertQueue | None = None,
+    relation_upsert_queue: VectorUpsertQueue | None = None,
 ) -> None:
     """Two-phase merge: process all entities first, then all relationships
 
@@ -2759,8 +3233,17 @@ async def merge_nodes_and_edges(
     2. Phase 2: Process all relationships concurrently (may add missing entities)
     3. Phase 3: Update full_entities and full_relations storage with final results
 
+    When chunk_results is a ChunkResultStream, phases 1 and 2 run once per
+    round of results taken from the stream while extraction is still going,
+    and phase 3 runs after the stream is closed. Vector writes are queued and
+    flushed in the background; the merge waits for them before phase 3.
+
+    The document's entity and relation lists are also written after every
+    round and when the merge fails, including everything the failed round
+    touched, so a document that fails half way can still be deleted.
+
     Args:
-        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
+        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships, or a stream delivering them
         knowledge_graph_inst: Knowledge graph storage
         entity_vdb: Entity vector database
         relationships_vdb: Relationship vector database
@@ -2776,6 +3259,8 @@ async def merge_nodes_and_edges(
         current_file_number: Current file number for logging
         total_files: Total files for logging
         file_path: File path for logging
+        entity_upsert_queue: Shared queue for entity vector writes, so merges of concurrent documents keep their order
+        relation_upsert_queue: Shared queue for relationship vector writes
     """
 
     # Check for cancellation at the start of merge
@@ -2784,23 +3269,6 @@ async def merge_nodes_and_edges(
             if pipeline_status.get("cancellation_requested", False):
                 raise PipelineCancelledException("User cancelled during merge phase")
 
-    # Collect all nodes and edges from all chunks
-    all_nodes = defaultdict(list)
-    all_edges = defaultdict(list)
-
-    for maybe_nodes, maybe_edges in chunk_results:
-        # Collect nodes
-        for entity_name, entities in maybe_nodes.items():
-            all_nodes[entity_name].extend(entities)
-
-        # Collect edges with sorted keys for undirected graph
-        for edge_key, edges in maybe_edges.items():
-            sorted_edge_key = tuple(sorted(edge_key))
-            all_edges[sorted_edge_key].extend(edges)
-
-    total_entities_count = len(all_nodes)
-    total_relations_count = len(all_edges)
-
     log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
     logger.info(log_message)
     async with pipeline_status_lock:
@@ -2810,13 +3278,22 @@ async def merge_nodes_and_edges(
     # Get max async tasks limit from global_config for semaphore control
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
-
-    # ===== Phase 1: Process all entities concurrently =====
-    log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
-    logger.info(log_message)
-    async with pipeline_status_lock:
-        pipeline_status["latest_message"] = log_message
-        pipeline_status["history_messages"].append(log_message)
+    # Graph upserts of concurrent merge tasks are written in batches
+    graph_writer = _GraphWriteBatcher(knowledge_graph_inst)
+    # Vector writes are embedded and stored in the background, in order
+    vector_max_pending = global_config.get(
+        "embedding_batch_num", 10
+    ) * global_config.get("embedding_func_max_async", 8)
+    entity_writer = relation_writer = None
+    if entity_vdb is not None:
+        entity_writer = (
+            entity_upsert_queue or VectorUpsertQueue(entity_vdb, vector_max_pending)
+        ).writer()
+    if relationships_vdb is not None:
+        relation_writer = (
+            relation_upsert_queue
+            or VectorUpsertQueue(relationships_vdb, vector_max_pending)
+        ).writer()
 
     async def _locked_process_entity_name(entity_name, entities):
         async with semaphore:
@@ -2838,8 +3315,8 @@ async def merge_nodes_and_edges(
                     entity_data = await _merge_nodes_then_upsert(
                         entity_name,
                         entities,
-                        knowledge_graph_inst,
-                        entity_vdb,
+                        graph_writer,
+                        entity_writer,
                         global_config,
                         pipeline_status,
                         pipeline_status_lock,
@@ -2873,52 +3350,6 @@ async def merge_nodes_and_edges(
                     )
                     raise prefixed_exception from e
 
-    # Create entity processing tasks
-    entity_tasks = []
-    for entity_name, entities in all_nodes.items():
-        task = asyncio.create_task(_locked_process_entity_name(entity_name, entities))
-        entity_tasks.append(task)
-
-    # Execute entity tasks with error handling
-    processed_entities = []
-    if entity_tasks:
-        done, pending = await asyncio.wait(
-            entity_tasks, return_when=asyncio.FIRST_EXCEPTION
-        )
-
-        first_exception = None
-        processed_entities = []
-
-        for task in done:
-            try:
-                result = task.result()
-            except BaseException as e:
-                if first_exception is None:
-                    first_exception = e
-            else:
-                processed_entities.append(result)
-
-        if pending:
-            for task in pending:
-                task.cancel()
-            pending_results = await asyncio.gather(*pending, return_exceptions=True)
-            for result in pending_results:
-                if isinstance(result, BaseException):
-                    if first_exception is None:
-                        first_exception = result
-                else:
-                    processed_entities.append(result)
-
-        if first_exception is not None:
-            raise first_exception
-
-    # ===== Phase 2: Process all relationships concurrently =====
-    log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
-    logger.info(log_message)
-    async with pipeline_status_lock:
-        pipeline_status["latest_message"] = log_message
-        pipeline_status["history_messages"].append(log_message)
-
     async def _locked_process_edges(edge_key, edges):
         async with semaphore:
             # Check for cancellation before processing edges
@@ -2946,9 +3377,9 @@ async def merge_nodes_and_edges(
                         edge_key[0],
                         edge_key[1],
                         edges,
-                        knowledge_graph_inst,
-                        relationships_vdb,
-                        entity_vdb,
+                        graph_writer,
+                        relation_writer,
+                        entity_writer,
                         global_config,
                         pipeline_status,
                         pipeline_status_lock,
@@ -2987,53 +3418,137 @@ async def merge_nodes_and_edges(
                     )
                     raise prefixed_exception from e
 
-    # Create relationship processing tasks
-    edge_tasks = []
-    for edge_key, edges in all_edges.items():
-        task = asyncio.create_task(_locked_process_edges(edge_key, edges))
-        edge_tasks.append(task)
+    async def _merge_round(round_results: list) -> None:
+        # Collect all nodes and edges from the chunks of this round
+        all_nodes = defaultdict(list)
+        all_edges = defaultdict(list)
 
-    # Execute relationship tasks with error handling
-    processed_edges = []
-    all_added_entities = []
+        for maybe_nodes, maybe_edges in round_results:
+            # Collect nodes
+            for entity_name, entities in maybe_nodes.items():
+                all_nodes[entity_name].extend(entities)
 
-    if edge_tasks:
-        done, pending = await asyncio.wait(
-            edge_tasks, return_when=asyncio.FIRST_EXCEPTION
-        )
+            # Collect edges with sorted keys for undirected graph
+            for edge_key, edges in maybe_edges.items():
+                sorted_edge_key = tuple(sorted(edge_key))
+                all_edges[sorted_edge_key].extend(edges)
 
-        first_exception = None
+        # Everything this round may write, in case it fails half way
+        attempted_entities.update(all_nodes)
+        for sorted_edge_key in all_edges:
+            attempted_entities.update(sorted_edge_key)
+            attempted_relations.add(sorted_edge_key)
 
-        for task in done:
-            try:
-                edge_data, added_entities = task.result()
-            except BaseException as e:
-                if first_exception is None:
-                    first_exception = e
-            else:
-                if edge_data is not None:
-                    processed_edges.append(edge_data)
-                all_added_entities.extend(added_entities)
+        total_entities_count = len(all_nodes)
+        total_relations_count = len(all_edges)
 
-        if pending:
-            for task in pending:
-                task.cancel()
-            pending_results = await asyncio.gather(*pending, return_exceptions=True)
-            for result in pending_results:
-                if isinstance(result, BaseException):
+        # ===== Phase 1: Process all entities concurrently =====
+        log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
+        logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
+        # Create entity processing tasks
+        entity_tasks = []
+        for entity_name, entities in all_nodes.items():
+            task = asyncio.create_task(
+                _locked_process_entity_name(entity_name, entities)
+            )
+            entity_tasks.append(task)
+
+        # Execute entity tasks with error handling
+        if entity_tasks:
+            done, pending = await asyncio.wait(
+                entity_tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
+
+            first_exception = None
+
+            for task in done:
+                try:
+                    result = task.result()
+                except BaseException as e:
+                    if first_exception is None:
+                        first_exception = e
+                else:
+                    processed_entities.append(result)
+
+            if pending:
+                for task in pending:
+                    task.cancel()
+                pending_results = await asyncio.gather(*pending, return_exceptions=True)
+                for result in pending_results:
+                    if isinstance(result, BaseException):
+                        if first_exception is None:
+                            first_exception = result
+                    else:
+                        processed_entities.append(result)
+
+            if first_exception is not None:
+                raise first_exception
+
+        # ===== Phase 2: Process all relationships concurrently =====
+        log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
+        logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
+        # Create relationship processing tasks
+        edge_tasks = []
+        for edge_key, edges in all_edges.items():
+            task = asyncio.create_task(_locked_process_edges(edge_key, edges))
+            edge_tasks.append(task)
+
+        # Execute relationship tasks with error handling
+        if edge_tasks:
+            done, pending = await asyncio.wait(
+                edge_tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
+
+            first_exception = None
+
+            for task in done:
+                try:
+                    edge_data, added_entities = task.result()
+                except BaseException as e:
                     if first_exception is None:
-                        first_exception = result
+                        first_exception = e
                 else:
-                    edge_data, added_entities = result
                     if edge_data is not None:
                         processed_edges.append(edge_data)
                     all_added_entities.extend(added_entities)
 
-        if first_exception is not None:
-            raise first_exception
+            if pending:
+                for task in pending:
+                    task.cancel()
+                pending_results = await asyncio.gather(*pending, return_exceptions=True)
+                for result in pending_results:
+                    if isinstance(result, BaseException):
+                        if first_exception is None:
+                            first_exception = result
+                    else:
+                        edge_data, added_entities = result
+                        if edge_data is not None:
+                            processed_edges.append(edge_data)
+                        all_added_entities.extend(added_entities)
 
-    # ===== Phase 3: Update full_entities and full_relations storage =====
-    if full_entities_storage and full_relations_storage and doc_id:
+            if first_exception is not None:
+                raise first_exception
+
+    processed_entities = []
+    processed_edges = []
+    all_added_entities = []
+    attempted_entities: set[str] = set()
+    attempted_relations: set[tuple[str, str]] = set()
+    indexed_counts = (0, 0)
+
+    async def _update_doc_index(phase3: bool, include_attempted: bool) -> None:
+        """Write the entities and relations merged so far for doc_id"""
+        nonlocal indexed_counts
+        if not (full_entities_storage and full_relations_storage and doc_id):
+            return
         try:
             # Merge all entities: original entities + entities added during edge processing
             final_entity_names = set()
@@ -3058,11 +3573,21 @@ async def merge_nodes_and_edges(
                         relation_pair = tuple(sorted([src_id, tgt_id]))
                         final_relation_pairs.add(relation_pair)
 
-            log_message = f"Phase 3: Updating final {len(final_entity_names)}({len(processed_entities)}+{len(all_added_entities)}) entities and  {len(final_relation_pairs)} relations from {doc_id}"
-            logger.info(log_message)
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+            if include_attempted:
+                # Deletion skips listed names that never made it into the graph
+                final_entity_names.update(attempted_entities)
+                final_relation_pairs.update(attempted_relations)
+
+            counts = (len(final_entity_names), len(final_relation_pairs))
+            if not phase3 and counts == indexed_counts:
+                return
+
+            if phase3:
+                log_message = f"Phase 3: Updating final {len(final_entity_names)}({len(processed_entities)}+{len(all_added_entities)}) entities and  {len(final_relation_pairs)} relations from {doc_id}"
+                logger.info(log_message)
+                async with pipeline_status_lock:
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
 
             # Update storage
             if final_entity_names:
@@ -3086,6 +3611,7 @@ async def merge_nodes_and_edges(
                         }
                     }
                 )
+            indexed_counts = counts
 
             logger.debug(
                 f"Updated entity-relation index for document {doc_id}: {len(final_entity_names)} entities (original: {len(processed_entities)}, added: {len(all_added_entities)}), {len(final_relation_pairs)} relations"
@@ -3097,6 +3623,30 @@ async def merge_nodes_and_edges(
             )
             # Don't raise exception to avoid affecting main flow
 
+    try:
+        if isinstance(chunk_results, ChunkResultStream):
+            try:
+                while round_results := await chunk_results.get_batch():
+                    await _merge_round(round_results)
+                    # Keep the document deletable if a later chunk fails
+                    await _update_doc_index(phase3=False, include_attempted=False)
+            except BaseException as e:
+                # Stop extraction from waiting on a merge that is gone
+                await chunk_results.abort(e)
+                raise
+        else:
+            await _merge_round(chunk_results)
+
+        for writer in (entity_writer, relation_writer):
+            if writer is not None:
+                await writer.flush()
+    except BaseException:
+        await _update_doc_index(phase3=False, include_attempted=True)
+        raise
+
+    # ===== Phase 3: Update full_entities and full_relations storage =====
+    await _update_doc_index(phase3=True, include_attempted=False)
+
     log_message = f"Completed merging: {len(processed_entities)} entities, {len(all_added_entities)} extra entities, {len(processed_edges)} relations"
     logger.info(log_message)
     async with pipeline_status_lock:
@@ -3104,6 +3654,219 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
+class ChunkExtractionScheduler:
+    """Fair, batch-wide admission of chunk extraction work.
+
+    All documents extracted in one pipeline batch share ``max_async``
+    extraction slots. A freed slot goes to the waiting document with the
+    fewest chunks in flight, rotating between documents on ties, so one
+    large document cannot hold every slot while small ones wait. Per-document
+    progress is kept for status reporting.
+    """
+
+    def __init__(self, max_async: int):
+        self.max_async = max(1, int(max_async))
+        self._in_use = 0
+        self._in_flight: dict[str, int] = defaultdict(int)
+        # Insertion order of the keys is the rotation order between documents
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        self._progress: dict[str, dict[str, int]] = {}
+
+    def register(self, doc_id: str, total: int) -> None:
+        self._progress[doc_id] = {"done": 0, "total": total}
+
+    def complete(self, doc_id: str) -> None:
+        if doc_id in self._progress:
+            self._progress[doc_id]["done"] += 1
+
+    def forget(self, doc_id: str) -> None:
+        self._progress.pop(doc_id, None)
+
+    def progress(self) -> dict[str, dict[str, int]]:
+        """Snapshot of ``{doc_id: {"done": n, "total": m}}`` for active documents"""
+        return {doc_id: dict(p) for doc_id, p in self._progress.items()}
+
+    @asynccontextmanager
+    async def slot(self, doc_id: str):
+        await self._acquire(doc_id)
+        try:
+            yield
+        finally:
+            self._release(doc_id)
+
+    async def _acquire(self, doc_id: str) -> None:
+        if self._in_use < self.max_async and not self._waiters:
+            self._grant(doc_id)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(doc_id, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation arrived
+                self._release(doc_id)
+            else:
+                waiters = self._waiters.get(doc_id)
+                if waiters is not None and future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del self._waiters[doc_id]
+            raise
+
+    def _grant(self, doc_id: str) -> None:
+        self._in_use += 1
+        self._in_flight[doc_id] += 1
+
+    def _release(self, doc_id: str) -> None:
+        self._in_use -= 1
+        self._in_flight[doc_id] -= 1
+        if self._in_flight[doc_id] <= 0:
+            del self._in_flight[doc_id]
+
+        while self._in_use < self.max_async and self._waiters:
+            next_doc = min(self._waiters, key=lambda d: self._in_flight.get(d, 0))
+            waiters = self._waiters.pop(next_doc)
+            future = waiters.popleft()
+            if waiters:
+                # Re-queue behind the other documents to rotate on ties
+                self._waiters[next_doc] = waiters
+            if future.done():
+                continue
+            self._grant(next_doc)
+            future.set_result(None)
+
+
+class GleaningPolicy:
+    """Per-chunk decision on whether another gleaning round is worth its cost.
+
+    Gleaning re-asks the LLM for entities the first pass missed, which doubles
+    the cost of a chunk per round. A chunk is not gleaned when it is shorter
+    than ``min_chunk_tokens`` (tiny or table-only chunks rarely hide more
+    entities) or when its first pass already found at least
+    ``max_entity_density`` entities per 100 tokens. Later rounds stop as soon
+    as a round adds no new entity or relation.
+
+    Every decision is recorded, including the yield of gleaning rounds bucketed
+    by chunk size and first pass density, so the thresholds can be tuned for a
+    corpus from ``snapshot()``.
+    """
+
+    TOKEN_BUCKETS = (128, 256, 512, 1024)
+    DENSITY_BUCKETS = (1.0, 2.0, 4.0, 8.0)
+
+    def __init__(
+        self,
+        max_rounds: int,
+        min_chunk_tokens: int = 0,
+        max_entity_density: float = 0.0,
+    ):
+        self.max_rounds = max(0, int(max_rounds))
+        self.min_chunk_tokens = min_chunk_tokens
+        self.max_entity_density = max_entity_density
+        self._stats = {
+            "chunks": 0,
+            "gleaned_chunks": 0,
+            "rounds": 0,
+            "productive_rounds": 0,
+            "entities_added": 0,
+            "relations_added": 0,
+            "stop_reasons": defaultdict(int),
+            "by_tokens": {},
+            "by_density": {},
+        }
+
+    @staticmethod
+    def _density(chunk_tokens: int, entities: int) -> float:
+        return 100.0 * entities / max(chunk_tokens, 1)
+
+    @staticmethod
+    def _bucket(value: float, bounds: tuple) -> str:
+        for bound in bounds:
+            if value < bound:
+                return f"<{bound:g}"
+        return f">={bounds[-1]:g}"
+
+    def stop_reason(
+        self,
+        rounds_done: int,
+        chunk_tokens: int,
+        first_pass_entities: int,
+        last_added: int | None = None,
+    ) -> str | None:
+        """Return why the chunk should not be gleaned again, or None to glean
+
+        Args:
+            rounds_done: Gleaning rounds already run for this chunk
+            chunk_tokens: Token count of the chunk
+            first_pass_entities: Entities found by the initial extraction
+            last_added: New entities plus relations from the previous round
+        """
+        if rounds_done >= self.max_rounds:
+            return "max_rounds" if rounds_done else "disabled"
+        if rounds_done == 0:
+            if chunk_tokens < self.min_chunk_tokens:
+                return "small_chunk"
+            if self.max_entity_density > 0 and (
+                self._density(chunk_tokens, first_pass_entities)
+                >= self.max_entity_density
+            ):
+                return "dense_first_pass"
+        elif not last_added:
+            return "no_gain"
+        return None
+
+    def record(
+        self,
+        chunk_tokens: int,
+        first_pass_entities: int,
+        round_yields: list[tuple[int, int]],
+        stop_reason: str,
+    ) -> None:
+        """Record the gleaning outcome of one chunk
+
+        Args:
+            round_yields: (entities_added, relations_added) per round run
+            stop_reason: Reason returned by stop_reason() that ended gleaning
+        """
+        stats = self._stats
+        stats["chunks"] += 1
+        stats["stop_reasons"][stop_reason] += 1
+        productive = sum(1 for e, r in round_yields if e or r)
+        entities_added = sum(e for e, _ in round_yields)
+        relations_added = sum(r for _, r in round_yields)
+        if round_yields:
+            stats["gleaned_chunks"] += 1
+        stats["rounds"] += len(round_yields)
+        stats["productive_rounds"] += productive
+        stats["entities_added"] += entities_added
+        stats["relations_added"] += relations_added
+
+        density = self._density(chunk_tokens, first_pass_entities)
+        for table, key in (
+            ("by_tokens", self._bucket(chunk_tokens, self.TOKEN_BUCKETS)),
+            ("by_density", self._bucket(density, self.DENSITY_BUCKETS)),
+        ):
+            bucket = stats[table].setdefault(
+                key, {"chunks": 0, "rounds": 0, "productive_rounds": 0, "added": 0}
+            )
+            bucket["chunks"] += 1
+            bucket["rounds"] += len(round_yields)
+            bucket["productive_rounds"] += productive
+            bucket["added"] += entities_added + relations_added
+
+    def snapshot(self) -> dict[str, Any]:
+        """Copy of the recorded statistics, safe to publish in pipeline_status"""
+        stats = self._stats
+        return {
+            **{k: v for k, v in stats.items() if isinstance(v, int)},
+            "stop_reasons": dict(stats["stop_reasons"]),
+            "by_tokens": {k: dict(v) for k, v in stats["by_tokens"].items()},
+            "by_density": {k: dict(v) for k, v in stats["by_density"].items()},
+        }
+
+
 async def extract_entities(
     chunks: dict[str, TextChunkSchema],
     global_config: dict[str, str],
@@ -3111,6 +3874,11 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    chunk_extractions_storage: BaseKVStorage | None = None,
+    chunk_scheduler: ChunkExtractionScheduler | None = None,
+    result_stream: ChunkResultStream | None = None,
+    shared_extraction_cache: SharedExtractionCache | None = None,
+    gleaning_policy: GleaningPolicy | None = None,
 ) -> list:
     # Check for cancellation at the start of entity extraction
     if pipeline_status is not None and pipeline_status_lock is not None:
@@ -3122,6 +3890,12 @@ async def extract_entities(
 
     use_llm_func: callable = global_config["llm_model_func"]
     entity_extract_max_gleaning = global_config["entity_extract_max_gleaning"]
+    if gleaning_policy is None:
+        gleaning_policy = GleaningPolicy(
+            entity_extract_max_gleaning,
+            min_chunk_tokens=global_config.get("gleaning_min_chunk_tokens", 0),
+            max_entity_density=global_config.get("gleaning_max_entity_density", 0.0),
+        )
 
     ordered_chunks = list(chunks.items())
     # add language and example number params to prompt
@@ -3149,14 +3923,32 @@ async def extract_entities(
         language=language,
     )
 
+    if shared_extraction_cache is not None:
+        shared_key_params = dict(
+            prompt_version=extraction_prompt_version(
+                PROMPTS["entity_extraction_system_prompt"],
+                PROMPTS["entity_extraction_user_prompt"],
+                PROMPTS["entity_continue_extraction_user_prompt"],
+                examples,
+                context_base["tuple_delimiter"],
+                context_base["completion_delimiter"],
+            ),
+            model=global_config.get("llm_model_name", ""),
+            language=language,
+            entity_types=entity_types,
+        )
+
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
 
-    async def _process_single_content(chunk_key_dp: tuple[str, TextChunkSchema]):
+    async def _process_single_content(
+        chunk_key_dp: tuple[str, TextChunkSchema], packed_answer: str | None = None
+    ):
         """Process a single chunk
         Args:
             chunk_key_dp (tuple[str, TextChunkSchema]):
                 ("chunk-xxxxxx", {"tokens": int, "content": str, "full_doc_id": str, "chunk_order_index": int})
+            packed_answer (str | None): This chunk's part of a packed extraction answer
         Returns:
             tuple: (maybe_nodes, maybe_edges) containing extracted entities and relationships
         """
@@ -3181,14 +3973,26 @@ async def extract_entities(
             "entity_continue_extraction_user_prompt"
         ].format(**{**context_base, "input_text": content})
 
+        shared_key = None
+        if shared_extraction_cache is not None:
+            shared_key = shared_extraction_cache.make_key(content, **shared_key_params)
+
+        initial_llm_func = use_llm_func
+        if packed_answer is not None:
+            # Already answered by a packed request, cache it as this chunk's answer
+            async def initial_llm_func(*args, **kwargs):
+                return packed_answer
+
         final_result, timestamp = await use_llm_func_with_cache(
             entity_extraction_user_prompt,
-            use_llm_func,
+            initial_llm_func,
             system_prompt=entity_extraction_system_prompt,
             llm_response_cache=llm_response_cache,
             cache_type="extract",
             chunk_id=chunk_key,
             cache_keys_collector=cache_keys_collector,
+            shared_cache=shared_extraction_cache,
+            shared_cache_key=shared_key,
         )
 
         history = pack_user_ass_to_openai_messages(
@@ -3205,8 +4009,29 @@ async def extract_entities(
             completion_delimiter=context_base["completion_delimiter"],
         )
 
-        # Process additional gleaning results only 1 time when entity_extract_max_gleaning is greater than zero.
-        if entity_extract_max_gleaning > 0:
+        # Glean for missed entities while the policy expects it to pay off
+        chunk_tokens = chunk_dp.get("tokens", 0)
+        first_pass_entities = len(maybe_nodes)
+        answers = [final_result]
+        round_yields: list[tuple[int, int]] = []
+        while True:
+            stop_reason = gleaning_policy.stop_reason(
+                len(round_yields),
+                chunk_tokens,
+                first_pass_entities,
+                sum(round_yields[-1]) if round_yields else None,
+            )
+            if stop_reason is not None:
+                break
+
+            glean_key = None
+            if shared_extraction_cache is not None:
+                # Gleaning continues from the earlier answers, address it by them too
+                glean_key = shared_extraction_cache.make_key(
+                    content,
+                    **shared_key_params,
+                    stage=f"glean:{compute_args_hash(*answers)}",
+                )
             glean_result, timestamp = await use_llm_func_with_cache(
                 entity_continue_extraction_user_prompt,
                 use_llm_func,
@@ -3216,6 +4041,12 @@ async def extract_entities(
                 cache_type="extract",
                 chunk_id=chunk_key,
                 cache_keys_collector=cache_keys_collector,
+                shared_cache=shared_extraction_cache,
+                shared_cache_key=glean_key,
+            )
+            answers.append(glean_result)
+            history = history + pack_user_ass_to_openai_messages(
+                entity_continue_extraction_user_prompt, glean_result
             )
 
             # Process gleaning result separately with file path
@@ -3227,6 +4058,12 @@ async def extract_entities(
                 tuple_delimiter=context_base["tuple_delimiter"],
                 completion_delimiter=context_base["completion_delimiter"],
             )
+            round_yields.append(
+                (
+                    len(glean_nodes.keys() - maybe_nodes.keys()),
+                    len(glean_edges.keys() - maybe_edges.keys()),
+                )
+            )
 
             # Merge results - compare description lengths to choose better version
             for entity_name, glean_entities in glean_nodes.items():
@@ -3259,6 +4096,10 @@ async def extract_entities(
                     # New edge from gleaning stage
                     maybe_edges[edge_key] = list(glean_edges)
 
+        gleaning_policy.record(
+            chunk_tokens, first_pass_entities, round_yields, stop_reason
+        )
+
         # Batch update chunk's llm_cache_list with all collected cache keys
         if cache_keys_collector and text_chunks_storage:
             await update_chunk_cache_list(
@@ -3268,25 +4109,151 @@ async def extract_entities(
                 "entity_extraction",
             )
 
+        # Persist the merged parse result so rebuilds can skip re-parsing the LLM cache
+        if chunk_extractions_storage is not None:
+            await chunk_extractions_storage.upsert(
+                {chunk_key: _pack_chunk_extraction(maybe_nodes, maybe_edges, file_path)}
+            )
+
         processed_chunks += 1
         entities_count = len(maybe_nodes)
         relations_count = len(maybe_edges)
         log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel {chunk_key}"
         logger.info(log_message)
+        chunk_scheduler.complete(doc_key)
         if pipeline_status is not None:
             async with pipeline_status_lock:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
+                pipeline_status["extraction_progress"] = chunk_scheduler.progress()
 
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
 
-    # Get max async tasks limit from global_config
-    chunk_max_async = global_config.get("llm_model_max_async", 4)
-    semaphore = asyncio.Semaphore(chunk_max_async)
+    # Without a batch-wide scheduler, only this call's chunks share the slots
+    if chunk_scheduler is None:
+        chunk_scheduler = ChunkExtractionScheduler(
+            global_config.get("llm_model_max_async", 4)
+        )
+    doc_key = ordered_chunks[0][1].get("full_doc_id", "") if ordered_chunks else ""
+    chunk_scheduler.register(doc_key, total_chunks)
+
+    async def _plan_extraction_packs() -> list[list[tuple[str, TextChunkSchema]]]:
+        """Group small chunks that no cache can answer into packed requests"""
+        small_chunks = [
+            chunk
+            for chunk in ordered_chunks
+            if chunk[1].get("tokens", 0) <= pack_chunk_max_tokens
+        ]
+        if len(small_chunks) < 2:
+            return []
 
-    async def _process_with_semaphore(chunk):
-        async with semaphore:
+        # Chunks with a cached answer keep their own cheap path
+        cache_keys = {}
+        for chunk_key, chunk_dp in small_chunks:
+            context = {**context_base, "input_text": chunk_dp["content"]}
+            cache_keys[chunk_key] = llm_cache_key(
+                PROMPTS["entity_extraction_user_prompt"].format(**context),
+                PROMPTS["entity_extraction_system_prompt"].format(**context),
+            )
+        uncached = set(cache_keys.values())
+        if llm_response_cache is not None and global_config.get(
+            "enable_llm_cache_for_entity_extract"
+        ):
+            uncached = await llm_response_cache.filter_keys(uncached)
+        candidates = [c for c in small_chunks if cache_keys[c[0]] in uncached]
+        if shared_extraction_cache is not None and candidates:
+            shared_keys = {
+                chunk_key: shared_extraction_cache.make_key(
+                    chunk_dp["content"], **shared_key_params
+                )
+                for chunk_key, chunk_dp in candidates
+            }
+            shared_uncached = await shared_extraction_cache.storage.filter_keys(
+                set(shared_keys.values())
+            )
+            candidates = [c for c in candidates if shared_keys[c[0]] in shared_uncached]
+
+        packs, current, current_tokens = [], [], 0
+        for chunk in candidates:
+            tokens = chunk[1].get("tokens", 0)
+            if current and current_tokens + tokens > pack_max_tokens:
+                packs.append(current)
+                current, current_tokens = [], 0
+            current.append(chunk)
+            current_tokens += tokens
+        if current:
+            packs.append(current)
+        return [pack for pack in packs if len(pack) > 1]
+
+    async def _extract_pack(pack: list[tuple[str, TextChunkSchema]]) -> dict[str, str]:
+        """Extract several small chunks with one request, return answers by chunk"""
+        section_delimiter = PROMPTS["DEFAULT_SECTION_DELIMITER"]
+        input_text = "\n".join(
+            f"{section_delimiter}{number}\n{chunk_dp['content']}"
+            for number, (_, chunk_dp) in enumerate(pack, 1)
+        )
+        system_prompt = PROMPTS["entity_extraction_system_prompt"].format(
+            **{**context_base, "input_text": input_text}
+        )
+        user_prompt = PROMPTS["entity_extraction_packed_user_prompt"].format(
+            **context_base,
+            section_count=len(pack),
+            section_delimiter=section_delimiter,
+        )
+
+        async with chunk_scheduler.slot(doc_key):
+            if pipeline_status is not None and pipeline_status_lock is not None:
+                async with pipeline_status_lock:
+                    if pipeline_status.get("cancellation_requested", False):
+                        raise PipelineCancelledException(
+                            "User cancelled during chunk processing"
+                        )
+            # Not cached as a whole, every chunk caches its own section
+            try:
+                result, _ = await use_llm_func_with_cache(
+                    user_prompt, use_llm_func, system_prompt=system_prompt
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Packed extraction of {len(pack)} chunks failed, "
+                    f"extracting them one by one: {e}"
+                )
+                return {}
+
+        sections = _split_packed_extraction(
+            result,
+            len(pack),
+            section_delimiter,
+            context_base["completion_delimiter"],
+        )
+        answers = {
+            chunk_key: sections[number]
+            for number, (chunk_key, _) in enumerate(pack, 1)
+            if number in sections
+        }
+        if len(answers) < len(pack):
+            logger.warning(
+                f"Packed extraction returned {len(answers)} of {len(pack)} sections, "
+                "extracting the others one by one"
+            )
+        return answers
+
+    pack_max_tokens = global_config.get("extraction_pack_max_tokens", 0)
+    pack_chunk_max_tokens = global_config.get("extraction_pack_chunk_max_tokens", 0)
+    pack_tasks: dict[str, asyncio.Task] = {}
+    if pack_max_tokens > 0 and pack_chunk_max_tokens > 0:
+        for pack in await _plan_extraction_packs():
+            pack_task = asyncio.create_task(_extract_pack(pack))
+            for chunk_key, _ in pack:
+                pack_tasks[chunk_key] = pack_task
+
+    async def _process_with_slot(chunk):
+        packed_answer = None
+        if chunk[0] in pack_tasks:
+            packed_answer = (await pack_tasks[chunk[0]]).get(chunk[0])
+
+        async with chunk_scheduler.slot(doc_key):
             # Check for cancellation before processing chunk
             if pipeline_status is not None and pipeline_status_lock is not None:
                 async with pipeline_status_lock:
@@ -3296,20 +4263,32 @@ async def extract_entities(
                         )
 
             try:
-                return await _process_single_content(chunk)
+                result = await _process_single_content(chunk, packed_answer)
             except Exception as e:
                 chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
                 prefixed_exception = create_prefixed_exception(e, chunk_id)
                 raise prefixed_exception from e
 
+        # Hand the result to the merge stage without holding an LLM slot
+        if result_stream is not None:
+            await result_stream.put(result)
+        return result
+
     tasks = []
     for c in ordered_chunks:
-        task = asyncio.create_task(_process_with_semaphore(c))
+        task = asyncio.create_task(_process_with_slot(c))
         tasks.append(task)
 
     # Wait for tasks to complete or for the first exception to occur
     # This allows us to cancel remaining tasks if any task fails
-    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        chunk_scheduler.forget(doc_key)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["extraction_progress"] = chunk_scheduler.progress()
+                pipeline_status["gleaning_stats"] = gleaning_policy.snapshot()
 
     # Check if any task raised an exception and ensure all exceptions are retrieved
     first_exception = None
@@ -3330,6 +4309,7 @@ async def extract_entities(
     # If any task failed, cancel all pending tasks and raise the first exception
     if first_exception is not None:
         # Cancel all pending tasks
+        pending |= {t for t in pack_tasks.values() if not t.done()}
         for pending_task in pending:
             pending_task.cancel()
 
@@ -3349,6 +4329,7 @@ async def extract_entities(
     return chunk_results
 
 
+@traced("kg_query")
 async def kg_query(
     query: str,
     knowledge_graph_inst: BaseGraphStorage,
@@ -3497,9 +4478,10 @@ async def kg_query(
         scope_key,
     )
 
-    cached_result = await handle_cache(
-        hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
-    )
+    with trace_span("llm_cache"):
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
+        )
 
     if cached_result is not None:
         cached_response, _ = cached_result  # Extract content, ignore timestamp
@@ -3508,13 +4490,14 @@ async def kg_query(
         )
         response = cached_response
     else:
-        response = await use_model_func(
-            user_query,
-            system_prompt=sys_prompt,
-            history_messages=query_param.conversation_history,
-            enable_cot=True,
-            stream=query_param.stream,
-        )
+        with trace_span("llm"):
+            response = await use_model_func(
+                user_query,
+                system_prompt=sys_prompt,
+                history_messages=query_param.conversation_history,
+                enable_cot=True,
+                stream=query_param.stream,
+            )
 
         if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
             queryparam_dict = {
@@ -3566,6 +4549,7 @@ async def kg_query(
         )
 
 
+@traced("keywords")
 async def get_keywords_from_query(
     query: str,
     query_param: QueryParam,
@@ -3707,6 +4691,18 @@ async def extract_keywords_only(
     return hl_keywords, ll_keywords
 
 
+def _vector_scope(query_param: QueryParam) -> VectorScopeFilter | None:
+    """Build the vector search scope for a query, or None when unrestricted."""
+    if query_param.accessible_doc_ids is None:
+        return None
+    chunk_ids = query_param.accessible_chunk_ids
+    return VectorScopeFilter(
+        doc_ids=frozenset(query_param.accessible_doc_ids),
+        chunk_ids=frozenset(chunk_ids) if chunk_ids is not None else None,
+    )
+
+
+@traced("vector_search")
 async def _get_vector_context(
     query: str,
     chunks_vdb: BaseVectorStorage,
@@ -3734,7 +4730,12 @@ async def _get_vector_context(
         cosine_threshold = chunks_vdb.cosine_better_than_threshold
 
         results = await chunks_vdb.query(
-            query, top_k=search_top_k, query_embedding=query_embedding
+            query,
+            top_k=search_top_k,
+            query_embedding=query_embedding,
+            scope=_vector_scope(query_param),
+            ef_search=query_param.hnsw_ef_search,
+            probes=query_param.ivfflat_probes,
         )
         if not results:
             logger.info(
@@ -3765,6 +4766,7 @@ async def _get_vector_context(
         return []
 
 
+@traced("kg_search")
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -3803,7 +4805,8 @@ async def _perform_kg_search(
         actual_embedding_func = text_chunks_db.embedding_func
         if actual_embedding_func:
             try:
-                query_embedding = await actual_embedding_func([query])
+                with trace_span("query_embedding"):
+                    query_embedding = await actual_embedding_func([query])
                 query_embedding = query_embedding[
                     0
                 ]  # Extract first embedding from batch result
@@ -3934,6 +4937,7 @@ async def _perform_kg_search(
     }
 
 
+@traced("token_truncation")
 async def _apply_token_truncation(
     search_result: dict[str, Any],
     query_param: QueryParam,
@@ -4105,6 +5109,7 @@ async def _apply_token_truncation(
     }
 
 
+@traced("merge_chunks")
 async def _merge_all_chunks(
     filtered_entities: list[dict],
     filtered_relations: list[dict],
@@ -4207,6 +5212,7 @@ async def _merge_all_chunks(
     return merged_chunks
 
 
+@traced("build_context_str")
 async def _build_context_str(
     entities_context: list[dict],
     relations_context: list[dict],
@@ -4389,6 +5395,7 @@ async def _build_context_str(
     return result, final_data
 
 
+@traced("scope_filter")
 async def _filter_by_accessible_docs(
     search_result: dict[str, Any],
     accessible_doc_ids: set[str],
@@ -4411,15 +5418,9 @@ async def _filter_by_accessible_docs(
     # Collect all unique chunk IDs from entities and relations source_ids
     all_chunk_ids = set()
     for entity in search_result.get("final_entities", []):
-        source_id = entity.get("source_id", "")
-        if source_id:
-            chunks = split_string_by_multi_markers(source_id, [GRAPH_FIELD_SEP])
-            all_chunk_ids.update(chunks)
+        all_chunk_ids.update(split_graph_field(entity.get("source_id")))
     for relation in search_result.get("final_relations", []):
-        source_id = relation.get("source_id", "")
-        if source_id:
-            chunks = split_string_by_multi_markers(source_id, [GRAPH_FIELD_SEP])
-            all_chunk_ids.update(chunks)
+        all_chunk_ids.update(split_graph_field(relation.get("source_id")))
 
     # Batch lookup chunk → full_doc_id mapping
     accessible_chunk_ids = set()
@@ -4435,21 +5436,17 @@ async def _filter_by_accessible_docs(
     # Filter entities: keep only those with at least one accessible source chunk
     filtered_entities = []
     for entity in search_result.get("final_entities", []):
-        source_id = entity.get("source_id", "")
-        if source_id:
-            entity_chunks = split_string_by_multi_markers(source_id, [GRAPH_FIELD_SEP])
-            if any(c in accessible_chunk_ids for c in entity_chunks):
-                filtered_entities.append(entity)
+        entity_chunks = split_graph_field(entity.get("source_id"))
+        if any(c in accessible_chunk_ids for c in entity_chunks):
+            filtered_entities.append(entity)
         # Entities without source_id are generic — exclude for safety
 
     # Filter relations: keep only those with at least one accessible source chunk
     filtered_relations = []
     for relation in search_result.get("final_relations", []):
-        source_id = relation.get("source_id", "")
-        if source_id:
-            rel_chunks = split_string_by_multi_markers(source_id, [GRAPH_FIELD_SEP])
-            if any(c in accessible_chunk_ids for c in rel_chunks):
-                filtered_relations.append(relation)
+        rel_chunks = split_graph_field(relation.get("source_id"))
+        if any(c in accessible_chunk_ids for c in rel_chunks):
+            filtered_relations.append(relation)
 
     # Filter vector chunks by full_doc_id
     filtered_vector_chunks = []
@@ -4487,6 +5484,7 @@ async def _filter_by_accessible_docs(
 
 
 # Now let's update the old _build_query_context to use the new architecture
+@traced("build_query_context")
 async def _build_query_context(
     query: str,
     ll_keywords: str,
@@ -4640,6 +5638,7 @@ async def _build_query_context(
     return QueryContextResult(context=context, raw_data=raw_data)
 
 
+@traced("local_search")
 async def _get_node_data(
     query: str,
     knowledge_graph_inst: BaseGraphStorage,
@@ -4651,7 +5650,14 @@ async def _get_node_data(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    with trace_span("entity_vdb"):
+        results = await entities_vdb.query(
+            query,
+            top_k=query_param.top_k,
+            scope=_vector_scope(query_param),
+            ef_search=query_param.hnsw_ef_search,
+            probes=query_param.ivfflat_probes,
+        )
 
     if not len(results):
         return [], []
@@ -4660,10 +5666,11 @@ async def _get_node_data(
     node_ids = [r["entity_name"] for r in results]
 
     # Call the batch node retrieval and degree functions concurrently.
-    nodes_dict, degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_nodes_batch(node_ids),
-        knowledge_graph_inst.node_degrees_batch(node_ids),
-    )
+    with trace_span("graph_read"):
+        nodes_dict, degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_nodes_batch(node_ids),
+            knowledge_graph_inst.node_degrees_batch(node_ids),
+        )
 
     # Now, if you need the node data and degree in order:
     node_datas = [nodes_dict.get(nid) for nid in node_ids]
@@ -4704,7 +5711,8 @@ async def _find_most_related_edges_from_entities(
     knowledge_graph_inst: BaseGraphStorage,
 ):
     node_names = [dp["entity_name"] for dp in node_datas]
-    batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
+    with trace_span("graph_read"):
+        batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
 
     all_edges = []
     seen = set()
@@ -4724,10 +5732,11 @@ async def _find_most_related_edges_from_entities(
     edge_pairs_tuples = list(all_edges)  # all_edges is already a list of tuples
 
     # Call the batched functions concurrently.
-    edge_data_dict, edge_degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
-        knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
-    )
+    with trace_span("graph_read"):
+        edge_data_dict, edge_degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+            knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
+        )
 
     # Reconstruct edge_datas list in the same order as the deduplicated results.
     all_edges_data = []
@@ -4754,6 +5763,7 @@ async def _find_most_related_edges_from_entities(
     return all_edges_data
 
 
+@traced("chunk_pick_entities")
 async def _find_related_text_unit_from_entities(
     node_datas: list[dict],
     query_param: QueryParam,
@@ -4780,9 +5790,7 @@ async def _find_related_text_unit_from_entities(
     entities_with_chunks = []
     for entity in node_datas:
         if entity.get("source_id"):
-            chunks = split_string_by_multi_markers(
-                entity["source_id"], [GRAPH_FIELD_SEP]
-            )
+            chunks = split_graph_field(entity["source_id"])
             if chunks:
                 entities_with_chunks.append(
                     {
@@ -4913,6 +5921,7 @@ async def _find_related_text_unit_from_entities(
     return result_chunks
 
 
+@traced("global_search")
 async def _get_edge_data(
     keywords,
     knowledge_graph_inst: BaseGraphStorage,
@@ -4923,7 +5932,14 @@ async def _get_edge_data(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    with trace_span("relation_vdb"):
+        results = await relationships_vdb.query(
+            keywords,
+            top_k=query_param.top_k,
+            scope=_vector_scope(query_param),
+            ef_search=query_param.hnsw_ef_search,
+            probes=query_param.ivfflat_probes,
+        )
 
     if not len(results):
         return [], []
@@ -4931,7 +5947,8 @@ async def _get_edge_data(
     # Prepare edge pairs in two forms:
     # For the batch edge properties function, use dicts.
     edge_pairs_dicts = [{"src": r["src_id"], "tgt": r["tgt_id"]} for r in results]
-    edge_data_dict = await knowledge_graph_inst.get_edges_batch(edge_pairs_dicts)
+    with trace_span("graph_read"):
+        edge_data_dict = await knowledge_graph_inst.get_edges_batch(edge_pairs_dicts)
 
     # Reconstruct edge_datas list in the same order as results.
     edge_datas = []
@@ -4986,7 +6003,8 @@ async def _find_most_related_entities_from_relationships(
             seen.add(e["tgt_id"])
 
     # Only get nodes data, no need for node degrees
-    nodes_dict = await knowledge_graph_inst.get_nodes_batch(entity_names)
+    with trace_span("graph_read"):
+        nodes_dict = await knowledge_graph_inst.get_nodes_batch(entity_names)
 
     # Rebuild the list in the same order as entity_names
     node_datas = []
@@ -5002,6 +6020,7 @@ async def _find_most_related_entities_from_relationships(
     return node_datas
 
 
+@traced("chunk_pick_relations")
 async def _find_related_text_unit_from_relations(
     edge_datas: list[dict],
     query_param: QueryParam,
@@ -5028,9 +6047,7 @@ async def _find_related_text_unit_from_relations(
     relations_with_chunks = []
     for relation in edge_datas:
         if relation.get("source_id"):
-            chunks = split_string_by_multi_markers(
-                relation["source_id"], [GRAPH_FIELD_SEP]
-            )
+            chunks = split_graph_field(relation["source_id"])
             if chunks:
                 # Build relation identifier
                 if "src_tgt" in relation:
@@ -5229,6 +6246,7 @@ async def naive_query(
 ) -> str | AsyncIterator[str]: ...
 
 
+@traced("naive_query")
 async def naive_query(
     query: str,
     chunks_vdb: BaseVectorStorage,
@@ -5431,9 +6449,10 @@ async def naive_query(
         query_param.enable_rerank,
         scope_key,
     )
-    cached_result = await handle_cache(
-        hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
-    )
+    with trace_span("llm_cache"):
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
+        )
     if cached_result is not None:
         cached_response, _ = cached_result  # Extract content, ignore timestamp
         logger.info(
@@ -5441,13 +6460,14 @@ async def naive_query(
         )
         response = cached_response
     else:
-        response = await use_model_func(
-            user_query,
-            system_prompt=sys_prompt,
-            history_messages=query_param.conversation_history,
-            enable_cot=True,
-            stream=query_param.stream,
-        )
+        with trace_span("llm"):
+            response = await use_model_func(
+                user_query,
+                system_prompt=sys_prompt,
+                history_messages=query_param.conversation_history,
+                enable_cot=True,
+                stream=query_param.stream,
+            )
 
         if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
             queryparam_dict = {
@@ -7,6 +7,7 @@ PROMPTS: dict[str, Any] = {}
 # All delimiters must be formatted as "<|UPPER_CASE_STRING|>"
 PROMPTS["DEFAULT_TUPLE_DELIMITER"] = "<|#|>"
 PROMPTS["DEFAULT_COMPLETION_DELIMITER"] = "<|COMPLETE|>"
+PROMPTS["DEFAULT_SECTION_DELIMITER"] = "<|SECTION|>"
 
 PROMPTS["entity_extraction_system_prompt"] = """---Role---
 You are a Knowledge Graph Specialist responsible for extracting entities and relationships from the input text.
@@ -80,6 +81,20 @@ Extract entities and relationships from the input text to be processed.
 <Output>
 """
 
+PROMPTS["entity_extraction_packed_user_prompt"] = """---Task---
+Extract entities and relationships from the input text to be processed. The input text consists of {section_count} independent sections, each one starting with a line `{section_delimiter}<number>`.
+
+---Instructions---
+1.  **One Section at a Time:** Extract every section on its own, as if it were the only input text. Before the entities and relationships of a section, output the line `{section_delimiter}<number>` with the number of that section. Output all sections in order, including the marker line of sections without any entity.
+2.  **No Cross-Section Relationships:** Only output relationships between entities extracted from the same section.
+3.  **Strict Adherence to Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system prompt.
+4.  **Output Content Only:** Output *only* the section marker lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+5.  **Completion Signal:** Output `{completion_delimiter}` once, as the final line after all sections have been extracted and presented.
+6.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+<Output>
+"""
+
 PROMPTS["entity_continue_extraction_user_prompt"] = """---Task---
 Based on the last extraction task, identify and extract any **missed or incorrectly formatted** entities and relationships from the input text.
 
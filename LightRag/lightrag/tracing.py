@@ -0,0 +1,238 @@
+"""
+Lightweight per-query tracing for the retrieval pipeline.
+
+Stages of a query are wrapped in spans (``trace_span`` / ``traced``). Every
+finished span is folded into a process-wide latency histogram per stage, and,
+when a ``query_trace`` is active, also recorded on that trace so its timings
+can be returned in the query response metadata.
+
+Traces are carried in a ContextVar, so spans opened in tasks created by
+asyncio.gather are attributed to the query that spawned them without passing
+any state through function signatures.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+# Upper bounds in seconds, roughly doubling from 1ms to 1 minute
+QUERY_STAGE_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_METRIC_NAME = "lightrag_query_stage_duration_seconds"
+
+
+@dataclass
+class QueryTrace:
+    """Spans recorded while serving a single query"""
+
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[dict[str, Any]] = field(default_factory=list)
+    finished: float | None = None
+
+    def add_span(
+        self, name: str, parent: str | None, start: float, duration: float
+    ) -> None:
+        self.spans.append(
+            {
+                "name": name,
+                "parent": parent,
+                "start_ms": round((start - self.started) * 1000, 3),
+                "duration_ms": round(duration * 1000, 3),
+            }
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize the trace for response metadata
+
+        stages sums the spans of each stage, since a stage such as graph_read
+        can run several times (local and global search) within one query.
+        """
+        end = self.finished if self.finished is not None else time.perf_counter()
+        stages: dict[str, dict[str, Any]] = {}
+        for span in self.spans:
+            stage = stages.setdefault(span["name"], {"duration_ms": 0.0, "count": 0})
+            stage["duration_ms"] = round(stage["duration_ms"] + span["duration_ms"], 3)
+            stage["count"] += 1
+        return {
+            "total_ms": round((end - self.started) * 1000, 3),
+            "stages": stages,
+            "spans": sorted(self.spans, key=lambda span: span["start_ms"]),
+        }
+
+
+class StageHistogram:
+    """Cumulative latency histogram with fixed buckets, Prometheus style"""
+
+    def __init__(self, buckets: tuple[float, ...] = QUERY_STAGE_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside the matching bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound
+        # Observation beyond the last finite bucket
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum * 1000, 3),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "buckets": buckets,
+        }
+
+
+_current_trace: ContextVar[QueryTrace | None] = ContextVar(
+    "lightrag_query_trace", default=None
+)
+_current_span: ContextVar[str | None] = ContextVar("lightrag_query_span", default=None)
+_histograms: dict[str, StageHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _observe(name: str, seconds: float) -> None:
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = StageHistogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def query_trace() -> Iterator[QueryTrace]:
+    """Collect the spans of one query; nested query_trace calls share the outer trace"""
+    existing = _current_trace.get()
+    if existing is not None:
+        yield existing
+        return
+
+    trace = QueryTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finished = time.perf_counter()
+        _current_trace.reset(token)
+
+
+@contextmanager
+def trace_span(name: str) -> Iterator[None]:
+    """Time a query stage, recording it on the active trace and stage histogram"""
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        _observe(name, duration)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(name, parent, start, duration)
+
+
+def traced(name: str):
+    """Decorator wrapping a coroutine function in trace_span(name)"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with trace_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_stage_histograms() -> dict[str, dict[str, Any]]:
+    """Return a JSON-serializable snapshot of all stage histograms"""
+    with _histograms_lock:
+        return {
+            name: histogram.snapshot()
+            for name, histogram in sorted(_histograms.items())
+        }
+
+
+def reset_stage_histograms() -> None:
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def render_prometheus() -> str:
+    """Render the stage histograms in the Prometheus text exposition format
+
+    Histograms are per process: with several API workers each worker exposes
+    its own series.
+    """
+    lines = [
+        f"# HELP {_METRIC_NAME} Duration of LightRAG query pipeline stages.",
+        f"# TYPE {_METRIC_NAME} histogram",
+    ]
+    with _histograms_lock:
+        for name, histogram in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{_METRIC_NAME}_bucket{{stage="{name}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'{_METRIC_NAME}_bucket{{stage="{name}",le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f'{_METRIC_NAME}_sum{{stage="{name}"}} {histogram.sum}')
+            lines.append(f'{_METRIC_NAME}_count{{stage="{name}"}} {histogram.count}')
+    return "\n".join(lines) + "\n"
@@ -3,7 +3,6 @@ import weakref
 
 import asyncio
 import html
-import csv
 import json
 import logging
 import logging.handlers
@@ -13,7 +12,7 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
 from hashlib import md5
 from typing import (
     Any,
@@ -39,6 +38,7 @@ from lightrag.constants import (
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
 )
+from lightrag.tracing import traced
 
 # Initialize logger with basic configuration
 logger = logging.getLogger("lightrag")
@@ -56,18 +56,26 @@ if not logger.handlers:
 # Set httpx logging level to WARNING
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-# Global import for pypinyin with startup-time logging
-try:
-    import pypinyin
-
-    _PYPINYIN_AVAILABLE = True
-    # logger.info("pypinyin loaded successfully for Chinese pinyin sorting")
-except ImportError:
-    pypinyin = None
-    _PYPINYIN_AVAILABLE = False
-    logger.warning(
-        "pypinyin is not installed. Chinese pinyin sorting will use simple string sorting."
-    )
+# pypinyin loads its phrase dictionaries on import (a few hundred ms), so it is
+# only imported the first time a pinyin sort key is needed
+_pypinyin = None
+_PYPINYIN_AVAILABLE: bool | None = None
+
+
+def _load_pypinyin():
+    global _pypinyin, _PYPINYIN_AVAILABLE
+    if _PYPINYIN_AVAILABLE is None:
+        try:
+            import pypinyin
+
+            _pypinyin = pypinyin
+            _PYPINYIN_AVAILABLE = True
+        except ImportError:
+            _PYPINYIN_AVAILABLE = False
+            logger.warning(
+                "pypinyin is not installed. Chinese pinyin sorting will use simple string sorting."
+            )
+    return _pypinyin
 
 
 async def safe_vdb_operation_with_exception(
@@ -169,6 +177,7 @@ def get_env_value(
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
     from lightrag.base import BaseKVStorage, BaseVectorStorage, QueryParam
+    from lightrag.kg.extraction_cache import SharedExtractionCache
 
 # use the .env that is inside the current folder
 # allows to use different .env file for each lightrag instance
@@ -986,6 +995,69 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def token_offsets(self, content: str, tokens: List[int]) -> Sequence[int] | None:
+        """
+        Maps token boundaries of an encoded string back to character offsets.
+
+        Lets callers slice ``content`` instead of decoding token windows: for
+        every ``i <= j`` with ``offsets[i] >= 0`` and ``offsets[j] >= 0``,
+        ``decode(tokens[i:j]) == content[offsets[i]:offsets[j]]``. A boundary
+        falling inside a character (byte-level BPE splitting a multi-byte
+        UTF-8 sequence) is reported as -1, windows touching it must be decoded.
+
+        The underlying tokenizer may provide its own ``token_offsets(content,
+        tokens)``; tiktoken encodings are supported through their per-token
+        bytes.
+
+        Args:
+            content: The string that was encoded.
+            tokens: The result of ``encode(content)``.
+
+        Returns:
+            ``len(tokens) + 1`` offsets (a list or numpy array), or None when
+            the tokenizer cannot map its tokens back to the string (e.g. lossy
+            tokenizers).
+        """
+        custom = getattr(self.tokenizer, "token_offsets", None)
+        if custom is not None:
+            return custom(content, tokens)
+
+        token_bytes = getattr(self.tokenizer, "decode_single_token_bytes", None)
+        if token_bytes is None:
+            return None
+        try:
+            raw = content.encode("utf-8")
+        except UnicodeEncodeError:
+            return None
+
+        ids = np.fromiter(tokens, dtype=np.int64, count=len(tokens))
+        byte_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        if len(ids):
+            # Byte length per token id, filled lazily: documents reuse few ids
+            lengths = getattr(self, "_token_byte_lengths", None)
+            size = int(ids.max()) + 1
+            if lengths is None or len(lengths) < size:
+                grown = np.full(max(size, 1024), -1, dtype=np.int64)
+                if lengths is not None:
+                    grown[: len(lengths)] = lengths
+                lengths = self._token_byte_lengths = grown
+            for token in np.unique(ids[lengths[ids] < 0]).tolist():
+                lengths[token] = len(token_bytes(token))
+            np.cumsum(lengths[ids], out=byte_offsets[1:])
+        if byte_offsets[-1] != len(raw):
+            return None
+
+        if len(raw) == len(content):
+            # ASCII only: byte and character offsets are the same
+            return byte_offsets
+
+        data = np.frombuffer(raw, dtype=np.uint8)
+        # UTF-8 continuation bytes are 0b10xxxxxx, the end of the string is a boundary
+        is_char_start = np.append((data & 0xC0) != 0x80, True)
+        char_offsets = np.zeros(len(raw) + 1, dtype=np.int32)
+        np.cumsum(is_char_start[:-1], dtype=np.int32, out=char_offsets[1:])
+        return np.where(is_char_start[byte_offsets], char_offsets[byte_offsets], -1)
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1033,6 +1105,34 @@ def split_string_by_multi_markers(content: str, markers: list[str]) -> list[str]
     return [r.strip() for r in results if r.strip()]
 
 
+# Distinct source_id/file_path strings whose parsed form is kept. Hub entities
+# are hit by most queries, so a few thousand entries cover the hot set
+GRAPH_FIELD_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=GRAPH_FIELD_CACHE_SIZE)
+def _split_graph_field(value: str) -> tuple[str, ...]:
+    return tuple(
+        dict.fromkeys(
+            part for part in map(str.strip, value.split(GRAPH_FIELD_SEP)) if part
+        )
+    )
+
+
+def split_graph_field(value: str | None) -> tuple[str, ...]:
+    """Parse a GRAPH_FIELD_SEP-joined node/edge field such as source_id or file_path
+
+    Returns the stripped, deduplicated items in their original order. Results
+    are cached by field content, so the same node or edge read again by later
+    queries (from any graph storage) is not re-split; a changed field is a new
+    cache key, so stale entries never need invalidating. The returned tuple is
+    shared between callers and must not be modified.
+    """
+    if not value:
+        return ()
+    return _split_graph_field(value if isinstance(value, str) else str(value))
+
+
 def is_float_regex(value: str) -> bool:
     return bool(re.match(r"^[-+]?[0-9]*\.?[0-9]+$", value))
 
@@ -1217,6 +1317,7 @@ async def aexport_data(
     output_path: str,
     file_format: str = "csv",
     include_vector_data: bool = False,
+    progress_callback: Callable[[str, int, int], None] | None = None,
 ) -> None:
     """
     Asynchronously exports all entities, relations, and relationships to various formats.
@@ -1226,83 +1327,76 @@ async def aexport_data(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
-            - csv: Comma-separated values file
+        file_format: Output format - "csv", "jsonl", "parquet", "excel", "md", "txt".
+            - csv: Comma-separated values file (streamed)
+            - jsonl: JSON Lines file, one entity/relation per line (streamed)
+            - parquet: One Parquet file per table (streamed)
             - excel: Microsoft Excel file with multiple sheets
             - md: Markdown tables
             - txt: Plain text formatted output
         include_vector_data: Whether to include data from the vector database.
+        progress_callback: Optional callable(stage, processed, total) for streamed formats
     """
+    from lightrag.utils_export import (
+        STREAMING_EXPORT_FORMATS,
+        astream_export_data,
+        iter_entity_rows,
+        iter_relation_rows,
+    )
+
+    # Streamed formats write page by page and never hold the whole graph in memory
+    if file_format in STREAMING_EXPORT_FORMATS:
+        await astream_export_data(
+            chunk_entity_relation_graph,
+            entities_vdb,
+            relationships_vdb,
+            output_path,
+            file_format,
+            include_vector_data,
+            progress_callback=progress_callback,
+        )
+        print(f"Data exported to: {output_path} with format: {file_format}")
+        return
+
     # Collect data
     entities_data = []
     relations_data = []
     relationships_data = []
-
-    # --- Entities ---
     all_entities = await chunk_entity_relation_graph.get_all_labels()
-    for entity_name in all_entities:
-        # Get entity information from graph
-        node_data = await chunk_entity_relation_graph.get_node(entity_name)
-        source_id = node_data.get("source_id") if node_data else None
-
-        entity_info = {
-            "graph_data": node_data,
-            "source_id": source_id,
-        }
 
-        # Optional: Get vector database information
-        if include_vector_data:
-            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
-            vector_data = await entities_vdb.get_by_id(entity_id)
-            entity_info["vector_data"] = vector_data
-
-        entity_row = {
-            "entity_name": entity_name,
-            "source_id": source_id,
-            "graph_data": str(
-                entity_info["graph_data"]
-            ),  # Convert to string to ensure compatibility
-        }
-        if include_vector_data and "vector_data" in entity_info:
-            entity_row["vector_data"] = str(entity_info["vector_data"])
-        entities_data.append(entity_row)
+    # --- Entities ---
+    async for rows in iter_entity_rows(
+        chunk_entity_relation_graph, entities_vdb, all_entities, include_vector_data
+    ):
+        for row in rows:
+            entity_row = {
+                "entity_name": row["entity_name"],
+                "source_id": row["source_id"],
+                "graph_data": str(
+                    row["graph_data"]
+                ),  # Convert to string to ensure compatibility
+            }
+            if include_vector_data:
+                entity_row["vector_data"] = str(row["vector_data"])
+            entities_data.append(entity_row)
 
     # --- Relations ---
-    for src_entity in all_entities:
-        for tgt_entity in all_entities:
-            if src_entity == tgt_entity:
-                continue
-
-            edge_exists = await chunk_entity_relation_graph.has_edge(
-                src_entity, tgt_entity
-            )
-            if edge_exists:
-                # Get edge information from graph
-                edge_data = await chunk_entity_relation_graph.get_edge(
-                    src_entity, tgt_entity
-                )
-                source_id = edge_data.get("source_id") if edge_data else None
-
-                relation_info = {
-                    "graph_data": edge_data,
-                    "source_id": source_id,
-                }
-
-                # Optional: Get vector database information
-                if include_vector_data:
-                    rel_id = compute_mdhash_id(src_entity + tgt_entity, prefix="rel-")
-                    vector_data = await relationships_vdb.get_by_id(rel_id)
-                    relation_info["vector_data"] = vector_data
-
-                relation_row = {
-                    "src_entity": src_entity,
-                    "tgt_entity": tgt_entity,
-                    "source_id": relation_info["source_id"],
-                    "graph_data": str(relation_info["graph_data"]),  # Convert to string
-                }
-                if include_vector_data and "vector_data" in relation_info:
-                    relation_row["vector_data"] = str(relation_info["vector_data"])
-                relations_data.append(relation_row)
+    async for rows in iter_relation_rows(
+        chunk_entity_relation_graph,
+        relationships_vdb,
+        all_entities,
+        include_vector_data,
+    ):
+        for row in rows:
+            relation_row = {
+                "src_entity": row["src_entity"],
+                "tgt_entity": row["tgt_entity"],
+                "source_id": row["source_id"],
+                "graph_data": str(row["graph_data"]),  # Convert to string
+            }
+            if include_vector_data:
+                relation_row["vector_data"] = str(row["vector_data"])
+            relations_data.append(relation_row)
 
     # --- Relationships (from VectorDB) ---
     all_relationships = await relationships_vdb.client_storage
@@ -1315,35 +1409,7 @@ async def aexport_data(
         )
 
     # Export based on format
-    if file_format == "csv":
-        # CSV export
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            # Entities
-            if entities_data:
-                csvfile.write("# ENTITIES\n")
-                writer = csv.DictWriter(csvfile, fieldnames=entities_data[0].keys())
-                writer.writeheader()
-                writer.writerows(entities_data)
-                csvfile.write("\n\n")
-
-            # Relations
-            if relations_data:
-                csvfile.write("# RELATIONS\n")
-                writer = csv.DictWriter(csvfile, fieldnames=relations_data[0].keys())
-                writer.writeheader()
-                writer.writerows(relations_data)
-                csvfile.write("\n\n")
-
-            # Relationships
-            if relationships_data:
-                csvfile.write("# RELATIONSHIPS\n")
-                writer = csv.DictWriter(
-                    csvfile, fieldnames=relationships_data[0].keys()
-                )
-                writer.writeheader()
-                writer.writerows(relationships_data)
-
-    elif file_format == "excel":
+    if file_format == "excel":
         # Excel export
         import pandas as pd
 
@@ -1505,7 +1571,7 @@ async def aexport_data(
 
     else:
         raise ValueError(
-            f"Unsupported file format: {file_format}. Choose from: csv, excel, md, txt"
+            f"Unsupported file format: {file_format}. Choose from: csv, jsonl, parquet, excel, md, txt"
         )
     if file_format is not None:
         print(f"Data exported to: {output_path} with format: {file_format}")
@@ -1520,6 +1586,7 @@ def export_data(
     output_path: str,
     file_format: str = "csv",
     include_vector_data: bool = False,
+    progress_callback: Callable[[str, int, int], None] | None = None,
 ) -> None:
     """
     Synchronously exports all entities, relations, and relationships to various formats.
@@ -1529,12 +1596,16 @@ def export_data(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
-            - csv: Comma-separated values file
+        file_format: Output format - "csv", "jsonl", "parquet", "excel", "md", "txt".
+            - csv: Comma-separated values file (streamed)
+            - jsonl: JSON Lines file, one entity/relation per line (streamed)
+            - parquet: One Parquet file per table (streamed)
             - excel: Microsoft Excel file with multiple sheets
             - md: Markdown tables
             - txt: Plain text formatted output
         include_vector_data: Whether to include data from the vector database.
+        progress_callback: Optional callable(stage, processed, total) reporting
+            progress of streamed formats.
     """
     try:
         loop = asyncio.get_event_loop()
@@ -1550,6 +1621,7 @@ def export_data(
             output_path,
             file_format,
             include_vector_data,
+            progress_callback=progress_callback,
         )
     )
 
@@ -1623,6 +1695,31 @@ def remove_think_tags(text: str) -> str:
     ).strip()
 
 
+def _llm_cache_prompt(
+    safe_user_prompt: str, safe_system_prompt: str | None, history: str | None
+) -> str:
+    prompt_parts = []
+    if safe_user_prompt:
+        prompt_parts.append(safe_user_prompt)
+    if safe_system_prompt:
+        prompt_parts.append(safe_system_prompt)
+    if history:
+        prompt_parts.append(history)
+    return "\n".join(prompt_parts)
+
+
+def llm_cache_key(
+    user_prompt: str, system_prompt: str | None = None, cache_type: str = "extract"
+) -> str:
+    """Cache key use_llm_func_with_cache uses for a call without history messages"""
+    _prompt = _llm_cache_prompt(
+        sanitize_text_for_encoding(user_prompt),
+        sanitize_text_for_encoding(system_prompt) if system_prompt else None,
+        None,
+    )
+    return generate_cache_key("default", cache_type, compute_args_hash(_prompt))
+
+
 async def use_llm_func_with_cache(
     user_prompt: str,
     use_llm_func: callable,
@@ -1633,11 +1730,15 @@ async def use_llm_func_with_cache(
     cache_type: str = "extract",
     chunk_id: str | None = None,
     cache_keys_collector: list = None,
+    shared_cache: "SharedExtractionCache | None" = None,
+    shared_cache_key: str | None = None,
 ) -> tuple[str, int]:
     """Call LLM function with cache support and text sanitization
 
     If cache is available and enabled (determined by handle_cache based on mode),
     retrieve result from cache; otherwise call LLM function and save result to cache.
+    When a shared extraction cache and its content address are given, it is
+    consulted before the workspace cache and filled with every answer.
 
     This function applies text sanitization to prevent UTF-8 encoding errors for all LLM providers.
 
@@ -1651,6 +1752,8 @@ async def use_llm_func_with_cache(
         chunk_id: Chunk identifier to store in cache
         text_chunks_storage: Text chunks storage to update llm_cache_list
         cache_keys_collector: Optional list to collect cache keys for batch processing
+        shared_cache: Optional cache shared by all workspaces
+        shared_cache_key: Content address of this call in shared_cache
 
     Returns:
         tuple[str, int]: (LLM response text, timestamp)
@@ -1676,19 +1779,42 @@ async def use_llm_func_with_cache(
     else:
         history = None
 
-    if llm_response_cache:
-        prompt_parts = []
-        if safe_user_prompt:
-            prompt_parts.append(safe_user_prompt)
-        if safe_system_prompt:
-            prompt_parts.append(safe_system_prompt)
-        if history:
-            prompt_parts.append(history)
-        _prompt = "\n".join(prompt_parts)
+    if shared_cache is None or not shared_cache_key:
+        shared_cache = None
+
+    if llm_response_cache or shared_cache:
+        _prompt = _llm_cache_prompt(safe_user_prompt, safe_system_prompt, history)
 
         arg_hash = compute_args_hash(_prompt)
         # Generate cache key for this LLM call
         cache_key = generate_cache_key("default", cache_type, arg_hash)
+        save_to_workspace = bool(
+            llm_response_cache
+            and llm_response_cache.global_config.get(
+                "enable_llm_cache_for_entity_extract"
+            )
+        )
+
+        if shared_cache is not None:
+            shared_entry = await shared_cache.get(shared_cache_key)
+            if shared_entry is not None:
+                statistic_data["llm_cache"] += 1
+                content = shared_entry["return"]
+                # Keep the workspace cache complete, rebuilds after deletions read it
+                if save_to_workspace:
+                    await save_to_cache(
+                        llm_response_cache,
+                        CacheData(
+                            args_hash=arg_hash,
+                            content=content,
+                            prompt=_prompt,
+                            cache_type=cache_type,
+                            chunk_id=chunk_id,
+                        ),
+                    )
+                    if cache_keys_collector is not None:
+                        cache_keys_collector.append(cache_key)
+                return content, shared_entry.get("create_time", int(time.time()))
 
         cached_result = await handle_cache(
             llm_response_cache,
@@ -1706,6 +1832,13 @@ async def use_llm_func_with_cache(
             if cache_keys_collector is not None:
                 cache_keys_collector.append(cache_key)
 
+            if shared_cache is not None:
+                await shared_cache.put(
+                    shared_cache_key,
+                    content,
+                    tokens=shared_cache.count_tokens(_prompt, content),
+                    cache_type=cache_type,
+                )
             return content, timestamp
         statistic_data["llm_call"] += 1
 
@@ -1725,7 +1858,15 @@ async def use_llm_func_with_cache(
         # Generate timestamp for cache miss (LLM call completion time)
         current_timestamp = int(time.time())
 
-        if llm_response_cache.global_config.get("enable_llm_cache_for_entity_extract"):
+        if shared_cache is not None:
+            await shared_cache.put(
+                shared_cache_key,
+                res,
+                tokens=shared_cache.count_tokens(_prompt, res),
+                cache_type=cache_type,
+            )
+
+        if save_to_workspace:
             await save_to_cache(
                 llm_response_cache,
                 CacheData(
@@ -2305,6 +2446,7 @@ class TokenTracker:
         )
 
 
+@traced("rerank")
 async def apply_rerank_if_enabled(
     query: str,
     retrieved_docs: list[dict],
@@ -2679,7 +2821,8 @@ def get_pinyin_sort_key(text: str) -> str:
     if not text:
         return ""
 
-    if _PYPINYIN_AVAILABLE:
+    pypinyin = _load_pypinyin()
+    if pypinyin is not None:
         try:
             # Convert Chinese characters to pinyin, keep non-Chinese as-is
             pinyin_list = pypinyin.lazy_pinyin(text, style=pypinyin.Style.NORMAL)
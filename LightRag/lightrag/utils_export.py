@@ -0,0 +1,805 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from typing import Any, AsyncIterator, Callable
+
+from .constants import DEFAULT_EXPORT_BATCH_SIZE
+from .kg.read_cache import unwrap_storage
+from .utils import compute_mdhash_id, logger
+
+ENTITY_EXPORT_FIELDS = ["entity_name", "source_id", "graph_data"]
+RELATION_EXPORT_FIELDS = ["src_entity", "tgt_entity", "source_id", "graph_data"]
+RELATIONSHIP_EXPORT_FIELDS = ["relationship_id", "data"]
+STREAMING_EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def _pages(items: list[str], batch_size: int):
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def _owned_edge_pairs(
+    page: list[str], nodes_edges: dict[str, list[tuple[str, str]]]
+) -> list[tuple[str, str]]:
+    """Undirected edges of a page of nodes, each owned by its smaller endpoint"""
+    pairs: list[tuple[str, str]] = []
+    seen: set[tuple[str, str]] = set()
+    for node_id in page:
+        for src, tgt in nodes_edges.get(node_id) or []:
+            pair = (src, tgt) if str(src) <= str(tgt) else (tgt, src)
+            if pair[0] != node_id or pair in seen:
+                continue
+            seen.add(pair)
+            pairs.append(pair)
+    return pairs
+
+
+def _relation_vector_ids(pairs: list[tuple[str, str]]) -> list[str]:
+    """Relation vector ids of both directions, forward first, for every pair"""
+    # Relation vectors are keyed by the direction used at insert time
+    vector_ids: list[str] = []
+    for src, tgt in pairs:
+        vector_ids.append(compute_mdhash_id(src + tgt, prefix="rel-"))
+        vector_ids.append(compute_mdhash_id(tgt + src, prefix="rel-"))
+    return vector_ids
+
+
+async def iter_entity_rows(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    labels: list[str],
+    include_vector_data: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield entity rows page by page using batch graph and vector reads.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance
+        entities_vdb: Entity vector storage, only read if include_vector_data is set
+        labels: Entity names to export
+        include_vector_data: Whether to attach the vector storage record
+        batch_size: Number of entities fetched per round trip
+
+    Yields:
+        Lists of at most batch_size rows with raw graph_data/vector_data objects
+    """
+    for page in _pages(labels, batch_size):
+        nodes = await chunk_entity_relation_graph.get_nodes_batch(page)
+
+        vector_records: list[dict[str, Any] | None] = []
+        if include_vector_data:
+            vector_records = await entities_vdb.get_by_ids(
+                [compute_mdhash_id(name, prefix="ent-") for name in page]
+            )
+
+        rows = []
+        for i, entity_name in enumerate(page):
+            node_data = nodes.get(entity_name)
+            if node_data is None:
+                # Removed between listing labels and reading the page
+                continue
+            row = {
+                "entity_name": entity_name,
+                "source_id": node_data.get("source_id"),
+                "graph_data": node_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = (
+                    vector_records[i] if i < len(vector_records) else None
+                )
+            rows.append(row)
+        yield rows
+
+
+async def iter_relation_rows(
+    chunk_entity_relation_graph,
+    relationships_vdb,
+    labels: list[str],
+    include_vector_data: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield relation rows page by page, emitting every undirected edge once.
+
+    Edges are discovered per page of nodes with get_nodes_edges_batch. An edge
+    is owned by its lexicographically smaller endpoint, so it is emitted exactly
+    once without keeping a global set of seen edges.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance
+        relationships_vdb: Relation vector storage, only read if include_vector_data is set
+        labels: Entity names whose edges should be exported
+        include_vector_data: Whether to attach the vector storage record
+        batch_size: Number of nodes scanned per round trip
+
+    Yields:
+        Lists of rows with raw graph_data/vector_data objects
+    """
+    for page in _pages(labels, batch_size):
+        nodes_edges = await chunk_entity_relation_graph.get_nodes_edges_batch(page)
+        pairs = _owned_edge_pairs(page, nodes_edges)
+        if not pairs:
+            yield []
+            continue
+
+        edges = await chunk_entity_relation_graph.get_edges_batch(
+            [{"src": src, "tgt": tgt} for src, tgt in pairs]
+        )
+
+        vector_records: list[dict[str, Any] | None] = []
+        if include_vector_data:
+            vector_records = await relationships_vdb.get_by_ids(
+                _relation_vector_ids(pairs)
+            )
+
+        rows = []
+        for i, (src, tgt) in enumerate(pairs):
+            edge_data = edges.get((src, tgt)) or edges.get((tgt, src))
+            if edge_data is None:
+                continue
+            row = {
+                "src_entity": src,
+                "tgt_entity": tgt,
+                "source_id": edge_data.get("source_id"),
+                "graph_data": edge_data,
+            }
+            if include_vector_data:
+                forward = vector_records[2 * i] if 2 * i < len(vector_records) else None
+                reverse = (
+                    vector_records[2 * i + 1]
+                    if 2 * i + 1 < len(vector_records)
+                    else None
+                )
+                row["vector_data"] = forward or reverse
+            rows.append(row)
+        yield rows
+
+
+async def iter_relationship_rows(
+    chunk_entity_relation_graph,
+    relationships_vdb,
+    labels: list[str],
+    include_vector_data: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield the relation vector records page by page, as in the legacy CSV export.
+
+    The legacy export listed the whole relationships vector storage in its
+    RELATIONSHIPS section. The records are looked up by the ids of the graph
+    edges instead, so no backend specific full scan is needed.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance
+        relationships_vdb: Relation vector storage
+        labels: Entity names whose edges should be exported
+        include_vector_data: Unused, the records are the content of this section
+        batch_size: Number of nodes scanned per round trip
+
+    Yields:
+        Lists of rows with the vector record id and the raw record
+    """
+    for page in _pages(labels, batch_size):
+        nodes_edges = await chunk_entity_relation_graph.get_nodes_edges_batch(page)
+        pairs = _owned_edge_pairs(page, nodes_edges)
+        records = (
+            await relationships_vdb.get_by_ids(_relation_vector_ids(pairs))
+            if pairs
+            else []
+        )
+        yield [
+            {"relationship_id": record.get("id"), "data": record}
+            for record in records
+            if record
+        ]
+
+
+def _encode_value(value: Any) -> Any:
+    """Serialize nested structures as JSON so rows stay flat and parseable"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+class _CsvExportWriter:
+    """Single CSV file with one titled section per table, like the legacy export"""
+
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", newline="", encoding="utf-8")
+        self._writer: csv.DictWriter | None = None
+        self._sections = 0
+
+    def begin_section(self, name: str, fieldnames: list[str]) -> None:
+        if self._sections:
+            self._file.write("\n\n")
+        self._file.write(f"# {name.upper()}\n")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        self._writer.writeheader()
+        self._sections += 1
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows(
+            {k: _encode_value(v) for k, v in row.items()} for row in rows
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    @property
+    def paths(self) -> list[str]:
+        return [self._file.name]
+
+
+_JSONL_RECORD_TYPES = {"entities": "entity", "relations": "relation"}
+
+
+class _JsonlExportWriter:
+    """Single JSON Lines file, each record tagged with its table name"""
+
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", encoding="utf-8")
+        self._record_type = ""
+
+    def begin_section(self, name: str, fieldnames: list[str]) -> None:
+        self._record_type = _JSONL_RECORD_TYPES[name]
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        for row in rows:
+            self._file.write(
+                json.dumps(
+                    {"type": self._record_type, **row},
+                    ensure_ascii=False,
+                    default=str,
+                )
+            )
+            self._file.write("\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    @property
+    def paths(self) -> list[str]:
+        return [self._file.name]
+
+
+class _ParquetExportWriter:
+    """One Parquet file per table, written one row group per page"""
+
+    def __init__(self, output_path: str):
+        import pipmaster as pm
+
+        if not pm.is_installed("pyarrow"):
+            pm.install("pyarrow")
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self._base_path = os.path.splitext(output_path)[0]
+        self._writer = None
+        self._schema = None
+        self._paths: list[str] = []
+
+    def begin_section(self, name: str, fieldnames: list[str]) -> None:
+        self._close_writer()
+        path = f"{self._base_path}_{name}.parquet"
+        self._schema = self._pa.schema(
+            [(field_name, self._pa.string()) for field_name in fieldnames]
+        )
+        self._writer = self._pq.ParquetWriter(path, self._schema)
+        self._paths.append(path)
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        columns = {
+            field_name: [
+                None
+                if row.get(field_name) is None
+                else str(_encode_value(row.get(field_name)))
+                for row in rows
+            ]
+            for field_name in self._schema.names
+        }
+        self._writer.write_table(
+            self._pa.Table.from_pydict(columns, schema=self._schema)
+        )
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self) -> None:
+        self._close_writer()
+
+    @property
+    def paths(self) -> list[str]:
+        return self._paths
+
+
+_EXPORT_WRITERS = {
+    "csv": _CsvExportWriter,
+    "jsonl": _JsonlExportWriter,
+    "parquet": _ParquetExportWriter,
+}
+
+
+async def astream_export_data(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    output_path: str,
+    file_format: str = "csv",
+    include_vector_data: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    progress_callback: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """Export entities and relations incrementally with bounded memory.
+
+    Nodes are read in pages of batch_size through the batch graph APIs and
+    written out before the next page is fetched. Only the list of entity
+    names is held for the whole export.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance for entities and relations
+        entities_vdb: Vector database storage for entities
+        relationships_vdb: Vector database storage for relationships
+        output_path: The path to the output file (including extension).
+            For parquet, "<name>_entities.parquet" and "<name>_relations.parquet"
+            are written next to it.
+        file_format: Output format - "csv", "jsonl" or "parquet". csv keeps
+            the legacy trailing RELATIONSHIPS section with the raw relation
+            vector records when relationships_vdb is given.
+        include_vector_data: Whether to include data from the vector database.
+        batch_size: Number of entities read and written per page
+        progress_callback: Optional callable(stage, processed, total) invoked
+            after each page, stage being "entities", "relations" or
+            "relationships"
+
+    Returns:
+        dict with the number of exported rows per section and written file paths
+    """
+    if file_format not in _EXPORT_WRITERS:
+        raise ValueError(
+            f"Unsupported streaming export format: {file_format}. "
+            f"Choose from: {', '.join(STREAMING_EXPORT_FORMATS)}"
+        )
+    batch_size = max(1, batch_size)
+
+    labels = await chunk_entity_relation_graph.get_all_labels()
+    total = len(labels)
+    vector_fields = ["vector_data"] if include_vector_data else []
+    stages = [
+        (
+            "entities",
+            ENTITY_EXPORT_FIELDS + vector_fields,
+            iter_entity_rows,
+            entities_vdb,
+        ),
+        (
+            "relations",
+            RELATION_EXPORT_FIELDS + vector_fields,
+            iter_relation_rows,
+            relationships_vdb,
+        ),
+    ]
+    if file_format == "csv" and relationships_vdb is not None:
+        # Keep the trailing RELATIONSHIPS section of the legacy CSV layout
+        stages.append(
+            (
+                "relationships",
+                RELATIONSHIP_EXPORT_FIELDS,
+                iter_relationship_rows,
+                relationships_vdb,
+            )
+        )
+    counts = {stage: 0 for stage, *_ in stages}
+
+    writer = _EXPORT_WRITERS[file_format](output_path)
+    try:
+        for stage, fieldnames, iter_rows, vdb in stages:
+            writer.begin_section(stage, fieldnames)
+            processed = 0
+            async for rows in iter_rows(
+                chunk_entity_relation_graph,
+                vdb,
+                labels,
+                include_vector_data,
+                batch_size,
+            ):
+                if rows:
+                    writer.write_rows(rows)
+                    counts[stage] += len(rows)
+                processed = min(total, processed + batch_size)
+                if progress_callback is not None:
+                    progress_callback(stage, processed, total)
+                logger.debug(
+                    f"Export {stage}: {processed}/{total} nodes scanned, {counts[stage]} rows written"
+                )
+    finally:
+        writer.close()
+
+    logger.info(
+        f"Exported {counts['entities']} entities and {counts['relations']} relations "
+        f"to {', '.join(writer.paths)} ({file_format})"
+    )
+    return {**counts, "paths": writer.paths}
+
+
+# ---------------------------------------------------------------------------
+# Whole-workspace transfer
+# ---------------------------------------------------------------------------
+
+WORKSPACE_FORMAT_VERSION = 1
+WORKSPACE_MANIFEST_FILE = "manifest.json"
+
+# (file name, LightRAG storage attribute, record kind, key source), in import
+# order: the graph goes in before its vectors and doc_status goes in last, so
+# an interrupted import never marks a document processed without its data.
+WORKSPACE_SECTIONS: tuple[tuple[str, str, str, str], ...] = (
+    ("full_docs", "full_docs", "kv", "docs"),
+    ("text_chunks", "text_chunks", "kv", "chunks"),
+    ("chunk_extractions", "chunk_extractions", "kv", "chunks"),
+    ("llm_response_cache", "llm_response_cache", "kv", "llm_cache"),
+    ("full_entities", "full_entities", "kv", "docs"),
+    ("full_relations", "full_relations", "kv", "docs"),
+    ("entity_chunks", "entity_chunks", "kv", "entities"),
+    ("relation_chunks", "relation_chunks", "kv", "relation_chunk_keys"),
+    ("graph_nodes", "chunk_entity_relation_graph", "nodes", "entities"),
+    ("graph_edges", "chunk_entity_relation_graph", "edges", "relations"),
+    ("entities_vdb", "entities_vdb", "vector", "entity_vector_ids"),
+    ("relationships_vdb", "relationships_vdb", "vector", "relation_vector_ids"),
+    ("chunks_vdb", "chunks_vdb", "vector", "chunks"),
+    ("doc_status", "doc_status", "kv", "docs"),
+)
+
+# Fields storages add when reading a record, which must not be written back
+_KV_READ_FIELDS = {"_id"}
+_VECTOR_READ_FIELDS = {"id", "_id", "created_at", "distance", "vector"}
+
+
+def _import_pyarrow():
+    import pipmaster as pm
+
+    if not pm.is_installed("pyarrow"):
+        pm.install("pyarrow")
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    return pa, pq
+
+
+def _workspace_schema(pa, kind: str):
+    if kind == "edges":
+        fields = [("source", pa.string()), ("target", pa.string())]
+    else:
+        fields = [("id", pa.string())]
+    fields.append(("data", pa.string()))
+    if kind == "vector":
+        fields.append(("vector", pa.list_(pa.float32())))
+    return pa.schema(fields)
+
+
+def _clean_record(record: dict[str, Any], read_fields: set[str]) -> dict[str, Any]:
+    return {
+        k: v
+        for k, v in record.items()
+        if k not in read_fields and not k.startswith("__")
+    }
+
+
+def _as_list(vector: Any) -> list[float] | None:
+    return vector.tolist() if hasattr(vector, "tolist") else vector
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+async def _iter_relation_pairs(
+    chunk_entity_relation_graph, labels: list[str], batch_size: int
+) -> AsyncIterator[tuple[str, str]]:
+    """Yield every undirected edge once, owned by its smaller endpoint"""
+    for page in _pages(labels, batch_size):
+        nodes_edges = await chunk_entity_relation_graph.get_nodes_edges_batch(page)
+        for node_id in page:
+            seen: set[tuple[str, str]] = set()
+            for src, tgt in nodes_edges.get(node_id) or []:
+                pair = (src, tgt) if str(src) <= str(tgt) else (tgt, src)
+                if pair[0] != node_id or pair in seen:
+                    continue
+                seen.add(pair)
+                yield pair
+
+
+class _WorkspaceKeys:
+    """Record keys of a workspace, derived from the storages that reference them
+
+    Storages have no common "list all keys" call, so keys are discovered
+    the way the pipeline links records: documents from doc_status, chunks
+    from each document's chunks_list, extraction cache entries from each
+    chunk's llm_cache_list, and entities/relations from the graph.
+    """
+
+    def __init__(self, storages: dict[str, Any], batch_size: int):
+        self._storages = storages
+        self._batch_size = batch_size
+        self._docs: dict[str, Any] | None = None
+        self._labels: list[str] | None = None
+        self._pairs: list[tuple[str, str]] | None = None
+        self.llm_cache_ids: set[str] = set()
+
+    async def _load_docs(self) -> dict[str, Any]:
+        if self._docs is None:
+            from .base import DocStatus
+
+            self._docs = {}
+            for status in DocStatus:
+                self._docs.update(
+                    await self._storages["doc_status"].get_docs_by_status(status)
+                )
+        return self._docs
+
+    async def _load_labels(self) -> list[str]:
+        if self._labels is None:
+            graph = self._storages["chunk_entity_relation_graph"]
+            self._labels = sorted(await graph.get_all_labels())
+        return self._labels
+
+    async def _load_pairs(self) -> list[tuple[str, str]]:
+        if self._pairs is None:
+            graph = self._storages["chunk_entity_relation_graph"]
+            labels = await self._load_labels()
+            self._pairs = [
+                pair
+                async for pair in _iter_relation_pairs(graph, labels, self._batch_size)
+            ]
+        return self._pairs
+
+    async def get(self, source: str) -> list:
+        from .utils import make_relation_chunk_key
+
+        if source == "docs":
+            return list(await self._load_docs())
+        if source == "chunks":
+            docs = await self._load_docs()
+            return list(
+                dict.fromkeys(
+                    chunk_id
+                    for doc in docs.values()
+                    for chunk_id in (getattr(doc, "chunks_list", None) or [])
+                )
+            )
+        if source == "llm_cache":
+            return sorted(self.llm_cache_ids)
+        if source == "entities":
+            return await self._load_labels()
+        if source == "entity_vector_ids":
+            return [
+                compute_mdhash_id(name, prefix="ent-")
+                for name in await self._load_labels()
+            ]
+        if source == "relations":
+            return await self._load_pairs()
+        if source == "relation_chunk_keys":
+            return [make_relation_chunk_key(s, t) for s, t in await self._load_pairs()]
+        if source == "relation_vector_ids":
+            # Relation vectors are keyed by the direction used at insert time
+            return [
+                compute_mdhash_id(a + b, prefix="rel-")
+                for src, tgt in await self._load_pairs()
+                for a, b in ((src, tgt), (tgt, src))
+            ]
+        raise ValueError(f"Unknown workspace key source: {source}")
+
+
+async def _read_section_rows(storage, kind: str, page: list) -> list[dict[str, Any]]:
+    if kind == "kv":
+        values = await storage.get_by_ids(page)
+        return [
+            {"id": key, "data": _dumps(_clean_record(value, _KV_READ_FIELDS))}
+            for key, value in zip(page, values)
+            if value
+        ]
+    if kind == "vector":
+        records = await storage.get_by_ids(page)
+        vectors = await storage.get_vectors_by_ids(page)
+        return [
+            {
+                "id": key,
+                "data": _dumps(_clean_record(record, _VECTOR_READ_FIELDS)),
+                "vector": _as_list(vectors.get(key)),
+            }
+            for key, record in zip(page, records)
+            if record
+        ]
+    if kind == "nodes":
+        nodes = await storage.get_nodes_batch(page)
+        return [
+            {"id": node_id, "data": _dumps(nodes[node_id])}
+            for node_id in page
+            if nodes.get(node_id) is not None
+        ]
+    edges = await storage.get_edges_batch([{"src": s, "tgt": t} for s, t in page])
+    rows = []
+    for src, tgt in page:
+        edge = edges.get((src, tgt)) or edges.get((tgt, src))
+        if edge is not None:
+            rows.append({"source": src, "target": tgt, "data": _dumps(edge)})
+    return rows
+
+
+async def aexport_workspace(
+    storages: dict[str, Any],
+    output_dir: str,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    progress_callback: ProgressCallback | None = None,
+    manifest_extra: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Export every namespace of a workspace as one Parquet file each.
+
+    Records are read through the storage classes in pages of batch_size and
+    written as one row group per page, so any backend can be exported with
+    bounded memory (beyond the record keys). Vector records keep their
+    embeddings, so an import does not have to call the embedding model.
+
+    Args:
+        storages: Storage instances keyed by LightRAG attribute name
+            (full_docs, text_chunks, ..., chunk_entity_relation_graph, doc_status)
+        output_dir: Directory receiving "<section>.parquet" files and manifest.json
+        batch_size: Number of records read and written per page
+        progress_callback: Optional callable(section, processed, total) invoked
+            after each page
+        manifest_extra: Additional fields stored in the manifest
+
+    Returns:
+        The manifest, including the number of rows written per section
+    """
+    pa, pq = _import_pyarrow()
+    batch_size = max(1, batch_size)
+    os.makedirs(output_dir, exist_ok=True)
+    keys = _WorkspaceKeys(storages, batch_size)
+
+    sections: dict[str, Any] = {}
+    for name, attr, kind, key_source in WORKSPACE_SECTIONS:
+        storage = storages.get(attr)
+        if storage is None:
+            continue
+        schema = _workspace_schema(pa, kind)
+        section_keys = await keys.get(key_source)
+        total = len(section_keys)
+        written = 0
+        file_name = f"{name}.parquet"
+        writer = pq.ParquetWriter(os.path.join(output_dir, file_name), schema)
+        try:
+            for processed, page in enumerate(_pages(section_keys, batch_size), 1):
+                rows = await _read_section_rows(storage, kind, page)
+                if name == "text_chunks":
+                    for row in rows:
+                        keys.llm_cache_ids.update(
+                            json.loads(row["data"]).get("llm_cache_list") or []
+                        )
+                if rows:
+                    writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                    written += len(rows)
+                if progress_callback is not None:
+                    progress_callback(name, min(total, processed * batch_size), total)
+        finally:
+            writer.close()
+        sections[name] = {"file": file_name, "kind": kind, "rows": written}
+        logger.info(f"Workspace export {name}: {written} records")
+
+    manifest = {
+        "format_version": WORKSPACE_FORMAT_VERSION,
+        **(manifest_extra or {}),
+        "storages": {
+            attr: type(unwrap_storage(storages[attr])).__name__
+            for _, attr, _, _ in WORKSPACE_SECTIONS
+            if storages.get(attr) is not None
+        },
+        "sections": sections,
+    }
+    with open(
+        os.path.join(output_dir, WORKSPACE_MANIFEST_FILE), "w", encoding="utf-8"
+    ) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+async def _write_section_rows(
+    storage, kind: str, rows: list[dict[str, Any]], reuse_vectors: bool
+) -> None:
+    if kind == "kv":
+        await storage.upsert({row["id"]: json.loads(row["data"]) for row in rows})
+    elif kind == "nodes":
+        await storage.upsert_nodes_batch(
+            {row["id"]: json.loads(row["data"]) for row in rows}
+        )
+    elif kind == "edges":
+        await storage.upsert_edges_batch(
+            [(row["source"], row["target"], json.loads(row["data"])) for row in rows]
+        )
+    else:
+        data = {row["id"]: json.loads(row["data"]) for row in rows}
+        vectors = None
+        if reuse_vectors:
+            vectors = {
+                row["id"]: row["vector"]
+                for row in rows
+                if row.get("vector") is not None
+            }
+        await storage.upsert(data, vectors=vectors)
+
+
+async def aimport_workspace(
+    storages: dict[str, Any],
+    input_dir: str,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    reuse_vectors: bool = True,
+    progress_callback: ProgressCallback | None = None,
+) -> dict[str, int]:
+    """Load a workspace written by aexport_workspace into the given storages.
+
+    Each section is streamed back in batches of batch_size and written with
+    the storages' own batch upserts, so the target can be any configured
+    backend. Records are upserted, so importing into a non-empty workspace
+    merges into it and re-running an interrupted import is safe.
+
+    Args:
+        storages: Storage instances keyed by LightRAG attribute name
+        input_dir: Directory holding the exported Parquet files and manifest.json
+        batch_size: Number of records written per upsert call
+        reuse_vectors: Store the exported embeddings instead of re-embedding.
+            Disabled automatically when the embedding dimension differs.
+        progress_callback: Optional callable(section, processed, total) invoked
+            after each batch
+
+    Returns:
+        Number of records imported per section
+    """
+    _, pq = _import_pyarrow()
+    batch_size = max(1, batch_size)
+    with open(os.path.join(input_dir, WORKSPACE_MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != WORKSPACE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported workspace export version: {manifest.get('format_version')}"
+        )
+
+    counts: dict[str, int] = {}
+    for name, attr, kind, _ in WORKSPACE_SECTIONS:
+        storage = storages.get(attr)
+        section = manifest["sections"].get(name)
+        if storage is None or section is None:
+            if section is not None and section["rows"]:
+                logger.warning(f"Workspace import: no target storage for {name}")
+            continue
+
+        reuse = reuse_vectors
+        if kind == "vector" and reuse:
+            exported_dim = manifest.get("embedding_dim")
+            if exported_dim and exported_dim != storage.embedding_func.embedding_dim:
+                logger.warning(
+                    f"Workspace import {name}: embedding_dim {exported_dim} differs "
+                    f"from {storage.embedding_func.embedding_dim}, re-embedding"
+                )
+                reuse = False
+
+        parquet_file = pq.ParquetFile(os.path.join(input_dir, section["file"]))
+        total = parquet_file.metadata.num_rows
+        imported = 0
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            rows = batch.to_pylist()
+            await _write_section_rows(storage, kind, rows, reuse)
+            imported += len(rows)
+            if progress_callback is not None:
+                progress_callback(name, imported, total)
+        await storage.index_done_callback()
+        counts[name] = imported
+        logger.info(f"Workspace import {name}: {imported} records")
+    return counts
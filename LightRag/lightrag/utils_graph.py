@@ -309,27 +309,24 @@ async def _edit_entity_impl(
 
         relations_to_update = []
         relations_to_delete = []
-        edges = await chunk_entity_relation_graph.get_node_edges(entity_name)
-        if edges:
-            for source, target in edges:
-                edge_data = await chunk_entity_relation_graph.get_edge(source, target)
-                if edge_data:
-                    relations_to_delete.append(
-                        compute_mdhash_id(source + target, prefix="rel-")
-                    )
-                    relations_to_delete.append(
-                        compute_mdhash_id(target + source, prefix="rel-")
-                    )
-                    if source == entity_name:
-                        await chunk_entity_relation_graph.upsert_edge(
-                            new_entity_name, target, edge_data
-                        )
-                        relations_to_update.append((new_entity_name, target, edge_data))
-                    else:  # target == entity_name
-                        await chunk_entity_relation_graph.upsert_edge(
-                            source, new_entity_name, edge_data
-                        )
-                        relations_to_update.append((source, new_entity_name, edge_data))
+        edges = await chunk_entity_relation_graph.get_node_edges(entity_name) or []
+        edges_data = await chunk_entity_relation_graph.get_edges_batch(
+            [{"src": source, "tgt": target} for source, target in edges]
+        )
+        for source, target in edges:
+            edge_data = edges_data.get((source, target))
+            if edge_data:
+                relations_to_delete.append(
+                    compute_mdhash_id(source + target, prefix="rel-")
+                )
+                relations_to_delete.append(
+                    compute_mdhash_id(target + source, prefix="rel-")
+                )
+                if source == entity_name:
+                    relations_to_update.append((new_entity_name, target, edge_data))
+                else:  # target == entity_name
+                    relations_to_update.append((source, new_entity_name, edge_data))
+        await chunk_entity_relation_graph.upsert_edges_batch(relations_to_update)
 
         await chunk_entity_relation_graph.delete_node(entity_name)
 
@@ -338,6 +335,7 @@ async def _edit_entity_impl(
 
         await relationships_vdb.delete(relations_to_delete)
 
+        relation_data = {}
         for src, tgt, edge_data in relations_to_update:
             normalized_src, normalized_tgt = sorted([src, tgt])
 
@@ -352,18 +350,17 @@ async def _edit_entity_impl(
                 normalized_src + normalized_tgt, prefix="rel-"
             )
 
-            relation_data = {
-                relation_id: {
-                    "content": content,
-                    "src_id": normalized_src,
-                    "tgt_id": normalized_tgt,
-                    "source_id": source_id,
-                    "description": description,
-                    "keywords": keywords,
-                    "weight": weight,
-                }
+            relation_data[relation_id] = {
+                "content": content,
+                "src_id": normalized_src,
+                "tgt_id": normalized_tgt,
+                "source_id": source_id,
+                "description": description,
+                "keywords": keywords,
+                "weight": weight,
             }
 
+        if relation_data:
             await relationships_vdb.upsert(relation_data)
 
         entity_name = new_entity_name
@@ -448,26 +445,25 @@ async def _edit_entity_impl(
                 )
 
         if is_renaming and relation_chunks_storage is not None and relations_to_update:
+            # old storage key -> (new storage key, edge data) of every moved relation
+            migrations = {}
             for src, tgt, edge_data in relations_to_update:
                 old_src = original_entity_name if src == entity_name else src
                 old_tgt = original_entity_name if tgt == entity_name else tgt
 
-                old_normalized_src, old_normalized_tgt = sorted([old_src, old_tgt])
-                new_normalized_src, new_normalized_tgt = sorted([src, tgt])
-
-                old_storage_key = make_relation_chunk_key(
-                    old_normalized_src, old_normalized_tgt
-                )
-                new_storage_key = make_relation_chunk_key(
-                    new_normalized_src, new_normalized_tgt
-                )
-
+                old_storage_key = make_relation_chunk_key(old_src, old_tgt)
+                new_storage_key = make_relation_chunk_key(src, tgt)
                 if old_storage_key != new_storage_key:
-                    old_stored_data = await relation_chunks_storage.get_by_id(
-                        old_storage_key
-                    )
-                    relation_chunk_ids = []
-
+                    migrations[old_storage_key] = (new_storage_key, edge_data)
+
+            if migrations:
+                old_storage_keys = list(migrations)
+                old_stored = await relation_chunks_storage.get_by_ids(old_storage_keys)
+                chunk_updates = {}
+                for old_storage_key, old_stored_data in zip(
+                    old_storage_keys, old_stored
+                ):
+                    new_storage_key, edge_data = migrations[old_storage_key]
                     if old_stored_data and isinstance(old_stored_data, dict):
                         relation_chunk_ids = [
                             cid for cid in old_stored_data.get("chunk_ids", []) if cid
@@ -479,18 +475,15 @@ async def _edit_entity_impl(
                             for cid in relation_source_id.split(GRAPH_FIELD_SEP)
                             if cid
                         ]
-
-                    await relation_chunks_storage.delete([old_storage_key])
-
                     if relation_chunk_ids:
-                        await relation_chunks_storage.upsert(
-                            {
-                                new_storage_key: {
-                                    "chunk_ids": relation_chunk_ids,
-                                    "count": len(relation_chunk_ids),
-                                }
-                            }
-                        )
+                        chunk_updates[new_storage_key] = {
+                            "chunk_ids": relation_chunk_ids,
+                            "count": len(relation_chunk_ids),
+                        }
+
+                await relation_chunks_storage.delete(old_storage_keys)
+                if chunk_updates:
+                    await relation_chunks_storage.upsert(chunk_updates)
             logger.info(
                 f"Entity Edit: migrate {len(relations_to_update)} relations after rename"
             )
@@ -1159,40 +1152,49 @@ async def acreate_relation(
             raise
 
 
-async def _merge_entities_impl(
+def _validate_merge_groups(groups: list[tuple[list[str], str, dict[str, Any]]]) -> None:
+    """Reject merge groups that would touch the same entity twice.
+
+    Every entity may appear in at most one group, either as (one of) its
+    sources or as its target. A group's target may also be one of its own
+    sources, which is treated as merging into that entity.
+    """
+    owner: dict[str, int] = {}
+    for index, (source_entities, target_entity, _) in enumerate(groups):
+        if not source_entities:
+            raise ValueError(f"Merge into '{target_entity}' has no source entities")
+        for entity_name in {*source_entities, target_entity}:
+            if owner.setdefault(entity_name, index) != index:
+                raise ValueError(
+                    f"Entity '{entity_name}' appears in more than one merge group"
+                )
+
+
+async def _merge_entity_groups_impl(
     chunk_entity_relation_graph,
     entities_vdb,
     relationships_vdb,
-    source_entities: list[str],
-    target_entity: str,
+    groups: list[tuple[list[str], str, dict[str, Any]]],
     *,
     merge_strategy: dict[str, str] = None,
-    target_entity_data: dict[str, Any] = None,
     entity_chunks_storage=None,
     relation_chunks_storage=None,
-) -> dict[str, Any]:
-    """Internal helper that merges entities without acquiring storage locks.
+) -> list[str]:
+    """Internal helper that merges several entity groups in one bulk pass.
 
-    This function performs the actual entity merge operations without lock management.
-    It should only be called by public APIs that have already acquired necessary locks.
-
-    Args:
-        chunk_entity_relation_graph: Graph storage instance
-        entities_vdb: Vector database storage for entities
-        relationships_vdb: Vector database storage for relationships
-        source_entities: List of source entity names to merge
-        target_entity: Name of the target entity after merging
-        merge_strategy: Deprecated. Merge strategy for each field (optional)
-        target_entity_data: Dictionary of specific values to set for target entity (optional)
-        entity_chunks_storage: Optional KV storage for tracking chunks
-        relation_chunks_storage: Optional KV storage for tracking relation chunks
+    Each group is a (source_entities, target_entity, target_entity_data) tuple.
+    All involved nodes, edges and chunk tracking records are prefetched with the
+    batch storage APIs, the merged graph is computed in memory, and the result
+    is written back with one batch upsert/delete per storage, so the cost of a
+    merge no longer grows with one storage round trip per entity and relation.
 
     Returns:
-        Dictionary containing the merged entity information
+        The source entities removed from the graph, i.e. every source except
+        a group's own target
 
     Note:
         Caller must acquire appropriate locks before calling this function.
-        All source entities and the target entity should be locked together.
+        All source and target entities of all groups should be locked together.
     """
     # Default merge strategy for entities
     default_entity_merge_strategy = {
@@ -1210,88 +1212,100 @@ async def _merge_entities_impl(
             **default_entity_merge_strategy,
             **merge_strategy,
         }
-    target_entity_data = {} if target_entity_data is None else target_entity_data
-
-    # 1. Check if all source entities exist
-    source_entities_data = {}
-    for entity_name in source_entities:
-        node_exists = await chunk_entity_relation_graph.has_node(entity_name)
-        if not node_exists:
-            raise ValueError(f"Source entity '{entity_name}' does not exist")
-        node_data = await chunk_entity_relation_graph.get_node(entity_name)
-        source_entities_data[entity_name] = node_data
-
-    # 2. Check if target entity exists and get its data if it does
-    target_exists = await chunk_entity_relation_graph.has_node(target_entity)
-    existing_target_entity_data = {}
-    if target_exists:
-        existing_target_entity_data = await chunk_entity_relation_graph.get_node(
-            target_entity
+    _validate_merge_groups(groups)
+
+    # 1. Prefetch all source and target nodes in one call
+    involved_entities = list(
+        dict.fromkeys(
+            name
+            for source_entities, target_entity, _ in groups
+            for name in [*source_entities, target_entity]
         )
-
-    # 3. Merge entity data
-    merged_entity_data = _merge_attributes(
-        list(source_entities_data.values())
-        + ([existing_target_entity_data] if target_exists else []),
-        effective_entity_merge_strategy,
-        filter_none_only=False,  # Use entity behavior: filter falsy values
     )
-
-    # Apply any explicitly provided target entity data (overrides merged data)
-    for key, value in target_entity_data.items():
-        merged_entity_data[key] = value
-
-    # 4. Get all relationships of the source entities and target entity (if exists)
-    all_relations = []
-    entities_to_collect = source_entities.copy()
-
-    # If target entity exists and not already in source_entities, add it
-    if target_exists and target_entity not in source_entities:
-        entities_to_collect.append(target_entity)
-
+    nodes = await chunk_entity_relation_graph.get_nodes_batch(involved_entities)
+    for source_entities, _, _ in groups:
+        for entity_name in source_entities:
+            if entity_name not in nodes:
+                raise ValueError(f"Source entity '{entity_name}' does not exist")
+
+    # 2. Merge entity data of every group and map each source to its target
+    rename: dict[str, str] = {}
+    existing_targets: set[str] = set()
+    merged_entities: dict[str, dict[str, Any]] = {}
+    for source_entities, target_entity, target_entity_data in groups:
+        target_exists = target_entity in nodes
+        if target_exists:
+            existing_targets.add(target_entity)
+        merged_entity_data = _merge_attributes(
+            [nodes[entity_name] for entity_name in source_entities]
+            + ([nodes[target_entity]] if target_exists else []),
+            effective_entity_merge_strategy,
+            filter_none_only=False,  # Use entity behavior: filter falsy values
+        )
+        # Explicitly provided target entity data overrides merged data
+        merged_entity_data.update(target_entity_data or {})
+        merged_entity_data["entity_id"] = target_entity
+        merged_entities[target_entity] = merged_entity_data
+        for entity_name in source_entities:
+            rename[entity_name] = target_entity
+
+    # 3. Prefetch the relations of all sources and existing targets. An edge
+    # between two collected entities is reported from both ends, keep it once
+    entities_to_collect = [
+        name for name in involved_entities if name in rename or name in existing_targets
+    ]
+    node_edges = await chunk_entity_relation_graph.get_nodes_edges_batch(
+        entities_to_collect
+    )
+    edge_pairs: list[tuple[str, str]] = []
+    seen_pairs: set[frozenset[str]] = set()
     for entity_name in entities_to_collect:
-        # Get all relationships of the entities
-        edges = await chunk_entity_relation_graph.get_node_edges(entity_name)
-        if edges:
-            for src, tgt in edges:
-                # Ensure src is the current entity
-                if src == entity_name:
-                    edge_data = await chunk_entity_relation_graph.get_edge(src, tgt)
-                    all_relations.append((src, tgt, edge_data))
-
-    # 5. Create or update the target entity
-    merged_entity_data["entity_id"] = target_entity
-    if not target_exists:
-        await chunk_entity_relation_graph.upsert_node(target_entity, merged_entity_data)
-        logger.info(f"Entity Merge: created target '{target_entity}'")
-    else:
-        await chunk_entity_relation_graph.upsert_node(target_entity, merged_entity_data)
-        logger.info(f"Entity Merge: Updated target '{target_entity}'")
-
-    # 6. Recreate all relations pointing to the target entity in KG
-    # Also collect chunk tracking information in the same loop
+        for src, tgt in node_edges.get(entity_name) or []:
+            # Ensure src is the current entity
+            if src != entity_name:
+                continue
+            pair = frozenset((src, tgt))
+            if pair not in seen_pairs:
+                seen_pairs.add(pair)
+                edge_pairs.append((src, tgt))
+    edges_data = await chunk_entity_relation_graph.get_edges_batch(
+        [{"src": src, "tgt": tgt} for src, tgt in edge_pairs]
+    )
+    all_relations = [
+        (src, tgt, edges_data[(src, tgt)])
+        for src, tgt in edge_pairs
+        if edges_data.get((src, tgt)) is not None
+    ]
+
+    # 4. Recreate all relations pointing to the targets, collecting chunk
+    # tracking information in the same pass
     relation_updates = {}  # Track relationships that need to be merged
     relations_to_delete = []
-
-    # Initialize chunk tracking variables
     relation_chunk_tracking = {}  # key: storage_key, value: list of chunk_ids
     old_relation_keys_to_delete = []
 
+    stored_relation_chunks = {}
+    if relation_chunks_storage is not None and all_relations:
+        from .utils import make_relation_chunk_key
+
+        old_relation_keys_to_delete = [
+            make_relation_chunk_key(src, tgt) for src, tgt, _ in all_relations
+        ]
+        stored_relation_chunks = dict(
+            zip(
+                old_relation_keys_to_delete,
+                await relation_chunks_storage.get_by_ids(old_relation_keys_to_delete),
+            )
+        )
+
     for src, tgt, edge_data in all_relations:
         relations_to_delete.append(compute_mdhash_id(src + tgt, prefix="rel-"))
         relations_to_delete.append(compute_mdhash_id(tgt + src, prefix="rel-"))
 
-        # Collect old chunk tracking key for deletion
-        if relation_chunks_storage is not None:
-            from .utils import make_relation_chunk_key
+        new_src = rename.get(src, src)
+        new_tgt = rename.get(tgt, tgt)
 
-            old_storage_key = make_relation_chunk_key(src, tgt)
-            old_relation_keys_to_delete.append(old_storage_key)
-
-        new_src = target_entity if src in source_entities else src
-        new_tgt = target_entity if tgt in source_entities else tgt
-
-        # Skip relationships between source entities to avoid self-loops
+        # Skip relationships between entities of one group to avoid self-loops
         if new_src == new_tgt:
             logger.info(f"Entity Merge: skipping `{src}`~`{tgt}` to avoid self-loop")
             continue
@@ -1300,13 +1314,9 @@ async def _merge_entities_impl(
         normalized_src, normalized_tgt = sorted([new_src, new_tgt])
         relation_key = f"{normalized_src}|{normalized_tgt}"
 
-        # Process chunk tracking for this relation
         if relation_chunks_storage is not None:
             storage_key = make_relation_chunk_key(normalized_src, normalized_tgt)
-
-            # Get chunk_ids from storage for this original relation
-            stored = await relation_chunks_storage.get_by_id(old_storage_key)
-
+            stored = stored_relation_chunks.get(make_relation_chunk_key(src, tgt))
             if stored is not None and isinstance(stored, dict):
                 chunk_ids = [cid for cid in stored.get("chunk_ids", []) if cid]
             else:
@@ -1315,19 +1325,17 @@ async def _merge_entities_impl(
                 chunk_ids = [cid for cid in source_id.split(GRAPH_FIELD_SEP) if cid]
 
             # Accumulate chunk_ids with ordered deduplication
-            if storage_key not in relation_chunk_tracking:
-                relation_chunk_tracking[storage_key] = []
-
-            existing_chunks = set(relation_chunk_tracking[storage_key])
+            tracked = relation_chunk_tracking.setdefault(storage_key, [])
+            existing_chunks = set(tracked)
             for chunk_id in chunk_ids:
                 if chunk_id not in existing_chunks:
                     existing_chunks.add(chunk_id)
-                    relation_chunk_tracking[storage_key].append(chunk_id)
+                    tracked.append(chunk_id)
 
         if relation_key in relation_updates:
             # Merge relationship data
             existing_data = relation_updates[relation_key]["data"]
-            merged_relation = _merge_attributes(
+            relation_updates[relation_key]["data"] = _merge_attributes(
                 [existing_data, edge_data],
                 {
                     "description": "concatenate",
@@ -1338,7 +1346,6 @@ async def _merge_entities_impl(
                 },
                 filter_none_only=True,  # Use relation behavior: only filter None
             )
-            relation_updates[relation_key]["data"] = merged_relation
             logger.debug(
                 f"Entity Merge: deduplicating relation `{normalized_src}`~`{normalized_tgt}`"
             )
@@ -1351,15 +1358,19 @@ async def _merge_entities_impl(
                 "data": edge_data.copy(),
             }
 
-    # Apply relationship updates
-    logger.info(f"Entity Merge: updatign {len(relation_updates)} relations")
-    for rel_data in relation_updates.values():
-        await chunk_entity_relation_graph.upsert_edge(
-            rel_data["graph_src"], rel_data["graph_tgt"], rel_data["data"]
-        )
-        logger.info(
-            f"Entity Merge: updating relation `{rel_data['graph_src']}`~`{rel_data['graph_tgt']}`"
-        )
+    # 5. Write the targets and their relations to the KG
+    await chunk_entity_relation_graph.upsert_nodes_batch(merged_entities)
+    for target_entity in merged_entities:
+        action = "Updated" if target_entity in existing_targets else "created"
+        logger.info(f"Entity Merge: {action} target '{target_entity}'")
+
+    logger.info(f"Entity Merge: updating {len(relation_updates)} relations")
+    await chunk_entity_relation_graph.upsert_edges_batch(
+        [
+            (rel_data["graph_src"], rel_data["graph_tgt"], rel_data["data"])
+            for rel_data in relation_updates.values()
+        ]
+    )
 
     # Update relation chunk tracking storage
     if relation_chunks_storage is not None and all_relations:
@@ -1367,24 +1378,22 @@ async def _merge_entities_impl(
             await relation_chunks_storage.delete(old_relation_keys_to_delete)
 
         if relation_chunk_tracking:
-            updates = {}
-            for storage_key, chunk_ids in relation_chunk_tracking.items():
-                updates[storage_key] = {
-                    "chunk_ids": chunk_ids,
-                    "count": len(chunk_ids),
-                }
-
+            updates = {
+                storage_key: {"chunk_ids": chunk_ids, "count": len(chunk_ids)}
+                for storage_key, chunk_ids in relation_chunk_tracking.items()
+            }
             await relation_chunks_storage.upsert(updates)
             logger.info(
                 f"Entity Merge: {len(updates)} relation chunk tracking records updated"
             )
 
-    # 7. Update relationship vector representations
+    # 6. Re-embed all updated relations in one upsert
     logger.debug(
         f"Entity Merge: deleting {len(relations_to_delete)} relations from vdb"
     )
     await relationships_vdb.delete(relations_to_delete)
 
+    relation_data_for_vdb = {}
     for rel_data in relation_updates.values():
         edge_data = rel_data["data"]
         normalized_src = rel_data["norm_src"]
@@ -1392,120 +1401,106 @@ async def _merge_entities_impl(
 
         description = edge_data.get("description", "")
         keywords = edge_data.get("keywords", "")
-        source_id = edge_data.get("source_id", "")
-        weight = float(edge_data.get("weight", 1.0))
 
         # Use normalized order for content and relation ID
-        content = f"{keywords}\t{normalized_src}\n{normalized_tgt}\n{description}"
         relation_id = compute_mdhash_id(normalized_src + normalized_tgt, prefix="rel-")
-
-        relation_data_for_vdb = {
-            relation_id: {
-                "content": content,
-                "src_id": normalized_src,
-                "tgt_id": normalized_tgt,
-                "source_id": source_id,
-                "description": description,
-                "keywords": keywords,
-                "weight": weight,
-            }
+        relation_data_for_vdb[relation_id] = {
+            "content": f"{keywords}\t{normalized_src}\n{normalized_tgt}\n{description}",
+            "src_id": normalized_src,
+            "tgt_id": normalized_tgt,
+            "source_id": edge_data.get("source_id", ""),
+            "description": description,
+            "keywords": keywords,
+            "weight": float(edge_data.get("weight", 1.0)),
         }
+    if relation_data_for_vdb:
         await relationships_vdb.upsert(relation_data_for_vdb)
-        logger.debug(
-            f"Entity Merge: updating vdb `{normalized_src}`~`{normalized_tgt}`"
-        )
 
     logger.info(f"Entity Merge: {len(relation_updates)} relations in vdb updated")
 
-    # 8. Update entity vector representation
-    description = merged_entity_data.get("description", "")
-    source_id = merged_entity_data.get("source_id", "")
-    entity_type = merged_entity_data.get("entity_type", "")
-    content = target_entity + "\n" + description
-
-    entity_id = compute_mdhash_id(target_entity, prefix="ent-")
-    entity_data_for_vdb = {
-        entity_id: {
-            "content": content,
+    # 7. Re-embed all target entities in one upsert
+    entity_data_for_vdb = {}
+    for target_entity, merged_entity_data in merged_entities.items():
+        description = merged_entity_data.get("description", "")
+        entity_data_for_vdb[compute_mdhash_id(target_entity, prefix="ent-")] = {
+            "content": target_entity + "\n" + description,
             "entity_name": target_entity,
-            "source_id": source_id,
+            "source_id": merged_entity_data.get("source_id", ""),
             "description": description,
-            "entity_type": entity_type,
+            "entity_type": merged_entity_data.get("entity_type", ""),
         }
-    }
     await entities_vdb.upsert(entity_data_for_vdb)
-    logger.info(f"Entity Merge: updating vdb `{target_entity}`")
+    logger.info(f"Entity Merge: updating vdb {list(merged_entities)}")
+
+    # Sources that are removed, i.e. all of them except a group's own target
+    entities_to_delete = list(
+        dict.fromkeys(
+            entity_name
+            for source_entities, target_entity, _ in groups
+            for entity_name in source_entities
+            if entity_name != target_entity
+        )
+    )
 
-    # 9. Merge entity chunk tracking (source entities first, then target entity)
+    # 8. Merge entity chunk tracking (source entities first, then target entity)
     if entity_chunks_storage is not None:
-        all_chunk_id_lists = []
-
-        # Build list of entities to process (source entities first, then target entity)
-        entities_to_process = []
-
-        # Add source entities first (excluding target if it's already in source list)
-        for entity_name in source_entities:
-            if entity_name != target_entity:
-                entities_to_process.append(entity_name)
-
-        # Add target entity last (if it exists)
-        if target_exists:
-            entities_to_process.append(target_entity)
+        tracked_entities = entities_to_delete + sorted(existing_targets)
+        stored_entity_chunks = dict(
+            zip(
+                tracked_entities,
+                await entity_chunks_storage.get_by_ids(tracked_entities),
+            )
+        )
 
-        # Process all entities in order with unified logic
-        for entity_name in entities_to_process:
-            stored = await entity_chunks_storage.get_by_id(entity_name)
-            if stored and isinstance(stored, dict):
-                chunk_ids = [cid for cid in stored.get("chunk_ids", []) if cid]
-                if chunk_ids:
-                    all_chunk_id_lists.append(chunk_ids)
-
-        # Merge chunk_ids with ordered deduplication (preserves order, source entities first)
-        merged_chunk_ids = []
-        seen = set()
-        for chunk_id_list in all_chunk_id_lists:
-            for chunk_id in chunk_id_list:
-                if chunk_id not in seen:
-                    seen.add(chunk_id)
-                    merged_chunk_ids.append(chunk_id)
-
-        # Delete source entities' chunk tracking records
-        entity_keys_to_delete = [e for e in source_entities if e != target_entity]
-        if entity_keys_to_delete:
-            await entity_chunks_storage.delete(entity_keys_to_delete)
-
-        # Update target entity's chunk tracking
-        if merged_chunk_ids:
-            await entity_chunks_storage.upsert(
-                {
-                    target_entity: {
-                        "chunk_ids": merged_chunk_ids,
-                        "count": len(merged_chunk_ids),
-                    }
+        chunk_updates = {}
+        for source_entities, target_entity, _ in groups:
+            entities_to_process = [e for e in source_entities if e != target_entity]
+            if target_entity in existing_targets:
+                entities_to_process.append(target_entity)
+
+            # Merge chunk_ids with ordered deduplication (source entities first)
+            merged_chunk_ids = []
+            seen = set()
+            for entity_name in entities_to_process:
+                stored = stored_entity_chunks.get(entity_name)
+                if not stored or not isinstance(stored, dict):
+                    continue
+                for chunk_id in stored.get("chunk_ids", []):
+                    if chunk_id and chunk_id not in seen:
+                        seen.add(chunk_id)
+                        merged_chunk_ids.append(chunk_id)
+
+            if merged_chunk_ids:
+                chunk_updates[target_entity] = {
+                    "chunk_ids": merged_chunk_ids,
+                    "count": len(merged_chunk_ids),
                 }
-            )
-            logger.info(
-                f"Entity Merge: find {len(merged_chunk_ids)} chunks related to '{target_entity}'"
-            )
+                logger.info(
+                    f"Entity Merge: find {len(merged_chunk_ids)} chunks related to '{target_entity}'"
+                )
 
-    # 10. Delete source entities
-    for entity_name in source_entities:
-        if entity_name == target_entity:
+        # Delete source entities' chunk tracking records, then update targets
+        if entities_to_delete:
+            await entity_chunks_storage.delete(entities_to_delete)
+        if chunk_updates:
+            await entity_chunks_storage.upsert(chunk_updates)
+
+    # 9. Delete source entities (and their remaining edges) from KG and vdb
+    for source_entities, target_entity, _ in groups:
+        if target_entity in source_entities:
             logger.warning(
-                f"Entity Merge: source entity'{entity_name}' is same as target entity"
+                f"Entity Merge: source entity'{target_entity}' is same as target entity"
             )
-            continue
-
-        logger.info(f"Entity Merge: deleting '{entity_name}' from KG and vdb")
-
-        # Delete entity node and related edges from knowledge graph
-        await chunk_entity_relation_graph.delete_node(entity_name)
-
-        # Delete entity record from vector database
-        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
-        await entities_vdb.delete([entity_id])
+    if entities_to_delete:
+        logger.info(
+            f"Entity Merge: deleting {len(entities_to_delete)} entities from KG and vdb"
+        )
+        await chunk_entity_relation_graph.remove_nodes(entities_to_delete)
+        await entities_vdb.delete(
+            [compute_mdhash_id(name, prefix="ent-") for name in entities_to_delete]
+        )
 
-    # 11. Save changes
+    # 10. Save changes
     await _persist_graph_updates(
         entities_vdb=entities_vdb,
         relationships_vdb=relationships_vdb,
@@ -1513,6 +1508,53 @@ async def _merge_entities_impl(
         entity_chunks_storage=entity_chunks_storage,
         relation_chunks_storage=relation_chunks_storage,
     )
+    return entities_to_delete
+
+
+async def _merge_entities_impl(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    source_entities: list[str],
+    target_entity: str,
+    *,
+    merge_strategy: dict[str, str] = None,
+    target_entity_data: dict[str, Any] = None,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
+) -> dict[str, Any]:
+    """Internal helper that merges entities without acquiring storage locks.
+
+    This function performs the actual entity merge operations without lock management.
+    It should only be called by public APIs that have already acquired necessary locks.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance
+        entities_vdb: Vector database storage for entities
+        relationships_vdb: Vector database storage for relationships
+        source_entities: List of source entity names to merge
+        target_entity: Name of the target entity after merging
+        merge_strategy: Deprecated. Merge strategy for each field (optional)
+        target_entity_data: Dictionary of specific values to set for target entity (optional)
+        entity_chunks_storage: Optional KV storage for tracking chunks
+        relation_chunks_storage: Optional KV storage for tracking relation chunks
+
+    Returns:
+        Dictionary containing the merged entity information
+
+    Note:
+        Caller must acquire appropriate locks before calling this function.
+        All source entities and the target entity should be locked together.
+    """
+    await _merge_entity_groups_impl(
+        chunk_entity_relation_graph,
+        entities_vdb,
+        relationships_vdb,
+        [(list(source_entities), target_entity, target_entity_data or {})],
+        merge_strategy=merge_strategy,
+        entity_chunks_storage=entity_chunks_storage,
+        relation_chunks_storage=relation_chunks_storage,
+    )
 
     logger.info(
         f"Entity Merge: successfully merged {len(source_entities)} entities into '{target_entity}'"
@@ -1585,6 +1627,81 @@ async def amerge_entities(
             raise
 
 
+async def amerge_entities_batch(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    merges: list[dict[str, Any]],
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
+) -> list[dict[str, Any]]:
+    """Asynchronously apply several entity merges in one bulk pass.
+
+    Equivalent to calling amerge_entities once per merge, but all involved
+    entities are locked in a single acquisition, nodes, edges and chunk
+    tracking records are prefetched with the batch storage APIs, and the
+    merged graph is written back and re-embedded with one upsert per storage.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance
+        entities_vdb: Vector database storage for entities
+        relationships_vdb: Vector database storage for relationships
+        merges: List of merges, each a dict with "source_entities" (list of names),
+            "target_entity" (name) and optional "target_entity_data" (values that
+            override the merged ones). An entity may only appear in one merge.
+        entity_chunks_storage: Optional KV storage for tracking chunks that reference entities
+        relation_chunks_storage: Optional KV storage for tracking chunks that reference relations
+
+    Returns:
+        List with the merged entity information of each target, in input order
+    """
+    groups = [
+        (
+            list(merge["source_entities"]),
+            merge["target_entity"],
+            merge.get("target_entity_data") or {},
+        )
+        for merge in merges
+    ]
+    if not groups:
+        return []
+    _validate_merge_groups(groups)
+
+    lock_keys = sorted(
+        {name for sources, target, _ in groups for name in [*sources, target]}
+    )
+
+    workspace = entities_vdb.global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    async with get_storage_keyed_lock(
+        lock_keys, namespace=namespace, enable_logging=False
+    ):
+        try:
+            removed_entities = await _merge_entity_groups_impl(
+                chunk_entity_relation_graph,
+                entities_vdb,
+                relationships_vdb,
+                groups,
+                entity_chunks_storage=entity_chunks_storage,
+                relation_chunks_storage=relation_chunks_storage,
+            )
+            logger.info(
+                f"Entity Merge: successfully merged {len(removed_entities)} entities in {len(groups)} groups"
+            )
+            return [
+                await get_entity_info(
+                    chunk_entity_relation_graph,
+                    entities_vdb,
+                    target_entity,
+                    include_vector_data=True,
+                )
+                for _, target_entity, _ in groups
+            ]
+        except Exception as e:
+            logger.error(f"Error merging entities: {e}")
+            raise
+
+
 def _merge_attributes(
     data_list: list[dict[str, Any]],
     merge_strategy: dict[str, str],
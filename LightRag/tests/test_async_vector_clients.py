@@ -0,0 +1,86 @@
+"""Concurrent queries against the Qdrant and Milvus vector storages.
+
+Both run against local embedded backends (Qdrant in-memory mode, Milvus
+Lite), so they are skipped when those packages are not installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+
+async def _embed(texts: list[str]) -> np.ndarray:
+    rng = np.random.default_rng(abs(hash(tuple(texts))) % (2**32))
+    return rng.random((len(texts), 8), dtype=np.float32)
+
+
+def _global_config(tmp_path) -> dict:
+    return {
+        "working_dir": str(tmp_path),
+        "embedding_batch_num": 16,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": -1.0},
+    }
+
+
+async def _upsert_and_query_concurrently(storage) -> list[list[dict]]:
+    await storage.initialize()
+    await storage.upsert(
+        {
+            f"ent-{i}": {"content": f"entity {i}", "entity_name": f"E{i}"}
+            for i in range(32)
+        }
+    )
+    embedding = (await _embed(["query"]))[0]
+    return await asyncio.gather(
+        *(storage.query("query", top_k=5, query_embedding=embedding) for _ in range(8))
+    )
+
+
+@pytest.mark.asyncio
+async def test_qdrant_async_client_serves_concurrent_queries(tmp_path, monkeypatch):
+    pytest.importorskip("qdrant_client")
+    from lightrag.kg.qdrant_impl import QdrantVectorDBStorage
+
+    monkeypatch.setenv("QDRANT_URL", ":memory:")
+    initialize_share_data()
+    storage = QdrantVectorDBStorage(
+        namespace="entities",
+        global_config=_global_config(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=_embed),
+        workspace="async",
+        meta_fields={"entity_name"},
+    )
+    try:
+        results = await _upsert_and_query_concurrently(storage)
+    finally:
+        await storage.finalize()
+
+    assert all(len(r) == 5 for r in results)
+    assert all(r == results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_milvus_lite_serves_concurrent_queries(tmp_path, monkeypatch):
+    pytest.importorskip("pymilvus")
+    pytest.importorskip("milvus_lite")
+    from lightrag.kg.milvus_impl import MilvusVectorDBStorage
+
+    monkeypatch.setenv("MILVUS_URI", str(tmp_path / "milvus_lite.db"))
+    initialize_share_data()
+    storage = MilvusVectorDBStorage(
+        namespace="entities",
+        workspace="async",
+        global_config=_global_config(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=_embed),
+        meta_fields={"entity_name"},
+    )
+    results = await _upsert_and_query_concurrently(storage)
+
+    assert all(len(r) == 5 for r in results)
+    assert [r["id"] for r in results[0]] == [r["id"] for r in results[-1]]
@@ -0,0 +1,82 @@
+"""Tests for the persisted per-chunk extraction records used by rebuilds.
+
+A record written at extraction time must decode to exactly what re-parsing the
+raw LLM output would produce, so rebuilds can skip the parser entirely.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from lightrag.operate import (
+    _CHUNK_EXTRACTION_FORMAT,
+    _get_stored_chunk_extractions,
+    _pack_chunk_extraction,
+    _process_extraction_result,
+    _unpack_chunk_extraction,
+)
+
+TUPLE_DELIMITER = "<|#|>"
+COMPLETION_DELIMITER = "<|COMPLETE|>"
+
+EXTRACTION_OUTPUT = "\n".join(
+    [
+        "entity<|#|>Alice<|#|>person<|#|>Alice is a researcher.",
+        "entity<|#|>Bob<|#|>person<|#|>Bob is Alice's colleague.",
+        "entity<|#|>Alice<|#|>person<|#|>Alice works on graphs.",
+        "relation<|#|>Alice<|#|>Bob<|#|>collaboration<|#|>Alice works with Bob.",
+        COMPLETION_DELIMITER,
+    ]
+)
+
+
+class _DictKV:
+    def __init__(self, data):
+        self._data = data
+
+    async def get_by_ids(self, ids):
+        return [self._data.get(i) for i in ids]
+
+
+async def _parse(chunk_id: str = "chunk-1"):
+    return await _process_extraction_result(
+        EXTRACTION_OUTPUT,
+        chunk_id,
+        1700000000,
+        "paper.pdf",
+        tuple_delimiter=TUPLE_DELIMITER,
+        completion_delimiter=COMPLETION_DELIMITER,
+    )
+
+
+@pytest.mark.asyncio
+async def test_round_trip_matches_parser_output():
+    nodes, edges = await _parse()
+    record = _pack_chunk_extraction(nodes, edges, "paper.pdf")
+
+    assert record["format"] == _CHUNK_EXTRACTION_FORMAT
+    assert len(record["entities"]) == 3
+    assert len(record["relations"]) == 1
+
+    unpacked_nodes, unpacked_edges = _unpack_chunk_extraction("chunk-1", record)
+    assert dict(unpacked_nodes) == nodes
+    assert dict(unpacked_edges) == edges
+
+
+@pytest.mark.asyncio
+async def test_stored_extractions_skip_missing_and_outdated_records():
+    nodes, edges = await _parse()
+    storage = _DictKV(
+        {
+            "chunk-1": _pack_chunk_extraction(nodes, edges, "paper.pdf"),
+            "chunk-2": {"format": _CHUNK_EXTRACTION_FORMAT + 1, "entities": []},
+        }
+    )
+
+    chunk_entities, chunk_relationships = await _get_stored_chunk_extractions(
+        storage, {"chunk-1", "chunk-2", "chunk-3"}
+    )
+
+    assert set(chunk_entities) == set(chunk_relationships) == {"chunk-1"}
+    assert chunk_entities["chunk-1"]["Alice"][0]["source_id"] == "chunk-1"
+    assert ("Alice", "Bob") in chunk_relationships["chunk-1"]
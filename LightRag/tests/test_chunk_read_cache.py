@@ -0,0 +1,122 @@
+"""Tests for the read-through LRU cache in front of the text chunk KV storage."""
+
+from __future__ import annotations
+
+import pytest
+
+from lightrag.kg.read_cache import ReadThroughKVCache, unwrap_storage
+from lightrag.kg.shared_storage import initialize_share_data
+
+
+class _CountingKV:
+    namespace = "text_chunks"
+    workspace = "read_cache_test"
+    global_config: dict = {}
+    embedding_func = None
+
+    def __init__(self, data):
+        self.data = data
+        self.fetched: list[str] = []
+
+    async def initialize(self):
+        pass
+
+    async def get_by_ids(self, ids):
+        self.fetched.extend(ids)
+        return [dict(self.data[i]) if i in self.data else None for i in ids]
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+    async def delete(self, ids):
+        for i in ids:
+            self.data.pop(i, None)
+
+    async def drop(self):
+        self.data.clear()
+        return {"status": "success", "message": "data dropped"}
+
+
+async def _make_cache(data, **limits):
+    initialize_share_data()
+    storage = _CountingKV(data)
+    cache = ReadThroughKVCache(
+        storage,
+        max_entries=limits.get("max_entries", 100),
+        max_bytes=limits.get("max_bytes", 1 << 20),
+    )
+    await cache.initialize()
+    return storage, cache
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_are_served_from_memory():
+    storage, cache = await _make_cache(
+        {"a": {"content": "alpha"}, "b": {"content": "beta"}}
+    )
+
+    first = await cache.get_by_ids(["a", "b", "missing"])
+    second = await cache.get_by_ids(["b", "a"])
+
+    assert [r and r["content"] for r in first] == ["alpha", "beta", None]
+    assert [r["content"] for r in second] == ["beta", "alpha"]
+    assert storage.fetched == ["a", "b", "missing"]
+
+    # Returned records are copies, callers cannot corrupt the cache
+    second[0]["content"] = "changed"
+    assert (await cache.get_by_id("b"))["content"] == "beta"
+
+    stats = cache.cache_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["hit_ratio"] == 0.5
+
+    # Reports name the configured backend, not the wrapper
+    assert unwrap_storage(cache) is storage
+    assert unwrap_storage(storage) is storage
+
+
+@pytest.mark.asyncio
+async def test_lru_respects_entry_and_byte_limits():
+    data = {key: {"content": key * 100} for key in "abcd"}
+    storage, cache = await _make_cache(data, max_entries=3)
+
+    await cache.get_by_ids(["a", "b", "c"])
+    await cache.get_by_ids(["a"])  # a becomes most recently used
+    await cache.get_by_ids(["d"])  # evicts b
+    storage.fetched.clear()
+    await cache.get_by_ids(["a", "b", "c", "d"])
+    assert storage.fetched == ["b"]
+
+    one_record = cache.cache_stats()["bytes"] // 3
+    _, small = await _make_cache(data, max_bytes=one_record * 2)
+    await small.get_by_ids(["a", "b", "c"])
+    assert small.cache_stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_evict_only_written_keys_in_every_worker():
+    data = {"a": {"content": "alpha"}, "b": {"content": "beta"}}
+    storage, writer = await _make_cache(data)
+    reader = ReadThroughKVCache(storage, max_entries=100, max_bytes=1 << 20)
+    await reader.initialize()
+
+    await writer.get_by_ids(["a", "b"])
+    await reader.get_by_ids(["a", "b"])
+
+    await writer.upsert({"a": {"content": "alpha v2"}})
+    assert (await reader.get_by_id("a"))["content"] == "alpha v2"
+    # Keys nobody wrote stay cached in the writer and in the reader
+    storage.fetched.clear()
+    await writer.get_by_ids(["b"])
+    await reader.get_by_ids(["b"])
+    assert storage.fetched == []
+
+    await writer.delete(["a"])
+    assert await reader.get_by_id("a") is None
+    assert await writer.get_by_id("a") is None
+    assert reader.cache_stats()["entries"] == 1
+
+    await writer.drop()
+    await reader.get_by_ids([])
+    assert reader.cache_stats()["entries"] == 0
@@ -0,0 +1,82 @@
+"""Tests for the batch-wide fair chunk extraction scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from lightrag.operate import ChunkExtractionScheduler
+
+
+async def _run_chunk(scheduler, doc_id, started, release):
+    async with scheduler.slot(doc_id):
+        started.append(doc_id)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_small_document_is_not_starved_by_large_one():
+    scheduler = ChunkExtractionScheduler(2)
+    started: list[str] = []
+    gates = {}
+
+    async def chunk(doc_id, i):
+        gate = gates.setdefault((doc_id, i), asyncio.Event())
+        await _run_chunk(scheduler, doc_id, started, gate)
+
+    big = [asyncio.create_task(chunk("big", i)) for i in range(10)]
+    await asyncio.sleep(0)
+    small = [asyncio.create_task(chunk("small", i)) for i in range(2)]
+    await asyncio.sleep(0)
+    assert started == ["big", "big"]
+
+    # Freed slots alternate between the documents instead of draining the
+    # big document's backlog first
+    gates[("big", 0)].set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    gates[("big", 1)].set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert started[2:4] == ["small", "big"]
+
+    for gate in gates.values():
+        gate.set()
+    while not all(t.done() for t in big + small):
+        for gate in gates.values():
+            gate.set()
+        await asyncio.sleep(0)
+    assert started.count("big") == 10
+    assert scheduler._in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = ChunkExtractionScheduler(1)
+    started: list[str] = []
+    release = asyncio.Event()
+
+    holder = asyncio.create_task(_run_chunk(scheduler, "a", started, release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_run_chunk(scheduler, "b", started, release))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+
+    assert started == ["a"]
+    assert scheduler._in_use == 0
+    async with scheduler.slot("c"):
+        assert scheduler._in_use == 1
+
+
+def test_progress_tracks_registered_documents():
+    scheduler = ChunkExtractionScheduler(4)
+    scheduler.register("doc-1", 3)
+    scheduler.complete("doc-1")
+    scheduler.complete("doc-unknown")
+
+    assert scheduler.progress() == {"doc-1": {"done": 1, "total": 3}}
+    scheduler.forget("doc-1")
+    assert scheduler.progress() == {}
@@ -830,3 +830,116 @@ class TestOrphanHeadingMerging:
         chunks = self._chunk(content, tokenizer)
         for chunk in chunks:
             assert chunk["content"].strip() != ""
+
+
+# ===================================================================
+# Offset-based token windows
+# ===================================================================
+
+
+class _ByteTokenizerBackend:
+    """Byte-level tokenizer in the style of tiktoken: every token is three
+    UTF-8 bytes, so token boundaries regularly split multi-byte characters."""
+
+    def __init__(self):
+        self._vocab: dict[bytes, int] = {}
+        self._pieces: list[bytes] = []
+        self.decode_calls = 0
+
+    def encode(self, text: str) -> List[int]:
+        raw = text.encode("utf-8")
+        ids = []
+        for i in range(0, len(raw), 3):
+            piece = raw[i : i + 3]
+            if piece not in self._vocab:
+                self._vocab[piece] = len(self._pieces)
+                self._pieces.append(piece)
+            ids.append(self._vocab[piece])
+        return ids
+
+    def decode(self, ids: List[int]) -> str:
+        self.decode_calls += 1
+        return b"".join(self._pieces[i] for i in ids).decode("utf-8", errors="replace")
+
+    def decode_single_token_bytes(self, token: int) -> bytes:
+        return self._pieces[token]
+
+
+def _reference_chunking(
+    tokenizer, content, split_by_character, split_by_character_only, overlap, size
+):
+    """Decode-based sliding window, the behaviour the offset slicing must keep."""
+    if split_by_character:
+        pieces = []
+        for chunk in content.split(split_by_character):
+            tokens = tokenizer.encode(chunk)
+            if split_by_character_only or len(tokens) <= size:
+                pieces.append((len(tokens), chunk))
+                continue
+            for start in range(0, len(tokens), size - overlap):
+                pieces.append(
+                    (
+                        min(size, len(tokens) - start),
+                        tokenizer.decode(tokens[start : start + size]),
+                    )
+                )
+    else:
+        tokens = tokenizer.encode(content)
+        pieces = [
+            (
+                min(size, len(tokens) - start),
+                tokenizer.decode(tokens[start : start + size]),
+            )
+            for start in range(0, len(tokens), size - overlap)
+        ]
+    return [
+        {"tokens": n, "content": text.strip(), "chunk_order_index": i}
+        for i, (n, text) in enumerate(pieces)
+    ]
+
+
+_OFFSET_CASES = [
+    ("plain ascii text " * 40, None, False),
+    ("héllo wörld, 日本語のテキスト 🎉 mixed width. " * 25, None, False),
+    ("naïve café\n\n" * 30 + "日本語 " * 60, "\n\n", False),
+    ("first part\n\nsecond — part\n\n" * 10, "\n\n", True),
+]
+
+
+class TestOffsetTokenWindows:
+    @pytest.mark.parametrize("content,split_char,split_only", _OFFSET_CASES)
+    def test_byte_tokenizer_matches_decode(self, content, split_char, split_only):
+        from lightrag.utils import Tokenizer
+
+        tokenizer = Tokenizer("bytes", _ByteTokenizerBackend())
+        expected = _reference_chunking(
+            tokenizer, content, split_char, split_only, overlap=5, size=16
+        )
+        assert (
+            chunking_by_token_size(
+                tokenizer,
+                content,
+                split_char,
+                split_only,
+                overlap_token_size=5,
+                max_token_size=16,
+            )
+            == expected
+        )
+
+    def test_ascii_windows_are_sliced_not_decoded(self):
+        from lightrag.utils import Tokenizer
+
+        backend = _ByteTokenizerBackend()
+        tokenizer = Tokenizer("bytes", backend)
+        chunks = chunking_by_token_size(
+            tokenizer, "abcdefghij" * 50, overlap_token_size=2, max_token_size=10
+        )
+        assert len(chunks) > 1
+        assert backend.decode_calls == 0
+
+    def test_lossy_tokenizer_falls_back_to_decode(self, tokenizer):
+        content = "alpha  beta\tgamma\n" * 30
+        assert chunking_by_token_size(
+            tokenizer, content, overlap_token_size=3, max_token_size=12
+        ) == _reference_chunking(tokenizer, content, None, False, overlap=3, size=12)
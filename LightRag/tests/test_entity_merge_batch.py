@@ -0,0 +1,209 @@
+"""Tests for batched entity merges in utils_graph.
+
+A batch of merges must leave the graph, vector stores and chunk tracking in the
+same state as applying the merges one by one, while writing each storage once.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import compute_mdhash_id, make_relation_chunk_key
+from lightrag.utils_graph import (
+    _merge_entity_groups_impl,
+    amerge_entities,
+    amerge_entities_batch,
+)
+
+
+class _MemoryStorage:
+    """Minimal KV / vector storage keeping records in a dict."""
+
+    def __init__(self):
+        self.global_config = {"workspace": ""}
+        self.data: dict[str, dict] = {}
+        self.upserts = 0
+
+    async def get_by_id(self, id):
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        return [self.data.get(id) for id in ids]
+
+    async def upsert(self, data):
+        self.upserts += 1
+        self.data.update(data)
+
+    async def delete(self, ids):
+        for id in ids:
+            self.data.pop(id, None)
+
+    async def index_done_callback(self):
+        pass
+
+
+async def _build(tmp_path, workspace: str):
+    initialize_share_data()
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace=workspace,
+        global_config={"working_dir": str(tmp_path), "max_graph_nodes": 1000},
+        embedding_func=None,
+    )
+    await graph.initialize()
+    entities_vdb, relationships_vdb = _MemoryStorage(), _MemoryStorage()
+    entity_chunks, relation_chunks = _MemoryStorage(), _MemoryStorage()
+
+    for i, name in enumerate(
+        ["Elon Msk", "Elon Musk", "NY", "New York", "Tesla", "SpaceX"]
+    ):
+        await graph.upsert_node(
+            name,
+            {
+                "entity_id": name,
+                "entity_type": "ENTITY",
+                "description": f"about {name}",
+                "source_id": f"chunk-{i}",
+            },
+        )
+        entity_chunks.data[name] = {"chunk_ids": [f"chunk-{i}"], "count": 1}
+        entities_vdb.data[compute_mdhash_id(name, prefix="ent-")] = {
+            "entity_name": name
+        }
+
+    for src, tgt in [
+        ("Elon Msk", "Tesla"),
+        ("Elon Musk", "Tesla"),
+        ("Elon Msk", "SpaceX"),
+        ("Elon Msk", "NY"),
+        ("NY", "Tesla"),
+    ]:
+        await graph.upsert_edge(
+            src,
+            tgt,
+            {
+                "description": f"{src} -> {tgt}",
+                "keywords": "link",
+                "weight": "1.0",
+                "source_id": f"chunk-{src}-{tgt}",
+            },
+        )
+        relation_chunks.data[make_relation_chunk_key(src, tgt)] = {
+            "chunk_ids": [f"chunk-{src}-{tgt}"],
+            "count": 1,
+        }
+    return graph, entities_vdb, relationships_vdb, entity_chunks, relation_chunks
+
+
+def _normalized(value):
+    if isinstance(value, str) and GRAPH_FIELD_SEP in value:
+        return sorted(value.split(GRAPH_FIELD_SEP))
+    return value
+
+
+async def _snapshot(graph):
+    nx_graph = await graph._get_graph()
+    nodes = {
+        node: {k: _normalized(v) for k, v in data.items()}
+        for node, data in nx_graph.nodes(data=True)
+    }
+    edges = {
+        frozenset((src, tgt)): {k: _normalized(v) for k, v in data.items()}
+        for src, tgt, data in nx_graph.edges(data=True)
+    }
+    return nodes, edges
+
+
+_MERGES = [
+    {"source_entities": ["Elon Msk"], "target_entity": "Elon Musk"},
+    {"source_entities": ["NY"], "target_entity": "New York"},
+]
+
+
+@pytest.mark.asyncio
+async def test_batch_merge_matches_sequential_merges(tmp_path):
+    sequential = await _build(tmp_path, "sequential")
+    batched = await _build(tmp_path, "batched")
+
+    for merge in _MERGES:
+        await amerge_entities(
+            sequential[0],
+            sequential[1],
+            sequential[2],
+            merge["source_entities"],
+            merge["target_entity"],
+            entity_chunks_storage=sequential[3],
+            relation_chunks_storage=sequential[4],
+        )
+    results = await amerge_entities_batch(
+        batched[0],
+        batched[1],
+        batched[2],
+        _MERGES,
+        entity_chunks_storage=batched[3],
+        relation_chunks_storage=batched[4],
+    )
+
+    assert [r["entity_name"] for r in results] == ["Elon Musk", "New York"]
+    assert await _snapshot(batched[0]) == await _snapshot(sequential[0])
+    assert set(batched[1].data) == set(sequential[1].data)
+    assert set(batched[2].data) == set(sequential[2].data)
+    assert batched[3].data == sequential[3].data
+    assert {k: sorted(v["chunk_ids"]) for k, v in batched[4].data.items()} == {
+        k: sorted(v["chunk_ids"]) for k, v in sequential[4].data.items()
+    }
+
+    # The Elon Msk~NY relation ends up between the two targets
+    nodes, edges = await _snapshot(batched[0])
+    assert "Elon Msk" not in nodes and "NY" not in nodes
+    assert frozenset(("Elon Musk", "New York")) in edges
+    # One re-embedding pass per vector storage
+    assert batched[1].upserts == 1
+    assert batched[2].upserts == 1
+
+
+@pytest.mark.asyncio
+async def test_target_listed_as_source_is_not_counted_as_removed(tmp_path):
+    graph, entities_vdb, relationships_vdb, _, _ = await _build(tmp_path, "self")
+
+    removed = await _merge_entity_groups_impl(
+        graph,
+        entities_vdb,
+        relationships_vdb,
+        [
+            (["Elon Msk", "Elon Musk"], "Elon Musk", {}),
+            (["NY"], "New York", {}),
+        ],
+    )
+
+    assert removed == ["Elon Msk", "NY"]
+    nodes, _ = await _snapshot(graph)
+    assert "Elon Musk" in nodes and "Elon Msk" not in nodes
+
+
+@pytest.mark.asyncio
+async def test_batch_merge_rejects_overlapping_groups(tmp_path):
+    graph, entities_vdb, relationships_vdb, _, _ = await _build(tmp_path, "overlap")
+    before = await _snapshot(graph)
+
+    with pytest.raises(ValueError, match="more than one merge group"):
+        await amerge_entities_batch(
+            graph,
+            entities_vdb,
+            relationships_vdb,
+            [
+                {"source_entities": ["Elon Msk"], "target_entity": "Elon Musk"},
+                {"source_entities": ["Elon Musk"], "target_entity": "Tesla"},
+            ],
+        )
+    with pytest.raises(ValueError, match="does not exist"):
+        await amerge_entities_batch(
+            graph,
+            entities_vdb,
+            relationships_vdb,
+            [{"source_entities": ["Nobody"], "target_entity": "Elon Musk"}],
+        )
+    assert await _snapshot(graph) == before
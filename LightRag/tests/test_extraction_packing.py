@@ -0,0 +1,143 @@
+"""Tests for packing several small chunks into one extraction request."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.operate import _split_packed_extraction, extract_entities
+from lightrag.prompt import PROMPTS
+
+COMPLETE = PROMPTS["DEFAULT_COMPLETION_DELIMITER"]
+SECTION = PROMPTS["DEFAULT_SECTION_DELIMITER"]
+SEP = PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+
+
+def _entity(name: str) -> str:
+    return SEP.join(["entity", name, "concept", f"{name} is mentioned."])
+
+
+def test_split_keeps_numbered_sections_and_skips_unknown_ones():
+    result = "\n".join(
+        [
+            f"{SECTION}1",
+            _entity("Alpha"),
+            f"{SECTION}3",
+            f" {SECTION} 2 ",
+            _entity("Beta"),
+            f"{SECTION}9",
+            _entity("Ignored"),
+            COMPLETE,
+        ]
+    )
+
+    sections = _split_packed_extraction(result, 4, SECTION, COMPLETE)
+
+    assert sections == {
+        1: f"{_entity('Alpha')}\n{COMPLETE}",
+        2: f"{_entity('Beta')}\n{COMPLETE}",
+        3: COMPLETE,
+    }
+
+
+async def _packing_llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+    """Names one entity per input chunk after its first word"""
+    text = system_prompt.split("Text:\n```\n", 1)[1].rsplit("\n```", 1)[0]
+    if SECTION not in prompt:
+        _packing_llm.calls.append(1)
+        return "\n".join([_entity(text.split()[0]), COMPLETE])
+    parts = re.split(rf"^{re.escape(SECTION)}(\d+)$", text, flags=re.MULTILINE)
+    lines = []
+    for number, body in zip(parts[1::2], parts[2::2]):
+        lines += [f"{SECTION}{number}", _entity(body.split()[0])]
+    _packing_llm.calls.append(len(parts) // 2)
+    return "\n".join(lines + [COMPLETE])
+
+
+@pytest.mark.asyncio
+async def test_small_chunks_share_a_request_and_are_cached_one_by_one(tmp_path):
+    initialize_share_data()
+    cache = JsonKVStorage(
+        namespace="llm_response_cache",
+        workspace="packing",
+        global_config={
+            "working_dir": str(tmp_path),
+            "enable_llm_cache_for_entity_extract": True,
+        },
+        embedding_func=None,
+    )
+    await cache.initialize()
+    global_config = {
+        "llm_model_func": _packing_llm,
+        "entity_extract_max_gleaning": 0,
+        "addon_params": {},
+        "llm_model_max_async": 2,
+        "enable_llm_cache_for_entity_extract": True,
+        "extraction_pack_max_tokens": 100,
+        "extraction_pack_chunk_max_tokens": 40,
+    }
+    chunks = {
+        f"chunk-{name}": {"content": f"{name} heading", "tokens": 2, "full_doc_id": "d"}
+        for name in ("Alpha", "Beta", "Gamma")
+    }
+    chunks["chunk-Delta"] = {
+        "content": "Delta " + "body " * 60,
+        "tokens": 61,
+        "full_doc_id": "d",
+    }
+
+    _packing_llm.calls = []
+    results = await extract_entities(chunks, global_config, llm_response_cache=cache)
+
+    # One packed request for the three headings, one for the large chunk
+    assert sorted(_packing_llm.calls) == [1, 3]
+    assert sorted(name for nodes, _ in results for name in nodes) == [
+        "Alpha",
+        "Beta",
+        "Delta",
+        "Gamma",
+    ]
+
+    # Every chunk was cached under its own single-chunk prompt
+    _packing_llm.calls = []
+    await extract_entities(chunks, global_config, llm_response_cache=cache)
+    assert _packing_llm.calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_packed_request_falls_back_to_single_chunks(tmp_path):
+    initialize_share_data()
+    calls = []
+
+    async def _llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+        if SECTION in prompt:
+            calls.append("packed")
+            raise TimeoutError("packed request timed out")
+        calls.append("single")
+        return await _packing_llm(prompt, system_prompt, history_messages, **kwargs)
+
+    _packing_llm.calls = []
+    global_config = {
+        "llm_model_func": _llm,
+        "entity_extract_max_gleaning": 0,
+        "addon_params": {},
+        "llm_model_max_async": 2,
+        "extraction_pack_max_tokens": 100,
+        "extraction_pack_chunk_max_tokens": 40,
+    }
+    chunks = {
+        f"chunk-{name}": {"content": f"{name} heading", "tokens": 2, "full_doc_id": "d"}
+        for name in ("Alpha", "Beta", "Gamma")
+    }
+
+    results = await extract_entities(chunks, global_config)
+
+    assert calls == ["packed", "single", "single", "single"]
+    assert sorted(name for nodes, _ in results for name in nodes) == [
+        "Alpha",
+        "Beta",
+        "Gamma",
+    ]
@@ -0,0 +1,87 @@
+"""Tests for the per-chunk gleaning policy of entity extraction."""
+
+from __future__ import annotations
+
+import pytest
+
+from lightrag.operate import GleaningPolicy, extract_entities
+from lightrag.prompt import PROMPTS
+
+COMPLETE = PROMPTS["DEFAULT_COMPLETION_DELIMITER"]
+SEP = PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+
+
+def _entity(name: str) -> str:
+    return SEP.join(["entity", name, "person", f"{name} is a person."])
+
+
+def test_policy_skips_small_and_dense_chunks_and_stops_without_gain():
+    policy = GleaningPolicy(3, min_chunk_tokens=100, max_entity_density=5.0)
+
+    assert policy.stop_reason(0, 40, first_pass_entities=1) == "small_chunk"
+    assert policy.stop_reason(0, 400, first_pass_entities=20) == "dense_first_pass"
+    assert policy.stop_reason(0, 400, first_pass_entities=3) is None
+    assert policy.stop_reason(1, 400, 3, last_added=2) is None
+    assert policy.stop_reason(2, 400, 3, last_added=0) == "no_gain"
+    assert policy.stop_reason(3, 400, 3, last_added=1) == "max_rounds"
+    assert GleaningPolicy(0).stop_reason(0, 400, 3) == "disabled"
+
+
+def test_snapshot_buckets_gleaning_yield():
+    policy = GleaningPolicy(2, min_chunk_tokens=100)
+    policy.record(40, 1, [], "small_chunk")
+    policy.record(600, 3, [(2, 1), (0, 0)], "no_gain")
+
+    stats = policy.snapshot()
+    assert stats["chunks"] == 2
+    assert stats["gleaned_chunks"] == 1
+    assert stats["rounds"] == 2
+    assert stats["productive_rounds"] == 1
+    assert stats["entities_added"] == 2
+    assert stats["stop_reasons"] == {"small_chunk": 1, "no_gain": 1}
+    assert stats["by_tokens"]["<128"] == {
+        "chunks": 1,
+        "rounds": 0,
+        "productive_rounds": 0,
+        "added": 0,
+    }
+    assert stats["by_tokens"]["<1024"]["added"] == 3
+    assert stats["by_density"]["<1"]["rounds"] == 2
+
+
+@pytest.mark.asyncio
+async def test_extract_entities_glean_rounds_follow_the_policy():
+    calls = {"extract": 0, "glean": 0}
+
+    async def llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+        if not history_messages:
+            calls["extract"] += 1
+            return "\n".join([_entity("Alice"), COMPLETE])
+        calls["glean"] += 1
+        # The first gleaning round finds Bob, later rounds find nothing new
+        return "\n".join([_entity("Bob"), COMPLETE])
+
+    global_config = {
+        "llm_model_func": llm,
+        "entity_extract_max_gleaning": 5,
+        "addon_params": {},
+        "llm_model_max_async": 2,
+    }
+    chunks = {
+        "chunk-small": {"content": "Alice.", "tokens": 2, "full_doc_id": "doc"},
+        "chunk-large": {
+            "content": "Alice met someone. " * 40,
+            "tokens": 160,
+            "full_doc_id": "doc",
+        },
+    }
+    policy = GleaningPolicy(5, min_chunk_tokens=100, max_entity_density=5.0)
+
+    results = await extract_entities(chunks, global_config, gleaning_policy=policy)
+
+    # Only the large chunk is gleaned: once finding Bob, once adding nothing
+    assert calls == {"extract": 2, "glean": 2}
+    assert sorted(len(nodes) for nodes, _ in results) == [1, 2]
+    stats = policy.snapshot()
+    assert stats["stop_reasons"] == {"small_chunk": 1, "no_gain": 1}
+    assert stats["productive_rounds"] == 1
@@ -0,0 +1,113 @@
+"""Tests for batched graph writes.
+
+Covers the NetworkX batch upserts and the write batcher used by the merge
+phase, which must group concurrent upserts without changing what callers see.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.operate import _GraphWriteBatcher
+
+
+async def _make_storage(tmp_path, workspace: str) -> NetworkXStorage:
+    initialize_share_data()
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace=workspace,
+        global_config={"working_dir": str(tmp_path), "max_graph_nodes": 1000},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_networkx_batch_upserts_match_single_upserts(tmp_path):
+    single = await _make_storage(tmp_path, "single")
+    batched = await _make_storage(tmp_path, "batched")
+
+    nodes = {
+        f"n{i}": {"entity_id": f"n{i}", "entity_type": "concept", "weight": str(i)}
+        for i in range(5)
+    }
+    edges = [(f"n{i}", f"n{i + 1}", {"weight": "1.0"}) for i in range(4)]
+    update = {"n0": {"entity_id": "n0", "description": "updated"}}
+
+    for node_id, data in nodes.items():
+        await single.upsert_node(node_id, data)
+    for src, tgt, data in edges:
+        await single.upsert_edge(src, tgt, data)
+    await single.upsert_node("n0", update["n0"])
+
+    await batched.upsert_nodes_batch(nodes)
+    await batched.upsert_edges_batch(edges)
+    await batched.upsert_nodes_batch(update)
+
+    single_graph = await single._get_graph()
+    batched_graph = await batched._get_graph()
+    assert dict(batched_graph.nodes(data=True)) == dict(single_graph.nodes(data=True))
+    assert list(batched_graph.edges(data=True)) == list(single_graph.edges(data=True))
+    assert batched_graph.nodes["n0"]["entity_type"] == "concept"
+
+
+class _RecordingGraph:
+    def __init__(self, failing_node: str | None = None):
+        self.calls: list[tuple[str, object]] = []
+        self.failing_node = failing_node
+
+    async def upsert_nodes_batch(self, nodes):
+        self.calls.append(("nodes_batch", sorted(nodes)))
+        if self.failing_node in nodes:
+            raise ValueError("bad node")
+
+    async def upsert_edges_batch(self, edges):
+        self.calls.append(("edges_batch", [(src, tgt) for src, tgt, _ in edges]))
+
+    async def upsert_node(self, node_id, node_data):
+        self.calls.append(("node", node_id))
+        if node_id == self.failing_node:
+            raise ValueError("bad node")
+
+    async def has_node(self, node_id):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_batcher_groups_concurrent_writes_nodes_first():
+    graph = _RecordingGraph()
+    writer = _GraphWriteBatcher(graph)
+
+    async def merge(i):
+        await writer.upsert_node(f"n{i}", {"entity_id": f"n{i}"})
+        await writer.upsert_edge(f"n{i}", "hub", {"weight": "1"})
+
+    await asyncio.gather(*(merge(i) for i in range(4)))
+
+    assert graph.calls == [
+        ("nodes_batch", ["n0", "n1", "n2", "n3"]),
+        ("edges_batch", [("n0", "hub"), ("n1", "hub"), ("n2", "hub"), ("n3", "hub")]),
+    ]
+    # Reads are forwarded to the wrapped storage
+    assert await writer.has_node("n0")
+
+
+@pytest.mark.asyncio
+async def test_batcher_isolates_failures_to_their_caller():
+    graph = _RecordingGraph(failing_node="bad")
+    writer = _GraphWriteBatcher(graph)
+
+    results = await asyncio.gather(
+        writer.upsert_node("good", {"entity_id": "good"}),
+        writer.upsert_node("bad", {"entity_id": "bad"}),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    assert ("node", "good") in graph.calls
@@ -0,0 +1,35 @@
+"""Tests for the cached parsing of <SEP>-joined node/edge fields."""
+
+from __future__ import annotations
+
+from lightrag.api.rls import _is_source_allowed
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.utils import split_graph_field, split_string_by_multi_markers
+
+
+def test_split_graph_field_matches_legacy_split_without_duplicates():
+    value = GRAPH_FIELD_SEP.join(["chunk-1", " chunk-2 ", "", "chunk-1", "chunk-3"])
+
+    assert split_graph_field(value) == ("chunk-1", "chunk-2", "chunk-3")
+    assert list(split_graph_field(value)) == list(
+        dict.fromkeys(split_string_by_multi_markers(value, [GRAPH_FIELD_SEP]))
+    )
+    assert split_graph_field("") == ()
+    assert split_graph_field(None) == ()
+
+
+def test_split_graph_field_reuses_parsed_result_for_equal_strings():
+    value = GRAPH_FIELD_SEP.join(f"chunk-{i}" for i in range(100))
+    # An equal but distinct string, as returned by a storage on every read
+    copy = "".join([value[:10], value[10:]])
+    assert copy is not value
+
+    assert split_graph_field(copy) is split_graph_field(value)
+
+
+def test_is_source_allowed_uses_parsed_chunks():
+    source_id = GRAPH_FIELD_SEP.join(["chunk-a", "chunk-b"])
+
+    assert _is_source_allowed(source_id, {"chunk-b"})
+    assert not _is_source_allowed(source_id, {"chunk-c"})
+    assert not _is_source_allowed("", {"chunk-a"})
@@ -0,0 +1,171 @@
+"""Tests for the secondary indexes of JsonDocStatusStorage.
+
+Every indexed lookup is checked against a brute force scan of the stored
+records, including after status changes, deletes and writes made through
+another storage instance sharing the same namespace.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.json_doc_status_impl import (
+    _INDEX_CHANGE_LOG_SIZE,
+    JsonDocStatusStorage,
+    _DocStatusIndex,
+)
+from lightrag.kg.shared_storage import initialize_share_data
+
+STATUSES = [DocStatus.PENDING, DocStatus.PROCESSING, DocStatus.PROCESSED]
+
+
+def _record(i: int, status: DocStatus, **extra) -> dict:
+    record = {
+        "content_summary": f"doc {i}",
+        "content_length": 100 + i,
+        "file_path": f"file_{i % 7}.txt",
+        "status": status.value,
+        "created_at": f"2025-01-01T00:00:{i:02d}+00:00",
+        "updated_at": f"2025-01-02T00:{(i * 7) % 60:02d}:{i:02d}+00:00",
+        "track_id": f"track_{i % 3}",
+    }
+    record.update(extra)
+    return record
+
+
+async def _make_storage(tmp_path, workspace: str) -> JsonDocStatusStorage:
+    storage = JsonDocStatusStorage(
+        namespace="doc_status",
+        workspace=workspace,
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def _brute_force(storage, status=None, sort_field="updated_at", reverse=True):
+    docs = [
+        (doc_id, doc)
+        for doc_id, doc in storage._data.items()
+        if status is None or doc["status"] == status.value
+    ]
+    docs.sort(key=lambda item: (item[1][sort_field], item[0]), reverse=reverse)
+    return [doc_id for doc_id, _ in docs]
+
+
+@pytest.mark.asyncio
+async def test_indexed_lookups_match_full_scan(tmp_path):
+    initialize_share_data()
+    storage = await _make_storage(tmp_path, "index_lookups")
+    rng = random.Random(7)
+
+    await storage.upsert(
+        {f"doc-{i}": _record(i, rng.choice(STATUSES)) for i in range(40)}
+    )
+    # Status transitions and deletions must move documents between indexes
+    await storage.upsert(
+        {f"doc-{i}": _record(i + 1, DocStatus.FAILED) for i in range(0, 40, 5)}
+    )
+    await storage.delete([f"doc-{i}" for i in range(3, 40, 9)])
+
+    for status in DocStatus:
+        expected = set(_brute_force(storage, status))
+        assert set(await storage.get_docs_by_status(status)) == expected
+        assert (await storage.get_status_counts())[status.value] == len(expected)
+
+    track_docs = await storage.get_docs_by_track_id("track_1")
+    assert set(track_docs) == {
+        doc_id for doc_id, doc in storage._data.items() if doc["track_id"] == "track_1"
+    }
+
+    found = await storage.get_doc_by_file_path("file_2.txt")
+    assert found is not None and found["file_path"] == "file_2.txt"
+    assert await storage.get_doc_by_file_path("missing.txt") is None
+
+    for sort_field in ("created_at", "updated_at"):
+        for direction in ("asc", "desc"):
+            expected = _brute_force(
+                storage, DocStatus.FAILED, sort_field, direction == "desc"
+            )
+            page, total = await storage.get_docs_paginated(
+                status_filter=DocStatus.FAILED,
+                page=1,
+                page_size=10,
+                sort_field=sort_field,
+                sort_direction=direction,
+            )
+            assert total == len(expected)
+            assert [doc_id for doc_id, _ in page] == expected[:10]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_writes_from_other_instances(tmp_path):
+    initialize_share_data()
+    reader = await _make_storage(tmp_path, "index_shared")
+    writer = await _make_storage(tmp_path, "index_shared")
+
+    await writer.upsert({"doc-1": _record(1, DocStatus.PENDING)})
+    assert set(await reader.get_docs_by_status(DocStatus.PENDING)) == {"doc-1"}
+
+    await writer.upsert({"doc-1": _record(1, DocStatus.PROCESSED)})
+    assert await reader.get_docs_by_status(DocStatus.PENDING) == {}
+    assert set(await reader.get_docs_by_status(DocStatus.PROCESSED)) == {"doc-1"}
+
+    await writer.delete(["doc-1"])
+    assert await reader.get_doc_by_file_path("file_1.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_other_instances_reindex_only_changed_documents(tmp_path, monkeypatch):
+    initialize_share_data()
+    reader = await _make_storage(tmp_path, "index_replay")
+    writer = await _make_storage(tmp_path, "index_replay")
+    await writer.upsert({f"doc-{i}": _record(i, DocStatus.PENDING) for i in range(5)})
+    await reader.get_status_counts()
+
+    builds = []
+    original_build = _DocStatusIndex.build.__func__
+
+    def counting_build(cls, items):
+        builds.append(1)
+        return original_build(cls, items)
+
+    monkeypatch.setattr(_DocStatusIndex, "build", classmethod(counting_build))
+    await writer.upsert({"doc-1": _record(1, DocStatus.PROCESSED)})
+    await writer.delete(["doc-2"])
+    counts = await reader.get_status_counts()
+    assert builds == []
+    assert counts[DocStatus.PENDING.value] == 3
+    assert counts[DocStatus.PROCESSED.value] == 1
+
+    # A reader that fell behind the change log rebuilds once
+    for i in range(_INDEX_CHANGE_LOG_SIZE + 1):
+        await writer.upsert({"doc-0": _record(i % 50, DocStatus.PENDING)})
+    await reader.get_status_counts()
+    assert builds == [1]
+
+    await writer.drop()
+    assert (await reader.get_status_counts())[DocStatus.PENDING.value] == 0
+
+
+@pytest.mark.asyncio
+async def test_tenant_filter_does_not_change_json_results(tmp_path):
+    initialize_share_data()
+    storage = await _make_storage(tmp_path, "index_tenant")
+    await storage.upsert(
+        {
+            "public": _record(1, DocStatus.PROCESSED, scope="public"),
+            "pending": _record(3, DocStatus.PENDING),
+        }
+    )
+
+    # Like the other non-MongoDB backends, the JSON backend lists every record
+    for tenant_filter in (None, {"tenant_id": "other"}):
+        _, total = await storage.get_docs_paginated(tenant_filter=tenant_filter)
+        assert total == 2
+        counts = await storage.get_all_status_counts(tenant_filter=tenant_filter)
+        assert counts["all"] == 2
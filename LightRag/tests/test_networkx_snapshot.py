@@ -0,0 +1,135 @@
+"""Unit tests for the CSR snapshot used by NetworkXStorage subgraph queries.
+
+The snapshot-based traversal must return the same subgraph as the plain
+NetworkX breadth-first search it replaces, and must never serve stale data
+after the graph is modified.
+"""
+
+from __future__ import annotations
+
+import random
+
+import networkx as nx
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage, _GraphSnapshot
+from lightrag.kg.shared_storage import initialize_share_data
+
+
+def _reference_bfs(graph: nx.Graph, start: str, max_depth: int, max_nodes: int):
+    """Degree-prioritized BFS as implemented before the snapshot was introduced."""
+    bfs_nodes = []
+    visited = set()
+    queue = [(start, 0, graph.degree(start))]
+    while queue and len(bfs_nodes) < max_nodes:
+        current_depth = queue[0][1]
+        level = []
+        while queue and queue[0][1] == current_depth:
+            level.append(queue.pop(0))
+        level.sort(key=lambda x: x[2], reverse=True)
+        for node, depth, _ in level:
+            if node not in visited:
+                visited.add(node)
+                bfs_nodes.append(node)
+                if depth < max_depth:
+                    for neighbor in graph.neighbors(node):
+                        if neighbor not in visited:
+                            queue.append((neighbor, depth + 1, graph.degree(neighbor)))
+            if len(bfs_nodes) >= max_nodes:
+                break
+    return bfs_nodes
+
+
+def _random_graph(seed: int = 7) -> nx.Graph:
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    for i in range(120):
+        graph.add_node(f"n{i}", entity_type="concept", source_id=f"chunk-{i}")
+    for _ in range(300):
+        a, b = rng.randrange(120), rng.randrange(120)
+        graph.add_edge(f"n{a}", f"n{b}", weight=1.0, source_id=f"chunk-{a}")
+    return graph
+
+
+@pytest.fixture
+def storage(tmp_path):
+    initialize_share_data()
+    store = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path), "max_graph_nodes": 1000},
+        embedding_func=None,
+    )
+    return store
+
+
+def test_snapshot_matches_graph_structure():
+    graph = _random_graph()
+    graph.add_edge("n1", "n1")  # self-loop counts twice in the degree
+    snapshot = _GraphSnapshot.from_graph(graph)
+
+    for node, index in snapshot.node_index.items():
+        assert snapshot.degrees[index] == graph.degree(node)
+        neighbors = {snapshot.node_ids[i] for i in snapshot.neighbors(index)}
+        assert neighbors == set(graph.neighbors(node))
+
+    ordered = [snapshot.node_ids[i] for i in snapshot.degree_order]
+    expected = [n for n, _ in sorted(graph.degree(), key=lambda x: x[1], reverse=True)]
+    assert ordered == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_depth,max_nodes", [(1, 1000), (2, 15), (3, 50), (5, 7)])
+async def test_bfs_matches_reference(storage, max_depth, max_nodes):
+    await storage.initialize()
+    storage._graph = _random_graph()
+    storage._invalidate_snapshot()
+
+    result = await storage.get_knowledge_graph("n0", max_depth, max_nodes)
+    expected_nodes = _reference_bfs(storage._graph, "n0", max_depth, max_nodes)
+
+    assert [node.id for node in result.nodes] == expected_nodes
+    expected_edges = {
+        tuple(sorted(edge)) for edge in storage._graph.subgraph(expected_nodes).edges()
+    }
+    assert {(edge.source, edge.target) for edge in result.edges} == expected_edges
+    assert len(result.edges) == len(expected_edges)
+
+
+@pytest.mark.asyncio
+async def test_star_label_returns_highest_degree_nodes(storage):
+    await storage.initialize()
+    storage._graph = _random_graph()
+    storage._invalidate_snapshot()
+
+    result = await storage.get_knowledge_graph("*", max_nodes=10)
+    degrees = sorted(storage._graph.degree(), key=lambda x: x[1], reverse=True)
+
+    assert result.is_truncated
+    assert [node.id for node in result.nodes] == [n for n, _ in degrees[:10]]
+
+
+@pytest.mark.asyncio
+async def test_cached_subgraph_is_invalidated_on_write(storage):
+    await storage.initialize()
+    await storage.upsert_node("a", {"entity_type": "person"})
+    await storage.upsert_node("b", {"entity_type": "person"})
+    await storage.upsert_edge("a", "b", {"weight": "1.0"})
+
+    first = await storage.get_knowledge_graph("a", max_depth=2)
+    second = await storage.get_knowledge_graph("a", max_depth=2)
+    assert [n.id for n in first.nodes] == [n.id for n in second.nodes] == ["a", "b"]
+    second.nodes.clear()  # callers must not be able to corrupt the cache
+    assert len((await storage.get_knowledge_graph("a", max_depth=2)).nodes) == 2
+
+    await storage.upsert_node("c", {"entity_type": "person"})
+    await storage.upsert_edge("b", "c", {"weight": "1.0"})
+    updated = await storage.get_knowledge_graph("a", max_depth=2)
+    assert [n.id for n in updated.nodes] == ["a", "b", "c"]
+    assert await storage.get_popular_labels(1) == ["b"]
+
+    await storage.remove_nodes(["c"])
+    assert [n.id for n in (await storage.get_knowledge_graph("a", 2)).nodes] == [
+        "a",
+        "b",
+    ]
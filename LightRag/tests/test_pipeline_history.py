@@ -0,0 +1,82 @@
+"""Tests for the sequence-numbered pipeline history ring buffer."""
+
+from __future__ import annotations
+
+from lightrag.kg.shared_storage import PipelineHistory, SharedDataManager
+
+
+def _messages(batch: dict) -> list[str]:
+    return [event["message"] for event in batch["events"]]
+
+
+def test_events_since_returns_only_new_messages():
+    history = PipelineHistory()
+    for i in range(5):
+        history.append(f"m{i}")
+
+    first = history.events_since(0, limit=3)
+    assert _messages(first) == ["m0", "m1", "m2"]
+    assert [e["seq"] for e in first["events"]] == [1, 2, 3]
+
+    second = history.events_since(first["last_seq"])
+    assert _messages(second) == ["m3", "m4"]
+    assert history.events_since(second["last_seq"])["events"] == []
+    assert history.events_since(second["last_seq"])["last_seq"] == 5
+
+
+def test_ring_buffer_drops_oldest_and_reports_missed_messages():
+    history = PipelineHistory(maxlen=3)
+    for i in range(5):
+        history.append(f"m{i}")
+
+    assert list(history) == ["m2", "m3", "m4"]
+    batch = history.events_since(1)
+    assert batch["dropped"] == 1
+    assert [e["seq"] for e in batch["events"]] == [3, 4, 5]
+
+
+def test_clear_and_rewrite_keep_sequence_increasing():
+    history = PipelineHistory()
+    history.extend(["a", "b"])
+
+    del history[:]
+    history.append("c")
+    batch = history.events_since(2)
+    assert batch["events"] == [{"seq": 3, "message": "c"}]
+
+    history[:] = ["Starting document deletion process"]
+    assert history.events_since(3)["events"] == [
+        {"seq": 4, "message": "Starting document deletion process"}
+    ]
+    # A cursor from before a restart gets the whole buffer again
+    assert _messages(history.events_since(99)) == ["Starting document deletion process"]
+
+
+def test_tail_reads_latest_messages():
+    history = PipelineHistory()
+    history.extend(f"m{i}" for i in range(10))
+
+    assert history.tail(3) == {
+        "messages": ["m7", "m8", "m9"],
+        "count": 10,
+        "last_seq": 10,
+    }
+
+
+def test_shared_history_is_read_through_manager_proxy():
+    manager = SharedDataManager()
+    manager.start()
+    try:
+        shared = manager.dict()
+        shared["history_messages"] = manager.PipelineHistory()
+        history = shared["history_messages"]
+        history.append("indexing")
+        del history[:]
+        history.append("done")
+
+        batch = shared["history_messages"].events_since(0)
+        assert batch["events"] == [{"seq": 2, "message": "done"}]
+        assert batch["dropped"] == 1
+        assert history.tail(5)["messages"] == ["done"]
+    finally:
+        manager.shutdown()
@@ -0,0 +1,234 @@
+"""Tests for the bulk upsert and vector query paths of the PG storages.
+
+A recording connection stands in for asyncpg so the statements issued per
+call can be checked without a PostgreSQL server.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from lightrag.base import QueryParam, VectorScopeFilter  # noqa: E402
+from lightrag.kg.postgres_impl import (  # noqa: E402
+    PGKVStorage,
+    PGVectorStorage,
+    PostgreSQLDB,
+)
+from lightrag.operate import _get_edge_data, _get_vector_context  # noqa: E402
+from lightrag.utils import EmbeddingFunc  # noqa: E402
+
+
+class _RecordingConnection:
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.calls.append(("transaction",))
+        yield
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", sql, args))
+
+    async def executemany(self, sql, args):
+        self.calls.append(("executemany", sql, list(args)))
+
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        self.calls.append(("copy", table_name, list(records), list(columns)))
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", sql, args))
+        return []
+
+
+class _RecordingPool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+
+def _db(connection, **config) -> PostgreSQLDB:
+    db = PostgreSQLDB(
+        {
+            **config,
+            "host": "localhost",
+            "port": 5432,
+            "user": "user",
+            "password": "password",
+            "database": "lightrag",
+            "workspace": "bulk",
+            "max_connections": 4,
+            "connection_retry_attempts": 1,
+            "connection_retry_backoff": 0,
+            "connection_retry_backoff_max": 0,
+            "pool_close_timeout": 1,
+        }
+    )
+    db.pool = _RecordingPool(connection)
+    return db
+
+
+async def _embed(texts: list[str], **kwargs) -> np.ndarray:
+    return np.array([[float(len(t)), 0.5, 0.25] for t in texts], dtype=np.float32)
+
+
+def _vector_storage(namespace: str, db: PostgreSQLDB) -> PGVectorStorage:
+    storage = PGVectorStorage(
+        namespace=namespace,
+        workspace="bulk",
+        global_config={
+            "embedding_batch_num": 8,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=3, func=_embed),
+        meta_fields={"entity_name", "source_id", "content", "file_path"},
+    )
+    storage.db = db
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_kv_upsert_sends_one_batched_statement():
+    connection = _RecordingConnection()
+    storage = PGKVStorage(
+        namespace="full_entities",
+        workspace="bulk",
+        global_config={"embedding_batch_num": 10},
+        embedding_func=None,
+    )
+    storage.db = _db(connection)
+
+    await storage.upsert(
+        {f"doc-{i}": {"entity_names": [f"E{i}"], "count": 1} for i in range(50)}
+    )
+
+    batched = [c for c in connection.calls if c[0] == "executemany"]
+    assert len(batched) == 1
+    assert [c[0] for c in connection.calls if c[0] == "execute"] == []
+    assert len(batched[0][2]) == 50
+    assert batched[0][2][0][:2] == ("bulk", "doc-0")
+
+
+@pytest.mark.asyncio
+async def test_vector_upsert_copies_binary_vectors_and_merges_once():
+    connection = _RecordingConnection()
+    storage = _vector_storage("entities", _db(connection))
+
+    await storage.upsert(
+        {
+            f"ent-{i}": {
+                "entity_name": f"E{i}",
+                "content": f"entity {i}",
+                "source_id": "chunk-1<SEP>chunk-2",
+                "file_path": "a.txt",
+            }
+            for i in range(20)
+        }
+    )
+
+    copies = [c for c in connection.calls if c[0] == "copy"]
+    statements = [c[1] for c in connection.calls if c[0] == "execute"]
+    assert len(copies) == 1
+    _, stage_table, records, columns = copies[0]
+    assert len(records) == 20
+    record = dict(zip(columns, records[0]))
+    assert record["content_vector"] == [8.0, 0.5, 0.25]
+    assert record["chunk_ids"] == ["chunk-1", "chunk-2"]
+    assert "float4[]" in statements[1]
+    assert f"FROM {stage_table}" in statements[-1]
+    assert "content_vector::vector" in statements[-1]
+    # create + retype staging table, then a single merge
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_vector_query_binds_embedding_and_reuses_statement_text():
+    connection = _RecordingConnection()
+    storage = _vector_storage("chunks", _db(connection, hnsw_ef_search=80))
+
+    await storage.query("first", top_k=5, query_embedding=[0.1, 0.2, 0.3])
+    await storage.query("second", top_k=5, query_embedding=[0.3, 0.2, 0.1])
+    await storage.query("third", top_k=5, query_embedding=[0.3, 0.2, 0.1], probes=7)
+
+    fetches = [c for c in connection.calls if c[0] == "fetch"]
+    assert len({sql for _, sql, _ in fetches}) == 1
+    assert "0.1" not in fetches[0][1]
+    assert fetches[1][2][3] == pytest.approx([0.3, 0.2, 0.1])
+
+    settings = [c[2] for c in connection.calls if c[0] == "execute"]
+    assert settings == [
+        ("hnsw.ef_search", "80"),
+        ("hnsw.ef_search", "80"),
+        ("hnsw.ef_search", "80"),
+        ("ivfflat.probes", "7"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_param_search_settings_reach_the_vector_query():
+    connection = _RecordingConnection()
+    db = _db(connection, hnsw_ef_search=40)
+    param = QueryParam(mode="mix", hnsw_ef_search=200, ivfflat_probes=9)
+
+    await _get_vector_context(
+        "question",
+        _vector_storage("chunks", db),
+        param,
+        query_embedding=[0.1, 0.2, 0.3],
+    )
+    await _get_edge_data("keywords", None, _vector_storage("relationships", db), param)
+
+    settings = [c[2] for c in connection.calls if c[0] == "execute"]
+    assert (
+        settings
+        == [
+            ("hnsw.ef_search", "200"),
+            ("ivfflat.probes", "9"),
+        ]
+        * 2
+    )
+    # Without an override the storage configuration still applies
+    connection.calls.clear()
+    await _get_vector_context(
+        "question",
+        _vector_storage("chunks", db),
+        QueryParam(mode="naive"),
+        query_embedding=[0.1, 0.2, 0.3],
+    )
+    assert [c[2] for c in connection.calls if c[0] == "execute"] == [
+        ("hnsw.ef_search", "40")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scoped_vector_query_widens_the_index_search_until_top_k():
+    connection = _RecordingConnection()
+    # Rows the index search finds in scope at each ef_search
+    rows_by_ef_search = {"40": 1, "160": 2, "640": 5}
+
+    async def _fetch(sql, *args):
+        settings = dict(c[2] for c in connection.calls if c[0] == "execute")
+        connection.calls.append(("fetch", sql, args))
+        found = rows_by_ef_search[settings.get("hnsw.ef_search", "40")]
+        return [{"id": f"chunk-{i}"} for i in range(found)]
+
+    connection.fetch = _fetch
+    storage = _vector_storage("chunks", _db(connection, vector_index_type="HNSW"))
+    scope = VectorScopeFilter(doc_ids=frozenset({"doc-a"}))
+
+    results = await storage.query(
+        "q", top_k=5, query_embedding=[0.1, 0.2, 0.3], scope=scope
+    )
+
+    assert len(results) == 5
+    settings = [c[2] for c in connection.calls if c[0] == "execute"]
+    # The first query runs on the server default, which is pgvector's 40
+    assert settings == [("hnsw.ef_search", "160"), ("hnsw.ef_search", "640")]
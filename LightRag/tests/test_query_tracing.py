@@ -0,0 +1,90 @@
+"""Unit tests for per-query stage tracing and the stage latency histograms."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from lightrag.tracing import (
+    StageHistogram,
+    get_stage_histograms,
+    query_trace,
+    render_prometheus,
+    reset_stage_histograms,
+    trace_span,
+    traced,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_histograms():
+    reset_stage_histograms()
+    yield
+    reset_stage_histograms()
+
+
+@traced("search")
+async def _search():
+    async def branch(name):
+        with trace_span(name):
+            await asyncio.sleep(0)
+
+    await asyncio.gather(branch("local"), branch("global"))
+
+
+@pytest.mark.asyncio
+async def test_spans_are_attributed_to_their_parent_across_gather():
+    with query_trace() as trace:
+        with trace_span("query"):
+            await _search()
+            await _search()
+
+    summary = trace.to_dict()
+    parents = {(span["name"], span["parent"]) for span in summary["spans"]}
+    assert parents == {
+        ("query", None),
+        ("search", "query"),
+        ("local", "search"),
+        ("global", "search"),
+    }
+    assert summary["stages"]["search"]["count"] == 2
+    assert summary["total_ms"] >= summary["stages"]["query"]["duration_ms"]
+
+
+@pytest.mark.asyncio
+async def test_nested_query_trace_reuses_the_outer_trace():
+    with query_trace() as outer:
+        with query_trace() as inner:
+            with trace_span("stage"):
+                pass
+    assert inner is outer
+    assert [span["name"] for span in outer.spans] == ["stage"]
+
+
+def test_spans_without_trace_still_feed_histograms():
+    with trace_span("rerank"):
+        pass
+    with trace_span("rerank"):
+        pass
+
+    snapshot = get_stage_histograms()
+    assert snapshot["rerank"]["count"] == 2
+    assert snapshot["rerank"]["buckets"]["+Inf"] == 2
+
+    text = render_prometheus()
+    assert 'lightrag_query_stage_duration_seconds_count{stage="rerank"} 2' in text
+    assert (
+        'lightrag_query_stage_duration_seconds_bucket{stage="rerank",le="+Inf"} 2'
+        in text
+    )
+
+
+def test_histogram_quantile_interpolates_within_bucket():
+    histogram = StageHistogram(buckets=(0.1, 0.2, 0.4))
+    for value in (0.05, 0.15, 0.15, 0.3):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 0]
+    assert histogram.quantile(0.5) == pytest.approx(0.15)
+    assert histogram.quantile(1.0) == pytest.approx(0.4)
@@ -0,0 +1,98 @@
+"""Tests for the extraction cache shared between workspaces."""
+
+from __future__ import annotations
+
+import pytest
+
+from lightrag.kg.extraction_cache import SharedExtractionCache
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import use_llm_func_with_cache
+
+
+class _WordTokenizer:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+async def _kv(tmp_path, namespace: str, workspace: str) -> JsonKVStorage:
+    storage = JsonKVStorage(
+        namespace=namespace,
+        workspace=workspace,
+        global_config={
+            "working_dir": str(tmp_path),
+            "enable_llm_cache_for_entity_extract": True,
+        },
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def _key(content: str, **overrides) -> str:
+    params = dict(
+        prompt_version="v1",
+        model="model-a",
+        language="English",
+        entity_types=["person", "organization"],
+    )
+    params.update(overrides)
+    return SharedExtractionCache.make_key(content, **params)
+
+
+def test_key_depends_on_everything_that_shapes_the_answer():
+    base = _key("Alice founded Acme.")
+    assert _key("Alice founded Acme.") == base
+    assert _key("Alice founded Acme!") != base
+    assert _key("Alice founded Acme.", prompt_version="v2") != base
+    assert _key("Alice founded Acme.", model="model-b") != base
+    assert _key("Alice founded Acme.", language="French") != base
+    assert _key("Alice founded Acme.", entity_types=["person"]) != base
+    assert _key("Alice founded Acme.", stage="glean:abc") != base
+
+
+@pytest.mark.asyncio
+async def test_identical_chunk_in_another_workspace_skips_the_llm(tmp_path):
+    initialize_share_data()
+    shared_storage = await _kv(tmp_path, "shared_extraction_cache", "shared")
+    calls = []
+
+    async def llm(prompt, system_prompt=None, **kwargs):
+        calls.append(prompt)
+        return "entity<|>Alice<|>person<|>founder"
+
+    content = "Alice founded Acme."
+    results = {}
+    for workspace, file_name in (("tenant_a", "a.txt"), ("tenant_b", "renamed.txt")):
+        cache = SharedExtractionCache(
+            shared_storage, workspace=workspace, tokenizer=_WordTokenizer()
+        )
+        workspace_cache = await _kv(tmp_path, "llm_response_cache", workspace)
+        collected = []
+        # The prompt differs per upload, the content address does not
+        results[workspace], _ = await use_llm_func_with_cache(
+            f"file: {file_name}\n{content}",
+            llm,
+            llm_response_cache=workspace_cache,
+            cache_type="extract",
+            chunk_id="chunk-1",
+            cache_keys_collector=collected,
+            shared_cache=cache,
+            shared_cache_key=_key(content),
+        )
+        await cache.flush()
+        # Served answers are written through so workspace rebuilds still work
+        assert collected
+        assert (await workspace_cache.get_by_id(collected[0]))["return"] == results[
+            workspace
+        ]
+
+    assert len(calls) == 1
+    assert results["tenant_a"] == results["tenant_b"]
+
+    report = await cache.report()
+    assert report["workspaces"]["tenant_a"]["stored"] == 1
+    assert report["workspaces"]["tenant_b"]["hits"] == 1
+    assert report["workspaces"]["tenant_b"]["cross_workspace_hits"] == 1
+    assert report["totals"]["saved_tokens"] > 0
+    assert report["totals"]["hit_rate"] == 0.5
@@ -0,0 +1,92 @@
+"""Import-time budget for lightrag-server startup.
+
+Every API worker (and every gunicorn worker recycle) pays the import of
+lightrag.api.lightrag_server, so heavy optional dependencies must stay out of
+it and be imported on first use instead. The import runs in a fresh
+interpreter so modules loaded by other tests do not hide a regression.
+
+The wall-clock budget defaults to a generous value and can be tightened on a
+known machine with LIGHTRAG_IMPORT_BUDGET_S.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+_IMPORT_BUDGET_S = float(os.getenv("LIGHTRAG_IMPORT_BUDGET_S", "2.5"))
+
+# Modules that must only be imported on first use
+_LAZY_MODULES = [
+    # Chinese pinyin sorting of document lists
+    "pypinyin",
+    # MongoDB driver, loaded when the user database connects
+    "motor",
+    "pymongo",
+    # Only needed to install missing optional packages
+    "pipmaster",
+    # Only used for type annotations in lightrag.exceptions
+    "httpx",
+    # LLM bindings, resolved from LLM_BINDING when the app is created
+    "openai",
+    "lightrag.llm.openai",
+    "lightrag.llm.ollama",
+    # Storage implementations, resolved through lightrag.kg.STORAGES
+    "lightrag.kg.json_kv_impl",
+    "lightrag.kg.nano_vector_db_impl",
+    "lightrag.kg.networkx_impl",
+    "lightrag.kg.postgres_impl",
+    "networkx",
+    "nano_vectordb",
+    # Document parsers, imported by the upload handlers
+    "docling",
+    "PyPDF2",
+    "docx",
+    "pptx",
+    "openpyxl",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import lightrag.api.lightrag_server
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.fixture(scope="module")
+def server_import(tmp_path_factory):
+    # Run outside the repo so a developer's .env does not change the result
+    cwd = tmp_path_factory.mktemp("startup")
+    env = {k: v for k, v in os.environ.items() if k != "GUNICORN_CMD_ARGS"}
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        pytest.skip(f"lightrag.api.lightrag_server cannot be imported: {proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result["elapsed"], set(result["modules"])
+
+
+@pytest.mark.parametrize("module", _LAZY_MODULES)
+def test_optional_module_not_imported_at_startup(server_import, module):
+    _, modules = server_import
+    assert module not in modules
+
+
+def test_server_import_within_budget(server_import):
+    elapsed, _ = server_import
+    assert elapsed < _IMPORT_BUDGET_S, (
+        f"importing lightrag.api.lightrag_server took {elapsed:.2f}s "
+        f"(budget {_IMPORT_BUDGET_S:.2f}s)"
+    )
@@ -0,0 +1,166 @@
+"""Unit tests for the streaming knowledge graph export."""
+
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+import pytest_asyncio
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import compute_mdhash_id
+from lightrag.utils_export import astream_export_data
+
+
+class _FakeVectorStorage:
+    """Records get_by_ids calls so tests can assert on batching."""
+
+    def __init__(self, records: dict[str, dict]):
+        self._records = records
+        self.calls: list[list[str]] = []
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict | None]:
+        self.calls.append(list(ids))
+        return [self._records.get(i) for i in ids]
+
+
+@pytest_asyncio.fixture
+async def graph(tmp_path):
+    initialize_share_data()
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    for i in range(7):
+        await storage.upsert_node(
+            f"E{i}", {"entity_type": "concept", "source_id": f"chunk-{i}"}
+        )
+    for i in range(6):
+        await storage.upsert_edge(
+            f"E{i}", f"E{i + 1}", {"weight": "1.0", "source_id": f"chunk-{i}"}
+        )
+    await storage.upsert_edge("E0", "E6", {"weight": "2.0", "source_id": "chunk-0"})
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_jsonl_export_emits_each_edge_once(graph, tmp_path):
+    output = tmp_path / "export.jsonl"
+    progress = []
+
+    result = await astream_export_data(
+        graph,
+        None,
+        None,
+        str(output),
+        file_format="jsonl",
+        batch_size=3,
+        progress_callback=lambda stage, done, total: progress.append(
+            (stage, done, total)
+        ),
+    )
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    entities = [r for r in records if r["type"] == "entity"]
+    relations = [r for r in records if r["type"] == "relation"]
+    assert result["entities"] == len(entities) == 7
+    assert result["relations"] == len(relations) == 7
+    assert len({(r["src_entity"], r["tgt_entity"]) for r in relations}) == 7
+    assert entities[0]["graph_data"]["entity_type"] == "concept"
+    assert progress[-1] == ("relations", 7, 7)
+    assert [p for p in progress if p[0] == "entities"] == [
+        ("entities", 3, 7),
+        ("entities", 6, 7),
+        ("entities", 7, 7),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_export_reads_vectors_in_batches(graph, tmp_path):
+    entity_vectors = {
+        compute_mdhash_id(f"E{i}", prefix="ent-"): {"id": f"ent-{i}"} for i in range(7)
+    }
+    # Relation vectors may be stored under either direction
+    relation_vectors = {
+        compute_mdhash_id("E6E0", prefix="rel-"): {"id": "rel-reverse"},
+    }
+    entities_vdb = _FakeVectorStorage(entity_vectors)
+    relationships_vdb = _FakeVectorStorage(relation_vectors)
+    output = tmp_path / "export.csv"
+
+    await astream_export_data(
+        graph,
+        entities_vdb,
+        relationships_vdb,
+        str(output),
+        file_format="csv",
+        include_vector_data=True,
+        batch_size=4,
+    )
+
+    assert [len(call) for call in entities_vdb.calls] == [4, 3]
+    sections = output.read_text(encoding="utf-8").split("\n\n\n")
+    assert sections[0].startswith("# ENTITIES")
+    assert sections[1].startswith("# RELATIONS")
+    relation_rows = list(csv.DictReader(sections[1].splitlines()[1:]))
+    assert len(relation_rows) == 7
+    wrapped = [
+        r for r in relation_rows if {r["src_entity"], r["tgt_entity"]} == {"E0", "E6"}
+    ]
+    assert json.loads(wrapped[0]["vector_data"]) == {"id": "rel-reverse"}
+
+    # The legacy trailing section lists the relation vector records
+    assert sections[2].startswith("# RELATIONSHIPS")
+    relationship_rows = list(csv.DictReader(sections[2].splitlines()[1:]))
+    assert [r["relationship_id"] for r in relationship_rows] == ["rel-reverse"]
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_writes_one_file_per_table(graph, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    result = await astream_export_data(
+        graph, None, None, str(tmp_path / "export.parquet"), file_format="parquet"
+    )
+
+    entities_path, relations_path = result["paths"]
+    assert pq.read_table(entities_path).num_rows == 7
+    assert pq.read_table(relations_path).num_rows == 7
+
+
+@pytest.mark.asyncio
+async def test_unsupported_format_is_rejected(graph, tmp_path):
+    with pytest.raises(ValueError):
+        await astream_export_data(
+            graph, None, None, str(tmp_path / "out.xml"), file_format="xml"
+        )
+
+
+def test_sync_export_wrappers_forward_progress_callback(monkeypatch, tmp_path):
+    import lightrag.utils as utils
+    from lightrag.lightrag import LightRAG
+
+    def callback(stage, done, total):
+        pass
+
+    forwarded = []
+
+    async def _aexport_data(*args, **kwargs):
+        forwarded.append(kwargs.get("progress_callback"))
+
+    monkeypatch.setattr(utils, "aexport_data", _aexport_data)
+    utils.export_data(
+        None, None, None, str(tmp_path / "out.csv"), progress_callback=callback
+    )
+
+    class _Rag:
+        aexport_data = staticmethod(_aexport_data)
+
+    LightRAG.export_data(_Rag(), str(tmp_path / "out.csv"), progress_callback=callback)
+
+    assert forwarded == [callback, callback]
@@ -0,0 +1,181 @@
+"""Tests for the hand-offs between extraction, merging and vector writes."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+
+import numpy as np
+import pytest
+
+from lightrag import LightRAG
+from lightrag.base import DocStatus
+from lightrag.kg.shared_storage import initialize_pipeline_status
+from lightrag.operate import ChunkResultStream, VectorUpsertQueue
+from lightrag.prompt import PROMPTS
+from lightrag.utils import EmbeddingFunc, Tokenizer, compute_mdhash_id
+
+SEP = PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+COMPLETE = PROMPTS["DEFAULT_COMPLETION_DELIMITER"]
+
+
+class _RecordingVectorStorage:
+    def __init__(self, fail_on: str | None = None):
+        self.calls: list[tuple] = []
+        self.fail_on = fail_on
+
+    async def upsert(self, data):
+        await asyncio.sleep(0)
+        self.calls.append(("upsert", sorted(data)))
+        if self.fail_on in data:
+            raise ValueError("embedding failed")
+
+    async def delete(self, ids):
+        self.calls.append(("delete", list(ids)))
+
+
+@pytest.mark.asyncio
+async def test_vector_queue_batches_upserts_in_submission_order():
+    storage = _RecordingVectorStorage()
+    queue = VectorUpsertQueue(storage, max_pending=16)
+    first, second = queue.writer(), queue.writer()
+
+    await first.upsert({"ent-a": {"content": "a"}})
+    await second.upsert({"ent-b": {"content": "b"}})
+    await second.delete(["rel-x"])
+    await first.upsert({"rel-x": {"content": "x"}})
+    await asyncio.gather(first.flush(), second.flush())
+
+    assert storage.calls == [
+        ("upsert", ["ent-a", "ent-b"]),
+        ("delete", ["rel-x"]),
+        ("upsert", ["rel-x"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_vector_queue_reports_failures_only_to_the_writing_merge():
+    storage = _RecordingVectorStorage(fail_on="ent-bad")
+    queue = VectorUpsertQueue(storage, max_pending=16)
+    failing, other = queue.writer(), queue.writer()
+
+    await failing.upsert({"ent-bad": {"content": "?"}})
+    with pytest.raises(Exception, match="embedding failed"):
+        await failing.flush()
+
+    await other.upsert({"ent-ok": {"content": "ok"}})
+    await other.flush()
+    assert storage.calls[-1] == ("upsert", ["ent-ok"])
+
+
+@pytest.mark.asyncio
+async def test_vector_queue_splits_a_failed_batch_between_its_writers():
+    storage = _RecordingVectorStorage(fail_on="ent-bad")
+    queue = VectorUpsertQueue(storage, max_pending=16)
+    failing, other = queue.writer(), queue.writer()
+
+    # Both writes are queued before the writer task runs, so they share a batch
+    await failing.upsert({"ent-bad": {"content": "?"}})
+    await other.upsert({"ent-ok": {"content": "ok"}})
+    results = await asyncio.gather(
+        failing.flush(), other.flush(), return_exceptions=True
+    )
+
+    assert isinstance(results[0], Exception)
+    assert results[1] is None
+    assert ("upsert", ["ent-bad", "ent-ok"]) in storage.calls
+    assert storage.calls[-1] == ("upsert", ["ent-ok"])
+
+
+class _WordTokenizer:
+    def encode(self, content: str) -> list[str]:
+        return content.split()
+
+    def decode(self, tokens: list[str]) -> str:
+        return " ".join(tokens)
+
+
+async def _embed(texts: list[str], **kwargs) -> np.ndarray:
+    vectors = np.zeros((len(texts), 8), dtype=np.float32)
+    for row, text in enumerate(texts):
+        vectors[row, len(text) % 8] = 1.0
+    return vectors
+
+
+async def _failing_llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+    """Extracts the capitalized names of a chunk, times out on the last chunk"""
+    if history_messages:
+        return COMPLETE
+    text = system_prompt.split("Text:\n```\n", 1)[1].rsplit("\n```", 1)[0]
+    if "Timeout" in text:
+        # Give the merge of the earlier chunks time to run first
+        await asyncio.sleep(0.3)
+        raise TimeoutError("LLM request timed out")
+    names = re.findall(r"\b[A-Z][a-z]+\b", text)
+    lines = [
+        SEP.join(["entity", name, "person", f"{name} is named."]) for name in names
+    ]
+    lines.append(SEP.join(["relation", names[0], names[1], "knows", "They met."]))
+    return "\n".join(lines + [COMPLETE])
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_leaves_merged_rounds_deletable(tmp_path):
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        workspace="streaming_failure",
+        llm_model_func=_failing_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, max_token_size=512, func=_embed),
+        tokenizer=Tokenizer(model_name="word", tokenizer=_WordTokenizer()),
+        enable_llm_cache=False,
+        llm_model_max_async=2,
+    )
+    await rag.initialize_storages()
+    await initialize_pipeline_status()
+    try:
+        await rag.ainsert(
+            "Alice met Bob.\n\nCarol met Dave.\n\nTimeout follows here.",
+            ids="doc-1",
+            split_by_character="\n\n",
+            split_by_character_only=True,
+        )
+
+        assert "doc-1" in await rag.doc_status.get_docs_by_status(DocStatus.FAILED)
+        graph = rag.chunk_entity_relation_graph
+        merged = set(await graph.get_all_labels())
+        # The first round reached the graph before the last chunk failed
+        assert merged & {"Alice", "Bob", "Carol", "Dave"}
+        listed = await rag.full_entities.get_by_id("doc-1")
+        assert set(listed["entity_names"]) >= merged
+
+        result = await rag.adelete_by_doc_id("doc-1")
+        assert result.status == "success"
+        assert await graph.get_all_labels() == []
+        vectors = await rag.entities_vdb.get_by_ids(
+            [compute_mdhash_id(name, prefix="ent-") for name in merged]
+        )
+        assert not any(vectors)
+        assert await rag.full_entities.get_by_id("doc-1") is None
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.asyncio
+async def test_chunk_result_stream_applies_backpressure_and_aborts():
+    stream = ChunkResultStream(maxsize=2)
+    await stream.put(({"A": []}, {}))
+    await stream.put(({"B": []}, {}))
+
+    blocked = asyncio.create_task(stream.put(({"C": []}, {})))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    assert len(await stream.get_batch()) == 2
+    await blocked
+    await stream.abort(ValueError("merge failed"))
+    with pytest.raises(RuntimeError):
+        await stream.put(({"D": []}, {}))
+
+    await stream.close()
+    assert len(await stream.get_batch()) == 1
+    assert await stream.get_batch() == []
@@ -0,0 +1,182 @@
+"""Tests for document scope filters pushed into vector search."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lightrag.base import VectorScopeFilter
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.mongo_impl import MongoVectorDBStorage
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+
+def test_scope_filter_matches_chunks_by_doc_and_entities_by_source():
+    scope = VectorScopeFilter(
+        doc_ids=frozenset({"doc-a"}), chunk_ids=frozenset({"chunk-a1"})
+    )
+
+    assert scope.matches({"full_doc_id": "doc-a"})
+    assert not scope.matches({"full_doc_id": "doc-b"})
+    assert scope.matches({"source_id": GRAPH_FIELD_SEP.join(["chunk-b1", "chunk-a1"])})
+    assert not scope.matches({"source_id": "chunk-b1"})
+    assert not scope.matches({"source_id": ""})
+
+    # Without known chunk ids, entities and relations are left to post-filtering
+    unresolved = VectorScopeFilter(doc_ids=frozenset({"doc-a"}))
+    assert unresolved.matches({"source_id": "chunk-b1"})
+    assert not unresolved.matches({"full_doc_id": "doc-b"})
+
+
+async def _fake_embed(texts: list[str]) -> np.ndarray:
+    # "rank-<i>" is embedded further from the query direction as i grows
+    vectors = []
+    for text in texts:
+        rank = int(text.rsplit("-", 1)[1]) if text.startswith("rank-") else 0
+        angle = rank * 0.02
+        vectors.append([np.cos(angle), np.sin(angle), 0.0, 0.0])
+    return np.array(vectors, dtype=np.float32)
+
+
+def _global_config(tmp_path) -> dict:
+    return {
+        "working_dir": str(tmp_path),
+        "embedding_batch_num": 32,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+    }
+
+
+async def _nano_storage(tmp_path) -> NanoVectorDBStorage:
+    initialize_share_data()
+    storage = NanoVectorDBStorage(
+        namespace="entities",
+        workspace="scope",
+        global_config=_global_config(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=_fake_embed),
+        meta_fields={"entity_name", "source_id"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_nano_scoped_query_fills_top_k_from_matching_records(tmp_path):
+    storage = await _nano_storage(tmp_path)
+    # The ten best matches come from a document the user cannot access
+    await storage.upsert(
+        {
+            f"ent-{i}": {
+                "content": f"rank-{i}",
+                "entity_name": f"E{i}",
+                "source_id": "chunk-hidden" if i < 10 else f"chunk-{i}",
+            }
+            for i in range(20)
+        }
+    )
+    query_embedding = (await _fake_embed(["query"]))[0]
+    scope = VectorScopeFilter(
+        doc_ids=frozenset({"doc-open"}),
+        chunk_ids=frozenset(f"chunk-{i}" for i in range(10, 20)),
+    )
+
+    unscoped = await storage.query("query", top_k=3, query_embedding=query_embedding)
+    scoped = await storage.query(
+        "query", top_k=3, query_embedding=query_embedding, scope=scope
+    )
+
+    assert [r["entity_name"] for r in unscoped] == ["E0", "E1", "E2"]
+    assert [r["entity_name"] for r in scoped] == ["E10", "E11", "E12"]
+    assert all(r["distance"] > 0.2 for r in scoped)
+
+
+@pytest.mark.asyncio
+async def test_nano_scoped_query_without_matching_records(tmp_path):
+    storage = await _nano_storage(tmp_path)
+    await storage.upsert(
+        {"ent-0": {"content": "rank-0", "entity_name": "E0", "source_id": "chunk-0"}}
+    )
+    scope = VectorScopeFilter(
+        doc_ids=frozenset({"doc-open"}), chunk_ids=frozenset({"chunk-open"})
+    )
+
+    query_embedding = (await _fake_embed(["query"]))[0]
+
+    assert (
+        await storage.query(
+            "query", top_k=3, query_embedding=query_embedding, scope=scope
+        )
+        == []
+    )
+
+
+class _VectorSearchCollection:
+    """Answers $vectorSearch pipelines from precomputed scores, best first"""
+
+    def __init__(self, docs: list[dict]):
+        self.docs = sorted(docs, key=lambda doc: -doc["score"])
+        self.limits: list[int] = []
+
+    async def aggregate(self, pipeline, **kwargs):
+        search = pipeline[0]["$vectorSearch"]
+        threshold = pipeline[2]["$match"]["score"]["$gte"]
+        self.limits.append(search["limit"])
+        docs = [
+            dict(doc)
+            for doc in self.docs[: search["limit"]]
+            if doc["score"] >= threshold
+        ]
+
+        class _Cursor:
+            async def to_list(self, length=None):
+                return docs
+
+        return _Cursor()
+
+
+@pytest.mark.asyncio
+async def test_mongo_scoped_query_widens_until_top_k_match(tmp_path):
+    storage = MongoVectorDBStorage(
+        namespace="entities",
+        workspace="scope",
+        global_config=_global_config(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=_fake_embed),
+        meta_fields={"entity_name", "source_id"},
+    )
+    # The thirty best matches come from a document the user cannot access
+    storage._data = _VectorSearchCollection(
+        [
+            {
+                "_id": f"ent-{i}",
+                "entity_name": f"E{i}",
+                "source_id": "chunk-hidden" if i < 30 else f"chunk-{i}",
+                "score": 1 - i * 0.01,
+            }
+            for i in range(60)
+        ]
+    )
+    scope = VectorScopeFilter(
+        doc_ids=frozenset({"doc-open"}),
+        chunk_ids=frozenset(f"chunk-{i}" for i in range(30, 60)),
+    )
+
+    results = await storage.query(
+        "query", top_k=3, query_embedding=[1.0, 0.0, 0.0, 0.0], scope=scope
+    )
+
+    assert [r["entity_name"] for r in results] == ["E30", "E31", "E32"]
+    assert storage._data.limits == [12, 48]
+
+    # Stops once the candidates above the threshold run out
+    storage._data.limits.clear()
+    hidden = VectorScopeFilter(
+        doc_ids=frozenset({"doc-open"}), chunk_ids=frozenset({"chunk-none"})
+    )
+    assert (
+        await storage.query(
+            "query", top_k=3, query_embedding=[1.0, 0.0, 0.0, 0.0], scope=hidden
+        )
+        == []
+    )
+    assert storage._data.limits == [12, 48, 192]
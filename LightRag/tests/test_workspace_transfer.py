@@ -0,0 +1,183 @@
+"""Round trip of a workspace through the Parquet export and import."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage  # noqa: E402
+from lightrag.kg.json_kv_impl import JsonKVStorage  # noqa: E402
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage  # noqa: E402
+from lightrag.kg.networkx_impl import NetworkXStorage  # noqa: E402
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+from lightrag.utils import EmbeddingFunc, compute_mdhash_id  # noqa: E402
+from lightrag.utils_export import aexport_workspace, aimport_workspace  # noqa: E402
+
+
+class _CountingEmbedding:
+    def __init__(self):
+        self.texts = 0
+
+    async def __call__(self, texts: list[str]) -> np.ndarray:
+        self.texts += len(texts)
+        return np.array(
+            [[len(t), t.count("a"), t.count("e"), 1.0] for t in texts],
+            dtype=np.float32,
+        )
+
+
+async def _storages(tmp_path, workspace: str, embed: _CountingEmbedding) -> dict:
+    config = {
+        "working_dir": str(tmp_path),
+        "embedding_batch_num": 8,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+    }
+    embedding_func = EmbeddingFunc(embedding_dim=4, func=embed)
+
+    def kv(namespace):
+        return JsonKVStorage(
+            namespace=namespace,
+            workspace=workspace,
+            global_config=config,
+            embedding_func=embedding_func,
+        )
+
+    def vdb(namespace, meta_fields):
+        return NanoVectorDBStorage(
+            namespace=namespace,
+            workspace=workspace,
+            global_config=config,
+            embedding_func=embedding_func,
+            meta_fields=meta_fields,
+        )
+
+    storages = {
+        "full_docs": kv("full_docs"),
+        "text_chunks": kv("text_chunks"),
+        "llm_response_cache": kv("llm_response_cache"),
+        "entity_chunks": kv("entity_chunks"),
+        "chunk_entity_relation_graph": NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace=workspace,
+            global_config=config,
+            embedding_func=embedding_func,
+        ),
+        "entities_vdb": vdb("entities", {"entity_name", "source_id", "content"}),
+        "chunks_vdb": vdb("chunks", {"full_doc_id", "content"}),
+        "doc_status": JsonDocStatusStorage(
+            namespace="doc_status",
+            workspace=workspace,
+            global_config=config,
+            embedding_func=None,
+        ),
+    }
+    for storage in storages.values():
+        await storage.initialize()
+    return storages
+
+
+async def _populate(storages: dict) -> None:
+    await storages["full_docs"].upsert({"doc-1": {"content": "alpha beta"}})
+    await storages["text_chunks"].upsert(
+        {
+            "chunk-1": {
+                "content": "alpha",
+                "full_doc_id": "doc-1",
+                "llm_cache_list": ["default:extract:abc"],
+            }
+        }
+    )
+    await storages["llm_response_cache"].upsert(
+        {
+            "default:extract:abc": {"return": "(entity)", "cache_type": "extract"},
+            "default:extract:unreferenced": {"return": "-", "cache_type": "extract"},
+        }
+    )
+    await storages["entity_chunks"].upsert(
+        {"Alpha": {"chunk_ids": ["chunk-1"], "count": 1}}
+    )
+    graph = storages["chunk_entity_relation_graph"]
+    for name in ("Alpha", "Beta"):
+        await graph.upsert_node(
+            name,
+            {"entity_id": name, "entity_type": "concept", "source_id": "chunk-1"},
+        )
+    await graph.upsert_edge("Alpha", "Beta", {"weight": 1.0, "source_id": "chunk-1"})
+    await storages["entities_vdb"].upsert(
+        {
+            compute_mdhash_id(name, prefix="ent-"): {
+                "entity_name": name,
+                "source_id": "chunk-1",
+                "content": f"{name}\nsome entity",
+            }
+            for name in ("Alpha", "Beta")
+        }
+    )
+    await storages["chunks_vdb"].upsert(
+        {"chunk-1": {"full_doc_id": "doc-1", "content": "alpha"}}
+    )
+    await storages["doc_status"].upsert(
+        {
+            "doc-1": {
+                "status": "processed",
+                "chunks_list": ["chunk-1"],
+                "chunks_count": 1,
+                "content_summary": "alpha beta",
+                "content_length": 10,
+                "file_path": "a.txt",
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            }
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_workspace_round_trip_reuses_exported_vectors(tmp_path):
+    initialize_share_data()
+    source_embed, target_embed = _CountingEmbedding(), _CountingEmbedding()
+    source = await _storages(tmp_path, "source", source_embed)
+    await _populate(source)
+
+    export_dir = tmp_path / "export"
+    manifest = await aexport_workspace(
+        source, str(export_dir), batch_size=1, manifest_extra={"embedding_dim": 4}
+    )
+    rows = {name: section["rows"] for name, section in manifest["sections"].items()}
+    assert rows["graph_nodes"] == 2
+    assert rows["graph_edges"] == 1
+    assert rows["entities_vdb"] == 2
+    # Only cache entries referenced by a chunk belong to the workspace
+    assert rows["llm_response_cache"] == 1
+
+    target = await _storages(tmp_path, "target", target_embed)
+    # The live storage keeps its embedding function while vectors are imported
+    entities_vdb = target["entities_vdb"]
+    embedding_func = entities_vdb.embedding_func
+    upsert = entities_vdb.upsert
+    seen_funcs = []
+
+    async def _upsert(data, vectors=None):
+        seen_funcs.append(entities_vdb.embedding_func)
+        await upsert(data, vectors=vectors)
+
+    entities_vdb.upsert = _upsert
+    counts = await aimport_workspace(target, str(export_dir), batch_size=1)
+
+    assert counts["doc_status"] == 1
+    assert target_embed.texts == 0
+    assert seen_funcs == [embedding_func, embedding_func]
+    assert (await target["full_docs"].get_by_id("doc-1"))["content"] == "alpha beta"
+    assert (await target["doc_status"].get_by_id("doc-1"))["chunks_list"] == ["chunk-1"]
+    graph = target["chunk_entity_relation_graph"]
+    assert await graph.has_edge("Beta", "Alpha")
+    ent_id = compute_mdhash_id("Alpha", prefix="ent-")
+    source_vector = (await source["entities_vdb"].get_vectors_by_ids([ent_id]))[ent_id]
+    target_vector = (await target["entities_vdb"].get_vectors_by_ids([ent_id]))[ent_id]
+    assert target_vector == pytest.approx(source_vector, rel=1e-2)
+    hits = await target["chunks_vdb"].query(
+        "alpha", top_k=1, query_embedding=(await source_embed(["alpha"]))[0]
+    )
+    assert [hit["id"] for hit in hits] == ["chunk-1"]
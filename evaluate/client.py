@@ -1,25 +1,36 @@
 """
-LightRAG HTTP client.
+LightRAG HTTP clients.
 
 Authentication:
   - Login only via email/password at POST /login.
-  - Token is cached and reused for all subsequent requests.
+  - Token is cached at class level and shared by every client instance,
+    sync or async; it is only refreshed after a 401/403.
 
-Two separate API calls per question:
-  POST /query/data  → pure retrieval (no LLM).
-                       Returns { "data": { "chunks": [...], "entities": [...], ... } }
-  POST /query       → LLM generation.
-                       Returns { "response": "<answer>" }
+One API call per question:
+  POST /query       → retrieval + LLM generation in a single server round.
+                       Returns { "response": "<answer>",
+                                 "context_data": { "chunks": [...], "entities": [...], ... } }
+
+POST /query/data (retrieval only) and the answer-only helpers are kept for
+diagnostics, but the evaluation runner no longer uses them: calling both
+endpoints ran retrieval twice per question.
+
+LightRAGClient is the blocking client used by the TruLens-instrumented
+RAGPipeline. AsyncLightRAGClient is used by the concurrent runner and keeps a
+pooled httpx.AsyncClient open for the whole evaluation.
 """
 
 from __future__ import annotations
 
+import asyncio
 import time
 from typing import Any
 
+import httpx
 import requests
 
 from config import (
+    EVAL_QUERY_CONCURRENCY,
     LIGHTRAG_HOST,
     LIGHTRAG_PASSWORD,
     LIGHTRAG_USERNAME,
@@ -28,6 +39,28 @@ from config import (
 )
 
 
+def _query_payload(question: str, mode: str, top_k: int) -> dict[str, Any]:
+    """Request body for a non-streaming POST /query returning answer + context."""
+    return {
+        "query": question,
+        "mode": mode,
+        "top_k": top_k,
+        "stream": False,
+        # context_data already carries the chunks, skip the reference list
+        "include_references": False,
+    }
+
+
+def _token_from_login(resp_json: dict[str, Any]) -> str:
+    token = resp_json.get("access_token")
+    if not token:
+        raise ValueError(
+            f"Login to {LIGHTRAG_HOST}/login succeeded but no access_token in response. "
+            "Check LIGHTRAG_USERNAME / LIGHTRAG_PASSWORD in evaluate/.env"
+        )
+    return token
+
+
 class LightRAGClient:
     """Thin HTTP client for the LightRAG server."""
 
@@ -38,8 +71,9 @@ class LightRAGClient:
 
     def _login(self) -> str:
         """Return a cached Bearer token, logging in via email/password."""
-        cached_token = self._token
+        cached_token = self._token or LightRAGClient._shared_token
         if cached_token is not None:
+            self._token = cached_token
             return cached_token
         resp = requests.post(
             f"{LIGHTRAG_HOST}/login",
@@ -48,12 +82,7 @@ class LightRAGClient:
             timeout=30,
         )
         resp.raise_for_status()
-        token = resp.json().get("access_token")
-        if not token:
-            raise ValueError(
-                f"Login to {LIGHTRAG_HOST}/login succeeded but no access_token in response. "
-                "Check LIGHTRAG_USERNAME / LIGHTRAG_PASSWORD in evaluate/.env"
-            )
+        token = _token_from_login(resp.json())
         self._token = token
         LightRAGClient._shared_token = token
         return token
@@ -107,6 +136,29 @@ class LightRAGClient:
             {"query": question, "mode": mode, "top_k": top_k, "stream": False},
         )
 
+    def query(self, question: str, mode: str, top_k: int = 10) -> dict[str, Any]:
+        """POST /query — one retrieval + generation, returns answer and context."""
+        return self._post("/query", _query_payload(question, mode, top_k))
+
+    @staticmethod
+    def extract_context(response_data: dict[str, Any]) -> dict[str, Any]:
+        """Return the retrieval data (chunks, entities, ...) of a POST /query response.
+
+        Has the same shape as ``response["data"]`` of ``/query/data``, so it can
+        be passed to the other ``extract_*`` helpers.
+        """
+        return response_data.get("context_data") or {}
+
+    @staticmethod
+    def extract_chunk_texts(data: dict[str, Any]) -> list[str]:
+        """Return the non-empty text chunk contents of retrieval data."""
+        texts: list[str] = []
+        for chunk in data.get("chunks") or []:
+            content = (chunk.get("content") or "").strip()
+            if content:
+                texts.append(content)
+        return texts
+
     @staticmethod
     def extract_chunks(
         data: dict[str, Any],
@@ -165,3 +217,83 @@ class LightRAGClient:
     def extract_answer(response_data: dict[str, Any]) -> str:
         """Return the generated answer string from a POST /query response."""
         return response_data.get("response", "")
+
+
+class AsyncLightRAGClient:
+    """Asyncio HTTP client for the LightRAG server.
+
+    One instance is meant to be shared by every concurrent task of an
+    evaluation run: requests go through a single pooled ``httpx.AsyncClient``
+    and a single login token. When the token expires, only the first task to
+    see the 401/403 logs in again, the others pick up the refreshed token.
+    """
+
+    def __init__(self, max_connections: int = EVAL_QUERY_CONCURRENCY) -> None:
+        self._http = httpx.AsyncClient(
+            base_url=LIGHTRAG_HOST,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._token: str | None = LightRAGClient._shared_token
+        self._login_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncLightRAGClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def _login(self, expired: str | None = None) -> str:
+        """Return the shared token, logging in when missing or equal to *expired*."""
+        async with self._login_lock:
+            if self._token is not None and self._token != expired:
+                return self._token
+            resp = await self._http.post(
+                "/login",
+                data={"username": LIGHTRAG_USERNAME, "password": LIGHTRAG_PASSWORD},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            token = _token_from_login(resp.json())
+            self._token = token
+            LightRAGClient._shared_token = token
+            return token
+
+    async def _post(self, endpoint: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """POST to an endpoint with retry/back-off. Returns parsed JSON."""
+        last_exc: Exception | None = None
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                token = await self._login()
+                resp = await self._http.post(
+                    endpoint,
+                    json=payload,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                if resp.status_code in (401, 403):
+                    token = await self._login(expired=token)
+                    resp = await self._http.post(
+                        endpoint,
+                        json=payload,
+                        headers={"Authorization": f"Bearer {token}"},
+                    )
+                resp.raise_for_status()
+                return resp.json()
+            except Exception as exc:
+                last_exc = exc
+                if attempt < MAX_RETRIES:
+                    await asyncio.sleep(attempt)
+
+        raise RuntimeError(
+            f"LightRAG {endpoint} failed after {MAX_RETRIES} attempts: {last_exc}"
+        )
+
+    async def query(self, question: str, mode: str, top_k: int = 10) -> dict[str, Any]:
+        """POST /query — one retrieval + generation, returns answer and context."""
+        return await self._post("/query", _query_payload(question, mode, top_k))
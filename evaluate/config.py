@@ -25,6 +25,10 @@ MAX_RELATIONSHIPS: int = 5
 REQUEST_TIMEOUT: int = 120
 MAX_RETRIES: int = 3
 
+# Concurrent runner — in-flight LightRAG /query calls and metric computations
+EVAL_QUERY_CONCURRENCY: int = int(os.getenv("EVAL_QUERY_CONCURRENCY", "8"))
+EVAL_METRIC_CONCURRENCY: int = int(os.getenv("EVAL_METRIC_CONCURRENCY", "8"))
+
 # Groundedness v2 — OpenAI SDK direct call
 GROUNDEDNESS_MODEL: str = os.getenv("GROUNDEDNESS_MODEL", "gpt-4o-mini")
 GROUNDEDNESS_TEMPERATURE: float = 0.0
@@ -6,7 +6,7 @@ All business logic lives in dedicated modules:
   client.py     - LightRAG HTTP client
   evaluator.py  - plain RAGPipeline (no TruLens instrumentation)
   metrics.py    - direct provider metric computation
-  runner.py     - per-mode, per-question evaluation loop
+  runner.py     - concurrent (mode, question) evaluation
   reporting.py  - results persistence and terminal output
 
 Usage:
@@ -15,6 +15,7 @@ Usage:
     py evaluate_trulens.py --questions 5       # quick test (5 questions)
     py evaluate_trulens.py --mode local        # single mode
     py evaluate_trulens.py --mode local --mode global  # multiple modes
+    py evaluate_trulens.py --concurrency 16    # 16 LightRAG queries in flight
     py evaluate_trulens.py --dashboard         # open TruLens dashboard
     py evaluate_trulens.py --summary           # print last run summary
     py evaluate_trulens.py --clear             # reset TruLens database
@@ -26,12 +27,19 @@ Configuration (evaluate/.env):
     LIGHTRAG_HOST       server URL         (default: http://localhost:9621)
     LIGHTRAG_USERNAME   login username (email, default: admin@example.com)
     LIGHTRAG_PASSWORD   login password      (default: 12345678)
+    EVAL_QUERY_CONCURRENCY   concurrent /query calls        (default: 8)
+    EVAL_METRIC_CONCURRENCY  concurrent metric computations (default: 8)
 """
 
 import argparse
 import sys
 
-from config import RETRIEVAL_MODES, TRULENS_PORT
+from config import (
+    EVAL_METRIC_CONCURRENCY,
+    EVAL_QUERY_CONCURRENCY,
+    RETRIEVAL_MODES,
+    TRULENS_PORT,
+)
 from reporting import (
     print_previous_summary,
     print_summary,
@@ -84,6 +92,20 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Append to existing TruLens database instead of resetting it",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=EVAL_QUERY_CONCURRENCY,
+        metavar="N",
+        help=f"Concurrent LightRAG /query calls (default: {EVAL_QUERY_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--metric-concurrency",
+        type=int,
+        default=EVAL_METRIC_CONCURRENCY,
+        metavar="N",
+        help=f"Concurrent metric computations (default: {EVAL_METRIC_CONCURRENCY})",
+    )
     return parser.parse_args()
 
 
@@ -103,6 +125,8 @@ def _cmd_run(args: argparse.Namespace) -> None:
         modes=modes,
         max_questions=args.questions,
         reset_db=reset,
+        query_concurrency=args.concurrency,
+        metric_concurrency=args.metric_concurrency,
     )
 
     save_detailed_results(result)
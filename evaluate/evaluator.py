@@ -6,11 +6,19 @@ RAGPipeline calls LightRAG APIs directly and returns results for metric computat
 query() returns the answer string (str) so that TruLens select_record_output()
 resolves to the answer directly.  The full result tuple
 (chunks, answer, entities, relationships) is cached in _last_query_result for
-_evaluate_one() to read after the call returns.
+the runner to read after the call returns.
+
+A single POST /query per question returns both the answer and the retrieval
+context; retrieve() and generate() are instrumented views over that response
+so TruLens still records a RETRIEVAL and a GENERATION span.  The concurrent
+runner fetches all responses up front and passes them as ``prefetched`` so
+that recording the TruLens dashboard does not hit the server again.
 """
 
 from __future__ import annotations
 
+from typing import Any, Optional
+
 from trulens.core.otel.instrument import instrument
 from trulens.otel.semconv.trace import SpanAttributes
 
@@ -21,37 +29,42 @@ from config import DEFAULT_TOP_K, MAX_ENTITIES, MAX_RELATIONSHIPS
 class RAGPipeline:
     """Plain wrapper around LightRAGClient for one retrieval mode."""
 
-    def __init__(self, mode: str, top_k: int = DEFAULT_TOP_K) -> None:
+    def __init__(
+        self,
+        mode: str,
+        top_k: int = DEFAULT_TOP_K,
+        prefetched: Optional[dict[str, dict[str, Any]]] = None,
+    ) -> None:
         self.mode = mode
         self.top_k = top_k
         self._client = LightRAGClient()
-        # Raw /query/data response cached by retrieve() for use in query()
-        self._last_retrieve_data: dict = {}
+        # question -> raw POST /query response already fetched by the runner
+        self._prefetched = prefetched or {}
+        # Raw POST /query response of the question being processed
+        self._last_response: dict[str, Any] = {}
 
     @instrument(span_type=SpanAttributes.SpanType.RETRIEVAL)
     def retrieve(self, question: str) -> list[str]:
-        """Call POST /query/data, cache raw data, return limited chunk strings.
+        """Return the text chunks of the current /query response.
 
         The returned list contains only text chunks (no entities / relationships)
         so that TruLens context-span selectors see a clean chunk list.  Entities
         and relationships are surfaced separately via query().
         """
-        raw = self._client.retrieve(question, self.mode, self.top_k)
-        self._last_retrieve_data = raw.get("data") or {}
-
-        # Return only text chunks for the TruLens retrieval span
-        chunks: list[str] = []
-        for chunk in self._last_retrieve_data.get("chunks") or []:
-            content = (chunk.get("content") or "").strip()
-            if content:
-                chunks.append(content)
-        return chunks
+        data = LightRAGClient.extract_context(self._last_response)
+        return LightRAGClient.extract_chunk_texts(data)
 
     @instrument(span_type=SpanAttributes.SpanType.GENERATION)
     def generate(self, question: str) -> str:
-        """Call POST /query (LLM), return answer string."""
-        raw = self._client.generate(question, self.mode, self.top_k)
-        return LightRAGClient.extract_answer(raw)
+        """Return the answer string of the current /query response."""
+        return LightRAGClient.extract_answer(self._last_response)
+
+    def fetch(self, question: str) -> dict[str, Any]:
+        """Return the raw POST /query response, calling the server if not prefetched."""
+        raw = self._prefetched.get(question)
+        if raw is None:
+            raw = self._client.query(question, self.mode, self.top_k)
+        return raw
 
     @instrument()
     def query(self, question: str) -> str:
@@ -60,19 +73,19 @@ class RAGPipeline:
         Returns the answer string so that TruLens ``select_record_output()``
         resolves to the answer directly (not a tuple).  The full result tuple
         ``(chunks, answer, entities, relationships)`` is cached in
-        ``self._last_query_result`` for ``_evaluate_one()`` to read after the
-        call returns.
+        ``self._last_query_result`` for the runner to read after the call
+        returns.
         """
+        self._last_response = self.fetch(question)
         chunks = self.retrieve(question)
         answer = self.generate(question)
 
-        data = self._last_retrieve_data
+        data = LightRAGClient.extract_context(self._last_response)
         entities = LightRAGClient.extract_entities(data, max_entities=MAX_ENTITIES)
         relationships = LightRAGClient.extract_relationships(
             data, max_relationships=MAX_RELATIONSHIPS
         )
 
-        # Cache for manual metric computation in runner._evaluate_one()
         self._last_query_result: tuple[list[str], str, list[str], list[str]] = (
             chunks,
             answer,
@@ -13,6 +13,7 @@ per-claim sub-calls that can inflate LLM request counts.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 
 import numpy as np
 
@@ -207,10 +208,7 @@ def compute_groundedness_v2(
     try:
         import json as _json
 
-        from openai import OpenAI
-
-        os.environ.setdefault("OPENAI_API_KEY", OPENAI_API_KEY)
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = _openai_client()
         response = client.chat.completions.create(
             model=GROUNDEDNESS_MODEL,
             messages=[
@@ -268,6 +266,15 @@ def compute_groundedness_v2(
         return (0.0, []) if return_reasons else 0.0
 
 
+@lru_cache(maxsize=1)
+def _openai_client() -> object:
+    """Shared OpenAI SDK client, reused across calls and worker threads."""
+    from openai import OpenAI
+
+    os.environ.setdefault("OPENAI_API_KEY", OPENAI_API_KEY)
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
 def create_provider() -> object:
     """Instantiate the TruLens OpenAI provider."""
     try:
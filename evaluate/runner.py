@@ -1,16 +1,22 @@
 """
 Evaluation orchestration for LightRAG + TruLens.
 
-run_evaluation() is the single public entry point:
+run_evaluation() (or run_evaluation_async() from a running event loop) is
+the single public entry point:
   1. Load questions from the dataset file.
-  2. For every requested retrieval mode:
-     a. Create a RAGPipeline.
-     b. For each question: retrieve + generate, then compute three metrics directly.
-  3. Build a leaderboard DataFrame and return a structured results dict.
+  2. Evaluate every (mode, question) pair concurrently, in two stages with
+     their own concurrency limit:
+     a. One POST /query through a shared AsyncLightRAGClient, returning both
+        the answer and the retrieval context.
+     b. Compute the three metrics directly in a worker thread.
+  3. Replay the fetched responses through a TruLens-instrumented RAGPipeline
+     per mode so the dashboard gets its records.
+  4. Build a leaderboard DataFrame and return a structured results dict.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 import warnings
@@ -23,7 +29,13 @@ import pandas as pd
 
 from trulens.core import Metric, Selector
 
+from client import AsyncLightRAGClient, LightRAGClient
 from config import (
+    DEFAULT_TOP_K,
+    EVAL_METRIC_CONCURRENCY,
+    EVAL_QUERY_CONCURRENCY,
+    MAX_ENTITIES,
+    MAX_RELATIONSHIPS,
     OPENAI_MODEL,
     PROMPTS_OUTPUT_FILE,
     QUESTIONS_FILE,
@@ -121,27 +133,43 @@ def load_questions(
 # Per-question evaluation
 
 
-def _evaluate_one(
-    pipeline: RAGPipeline,
-    provider: object,
-    question_data: dict,
-    idx: int,
-    total: int,
-) -> dict[str, Any]:
-    """Evaluate a single question: retrieve + generate + compute metrics."""
-    question = question_data["question"]
-    q_id = question_data.get("id", f"q{idx:03d}")
-    short_q = question[:70] + "..." if len(question) > 70 else question
+class _Progress:
+    """Prints one line per finished question; tasks finish out of order."""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.done = 0
+
+    def report(self, result: dict[str, Any]) -> None:
+        self.done += 1
+        question = result["question"]
+        short_q = question[:60] + "..." if len(question) > 60 else question
+        if result["status"] == "success":
+            suffix = "" if result["context_count"] else " (no context)"
+            outcome = (
+                f"[OK] CR={result['context_relevance']:.2f} "
+                f"AR={result['answer_relevance']:.2f} "
+                f"GR={result['groundedness']:.2f}{suffix}"
+            )
+        elif result["status"] == "empty_response":
+            outcome = "[ERR] (empty response)"
+        else:
+            outcome = f"[ERR] ({result['error']})"
+        print(
+            f"  [{self.done:>4}/{self.total}] {result['mode']:<6} "
+            f"{result['id']}: {short_q} {outcome}",
+            flush=True,
+        )
 
-    print(f"  [{idx:>3}/{total}] {q_id}: {short_q}", end=" ", flush=True)
 
-    result: dict[str, Any] = {
-        "id": q_id,
-        "question": question,
+def _new_result(question_data: dict, idx: int, mode: str) -> dict[str, Any]:
+    return {
+        "id": question_data.get("id", f"q{idx:03d}"),
+        "question": question_data["question"],
         "category": question_data.get("category", "unknown"),
         "retrieval_type": question_data.get("retrieval_type", "unknown"),
         "sources": question_data.get("sources", []),
-        "mode": pipeline.mode,
+        "mode": mode,
         "answer": None,
         "context_count": 0,
         "status": "pending",
@@ -153,53 +181,85 @@ def _evaluate_one(
         "chunks": [],
     }
 
+
+def _score_result(
+    provider: object,
+    result: dict[str, Any],
+    entities: list[str],
+    relationships: list[str],
+) -> None:
+    """Compute the RAG Triad metrics of a successful result in place.
+
+    Blocking (TruLens provider and OpenAI SDK calls), run in a worker thread.
+    Answer relevance does not require retrieved context, so it is computed
+    whenever we have an answer. Context relevance and groundedness depend on
+    chunks.
+    """
+    question = result["question"]
+    answer = result["answer"]
+    chunks = result["chunks"]
+
+    result["answer_relevance"] = compute_answer_relevance(provider, question, answer)
+    if chunks:
+        result["context_relevance"] = compute_context_relevance(
+            provider, question, chunks
+        )
+        result["groundedness"] = compute_groundedness_v2(
+            answer=answer,
+            chunks=chunks,
+            entities=entities,
+            relationships=relationships,
+        )
+
+
+async def _evaluate_one(
+    client: AsyncLightRAGClient,
+    provider: object,
+    question_data: dict,
+    idx: int,
+    mode: str,
+    query_slots: asyncio.Semaphore,
+    metric_slots: asyncio.Semaphore,
+    progress: _Progress,
+) -> tuple[dict[str, Any], Optional[dict[str, Any]]]:
+    """Evaluate a single question: one /query call, then compute metrics.
+
+    Each stage holds its own semaphore only while it runs, so LightRAG
+    queries of later questions overlap with metric computation of earlier
+    ones. Returns the result dict and the raw /query response (None on error).
+    """
+    result = _new_result(question_data, idx, mode)
+    raw: Optional[dict[str, Any]] = None
+
     try:
-        answer = pipeline.query(question)
-        chunks, _, entities, relationships = pipeline._last_query_result
+        async with query_slots:
+            raw = await client.query(result["question"], mode, DEFAULT_TOP_K)
+
+        data = LightRAGClient.extract_context(raw)
+        answer = LightRAGClient.extract_answer(raw)
+        chunks = LightRAGClient.extract_chunk_texts(data)
 
         result["answer"] = answer
         result["context_count"] = len(chunks)
         result["chunks"] = chunks
+        result["status"] = "success" if answer else "empty_response"
 
-        if answer:
-            result["status"] = "success"
-        else:
-            result["status"] = "empty_response"
-
-        # Compute RAG Triad metrics directly.
-        # Answer relevance does not require retrieved context, so compute it whenever
-        # we have an answer. Context relevance and groundedness depend on chunks.
         if result["status"] == "success":
-            result["answer_relevance"] = compute_answer_relevance(
-                provider, question, answer
+            entities = LightRAGClient.extract_entities(data, max_entities=MAX_ENTITIES)
+            relationships = LightRAGClient.extract_relationships(
+                data, max_relationships=MAX_RELATIONSHIPS
             )
-            if chunks:
-                result["context_relevance"] = compute_context_relevance(
-                    provider, question, chunks
-                )
-                result["groundedness"] = compute_groundedness_v2(
-                    answer=answer,
-                    chunks=chunks,
-                    entities=entities,
-                    relationships=relationships,
+            async with metric_slots:
+                await asyncio.to_thread(
+                    _score_result, provider, result, entities, relationships
                 )
 
-            cr = result["context_relevance"]
-            ar = result["answer_relevance"]
-            gr = result["groundedness"]
-            suffix = "" if chunks else " (no context)"
-            print(f"[OK] CR={cr:.2f} AR={ar:.2f} GR={gr:.2f}{suffix}")
-        elif result["status"] == "empty_response":
-            print("[ERR] (empty response)")
-        else:
-            print("[ERR] (no context)")
-
     except Exception as exc:
         result["status"] = "error"
         result["error"] = str(exc)[:300]
-        print(f"[ERR] ({result['error']})")
 
-    return result
+    progress.report(result)
+    return result, raw
 
 
 # Main evaluation loop
@@ -209,14 +269,41 @@ def run_evaluation(
     modes: Optional[list[str]] = None,
     max_questions: Optional[int] = None,
     reset_db: bool = True,
+    query_concurrency: int = EVAL_QUERY_CONCURRENCY,
+    metric_concurrency: int = EVAL_METRIC_CONCURRENCY,
+) -> dict[str, Any]:
+    """Blocking wrapper around :func:`run_evaluation_async`."""
+    return asyncio.run(
+        run_evaluation_async(
+            modes=modes,
+            max_questions=max_questions,
+            reset_db=reset_db,
+            query_concurrency=query_concurrency,
+            metric_concurrency=metric_concurrency,
+        )
+    )
+
+
+async def run_evaluation_async(
+    modes: Optional[list[str]] = None,
+    max_questions: Optional[int] = None,
+    reset_db: bool = True,
+    query_concurrency: int = EVAL_QUERY_CONCURRENCY,
+    metric_concurrency: int = EVAL_METRIC_CONCURRENCY,
 ) -> dict[str, Any]:
     """
     Run the full evaluation pipeline.
 
+    Every (mode, question) pair is evaluated concurrently, with at most
+    ``query_concurrency`` LightRAG queries and ``metric_concurrency`` metric
+    computations in flight.
+
     Args:
-        modes:         Retrieval modes to evaluate (default: all five).
-        max_questions: Cap the number of questions per mode (for testing).
-        reset_db:      Optionally reset TruLens database (ignored if TruSession unavailable).
+        modes:              Retrieval modes to evaluate (default: all five).
+        max_questions:      Cap the number of questions per mode (for testing).
+        reset_db:           Optionally reset TruLens database (ignored if TruSession unavailable).
+        query_concurrency:  Maximum concurrent POST /query calls.
+        metric_concurrency: Maximum concurrent metric computations.
 
     Returns:
         Dict with keys: summary, results, leaderboard (DataFrame), session (optional).
@@ -249,64 +336,53 @@ def run_evaluation(
 
     _save_prompts(total_q, modes)
 
-    all_results: list[dict] = []
     start_time = datetime.now()
+    print(
+        f"\n[INFO] Evaluating {total_q * len(modes)} questions "
+        f"(query concurrency={query_concurrency}, "
+        f"metric concurrency={metric_concurrency}) ..."
+    )
 
-    for mode in modes:
-        print(f"\n{'-' * 65}")
-        print(f"  Mode: {mode.upper()}  ({total_q} questions)")
-        print(f"{'-' * 65}")
-
-        pipeline = RAGPipeline(mode=mode)
-        use_tru_context = False
-        mode_run_name = f"eval-{mode}-{int(time.time())}"
-        dashboard_metrics = _build_dashboard_metrics(provider)
-
-        try:
-            from trulens.apps.app import TruApp
-
-            tru_app = TruApp(
-                pipeline,
-                app_name="LightRAG-Evaluation",
-                app_version=mode,
-                main_method=pipeline.query,
-                feedbacks=dashboard_metrics,
-            )
-
-            with tru_app.run(run_name=mode_run_name):
-                use_tru_context = True
-                for idx, q in enumerate(questions, start=1):
-                    result = _evaluate_one(pipeline, provider, q, idx, total_q)
-                    all_results.append(result)
-                    time.sleep(0.05)  # light throttle
-
-            # Force immediate feedback computation while tru_app is still alive.
-            # The background evaluator thread polls every ~10 s; without an
-            # explicit flush the TruApp can be garbage-collected before the
-            # thread wakes up, clearing the weakref and causing the evaluator
-            # to log "'NoneType' object has no attribute 'connector'".
-            try:
-                tru_app._evaluator.compute_now(record_ids=None)
-                tru_app.stop_evaluator()
-                print(f"[INFO] Dashboard feedbacks flushed for mode={mode}")
-            except Exception as flush_exc:
-                warnings.warn(
-                    f"[WARN] Dashboard feedback flush failed for mode={mode}: {flush_exc}"
+    query_slots = asyncio.Semaphore(query_concurrency)
+    metric_slots = asyncio.Semaphore(metric_concurrency)
+    progress = _Progress(total_q * len(modes))
+    async with AsyncLightRAGClient(max_connections=query_concurrency) as client:
+        outcomes = await asyncio.gather(
+            *(
+                _evaluate_one(
+                    client,
+                    provider,
+                    q,
+                    idx,
+                    mode,
+                    query_slots,
+                    metric_slots,
+                    progress,
                 )
+                for mode in modes
+                for idx, q in enumerate(questions, start=1)
+            )
+        )
 
-        except Exception as exc:
-            warnings.warn(f"[WARN] TruApp context unavailable for mode={mode}: {exc}")
+    all_results = [result for result, _ in outcomes]
 
-        if not use_tru_context:
-            for idx, q in enumerate(questions, start=1):
-                result = _evaluate_one(pipeline, provider, q, idx, total_q)
-                all_results.append(result)
-                time.sleep(0.05)  # light throttle
+    # Replay the fetched responses through the instrumented pipeline so the
+    # TruLens dashboard gets its records without querying LightRAG again
+    responses: dict[str, dict[str, dict[str, Any]]] = {mode: {} for mode in modes}
+    for result, raw in outcomes:
+        if raw is not None:
+            responses[result["mode"]][result["question"]] = raw
+    for mode in modes:
+        await asyncio.to_thread(
+            _record_dashboard, provider, mode, questions, responses[mode]
+        )
 
+    print()
+    for mode in modes:
         success = sum(
             1 for r in all_results if r["mode"] == mode and r["status"] == "success"
         )
-        print(f"\n  Mode {mode}: {success}/{total_q} questions succeeded")
+        print(f"  Mode {mode}: {success}/{total_q} questions succeeded")
 
     # Build leaderboard DataFrame
     leaderboard_data = []
@@ -354,6 +430,52 @@ def run_evaluation(
 # Helpers
 
 
+def _record_dashboard(
+    provider: object,
+    mode: str,
+    questions: list[dict],
+    responses: dict[str, dict[str, Any]],
+) -> None:
+    """Record one TruLens app version per mode from already fetched responses."""
+    if not responses:
+        return
+    pipeline = RAGPipeline(mode=mode, prefetched=responses)
+    mode_run_name = f"eval-{mode}-{int(time.time())}"
+
+    try:
+        from trulens.apps.app import TruApp
+
+        tru_app = TruApp(
+            pipeline,
+            app_name="LightRAG-Evaluation",
+            app_version=mode,
+            main_method=pipeline.query,
+            feedbacks=_build_dashboard_metrics(provider),
+        )
+
+        with tru_app.run(run_name=mode_run_name):
+            for q in questions:
+                if q["question"] in responses:
+                    pipeline.query(q["question"])
+
+        # Force immediate feedback computation while tru_app is still alive.
+        # The background evaluator thread polls every ~10 s; without an
+        # explicit flush the TruApp can be garbage-collected before the
+        # thread wakes up, clearing the weakref and causing the evaluator
+        # to log "'NoneType' object has no attribute 'connector'".
+        try:
+            tru_app._evaluator.compute_now(record_ids=None)
+            tru_app.stop_evaluator()
+            print(f"[INFO] Dashboard feedbacks flushed for mode={mode}")
+        except Exception as flush_exc:
+            warnings.warn(
+                f"[WARN] Dashboard feedback flush failed for mode={mode}: {flush_exc}"
+            )
+
+    except Exception as exc:
+        warnings.warn(f"[WARN] TruApp context unavailable for mode={mode}: {exc}")
+
+
 def _build_dashboard_metrics(provider: object) -> list:
     """Build TruLens Metric objects for the Web UI dashboard.
 